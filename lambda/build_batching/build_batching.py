@@ -21,6 +21,7 @@ docs/architecture/event-driven-composition-architecture.md
 """
 
 import json
+import math
 import os
 import logging
 import uuid
@@ -28,9 +29,25 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import boto3
 from botocore.exceptions import ClientError
-from boto3.dynamodb.conditions import Key
 
 from models.composition import ContentEvent, ContentType
+from shared.composition.metrics_buffer import MetricsBuffer
+from shared.composition.build_batch_store import (
+    ActiveBatchExistsError,
+    BatchNotActiveError,
+    BuildBatchStore,
+    collapse_content_events,
+    header_key
+)
+from shared.composition.build_manifest import BuildManifestWriter, build_manifest_variables, load_content_routes
+from shared.composition.batch_scheduler import BatchScheduler, epoch_seconds, schedule_fields
+from shared.composition.build_lease import BuildLease
+from shared.composition.batch_window import (
+    DEFAULT_LATENCY_TARGET_SECONDS,
+    BatchingStatsStore,
+    WindowDecision,
+    choose_batch_window
+)
 
 
 # Configure logging for operational excellence
@@ -47,8 +64,9 @@ class BuildBatchingHandler:
     fraction of traditional costs while maintaining responsiveness for critical changes.
 
     OPTIMIZATION STRATEGIES:
-    - Immediate builds for high-priority content (≤3 events, products, critical pages)
-    - Intelligent batching for regular updates (30-60 second windows)
+    - Immediate builds for high-priority content (products, critical pages)
+    - Adaptive batch windows from per-client arrival rates and build durations,
+      bounded by a p95 publish-to-live latency target
     - Bulk update detection with extended batching (detecting imports/migrations)
     - Exponential backoff for burst content scenarios
 
@@ -64,23 +82,47 @@ class BuildBatchingHandler:
         # AWS service clients
         self.dynamodb = boto3.resource('dynamodb')
         self.codebuild = boto3.client('codebuild')
-        self.events = boto3.client('events')
         self.sns = boto3.client('sns')
 
+        # Change manifests for partial renders (routing rules of the client's SSG engine)
+        self.ssg_engine = os.environ.get('SSG_ENGINE', '')
+        self.content_routes = load_content_routes(os.environ.get('CONTENT_ROUTES'))
+        manifest_bucket = os.environ.get('BUILD_MANIFEST_BUCKET')
+        self.manifest_writer = BuildManifestWriter(boto3.client('s3'), manifest_bucket) if manifest_bucket else None
+
         # Configuration from environment
         self.batch_table = self.dynamodb.Table(os.environ['BUILD_BATCHING_TABLE'])
-        self.build_trigger_lambda_arn = os.environ.get('BUILD_TRIGGER_LAMBDA_ARN', '')
+        self.batch_store = BuildBatchStore(self.batch_table)
+        self.scheduler = BatchScheduler(self.batch_table)
+        self.build_lease = BuildLease(self.batch_table)   # At most one running build per client
         self.client_id = os.environ['CLIENT_ID']
         self.build_project_name = os.environ['BUILD_PROJECT_NAME']
 
+        # Per-invocation metrics, flushed once as EMF log lines
+        self.metrics = MetricsBuffer(
+            namespace='BuildPipeline',
+            default_dimensions={'ClientId': self.client_id, 'Component': 'build_batching'}
+        )
+
+        # Batch windows adapt to each client's event arrival rate and build
+        # durations, within a p95 publish-to-live latency target
+        self.stats_store = BatchingStatsStore(self.batch_table)
+        self.latency_target_seconds = int(os.environ.get('LATENCY_TARGET_P95_SECONDS', DEFAULT_LATENCY_TARGET_SECONDS))
+
         # Advanced batching parameters (tuned for optimal cost/performance balance)
-        self.batch_window_seconds = 30          # Standard batching window
+        self.batch_window_seconds = 30          # Window until arrival history exists
         self.max_batch_size = 50               # Maximum events per batch
-        self.immediate_build_threshold = 3     # Build immediately for ≤3 events
         self.bulk_update_threshold = 10        # Detect bulk update operations
-        self.extended_batch_window = 60        # Extended window for bulk operations
         self.max_batch_age_minutes = 10        # Maximum batch age before forced trigger
 
+        self.batch_append_attempts = 3         # Retries when racing other deliveries for the active batch
+
+        # Scheduler tick: a fixed-rate rule sweeps due batches this often.
+        # Batches coming due sooner get a delayed wakeup message on this queue
+        self.scheduler_tick_seconds = 60
+        self.wakeup_queue_url = os.environ.get('BATCH_WAKEUP_QUEUE_URL')
+        self.sqs = boto3.client('sqs') if self.wakeup_queue_url else None
+
         # Performance monitoring
         self.start_time = datetime.utcnow()
 
@@ -101,12 +143,18 @@ class BuildBatchingHandler:
             logger.info(f"Processing build batching request - ID: {request_id}")
 
             # Handle different event types
-            if 'Records' in event:
+            if event.get('Records') and event['Records'][0].get('eventSource') == 'aws:sqs':
+                # Delayed wakeup for a batch coming due between ticks
+                return self._handle_scheduler_tick(event, context)
+            elif 'Records' in event:
                 # SNS events from content changes
                 return self._handle_content_events(event, context)
             elif 'source' in event and event['source'] == 'aws.events':
-                # EventBridge scheduled batch trigger
-                return self._handle_scheduled_batch(event, context)
+                # Fixed-rate scheduler tick
+                return self._handle_scheduler_tick(event, context)
+            elif event.get('source') == 'aws.codebuild':
+                # Finished builds feed the build duration statistics
+                return self._handle_build_state_change(event)
             elif 'batch_id' in event and 'action' in event:
                 # Direct batch management commands
                 return self._handle_batch_command(event, context)
@@ -136,12 +184,19 @@ class BuildBatchingHandler:
             # Send error notification for monitoring
             self._send_error_notification(str(e), request_id, event)
 
+            self._emit_metric('BuildBatchingErrors', 1)
+
             return {
                 'statusCode': 500,
                 'message': 'Build batching failed',
                 'error': error_details
             }
 
+        finally:
+            # Single flush per invocation instead of one API call per metric
+            self._emit_metric('BatchingLatency', (datetime.utcnow() - processing_start).total_seconds() * 1000, 'Milliseconds')
+            self.metrics.flush()
+
     def _handle_content_events(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """Handle SNS events containing content changes for batching analysis."""
 
@@ -166,14 +221,28 @@ class BuildBatchingHandler:
                 }
 
             logger.info(f"Analyzing {len(content_events)} content events for intelligent batching")
+            self._emit_metric('ContentEventsReceived', len(content_events))
 
             # Apply intelligent batching strategy
             batching_decision = self._analyze_batching_strategy(content_events)
+            self._emit_metric('BatchingDecisions', 1, dimensions={'Strategy': batching_decision['action']})
 
             if batching_decision['action'] == 'build_immediately':
                 # High-priority content or small change sets
                 build_result = self._trigger_immediate_build(content_events, batching_decision)
 
+                if build_result['build_type'] == 'queued':
+                    # Another build of the site is running; the events build right after it
+                    return {
+                        'statusCode': 200,
+                        'message': f'Build queued behind running build in batch: {build_result["batch_id"]}',
+                        'strategy': 'coalesced',
+                        'reason': build_result['reason'],
+                        'batch_id': build_result['batch_id'],
+                        'events_processed': len(content_events),
+                        'cost_optimization': 'coalesced_with_running_build'
+                    }
+
                 return {
                     'statusCode': 200,
                     'message': f'Immediate build triggered: {build_result["build_id"]}',
@@ -201,19 +270,31 @@ class BuildBatchingHandler:
                 }
 
             elif batching_decision['action'] == 'trigger_batch_now':
-                # Batch is full or aged, trigger immediately
-                build_result = self._trigger_batch_build(batching_decision['batch_id'])
+                # Batch is full or aged: join it, then trigger immediately. The
+                # claim lets only one concurrent delivery start the build.
+                batch_result = self._add_to_batch(content_events, batching_decision)
+                build_result = self._trigger_batch_build(batch_result['batch_id'])
 
                 return {
                     'statusCode': 200,
-                    'message': f'Batch build triggered: {build_result["build_id"]}',
+                    'message': f'Batch build triggered: {build_result.get("build_id")}',
                     'strategy': 'batch_complete',
-                    'batch_id': batching_decision['batch_id'],
-                    'build_id': build_result['build_id'],
+                    'batch_id': batch_result['batch_id'],
+                    'build_id': build_result.get('build_id'),
                     'trigger_reason': batching_decision['reason'],
                     'cost_optimization': 'batch_optimization_applied'
                 }
 
+            elif batching_decision['action'] == 'skip_build':
+                # Draft-only changes: nothing visible to build
+                return {
+                    'statusCode': 200,
+                    'message': 'Build skipped - no build-worthy changes',
+                    'strategy': 'skipped',
+                    'reason': batching_decision['reason'],
+                    'events_processed': len(content_events)
+                }
+
             else:
                 logger.error(f"Unknown batching decision: {batching_decision['action']}")
                 return {
@@ -225,41 +306,89 @@ class BuildBatchingHandler:
             logger.error(f"Content events handling error: {str(e)}", exc_info=True)
             raise
 
-    def _handle_scheduled_batch(self, event: Dict[str, Any], context) -> Dict[str, Any]:
-        """Handle EventBridge scheduled batch triggers."""
+    def _handle_scheduler_tick(self, event: Dict[str, Any], context) -> Dict[str, Any]:
+        """
+        Build every batch whose scheduled time has passed.
 
-        # Extract batch information from EventBridge event
-        detail = event.get('detail', {})
-        batch_id = detail.get('batch_id')
+        Runs for scheduler ticks and wakeup messages alike. The sweep does not
+        wait for batches coming due before the next tick; it schedules a
+        wakeup for the earliest of them instead.
+        """
 
-        if not batch_id:
-            logger.error("No batch_id found in scheduled event")
-            return {
-                'statusCode': 400,
-                'message': 'Missing batch_id in scheduled event'
-            }
+        triggered = []
 
-        try:
-            # Trigger the scheduled batch
+        now = datetime.utcnow()
+        for batch_id in self.scheduler.due_batch_ids(now):
             build_result = self._trigger_batch_build(batch_id)
+            if build_result.get('build_id'):
+                triggered.append({'batch_id': batch_id, 'build_id': build_result['build_id']})
 
-            if build_result and build_result.get('build_id'):
-                return {
-                    'statusCode': 200,
-                    'message': f'Scheduled batch build triggered: {build_result["build_id"]}',
-                    'batch_id': batch_id,
-                    'build_id': build_result['build_id'],
-                    'strategy': 'scheduled_batch'
-                }
-            else:
-                return {
-                    'statusCode': 404,
-                    'message': f'Scheduled batch {batch_id} not found or already processed'
-                }
+        self._schedule_wakeup(self.scheduler.next_due_at(now), datetime.utcnow())
 
-        except Exception as e:
-            logger.error(f"Scheduled batch handling error for {batch_id}: {str(e)}", exc_info=True)
-            raise
+        self._emit_metric('ScheduledBatchesTriggered', len(triggered))
+
+        return {
+            'statusCode': 200,
+            'message': f'Scheduler tick triggered {len(triggered)} batch builds',
+            'builds': triggered,
+            'strategy': 'scheduled_batch'
+        }
+
+    def _schedule_wakeup(self, due_at: Optional[int], now: datetime) -> None:
+        """
+        Sweep again at due_at (epoch seconds) if that is before the next tick.
+
+        The wakeup is an SQS message delayed until the batch is due, so batch
+        windows shorter than the tick interval are honored without keeping an
+        invocation waiting. Duplicate wakeups are harmless: claiming a batch
+        is conditional, and a sweep finding nothing due only re-arms.
+        """
+
+        if self.sqs is None or due_at is None:
+            return
+
+        delay_seconds = max(0, math.ceil(due_at - epoch_seconds(now)))
+        if delay_seconds >= self.scheduler_tick_seconds:
+            return
+
+        try:
+            self.sqs.send_message(
+                QueueUrl=self.wakeup_queue_url,
+                MessageBody=json.dumps({'client_id': self.client_id, 'due_at': due_at}),
+                DelaySeconds=delay_seconds
+            )
+        except ClientError as e:
+            # The next tick still builds the batch, only later
+            logger.warning(f"Failed to schedule batch wakeup for {due_at}: {str(e)}")
+
+    def _handle_build_state_change(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle a finished CodeBuild build: record its duration, release the
+        client's build lease and start the batch that queued behind it.
+        """
+
+        detail = event.get('detail', {})
+        # Events carry the build ARN; start_build returned "<project>:<uuid>"
+        build_id = detail.get('build-id', '').split('/')[-1]
+        phases = detail.get('additional-information', {}).get('phases', [])
+        duration_seconds = sum(phase.get('duration-in-seconds', 0) for phase in phases)
+
+        result = {'statusCode': 200, 'message': f'Build {build_id} finished', 'build_id': build_id}
+
+        if duration_seconds > 0:
+            stats = self.stats_store.record_build_duration(self.client_id, duration_seconds)
+            self._emit_metric('BuildDuration', duration_seconds, 'Seconds',
+                              dimensions={'BuildStatus': detail.get('build-status', 'UNKNOWN')})
+            result['build_duration_p95'] = stats.build_duration_p95
+
+        if build_id and self.build_lease.release(self.client_id, build_id=build_id):
+            waiting_batch = self.batch_store.get_active_batch(self.client_id)
+            if waiting_batch and waiting_batch.get('waiting_for_build'):
+                next_build = self._trigger_batch_build(waiting_batch['batch_id'])
+                result['next_build'] = next_build
+                result['message'] = f"Build {build_id} finished, started queued batch {waiting_batch['batch_id']}"
+
+        return result
 
     def _handle_batch_command(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """Handle direct batch management commands."""
@@ -302,7 +431,17 @@ class BuildBatchingHandler:
         # Check for existing active batch
         existing_batch = self._get_active_batch()
 
-        logger.info(f"Batching analysis: {analysis['summary']}")
+        # Fold this delivery into the client's arrival statistics and size the window
+        stats = self.stats_store.record_arrival(self.client_id, current_time)
+        window = choose_batch_window(
+            stats,
+            latency_target_seconds=self.latency_target_seconds,
+            max_window_seconds=self.max_batch_age_minutes * 60,
+            fallback_window_seconds=self.batch_window_seconds
+        )
+        self._emit_metric('BatchWindow', window.window_seconds, 'Seconds')
+
+        logger.info(f"Batching analysis: {analysis['summary']}; window: {window.reason}")
 
         # STRATEGY 1: Immediate build for high-priority content
         if analysis['high_priority_count'] > 0:
@@ -313,17 +452,17 @@ class BuildBatchingHandler:
                 'cost_justification': 'User experience priority over cost optimization'
             }
 
-        # STRATEGY 2: Immediate build for small change sets (cost-effective anyway)
-        if analysis['build_worthy_count'] <= self.immediate_build_threshold and not existing_batch:
+        # STRATEGY 2: Immediate build when waiting would not batch further changes
+        if window.build_immediately and analysis['build_worthy_count'] > 0 and not existing_batch:
             return {
                 'action': 'build_immediately',
-                'reason': f'Small change set: {analysis["build_worthy_count"]} events (threshold: {self.immediate_build_threshold})',
-                'cost_justification': 'Minimal cost difference for small changes'
+                'reason': window.reason,
+                'cost_justification': 'No further changes expected within the latency target'
             }
 
         # STRATEGY 3: Check if existing batch should be triggered
         if existing_batch:
-            batch_analysis = self._analyze_existing_batch(existing_batch, content_events, current_time)
+            batch_analysis = self._analyze_existing_batch(existing_batch, content_events, current_time, window)
 
             if batch_analysis['should_trigger']:
                 return {
@@ -338,18 +477,18 @@ class BuildBatchingHandler:
                     'batch_id': existing_batch['batch_id'],
                     'reason': batch_analysis['reason'],
                     'is_bulk_operation': analysis['is_bulk_operation'],
-                    'estimated_delay': batch_analysis['estimated_delay']
+                    'estimated_delay': batch_analysis['estimated_delay'],
+                    'due_time': batch_analysis['due_time']
                 }
 
         # STRATEGY 4: Create new batch for cost optimization
         if analysis['build_worthy_count'] > 0:
-            batch_window = self.extended_batch_window if analysis['is_bulk_operation'] else self.batch_window_seconds
-
             return {
                 'action': 'add_to_batch',
-                'reason': f'Cost optimization: batching {analysis["build_worthy_count"]} events',
+                'reason': f'Cost optimization: batching {analysis["build_worthy_count"]} events ({window.reason})',
                 'is_bulk_operation': analysis['is_bulk_operation'],
-                'batch_window': batch_window,
+                'batch_window': window.window_seconds,
+                'quiet_seconds': window.quiet_seconds,
                 'estimated_cost_savings': self._estimate_cost_savings(analysis['build_worthy_count'])
             }
 
@@ -436,20 +575,20 @@ class BuildBatchingHandler:
         """Get active batch for the client with comprehensive error handling."""
 
         try:
-            response = self.batch_table.query(
-                IndexName='ClientActiveIndex',
-                KeyConditionExpression=Key('client_id').eq(self.client_id) & Key('status').eq('active'),
-                Limit=1
-            )
-
-            items = response.get('Items', [])
-            return items[0] if items else None
+            # Strongly consistent read of the client's active batch pointer
+            return self.batch_store.get_active_batch(self.client_id)
 
         except Exception as e:
             logger.error(f"Failed to get active batch for {self.client_id}: {str(e)}")
             return None
 
-    def _analyze_existing_batch(self, batch: Dict[str, Any], new_events: List[ContentEvent], current_time: datetime) -> Dict[str, Any]:
+    def _analyze_existing_batch(
+        self,
+        batch: Dict[str, Any],
+        new_events: List[ContentEvent],
+        current_time: datetime,
+        window: WindowDecision
+    ) -> Dict[str, Any]:
         """Analyze existing batch to determine if it should be triggered or extended."""
 
         batch_created = datetime.fromisoformat(batch['created_at'])
@@ -462,6 +601,7 @@ class BuildBatchingHandler:
             'should_add': True,
             'reason': '',
             'estimated_delay': 0,
+            'due_time': None,
             'stats': {
                 'current_size': current_batch_size,
                 'projected_size': projected_batch_size,
@@ -483,15 +623,21 @@ class BuildBatchingHandler:
             return analysis
 
         # Trigger if batch window has elapsed
-        batch_window = self.extended_batch_window if batch.get('is_bulk_operation') else self.batch_window_seconds
+        batch_window = int(batch.get('batch_window_seconds', self.batch_window_seconds))
         if batch_age_seconds >= batch_window:
             analysis['should_trigger'] = True
             analysis['reason'] = f'Batch window elapsed: {batch_age_seconds:.0f}s >= {batch_window}s'
             return analysis
 
-        # Add to existing batch
+        # Add to existing batch and push its build back by the quiet period,
+        # never past the window it was opened with
+        due_time = min(
+            batch_created + timedelta(seconds=batch_window),
+            current_time + timedelta(seconds=window.quiet_seconds)
+        )
         analysis['should_add'] = True
-        analysis['estimated_delay'] = max(0, batch_window - batch_age_seconds)
+        analysis['due_time'] = due_time
+        analysis['estimated_delay'] = max(0, (due_time - current_time).total_seconds())
         analysis['reason'] = f'Adding to existing batch (age: {batch_age_seconds:.0f}s, window: {batch_window}s)'
 
         return analysis
@@ -507,15 +653,30 @@ class BuildBatchingHandler:
         try:
             current_time = datetime.utcnow()
 
-            # Check if adding to existing batch or creating new one
+            # Add to the active batch, or open a new one. Concurrent deliveries
+            # race on the active pointer; losers join the winner's batch.
             existing_batch_id = batching_decision.get('batch_id')
+            due_time = batching_decision.get('due_time')
+            result = None
 
-            if existing_batch_id:
-                # Add to existing batch
-                result = self._add_to_existing_batch(existing_batch_id, content_events, current_time)
-            else:
-                # Create new batch
-                result = self._create_new_batch(content_events, batching_decision, current_time)
+            for attempt in range(self.batch_append_attempts):
+                if existing_batch_id:
+                    try:
+                        result = self._add_to_existing_batch(existing_batch_id, content_events, current_time, due_time)
+                        break
+                    except BatchNotActiveError:
+                        logger.info(f"Batch {existing_batch_id} closed before append, opening a new batch")
+
+                try:
+                    result = self._create_new_batch(content_events, batching_decision, current_time)
+                    break
+                except ActiveBatchExistsError as e:
+                    logger.info(f"Batch {e.batch_id} opened concurrently, appending to it")
+                    existing_batch_id = e.batch_id
+                    due_time = None
+
+            if result is None:
+                raise RuntimeError(f"Failed to place events in a batch after {self.batch_append_attempts} attempts")
 
             # Calculate estimated cost savings
             estimated_savings = self._estimate_cost_savings(len(content_events))
@@ -531,9 +692,10 @@ class BuildBatchingHandler:
 
             # Fallback: trigger immediate build to ensure content is not lost
             logger.warning("Falling back to immediate build due to batching error")
+            # Bypasses the build lease: queueing behind it relies on batching
             fallback_result = self._trigger_immediate_build(content_events, {
                 'reason': 'Batching system failure - fallback to immediate build'
-            })
+            }, respect_lease=False)
 
             return {
                 'batch_id': 'fallback-immediate',
@@ -543,23 +705,22 @@ class BuildBatchingHandler:
                 'estimated_savings': '0% (fallback mode)'
             }
 
-    def _add_to_existing_batch(self, batch_id: str, content_events: List[ContentEvent], current_time: datetime) -> Dict[str, Any]:
+    def _add_to_existing_batch(
+        self,
+        batch_id: str,
+        content_events: List[ContentEvent],
+        current_time: datetime,
+        due_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """Add events to existing batch with atomic updates."""
 
         try:
-            # Update existing batch atomically
-            response = self.batch_table.update_item(
-                Key={'batch_id': batch_id},
-                UpdateExpression='ADD event_count :count SET updated_at = :updated, events = list_append(events, :new_events)',
-                ExpressionAttributeValues={
-                    ':count': len(content_events),
-                    ':updated': current_time.isoformat(),
-                    ':new_events': [event.model_dump() for event in content_events]
-                },
-                ReturnValues='ALL_NEW'
-            )
+            reschedule = None
+            if due_time:
+                reschedule = {'scheduled_build_time': due_time.isoformat(), **schedule_fields(due_time)}
 
-            updated_batch = response['Attributes']
+            # Reserve sequence numbers on the header, reschedule it and write compact children
+            updated_batch = self.batch_store.add_events(batch_id, content_events, current_time, reschedule=reschedule)
             batch_size = updated_batch['event_count']
 
             logger.info(f"Added {len(content_events)} events to existing batch {batch_id} (total: {batch_size})")
@@ -571,6 +732,9 @@ class BuildBatchingHandler:
                 'scheduled_build_time': updated_batch.get('scheduled_build_time')
             }
 
+        except BatchNotActiveError:
+            raise
+
         except Exception as e:
             logger.error(f"Failed to add to existing batch {batch_id}: {str(e)}")
             raise
@@ -582,31 +746,31 @@ class BuildBatchingHandler:
             # Generate unique batch ID
             batch_id = f"{self.client_id}-{int(current_time.timestamp())}-{str(uuid.uuid4())[:8]}"
 
-            # Determine batch window
+            # Build after the quiet period; later events push it back up to the window
             is_bulk_operation = batching_decision.get('is_bulk_operation', False)
-            batch_window = batching_decision.get('batch_window', self.extended_batch_window if is_bulk_operation else self.batch_window_seconds)
+            batch_window = batching_decision.get('batch_window', self.batch_window_seconds)
+            quiet_seconds = batching_decision.get('quiet_seconds', batch_window)
 
-            scheduled_build_time = current_time + timedelta(seconds=batch_window)
+            scheduled_build_time = current_time + timedelta(seconds=min(quiet_seconds, batch_window))
 
-            # Create batch record
+            # Create batch header; events are stored as child items
             batch_item = {
                 'batch_id': batch_id,
                 'client_id': self.client_id,
                 'status': 'active',
-                'event_count': len(content_events),
-                'events': [event.model_dump() for event in content_events],
                 'created_at': current_time.isoformat(),
                 'updated_at': current_time.isoformat(),
                 'scheduled_build_time': scheduled_build_time.isoformat(),
                 'batch_window_seconds': batch_window,
+                'quiet_seconds': quiet_seconds,
                 'is_bulk_operation': is_bulk_operation,
-                'ttl': int((current_time + timedelta(hours=24)).timestamp())  # 24-hour TTL
+                'ttl': int((current_time + timedelta(hours=24)).timestamp()),  # 24-hour TTL
+                # Picked up by the scheduler tick once due
+                **schedule_fields(scheduled_build_time)
             }
 
-            self.batch_table.put_item(Item=batch_item)
-
-            # Schedule batch build
-            self._schedule_batch_build(batch_id, batch_window)
+            self.batch_store.open_batch(batch_item, content_events)
+            self._schedule_wakeup(batch_item['due_at'], current_time)
 
             logger.info(f"Created new batch {batch_id} with {len(content_events)} events "
                        f"(scheduled in {batch_window}s, bulk: {is_bulk_operation})")
@@ -620,56 +784,35 @@ class BuildBatchingHandler:
                 'is_bulk_operation': is_bulk_operation
             }
 
+        except ActiveBatchExistsError:
+            raise
+
         except Exception as e:
             logger.error(f"Failed to create new batch: {str(e)}")
             raise
 
-    def _schedule_batch_build(self, batch_id: str, delay_seconds: int) -> None:
-        """Schedule batch build using EventBridge with error handling."""
-
-        try:
-            schedule_time = datetime.utcnow() + timedelta(seconds=delay_seconds)
-            rule_name = f"batch-build-{batch_id}"
-
-            # Create EventBridge rule for scheduled execution
-            self.events.put_rule(
-                Name=rule_name,
-                ScheduleExpression=f"at({schedule_time.strftime('%Y-%m-%dT%H:%M:%S')})",
-                State='ENABLED',
-                Description=f"Trigger batch build for {batch_id} (Client: {self.client_id})"
-            )
-
-            # Add target to trigger this Lambda function
-            self.events.put_targets(
-                Rule=rule_name,
-                Targets=[
-                    {
-                        'Id': '1',
-                        'Arn': self.build_trigger_lambda_arn,
-                        'Input': json.dumps({
-                            'batch_id': batch_id,
-                            'action': 'trigger_batch_build',
-                            'client_id': self.client_id,
-                            'scheduled_time': schedule_time.isoformat()
-                        })
-                    }
-                ]
-            )
+    def _trigger_immediate_build(
+        self,
+        content_events: List[ContentEvent],
+        decision: Dict[str, Any],
+        respect_lease: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Trigger immediate build bypassing batching for high-priority content.
 
-            logger.info(f"Scheduled batch build {batch_id} for {schedule_time.isoformat()} "
-                       f"({delay_seconds} seconds from now)")
+        While another build of the site runs, the events join the client's
+        active batch instead, which builds as soon as the running build ends.
+        """
 
-        except Exception as e:
-            logger.error(f"Failed to schedule batch build {batch_id}: {str(e)}")
-            # Don't fail the entire operation - batch can still be triggered manually or through monitoring
+        build_key = f"immediate-{uuid.uuid4()}"
+        reason = decision.get('reason', 'High priority content changes')
 
-    def _trigger_immediate_build(self, content_events: List[ContentEvent], decision: Dict[str, Any]) -> Dict[str, str]:
-        """Trigger immediate build bypassing batching for high-priority content."""
+        if respect_lease and not self.build_lease.acquire(self.client_id, build_key, datetime.utcnow()):
+            return self._queue_behind_running_build(content_events, reason)
 
         try:
             # Create build context
             build_context = self._create_build_context(content_events, 'immediate')
-            reason = decision.get('reason', 'High priority content changes')
 
             logger.info(f"Triggering immediate build: {reason}")
 
@@ -692,11 +835,7 @@ class BuildBatchingHandler:
                         'value': str(len(content_events)),
                         'type': 'PLAINTEXT'
                     },
-                    {
-                        'name': 'CONTENT_CHANGES_SUMMARY',
-                        'value': json.dumps(build_context),
-                        'type': 'PLAINTEXT'
-                    },
+                    *self._build_manifest_variables(build_key, content_events, build_context),
                     {
                         'name': 'CLIENT_ID',
                         'value': self.client_id,
@@ -706,7 +845,10 @@ class BuildBatchingHandler:
             )
 
             build_id = response['build']['id']
+            if respect_lease:
+                self.build_lease.attach_build(self.client_id, build_key, build_id)
             logger.info(f"Immediate build triggered: {build_id}")
+            self._emit_metric('BuildsTriggered', 1, dimensions={'BuildType': 'immediate'})
 
             # Send build notification
             self._send_build_notification('immediate', build_id, len(content_events))
@@ -719,15 +861,62 @@ class BuildBatchingHandler:
 
         except Exception as e:
             logger.error(f"Failed to trigger immediate build: {str(e)}", exc_info=True)
+            if respect_lease:
+                self.build_lease.release(self.client_id, holder=build_key)
             raise
 
-    def _trigger_batch_build(self, batch_id: str) -> Dict[str, Any]:
+    def _queue_behind_running_build(self, content_events: List[ContentEvent], reason: str) -> Dict[str, Any]:
+        """Add events to the client's active batch and hold it until the running build ends."""
+
+        active_batch = self._get_active_batch()
+        batch_result = self._add_to_batch(content_events, {
+            'batch_id': active_batch['batch_id'] if active_batch else None,
+            'reason': reason
+        })
+
+        if batch_result['operation'] == 'fallback_immediate_build':
+            return {'build_id': batch_result['build_id'], 'build_type': 'immediate', 'reason': reason}
+
+        deferred = self._defer_batch(batch_result['batch_id'])
+        logger.info(f"Queued {len(content_events)} events behind running build in batch {batch_result['batch_id']}")
+
+        return {
+            'build_id': deferred.get('build_id'),
+            'build_type': 'queued',
+            'batch_id': batch_result['batch_id'],
+            'reason': reason
+        }
+
+    def _defer_batch(self, batch_id: str, retry_on_release: bool = True) -> Dict[str, Any]:
+        """Mark a batch as waiting for the client's running build."""
+
+        now = datetime.utcnow()
+        lease = self.build_lease.current(self.client_id, now)
+        # Fallback schedule in case the running build's completion event is lost
+        until = datetime.utcfromtimestamp(int(lease['expires_at'])) if lease else now
+
+        if not self.scheduler.defer(batch_id, until):
+            return {'error': 'Batch no longer active'}
+
+        self._emit_metric('BuildsCoalesced', 1)
+
+        # The running build may have finished before the batch was marked
+        # waiting, in which case its completion handler did not see the batch
+        if retry_on_release and self.build_lease.current(self.client_id, datetime.utcnow()) is None:
+            return self._trigger_batch_build(batch_id, retry_on_release=False)
+
+        return {
+            'batch_id': batch_id,
+            'build_type': 'deferred',
+            'waiting_for_build': lease.get('build_id') if lease else None
+        }
+
+    def _trigger_batch_build(self, batch_id: str, retry_on_release: bool = True) -> Dict[str, Any]:
         """Trigger build for accumulated batch with comprehensive error handling."""
 
         try:
             # Get batch details
-            response = self.batch_table.get_item(Key={'batch_id': batch_id})
-            batch = response.get('Item')
+            batch = self.batch_store.get_header(batch_id)
 
             if not batch:
                 logger.warning(f"Batch {batch_id} not found")
@@ -737,20 +926,31 @@ class BuildBatchingHandler:
                 logger.warning(f"Batch {batch_id} status is {batch['status']}, not active")
                 return {'error': f'Batch status is {batch["status"]}, not active'}
 
-            # Mark batch as building
-            self.batch_table.update_item(
-                Key={'batch_id': batch_id},
-                UpdateExpression='SET #status = :status, build_started_at = :started',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'building',
-                    ':started': datetime.utcnow().isoformat()
-                }
-            )
+            # One build per client: hold the batch back while another build runs
+            if not self.build_lease.acquire(self.client_id, batch_id, datetime.utcnow()):
+                return self._defer_batch(batch_id, retry_on_release)
+
+            # Claim the batch; a concurrent tick or size trigger may have won
+            if not self.scheduler.claim(batch_id, datetime.utcnow()):
+                self.build_lease.release(self.client_id, holder=batch_id)
+                return {'error': 'Batch already claimed'}
 
-            # Process batch events
-            events = [ContentEvent(**event_data) for event_data in batch['events']]
+            # New events now open the client's next batch
+            self.batch_store.release_active(self.client_id, batch_id)
+
+            # Fence appends still in flight: they either commit before the
+            # seal and are read below, or move to the next batch
+            self.batch_store.seal(batch_id)
+
+            # Stream batch events from the child items
+            events = list(self.batch_store.iter_events(batch_id))
             build_context = self._create_build_context(events, 'batch')
+            self._emit_metric('EventsCollapsed', len(events) - build_context['total_events'])
+
+            # Every change in the batch cancelled out (e.g. created then deleted)
+            if not build_context['total_events']:
+                self._complete_empty_batch(batch_id, len(events))
+                return {'batch_id': batch_id, 'events_processed': len(events), 'build_type': 'skipped'}
 
             logger.info(f"Triggering batch build for {len(events)} events (batch: {batch_id})")
 
@@ -770,14 +970,10 @@ class BuildBatchingHandler:
                     },
                     {
                         'name': 'BATCH_EVENT_COUNT',
-                        'value': str(len(events)),
-                        'type': 'PLAINTEXT'
-                    },
-                    {
-                        'name': 'CONTENT_CHANGES_SUMMARY',
-                        'value': json.dumps(build_context),
+                        'value': str(build_context['total_events']),
                         'type': 'PLAINTEXT'
                     },
+                    *self._build_manifest_variables(batch_id, events, build_context),
                     {
                         'name': 'CLIENT_ID',
                         'value': self.client_id,
@@ -793,7 +989,8 @@ class BuildBatchingHandler:
                         'value': json.dumps({
                             'events_batched': len(events),
                             'estimated_savings': self._estimate_cost_savings(len(events)),
-                            'batch_window': batch.get('batch_window_seconds', 'unknown'),
+                            # Numbers read back from DynamoDB are Decimals
+                            'batch_window': str(batch.get('batch_window_seconds', 'unknown')),
                             'is_bulk_operation': batch.get('is_bulk_operation', False)
                         }),
                         'type': 'PLAINTEXT'
@@ -802,10 +999,11 @@ class BuildBatchingHandler:
             )
 
             build_id = response['build']['id']
+            self.build_lease.attach_build(self.client_id, batch_id, build_id)
 
             # Update batch with build information
             self.batch_table.update_item(
-                Key={'batch_id': batch_id},
+                Key=header_key(batch_id),
                 UpdateExpression='SET build_id = :build_id, build_triggered_at = :triggered',
                 ExpressionAttributeValues={
                     ':build_id': build_id,
@@ -814,13 +1012,12 @@ class BuildBatchingHandler:
             )
 
             logger.info(f"Batch build triggered: {build_id} for batch {batch_id}")
+            self._emit_metric('BuildsTriggered', 1, dimensions={'BuildType': 'batch'})
+            self._emit_metric('EventsPerBatchBuild', len(events), 'None')
 
             # Send build notification
             self._send_build_notification('batch', build_id, len(events), batch_id)
 
-            # Clean up EventBridge rule
-            self._cleanup_batch_schedule(batch_id)
-
             return {
                 'build_id': build_id,
                 'batch_id': batch_id,
@@ -830,11 +1027,13 @@ class BuildBatchingHandler:
 
         except Exception as e:
             logger.error(f"Failed to trigger batch build {batch_id}: {str(e)}", exc_info=True)
+            self._emit_metric('BuildTriggerFailures', 1, dimensions={'BuildType': 'batch'})
 
-            # Mark batch as failed
+            # Free the lease for the next build and mark batch as failed
             try:
+                self.build_lease.release(self.client_id, holder=batch_id)
                 self.batch_table.update_item(
-                    Key={'batch_id': batch_id},
+                    Key=header_key(batch_id),
                     UpdateExpression='SET #status = :status, error = :error, error_time = :error_time',
                     ExpressionAttributeNames={'#status': 'status'},
                     ExpressionAttributeValues={
@@ -848,12 +1047,39 @@ class BuildBatchingHandler:
 
             return {'error': str(e)}
 
+    def _complete_empty_batch(self, batch_id: str, event_count: int) -> None:
+        """Close a batch whose events collapsed to no net changes without building."""
+
+        self.build_lease.release(self.client_id, holder=batch_id)
+        self.batch_store.complete_skipped(batch_id)
+
+        logger.info(f"Batch {batch_id} skipped: {event_count} events collapsed to no changes")
+        self._emit_metric('BuildsSkipped', 1, dimensions={'Reason': 'NoNetChanges'})
+
+    def _build_manifest_variables(self, build_key: str, events: List[ContentEvent], build_context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """CodeBuild variables describing the build's changes (see build_manifest)."""
+
+        return build_manifest_variables(
+            self.manifest_writer,
+            collapse_content_events(events),
+            self.content_routes,
+            client_id=self.client_id,
+            batch_id=build_key,
+            engine=self.ssg_engine,
+            summary=build_context,
+            emit_metric=self._emit_metric
+        )
+
     def _create_build_context(self, events: List[ContentEvent], build_type: str) -> Dict[str, Any]:
         """Create comprehensive build context for CodeBuild optimization."""
 
+        # Save storms collapse to one net change per content item
+        changes = collapse_content_events(events)
+
         context = {
             'build_type': build_type,
-            'total_events': len(events),
+            'total_events': len(changes),
+            'received_events': len(events),
             'content_types': {},
             'providers': {},
             'event_types': {},
@@ -867,7 +1093,7 @@ class BuildBatchingHandler:
             }
         }
 
-        for event in events:
+        for event in changes:
             # Aggregate by content type
             content_type = event.content_type.value
             context['content_types'][content_type] = context['content_types'].get(content_type, 0) + 1
@@ -884,7 +1110,7 @@ class BuildBatchingHandler:
             context['affected_content_ids'].append(event.content_id)
 
             # Determine rebuild requirements
-            if event.event_type in ['collection.updated', 'content.deleted'] or len(events) > 25:
+            if event.event_type in ['collection.updated', 'content.deleted'] or len(changes) > 25:
                 context['requires_full_rebuild'] = True
 
         return context
@@ -904,25 +1130,13 @@ class BuildBatchingHandler:
 
         return f"{savings_percent:.0f}% (batched {event_count} events)"
 
-    def _cleanup_batch_schedule(self, batch_id: str) -> None:
-        """Clean up EventBridge rule after batch is processed."""
+    def _emit_metric(self, metric_name: str, value: float, unit: str = 'Count', dimensions: Optional[Dict[str, str]] = None) -> None:
+        """Record a build pipeline metric; flushed once at the end of the invocation."""
 
         try:
-            rule_name = f"batch-build-{batch_id}"
-
-            # Remove targets first
-            self.events.remove_targets(
-                Rule=rule_name,
-                Ids=['1']
-            )
-
-            # Delete the rule
-            self.events.delete_rule(Name=rule_name)
-
-            logger.info(f"Cleaned up EventBridge rule for batch {batch_id}")
-
+            self.metrics.add_metric(metric_name, value, unit, dimensions)
         except Exception as e:
-            logger.warning(f"Failed to cleanup EventBridge rule for batch {batch_id}: {str(e)}")
+            logger.warning(f"Failed to record metric {metric_name}: {str(e)}")
 
     def _send_build_notification(self, build_type: str, build_id: str, event_count: int, batch_id: Optional[str] = None) -> None:
         """Send build notifications for monitoring and user updates."""
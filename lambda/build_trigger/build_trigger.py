@@ -18,12 +18,24 @@ docs/architecture/event-driven-composition-architecture.md
 import json
 import os
 import logging
+import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import boto3
 from botocore.exceptions import ClientError
 
 from models.composition import ContentEvent, ContentType
+from shared.composition.metrics_buffer import MetricsBuffer
+from shared.composition.build_batch_store import (
+    ActiveBatchExistsError,
+    BatchNotActiveError,
+    BuildBatchStore,
+    collapse_content_events,
+    header_key
+)
+from shared.composition.build_manifest import BuildManifestWriter, build_manifest_variables, load_content_routes
+from shared.composition.batch_scheduler import BatchScheduler, schedule_fields
+from shared.composition.build_lease import BuildLease
 
 
 # Configure logging for operational excellence
@@ -52,25 +64,43 @@ class BuildTriggerHandler:
         # AWS service clients
         self.codebuild = boto3.client('codebuild')
         self.dynamodb = boto3.resource('dynamodb')
-        self.events = boto3.client('events')
         self.sns = boto3.client('sns')
 
+        # Change manifests for partial renders (routing rules of the client's SSG engine)
+        self.ssg_engine = os.environ.get('SSG_ENGINE', '')
+        self.content_routes = load_content_routes(os.environ.get('CONTENT_ROUTES'))
+        manifest_bucket = os.environ.get('BUILD_MANIFEST_BUCKET')
+        self.manifest_writer = BuildManifestWriter(boto3.client('s3'), manifest_bucket) if manifest_bucket else None
+
         # Configuration from environment
         self.build_project_name = os.environ['BUILD_PROJECT_NAME']
         self.integration_api_url = os.environ.get('INTEGRATION_API_URL', '')
         self.client_id = os.environ['CLIENT_ID']
 
+        # Per-invocation metrics, flushed once as EMF log lines
+        self.metrics = MetricsBuffer(
+            namespace='BuildPipeline',
+            default_dimensions={'ClientId': self.client_id, 'Component': 'build_trigger'}
+        )
+
         # Build batching configuration
         self.batch_window_seconds = int(os.environ.get('BATCH_WINDOW_SECONDS', '30'))
         self.max_batch_size = int(os.environ.get('MAX_BATCH_SIZE', '50'))
         self.immediate_build_threshold = int(os.environ.get('IMMEDIATE_BUILD_THRESHOLD', '3'))
         self.bulk_update_threshold = int(os.environ.get('BULK_UPDATE_THRESHOLD', '10'))
+        self.batch_append_attempts = 3  # Retries when racing other deliveries for the active batch
 
         # DynamoDB table for batch management
         if 'BUILD_BATCHING_TABLE' in os.environ:
             self.batch_table = self.dynamodb.Table(os.environ['BUILD_BATCHING_TABLE'])
+            self.batch_store = BuildBatchStore(self.batch_table)
+            self.scheduler = BatchScheduler(self.batch_table)
+            self.build_lease = BuildLease(self.batch_table)   # At most one running build per client
         else:
             self.batch_table = None
+            self.batch_store = None
+            self.scheduler = None
+            self.build_lease = None
             logger.warning("BUILD_BATCHING_TABLE not configured - batching disabled")
 
         logger.info(f"Build trigger handler initialized for client: {self.client_id}")
@@ -94,7 +124,7 @@ class BuildTriggerHandler:
                 # SNS events from content changes
                 return self._handle_sns_events(event, context)
             elif 'batch_id' in event:
-                # Direct batch build trigger from EventBridge
+                # Direct batch build command
                 return self._handle_batch_trigger(event, context)
             else:
                 logger.warning(f"Unknown event format: {event.keys()}")
@@ -120,6 +150,7 @@ class BuildTriggerHandler:
 
             # Send error notification
             self._send_error_notification(str(e), request_id)
+            self._emit_metric('BuildTriggerErrors', 1)
 
             return {
                 'statusCode': 500,
@@ -127,6 +158,11 @@ class BuildTriggerHandler:
                 'error': error_details
             }
 
+        finally:
+            # Single flush per invocation instead of one API call per metric
+            self._emit_metric('BuildTriggerLatency', (datetime.utcnow() - start_time).total_seconds() * 1000, 'Milliseconds')
+            self.metrics.flush()
+
     def _handle_sns_events(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """Handle SNS events containing content changes."""
 
@@ -151,14 +187,25 @@ class BuildTriggerHandler:
                 }
 
             logger.info(f"Processing {len(content_events)} content events for build decision")
+            self._emit_metric('ContentEventsReceived', len(content_events))
 
             # Apply intelligent build strategy
             build_decision = self._analyze_build_strategy(content_events)
+            self._emit_metric('BuildDecisions', 1, dimensions={'Strategy': build_decision['action']})
 
             if build_decision['action'] == 'build_immediately':
                 # Trigger immediate build for critical changes
                 build_id = self._trigger_immediate_build(content_events, build_decision.get('reason', 'High priority content'))
 
+                if build_id is None:
+                    # Another build of the site is running; the events build right after it
+                    return {
+                        'statusCode': 200,
+                        'message': 'Build queued behind running build',
+                        'strategy': 'coalesced',
+                        'events_processed': len(content_events)
+                    }
+
                 return {
                     'statusCode': 200,
                     'message': f'Immediate build triggered: {build_id}',
@@ -202,7 +249,7 @@ class BuildTriggerHandler:
             raise
 
     def _handle_batch_trigger(self, event: Dict[str, Any], context) -> Dict[str, Any]:
-        """Handle batch build trigger from EventBridge scheduler."""
+        """Handle a direct batch build command."""
 
         batch_id = event.get('batch_id')
         if not batch_id:
@@ -272,7 +319,7 @@ class BuildTriggerHandler:
             }
 
         # Strategy 2: Immediate build for small number of changes
-        if len(published_events) <= self.immediate_build_threshold:
+        if published_events and len(published_events) <= self.immediate_build_threshold:
             return {
                 'action': 'build_immediately',
                 'reason': f'Small change set: {len(published_events)} events (threshold: {self.immediate_build_threshold})',
@@ -295,14 +342,27 @@ class BuildTriggerHandler:
             'draft_events': len(draft_events)
         }
 
-    def _trigger_immediate_build(self, content_events: List[ContentEvent], reason: str) -> str:
+    def _trigger_immediate_build(self, content_events: List[ContentEvent], reason: str, respect_lease: bool = True) -> Optional[str]:
         """
         Trigger immediate build for high-priority content changes.
 
         This ensures that critical business changes (like product updates) are
         deployed quickly to maintain competitive advantage and user experience.
+        While another build of the site runs, the events are queued in the
+        client's active batch instead and None is returned.
         """
 
+        build_key = f"immediate-{uuid.uuid4()}"
+        respect_lease = respect_lease and self.build_lease is not None
+
+        if respect_lease and not self.build_lease.acquire(self.client_id, build_key, datetime.utcnow()):
+            batch_info = self._add_events_to_batch(content_events, {'reason': reason})
+            if batch_info.get('build_id'):
+                return batch_info['build_id']
+            self._defer_batch(batch_info['batch_id'])
+            logger.info(f"Queued {len(content_events)} events behind running build in batch {batch_info['batch_id']}")
+            return None
+
         try:
             # Create build context
             build_context = self._create_build_context(content_events, 'immediate')
@@ -328,11 +388,7 @@ class BuildTriggerHandler:
                         'value': str(len(content_events)),
                         'type': 'PLAINTEXT'
                     },
-                    {
-                        'name': 'CONTENT_CHANGES_SUMMARY',
-                        'value': json.dumps(build_context),
-                        'type': 'PLAINTEXT'
-                    },
+                    *self._build_manifest_variables(build_key, content_events, build_context),
                     {
                         'name': 'INTEGRATION_API_URL',
                         'value': self.integration_api_url,
@@ -347,7 +403,10 @@ class BuildTriggerHandler:
             )
 
             build_id = response['build']['id']
+            if respect_lease:
+                self.build_lease.attach_build(self.client_id, build_key, build_id)
             logger.info(f"Immediate build triggered: {build_id}")
+            self._emit_metric('BuildsTriggered', 1, dimensions={'BuildType': 'immediate'})
 
             # Send build notification
             self._send_build_notification('immediate', build_id, content_events)
@@ -356,6 +415,8 @@ class BuildTriggerHandler:
 
         except Exception as e:
             logger.error(f"Failed to trigger immediate build: {str(e)}", exc_info=True)
+            if respect_lease:
+                self.build_lease.release(self.client_id, holder=build_key)
             raise
 
     def _add_events_to_batch(self, content_events: List[ContentEvent], build_decision: Dict[str, Any]) -> Dict[str, Any]:
@@ -369,7 +430,7 @@ class BuildTriggerHandler:
         if not self.batch_table:
             # Fallback to immediate build if batching is not configured
             logger.warning("Batching not configured, falling back to immediate build")
-            build_id = self._trigger_immediate_build(content_events, "Batching fallback")
+            build_id = self._trigger_immediate_build(content_events, "Batching fallback", respect_lease=False)
             return {'batch_id': 'immediate', 'build_id': build_id}
 
         try:
@@ -377,46 +438,54 @@ class BuildTriggerHandler:
             existing_batch = self._get_active_batch()
 
             current_time = datetime.utcnow()
-            batch_id = existing_batch['batch_id'] if existing_batch else str(current_time.timestamp()).replace('.', '')
-
-            if existing_batch:
-                # Add to existing batch
-                self.batch_table.update_item(
-                    Key={'batch_id': batch_id},
-                    UpdateExpression='ADD event_count :count SET updated_at = :updated, events = list_append(events, :new_events)',
-                    ExpressionAttributeValues={
-                        ':count': len(content_events),
-                        ':updated': current_time.isoformat(),
-                        ':new_events': [event.model_dump() for event in content_events]
-                    }
-                )
-
-                batch_size = existing_batch['event_count'] + len(content_events)
-                logger.info(f"Added {len(content_events)} events to existing batch {batch_id} (total: {batch_size})")
+            batch_id = existing_batch['batch_id'] if existing_batch else None
+            scheduled_build_time = existing_batch.get('scheduled_build_time') if existing_batch else None
+            is_new_batch = False
+
+            # Concurrent deliveries race on the client's active batch pointer;
+            # losers append to the winner's batch instead of opening another
+            for attempt in range(self.batch_append_attempts):
+                if batch_id:
+                    try:
+                        updated_batch = self.batch_store.add_events(batch_id, content_events, current_time)
+                        batch_size = updated_batch['event_count']
+                        scheduled_build_time = updated_batch.get('scheduled_build_time')
+                        logger.info(f"Added {len(content_events)} events to existing batch {batch_id} (total: {batch_size})")
+                        break
+                    except BatchNotActiveError:
+                        logger.info(f"Batch {batch_id} closed before append, opening a new batch")
 
-            else:
                 # Create new batch
+                new_batch_id = str(current_time.timestamp()).replace('.', '')
                 delay_seconds = 60 if build_decision.get('is_bulk_update') else self.batch_window_seconds
+                build_time = current_time + timedelta(seconds=delay_seconds)
 
-                self.batch_table.put_item(
-                    Item={
-                        'batch_id': batch_id,
-                        'client_id': self.client_id,
-                        'status': 'active',
-                        'event_count': len(content_events),
-                        'events': [event.model_dump() for event in content_events],
-                        'created_at': current_time.isoformat(),
-                        'updated_at': current_time.isoformat(),
-                        'scheduled_build_time': (current_time + timedelta(seconds=delay_seconds)).isoformat(),
-                        'ttl': int((current_time + timedelta(hours=24)).timestamp())
-                    }
-                )
-
-                # Schedule batch build
-                self._schedule_batch_build(batch_id, delay_seconds)
+                try:
+                    # Scheduled through the batching table; the scheduler tick builds it once due
+                    self.batch_store.open_batch(
+                        {
+                            'batch_id': new_batch_id,
+                            'client_id': self.client_id,
+                            'status': 'active',
+                            'created_at': current_time.isoformat(),
+                            'updated_at': current_time.isoformat(),
+                            'scheduled_build_time': build_time.isoformat(),
+                            'ttl': int((current_time + timedelta(hours=24)).timestamp()),
+                            **schedule_fields(build_time)
+                        },
+                        content_events
+                    )
+                except ActiveBatchExistsError as e:
+                    logger.info(f"Batch {e.batch_id} opened concurrently, appending to it")
+                    batch_id = e.batch_id
+                    continue
 
-                batch_size = len(content_events)
+                batch_id, batch_size, is_new_batch = new_batch_id, len(content_events), True
+                scheduled_build_time = build_time.isoformat()
                 logger.info(f"Created new batch {batch_id} with {batch_size} events (build in {delay_seconds}s)")
+                break
+            else:
+                raise RuntimeError(f"Failed to place events in a batch after {self.batch_append_attempts} attempts")
 
             # Check if batch should be triggered immediately
             if batch_size >= self.max_batch_size:
@@ -430,81 +499,56 @@ class BuildTriggerHandler:
                 }
 
             # Return batch information
-            estimated_build_time = existing_batch.get('scheduled_build_time') if existing_batch else (current_time + timedelta(seconds=self.batch_window_seconds)).isoformat()
-
             return {
                 'batch_id': batch_id,
                 'batch_size': batch_size,
-                'estimated_build_time': estimated_build_time,
-                'is_new_batch': not existing_batch
+                'estimated_build_time': scheduled_build_time,
+                'is_new_batch': is_new_batch
             }
 
         except Exception as e:
             logger.error(f"Failed to add events to batch: {str(e)}", exc_info=True)
             # Fallback to immediate build
-            build_id = self._trigger_immediate_build(content_events, "Batch creation failed - fallback")
+            # Bypasses the build lease: queueing behind it relies on batching
+            build_id = self._trigger_immediate_build(content_events, "Batch creation failed - fallback", respect_lease=False)
             return {'batch_id': 'fallback', 'build_id': build_id}
 
     def _get_active_batch(self) -> Optional[Dict[str, Any]]:
         """Get active batch for the client."""
 
         try:
-            response = self.batch_table.query(
-                IndexName='ClientActiveIndex',
-                KeyConditionExpression='client_id = :client_id AND #status = :status',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':client_id': self.client_id,
-                    ':status': 'active'
-                },
-                Limit=1
-            )
-
-            items = response.get('Items', [])
-            return items[0] if items else None
+            # Strongly consistent read of the client's active batch pointer
+            return self.batch_store.get_active_batch(self.client_id)
 
         except Exception as e:
             logger.error(f"Failed to get active batch: {str(e)}")
             return None
 
-    def _schedule_batch_build(self, batch_id: str, delay_seconds: int) -> None:
-        """Schedule batch build using EventBridge."""
+    def _defer_batch(self, batch_id: str, retry_on_release: bool = True) -> Optional[str]:
+        """
+        Mark a batch as waiting for the client's running build, which starts
+        it on completion (see build_batching). Returns a build ID only if the
+        running build finished meanwhile and the batch was started here.
+        """
 
-        try:
-            schedule_time = datetime.utcnow() + timedelta(seconds=delay_seconds)
-            rule_name = f"batch-build-{batch_id}"
-
-            # Create one-time scheduled rule
-            self.events.put_rule(
-                Name=rule_name,
-                ScheduleExpression=f"at({schedule_time.strftime('%Y-%m-%dT%H:%M:%S')})",
-                State='ENABLED',
-                Description=f"Trigger batch build for {batch_id} - Client: {self.client_id}"
-            )
+        now = datetime.utcnow()
+        lease = self.build_lease.current(self.client_id, now)
+        # Fallback schedule in case the running build's completion event is lost
+        until = datetime.utcfromtimestamp(int(lease['expires_at'])) if lease else now
 
-            # Add Lambda target
-            self.events.put_targets(
-                Rule=rule_name,
-                Targets=[
-                    {
-                        'Id': '1',
-                        'Arn': context.invoked_function_arn if 'context' in globals() else os.environ.get('AWS_LAMBDA_FUNCTION_NAME', ''),
-                        'Input': json.dumps({
-                            'batch_id': batch_id,
-                            'action': 'trigger_batch_build',
-                            'client_id': self.client_id
-                        })
-                    }
-                ]
-            )
+        if not self.scheduler.defer(batch_id, until):
+            return None
 
-            logger.info(f"Scheduled batch build {batch_id} in {delay_seconds} seconds")
+        self._emit_metric('BuildsCoalesced', 1)
 
-        except Exception as e:
-            logger.error(f"Failed to schedule batch build {batch_id}: {str(e)}")
-            # Don't fail the entire operation - the batch can still be triggered manually
+        # The running build may have finished before the batch was marked
+        # waiting, in which case its completion handler did not see the batch
+        if retry_on_release and self.build_lease.current(self.client_id, datetime.utcnow()) is None:
+            return self._trigger_batch_build(batch_id, retry_on_release=False)
+
+        return None
 
-    def _trigger_batch_build(self, batch_id: str) -> Optional[str]:
+    def _trigger_batch_build(self, batch_id: str, retry_on_release: bool = True) -> Optional[str]:
         """Trigger build for accumulated batch."""
 
         if not self.batch_table:
@@ -513,8 +557,7 @@ class BuildTriggerHandler:
 
         try:
             # Get batch details
-            response = self.batch_table.get_item(Key={'batch_id': batch_id})
-            batch = response.get('Item')
+            batch = self.batch_store.get_header(batch_id)
 
             if not batch:
                 logger.warning(f"Batch {batch_id} not found")
@@ -524,20 +567,31 @@ class BuildTriggerHandler:
                 logger.warning(f"Batch {batch_id} status is {batch['status']}, not active")
                 return None
 
-            # Mark batch as building
-            self.batch_table.update_item(
-                Key={'batch_id': batch_id},
-                UpdateExpression='SET #status = :status, build_started_at = :started',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'building',
-                    ':started': datetime.utcnow().isoformat()
-                }
-            )
+            # One build per client: hold the batch back while another build runs
+            if not self.build_lease.acquire(self.client_id, batch_id, datetime.utcnow()):
+                return self._defer_batch(batch_id, retry_on_release)
+
+            # Claim the batch; a concurrent tick or size trigger may have won
+            if not self.scheduler.claim(batch_id, datetime.utcnow()):
+                self.build_lease.release(self.client_id, holder=batch_id)
+                return None
+
+            # New events now open the client's next batch
+            self.batch_store.release_active(self.client_id, batch_id)
+
+            # Fence appends still in flight: they either commit before the
+            # seal and are read below, or move to the next batch
+            self.batch_store.seal(batch_id)
 
-            # Create aggregated build context
-            events = [ContentEvent(**event_data) for event_data in batch['events']]
+            # Stream batch events from the child items
+            events = list(self.batch_store.iter_events(batch_id))
             build_context = self._create_build_context(events, 'batch')
+            self._emit_metric('EventsCollapsed', len(events) - build_context['total_events'])
+
+            # Every change in the batch cancelled out (e.g. created then deleted)
+            if not build_context['total_events']:
+                self._complete_empty_batch(batch_id, len(events))
+                return None
 
             logger.info(f"Triggering batch build for {len(events)} events")
 
@@ -557,14 +611,10 @@ class BuildTriggerHandler:
                     },
                     {
                         'name': 'BATCH_EVENT_COUNT',
-                        'value': str(len(events)),
-                        'type': 'PLAINTEXT'
-                    },
-                    {
-                        'name': 'CONTENT_CHANGES_SUMMARY',
-                        'value': json.dumps(build_context),
+                        'value': str(build_context['total_events']),
                         'type': 'PLAINTEXT'
                     },
+                    *self._build_manifest_variables(batch_id, events, build_context),
                     {
                         'name': 'INTEGRATION_API_URL',
                         'value': self.integration_api_url,
@@ -584,10 +634,11 @@ class BuildTriggerHandler:
             )
 
             build_id = response['build']['id']
+            self.build_lease.attach_build(self.client_id, batch_id, build_id)
 
             # Update batch with build information
             self.batch_table.update_item(
-                Key={'batch_id': batch_id},
+                Key=header_key(batch_id),
                 UpdateExpression='SET build_id = :build_id, #status = :status',
                 ExpressionAttributeNames={'#status': 'status'},
                 ExpressionAttributeValues={
@@ -597,6 +648,8 @@ class BuildTriggerHandler:
             )
 
             logger.info(f"Batch build triggered: {build_id} for batch {batch_id}")
+            self._emit_metric('BuildsTriggered', 1, dimensions={'BuildType': 'batch'})
+            self._emit_metric('EventsPerBatchBuild', len(events), 'None')
 
             # Send build notification
             self._send_build_notification('batch', build_id, events, batch_id)
@@ -605,12 +658,14 @@ class BuildTriggerHandler:
 
         except Exception as e:
             logger.error(f"Failed to trigger batch build {batch_id}: {str(e)}", exc_info=True)
+            self._emit_metric('BuildTriggerFailures', 1, dimensions={'BuildType': 'batch'})
 
-            # Mark batch as failed
+            # Free the lease for the next build and mark batch as failed
             if self.batch_table:
                 try:
+                    self.build_lease.release(self.client_id, holder=batch_id)
                     self.batch_table.update_item(
-                        Key={'batch_id': batch_id},
+                        Key=header_key(batch_id),
                         UpdateExpression='SET #status = :status, error = :error',
                         ExpressionAttributeNames={'#status': 'status'},
                         ExpressionAttributeValues={
@@ -623,12 +678,39 @@ class BuildTriggerHandler:
 
             return None
 
+    def _complete_empty_batch(self, batch_id: str, event_count: int) -> None:
+        """Close a batch whose events collapsed to no net changes without building."""
+
+        self.build_lease.release(self.client_id, holder=batch_id)
+        self.batch_store.complete_skipped(batch_id)
+
+        logger.info(f"Batch {batch_id} skipped: {event_count} events collapsed to no changes")
+        self._emit_metric('BuildsSkipped', 1, dimensions={'Reason': 'NoNetChanges'})
+
+    def _build_manifest_variables(self, build_key: str, events: List[ContentEvent], build_context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """CodeBuild variables describing the build's changes (see build_manifest)."""
+
+        return build_manifest_variables(
+            self.manifest_writer,
+            collapse_content_events(events),
+            self.content_routes,
+            client_id=self.client_id,
+            batch_id=build_key,
+            engine=self.ssg_engine,
+            summary=build_context,
+            emit_metric=self._emit_metric
+        )
+
     def _create_build_context(self, events: List[ContentEvent], build_type: str) -> Dict[str, Any]:
         """Create optimized build context for CodeBuild."""
 
+        # Save storms collapse to one net change per content item
+        changes = collapse_content_events(events)
+
         context = {
             'build_type': build_type,
-            'total_events': len(events),
+            'total_events': len(changes),
+            'received_events': len(events),
             'content_types': {},
             'providers': {},
             'event_types': {},
@@ -638,7 +720,7 @@ class BuildTriggerHandler:
             'timestamp': datetime.utcnow().isoformat()
         }
 
-        for event in events:
+        for event in changes:
             # Count by content type
             content_type = event.content_type.value
             context['content_types'][content_type] = context['content_types'].get(content_type, 0) + 1
@@ -655,11 +737,19 @@ class BuildTriggerHandler:
             context['affected_content_ids'].append(event.content_id)
 
             # Determine if full rebuild is needed
-            if event.event_type in ['collection.updated', 'content.deleted'] or len(events) > 20:
+            if event.event_type in ['collection.updated', 'content.deleted'] or len(changes) > 20:
                 context['requires_full_rebuild'] = True
 
         return context
 
+    def _emit_metric(self, metric_name: str, value: float, unit: str = 'Count', dimensions: Optional[Dict[str, str]] = None) -> None:
+        """Record a build pipeline metric; flushed once at the end of the invocation."""
+
+        try:
+            self.metrics.add_metric(metric_name, value, unit, dimensions)
+        except Exception as e:
+            logger.warning(f"Failed to record metric {metric_name}: {str(e)}")
+
     def _send_build_notification(self, build_type: str, build_id: str, events: List[ContentEvent], batch_id: Optional[str] = None) -> None:
         """Send build notification for monitoring and user updates."""
 
@@ -0,0 +1,214 @@
+"""
+Content Stream Processor Lambda Function
+
+This function consumes the unified content cache DynamoDB stream and keeps the
+per-client materialized content views up to date, so listings are answered
+with a single read instead of a Query. It also maintains the per-client
+content counters behind cache statistics. After every batch it bumps the
+cache generation counter, which tells warm integration handler containers to
+drop their in-process caches.
+
+Architecture Reference:
+docs/architecture/event-driven-composition-architecture.md
+"""
+
+import os
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+from shared.composition.materialized_views import (
+    MaterializedViewStore,
+    content_counter_deltas,
+    summarize_content,
+    view_ids_for_item
+)
+from shared.composition.metrics_buffer import MetricsBuffer
+
+
+# Configure logging for operational excellence
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+
+class ContentStreamProcessorHandler:
+    """
+    Applies content table changes to materialized views.
+
+    Records are grouped per (client, view) so each view is read and written
+    once per batch. Failures are reported through ReportBatchItemFailures,
+    so the batch is retried from the first record of a failed view only.
+    """
+
+    def __init__(self):
+        """Initialize stream processor with the view store."""
+
+        self.client_id = os.environ['CLIENT_ID']
+        self.view_store = MaterializedViewStore(
+            table_name=os.environ['MATERIALIZED_VIEWS_TABLE'],
+            content_table_name=os.environ['CONTENT_CACHE_TABLE'],
+            dynamodb=boto3.resource('dynamodb')
+        )
+        self.deserializer = TypeDeserializer()
+
+        # Per-invocation metrics, flushed once as EMF log lines
+        self.metrics = MetricsBuffer(
+            namespace='ContentViews',
+            default_dimensions={'ClientId': self.client_id}
+        )
+
+        logger.info(f"Content stream processor initialized for client: {self.client_id}")
+
+    def lambda_handler(self, event: Dict[str, Any], context) -> Dict[str, Any]:
+        """
+        Process a batch of DynamoDB stream records.
+
+        Returns:
+            Partial batch response listing the records to retry
+        """
+
+        processing_start = datetime.utcnow()
+        records = event.get('Records', [])
+
+        try:
+            # (client_id, view_id) -> [(content_id, summary or None)], plus the
+            # sequence numbers of the records that touched each view
+            changes: Dict[Tuple[str, str], List[Tuple[str, Optional[Dict[str, Any]]]]] = {}
+            sequence_numbers: Dict[Tuple[str, str], List[str]] = {}
+            # (sequence number, client_id, counter deltas) in stream order
+            counter_changes: List[Tuple[str, str, Dict[str, int]]] = []
+
+            for record in records:
+                old_item = self._deserialize(record['dynamodb'].get('OldImage'))
+                new_item = self._deserialize(record['dynamodb'].get('NewImage'))
+                sequence_number = record['dynamodb']['SequenceNumber']
+
+                for view_key, change in self._view_changes(old_item, new_item):
+                    changes.setdefault(view_key, []).append(change)
+                    sequence_numbers.setdefault(view_key, []).append(sequence_number)
+
+                deltas = content_counter_deltas(old_item, new_item)
+                if deltas:
+                    counter_changes.append((sequence_number, (new_item or old_item)['client_id'], deltas))
+
+            failed_sequence_numbers: List[str] = []
+            for (client_id, view_id), view_changes in changes.items():
+                try:
+                    self.view_store.apply_changes(client_id, view_id, view_changes)
+                    self.metrics.add_count('ViewUpdates')
+                except Exception as e:
+                    logger.error(f"Failed to update view {view_id} for {client_id}: {str(e)}", exc_info=True)
+                    self.metrics.add_count('ViewUpdateErrors')
+                    failed_sequence_numbers.extend(sequence_numbers[(client_id, view_id)])
+
+            if changes:
+                self.view_store.bump_generation()
+
+            # Counters are not idempotent, so they are applied last: anything
+            # that fails before this point replays the batch uncounted. Records
+            # from the first view failure on are replayed too, so only count
+            # the records before it.
+            first_failure = min((int(number) for number in failed_sequence_numbers), default=None)
+            first_uncounted = self._apply_counters([
+                change for change in counter_changes
+                if first_failure is None or int(change[0]) < first_failure
+            ])
+            if first_uncounted is not None:
+                failed_sequence_numbers.append(first_uncounted)
+
+            self.metrics.add_count('StreamRecordsProcessed', len(records))
+
+            # Retrying from the earliest failed record replays everything after
+            # it; view updates are idempotent upserts, so replays converge
+            if failed_sequence_numbers:
+                return {'batchItemFailures': [{'itemIdentifier': min(failed_sequence_numbers, key=int)}]}
+
+            return {'batchItemFailures': []}
+
+        except Exception as e:
+            logger.error(f"Content stream processing failed: {str(e)}", exc_info=True)
+            self.metrics.add_count('StreamProcessingErrors')
+            if not records:
+                return {'batchItemFailures': []}
+            return {'batchItemFailures': [{'itemIdentifier': records[0]['dynamodb']['SequenceNumber']}]}
+
+        finally:
+            processing_time = (datetime.utcnow() - processing_start).total_seconds()
+            self.metrics.add_timing('StreamBatchLatency', processing_time * 1000)
+            self.metrics.flush()
+
+    def _apply_counters(self, counter_changes: List[Tuple[str, str, Dict[str, int]]]) -> Optional[str]:
+        """
+        Apply counter deltas in stream order, one update per run of records
+        of the same client.
+
+        Returns:
+            Sequence number of the first record whose deltas were not
+            applied, or None when every delta was applied
+        """
+
+        # (first sequence number, client_id, summed deltas)
+        runs: List[Tuple[str, str, Dict[str, int]]] = []
+        for sequence_number, client_id, deltas in counter_changes:
+            if not runs or runs[-1][1] != client_id:
+                runs.append((sequence_number, client_id, {}))
+            totals = runs[-1][2]
+            for name, delta in deltas.items():
+                totals[name] = totals.get(name, 0) + delta
+
+        for first_sequence_number, client_id, totals in runs:
+            try:
+                self.view_store.apply_counter_deltas(client_id, {name: delta for name, delta in totals.items() if delta})
+            except Exception as e:
+                logger.error(f"Failed to update content counters for {client_id}: {str(e)}", exc_info=True)
+                self.metrics.add_count('CounterUpdateErrors')
+                return first_sequence_number
+
+        return None
+
+    def _view_changes(
+        self,
+        old_item: Optional[Dict[str, Any]],
+        new_item: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Tuple[str, str], Tuple[str, Optional[Dict[str, Any]]]]]:
+        """Translate one content change into per-view upserts and removals."""
+
+        item = new_item or old_item
+        if not item or 'data' not in item:
+            return []
+
+        client_id = item['client_id']
+        content_id = item['data']['id']
+
+        new_views = view_ids_for_item(new_item)
+
+        # Fingerprint commits and no-op resends leave every view as it was
+        if old_item and new_item and old_item.get('data') == new_item['data'] and view_ids_for_item(old_item) == new_views:
+            return []
+        summary = summarize_content(new_item['data']) if new_item else None
+
+        view_changes = [((client_id, view_id), (content_id, summary)) for view_id in new_views]
+
+        # Content that moved out of a view (deleted, unpublished, retyped)
+        for view_id in view_ids_for_item(old_item):
+            if view_id not in new_views:
+                view_changes.append(((old_item['client_id'], view_id), (content_id, None)))
+
+        return view_changes
+
+    def _deserialize(self, image: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Convert a stream image from DynamoDB JSON."""
+
+        if not image:
+            return None
+        return {key: self.deserializer.deserialize(value) for key, value in image.items()}
+
+
+# Lambda entry point
+handler = ContentStreamProcessorHandler()
+
+def lambda_handler(event, context):
+    """AWS Lambda entry point for content stream processing."""
+    return handler.lambda_handler(event, context)
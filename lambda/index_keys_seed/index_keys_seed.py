@@ -0,0 +1,82 @@
+"""
+Index Keys Seed Lambda Function
+
+CloudFormation custom resource handler, run when the integration layer is
+created or updated. Queries only use ClientFacetIndex and
+ClientTypeStatusIndex once INDEX_KEYS_VERSION is recorded on the views
+table, because content written before facet_key and type_status_key existed
+is missing from those indexes.
+
+A content table without items has nothing to backfill: every item it will
+ever hold is written with the keys. For such a table, a new deployment,
+the version is recorded right away. A table that already holds content
+(an existing deployment upgraded to index keys) is left alone until
+tools/migrations/backfill_index_keys.py has set the keys on its items and
+records the version itself.
+
+Architecture Reference:
+docs/architecture/event-driven-composition-architecture.md
+"""
+
+import os
+import logging
+from typing import Dict, Any
+import boto3
+
+from shared.composition.materialized_views import INDEX_KEYS_VERSION, MaterializedViewStore
+
+
+# Configure logging for operational excellence
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+
+class IndexKeysSeedHandler:
+    """Records the index key version for content tables that start out empty."""
+
+    def __init__(self):
+        """Initialize seed handler with the content table and view store."""
+
+        dynamodb = boto3.resource('dynamodb')
+        self.content_table = dynamodb.Table(os.environ['CONTENT_CACHE_TABLE'])
+        self.view_store = MaterializedViewStore(
+            table_name=os.environ['MATERIALIZED_VIEWS_TABLE'],
+            dynamodb=dynamodb
+        )
+
+    def lambda_handler(self, event: Dict[str, Any], context) -> Dict[str, Any]:
+        """
+        Handle a custom resource lifecycle event.
+
+        Returns:
+            Custom resource response; Data.Seeded tells whether the version was recorded
+        """
+
+        physical_id = event.get('PhysicalResourceId') or f"index-keys-seed-{self.content_table.name}"
+
+        if event['RequestType'] == 'Delete':
+            return {'PhysicalResourceId': physical_id}
+
+        if self.view_store.get_cache_state()[1] >= INDEX_KEYS_VERSION:
+            return {'PhysicalResourceId': physical_id, 'Data': {'Seeded': 'false'}}
+
+        # One item is enough to know the table holds content written before this deployment
+        if self.content_table.scan(Limit=1, ProjectionExpression='content_id').get('Items'):
+            logger.warning(
+                f"Content table {self.content_table.name} already holds content; run "
+                f"tools/migrations/backfill_index_keys.py to enable the index key queries"
+            )
+            return {'PhysicalResourceId': physical_id, 'Data': {'Seeded': 'false'}}
+
+        self.view_store.mark_index_keys_backfilled(INDEX_KEYS_VERSION)
+        logger.info(f"Recorded index key version {INDEX_KEYS_VERSION} for empty content table {self.content_table.name}")
+
+        return {'PhysicalResourceId': physical_id, 'Data': {'Seeded': 'true'}}
+
+
+# Lambda entry point
+handler = IndexKeysSeedHandler()
+
+def lambda_handler(event, context):
+    """AWS Lambda entry point for the index keys seed custom resource."""
+    return handler.lambda_handler(event, context)
@@ -0,0 +1,119 @@
+"""
+Webhook Ingestion Worker Lambda Function
+
+This function consumes the webhook ingestion queue. With async ingestion the
+integration handler only verifies each webhook, queues its raw body and
+answers 202; this worker then normalizes, stores and publishes the content
+using the integration handler's own pipeline, in batches of queued webhooks.
+
+Failures are reported through ReportBatchItemFailures, so only the webhooks
+that failed are redelivered. Payloads the provider adapter rejects will never
+succeed and are dropped with a metric instead of being retried into the DLQ.
+
+Architecture Reference:
+docs/architecture/event-driven-composition-architecture.md
+"""
+
+import os
+import logging
+from typing import Dict, Any, List
+from datetime import datetime
+import json
+
+from integration_handler import IntegrationHandler, handler as integration_handler
+
+
+# Configure logging for operational excellence
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+
+class IngestionWorkerHandler:
+    """
+    Processes queued webhooks with the integration handler's pipeline.
+
+    The worker shares the integration handler's clients, caches and metrics
+    buffer, so a warm worker container reuses the same adapter registry and
+    local content cache as the handler would.
+    """
+
+    def __init__(self, webhook_handler: IntegrationHandler):
+        """Initialize worker around an integration handler."""
+
+        self.webhook_handler = webhook_handler
+        self.metrics = webhook_handler.metrics
+
+    def lambda_handler(self, event: Dict[str, Any], context) -> Dict[str, Any]:
+        """
+        Process a batch of SQS records.
+
+        Returns:
+            {'batchItemFailures': [...]} naming the messages to redeliver
+        """
+
+        records = event.get('Records', [])
+        failures: List[Dict[str, str]] = []
+
+        try:
+            for record in records:
+                if not self._process_record(record):
+                    failures.append({'itemIdentifier': record['messageId']})
+
+            logger.info(f"Processed {len(records) - len(failures)}/{len(records)} queued webhooks")
+            return {'batchItemFailures': failures}
+
+        finally:
+            self.metrics.flush()
+
+    def _process_record(self, record: Dict[str, Any]) -> bool:
+        """
+        Process one queued webhook.
+
+        Returns:
+            False if the message should be redelivered
+        """
+
+        try:
+            envelope = self.webhook_handler.ingestion_queue.load(record['body'])
+        except Exception as e:
+            logger.error(f"Failed to load queued webhook {record.get('messageId')}: {str(e)}", exc_info=True)
+            return False
+
+        provider_name = envelope.provider
+        queue_latency = (datetime.utcnow() - envelope.received_at).total_seconds() * 1000
+        self.webhook_handler._emit_metric('WebhookQueueLatency', queue_latency, provider_name, 'Milliseconds')
+
+        try:
+            self.webhook_handler.process_webhook_payload(
+                provider_name, json.loads(envelope.raw_body), envelope.headers
+            )
+            return True
+
+        except ValueError as validation_error:
+            # The payload does not match the provider's format; retrying cannot help
+            logger.error(f"Dropping invalid queued webhook from {provider_name}: {str(validation_error)}", extra={
+                'provider': provider_name,
+                'request_id': envelope.request_id,
+                'message_id': record.get('messageId')
+            })
+            self.webhook_handler._emit_metric('WebhookValidationError', 1, provider_name)
+            return True
+
+        except Exception as processing_error:
+            logger.error(f"Queued webhook processing error from {provider_name}: {str(processing_error)}", exc_info=True, extra={
+                'provider': provider_name,
+                'request_id': envelope.request_id,
+                'message_id': record.get('messageId'),
+                'receive_count': record.get('attributes', {}).get('ApproximateReceiveCount'),
+                'error_type': type(processing_error).__name__
+            })
+            self.webhook_handler._emit_metric('WebhookError', 1, provider_name)
+            return False
+
+
+# Lambda entry point
+handler = IngestionWorkerHandler(integration_handler)
+
+def lambda_handler(event, context):
+    """AWS Lambda entry point for queued webhook ingestion."""
+    return handler.lambda_handler(event, context)
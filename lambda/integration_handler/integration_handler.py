@@ -20,14 +20,30 @@ import os
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import boto3
-from botocore.exceptions import ClientError
 
 # Import our optimized components
 from shared.composition.provider_adapter_registry import ProviderAdapterRegistry
 from shared.composition.optimized_content_cache import OptimizedContentCache, EventFilteringSystem
+from shared.composition.metrics_buffer import MetricsBuffer
+from shared.composition.pagination import (
+    PageTokenCodec,
+    InvalidPageTokenError,
+    PaginationConfigurationError,
+    signing_key_from_secret
+)
+from shared.composition.webhook_ingestion import WebhookIngestionQueue
+from shared.composition.webhook_pipeline import CaseInsensitiveHeaders, WebhookPipeline, compile_webhook_pipelines
+from shared.composition.secrets_cache import get_secrets_cache, webhook_secret_id
+from shared.composition.aws_clients import get_aws_clients
 from models.composition import UnifiedContent, ContentEvent, ContentType
 
+# Lambda SnapStart runtime hooks, only present in SnapStart-enabled Python runtimes
+try:
+    from snapshot_restore_py import register_after_restore
+    SNAPSTART_HOOKS_AVAILABLE = True
+except ImportError:
+    SNAPSTART_HOOKS_AVAILABLE = False
+
 
 # Configure logging for operational excellence
 logger = logging.getLogger(__name__)
@@ -52,24 +68,31 @@ class IntegrationHandler:
     def __init__(self):
         """Initialize handler with optimized components."""
 
+        # AWS service clients, created on first use from one shared session
+        self.aws = get_aws_clients()
+
         # Core optimization components
         self.provider_registry = ProviderAdapterRegistry()
         self.content_cache = OptimizedContentCache(
-            table_name=os.environ['CONTENT_CACHE_TABLE']
+            table_name=os.environ['CONTENT_CACHE_TABLE'],
+            local_cache_size=int(os.environ.get('LOCAL_CACHE_SIZE', '1000')),
+            local_cache_ttl_seconds=float(os.environ.get('LOCAL_CACHE_TTL_SECONDS', '5')),
+            views_table_name=os.environ.get('MATERIALIZED_VIEWS_TABLE'),
+            aws_clients=self.aws
         )
-        self.event_filter = EventFilteringSystem()
-
-        # AWS service clients
-        self.sns = boto3.client('sns')
-        self.dynamodb = boto3.resource('dynamodb')
-        self.secrets_manager = boto3.client('secretsmanager')
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.event_filter = EventFilteringSystem(aws_clients=self.aws)
 
         # Configuration
         self.client_id = os.environ['CLIENT_ID']
         self.events_topic_arn = os.environ['CONTENT_EVENTS_TOPIC_ARN']
         self.environment = os.environ.get('ENVIRONMENT', 'prod')
 
+        # Per-invocation metrics, flushed once as EMF log lines
+        self.metrics = MetricsBuffer(
+            namespace='WebhookRouter',
+            default_dimensions={'ClientId': self.client_id, 'Environment': self.environment}
+        )
+
         # Feature flags for graceful rollouts
         self.provider_registry_enabled = os.environ.get('PROVIDER_REGISTRY_ENABLED', 'true').lower() == 'true'
         self.cache_optimization_enabled = os.environ.get('CACHE_OPTIMIZATION_ENABLED', 'true').lower() == 'true'
@@ -82,20 +105,114 @@ class IntegrationHandler:
         self.timestamp_validation_enabled = os.environ.get('TIMESTAMP_VALIDATION_ENABLED', 'true').lower() == 'true'
         self.max_timestamp_skew_minutes = int(os.environ.get('MAX_TIMESTAMP_SKEW_MINUTES', '5'))
 
-        # Initialize webhook receipts table for idempotency
-        if self.idempotency_enabled:
-            self.webhook_receipts_table = self.dynamodb.Table(os.environ['WEBHOOK_RECEIPTS_TABLE'])
+        # Webhook receipts table for idempotency
+        self.webhook_receipts_table_name = os.environ['WEBHOOK_RECEIPTS_TABLE'] if self.idempotency_enabled else None
 
-        # Initialize webhook secret cache (15-minute TTL)
-        self.webhook_secret_cache = {}
-        self.secret_cache_ttl = 900  # 15 minutes
+        # Async ingestion: verified webhooks are queued and acknowledged with 202
+        self.async_ingestion_enabled = os.environ.get('ASYNC_INGESTION_ENABLED', 'false').lower() == 'true'
+        self._ingestion_queue = None
+
+        # Signing key for GET /content continuation tokens
+        self.pagination_secret_id = os.environ.get(
+            'PAGINATION_TOKEN_SECRET_ID', f"{self.client_id}/pagination/token-key"
+        )
+        self._page_token_codec = None
 
         # Initialize built-in adapters
         if self.provider_registry_enabled:
             self.provider_registry.register_builtin_adapters()
 
+        # Per-provider verify/timestamp/event-id/normalize steps, compiled once
+        self.webhook_pipelines = compile_webhook_pipelines(
+            self.provider_registry if self.provider_registry_enabled else None
+        )
+
+        # Every secret a request may need, shared with the adapters. They are
+        # fetched in one batch by warm_up or, without it, on first use, so
+        # init does not load boto3 for the Secrets Manager client
+        self.secrets = get_secrets_cache()
+        self.secrets.register(self.pagination_secret_id, *[
+            webhook_secret_id(provider, self.client_id) for provider in self._webhook_secret_providers()
+        ])
+
+        # Snapshotted deployments do all first-webhook work during init
+        self.eager_warm_up = os.environ.get('EAGER_WARM_UP', 'false').lower() == 'true'
+        if self.eager_warm_up:
+            self.warm_up()
+
         logger.info(f"Integration handler initialized for client: {self.client_id}")
 
+    def warm_up(self) -> None:
+        """
+        Load everything the first webhook would otherwise load.
+
+        Imports and validates every provider adapter, creates the webhook
+        path's AWS clients and prefetches the registered secrets, so a
+        SnapStart snapshot taken after init already contains them.
+        """
+
+        if self.provider_registry_enabled:
+            self.provider_registry.warm_up()
+        self._warm_clients()
+        self.secrets.prefetch()
+
+    def after_restore(self) -> None:
+        """
+        SnapStart restore hook: reconnect and refresh what the snapshot froze.
+
+        Connections captured in the snapshot are gone, and secrets and cached
+        content may be older than their TTLs, so clients and in-process
+        caches are rebuilt and every secret is refetched before the first
+        request of the restored environment.
+        """
+
+        self.aws.reset()
+        self._ingestion_queue = None
+        self.content_cache.reset()
+
+        self.secrets.client = self.aws.client('secretsmanager')
+        self.secrets.refresh_all()
+
+        if self.eager_warm_up:
+            self._warm_clients()
+
+        logger.info(f"Integration handler restored from snapshot for client: {self.client_id}")
+
+    def _warm_clients(self) -> None:
+        """Create the clients every webhook uses."""
+
+        self.aws.client('sns')
+        self.content_cache.table
+        if self.idempotency_enabled:
+            self.webhook_receipts_table
+        if self.async_ingestion_enabled:
+            self.ingestion_queue
+
+    @property
+    def sns(self):
+        return self.aws.client('sns')
+
+    @property
+    def dynamodb(self):
+        return self.aws.resource('dynamodb')
+
+    @property
+    def webhook_receipts_table(self):
+        return self.aws.table(self.webhook_receipts_table_name)
+
+    @property
+    def ingestion_queue(self) -> WebhookIngestionQueue:
+        """Queue for async ingestion, created on first use."""
+
+        if self._ingestion_queue is None:
+            self._ingestion_queue = WebhookIngestionQueue(
+                sqs_client=self.aws.client('sqs'),
+                queue_url=os.environ['INGESTION_QUEUE_URL'],
+                s3_client=self.aws.client('s3'),
+                bucket=os.environ.get('INGESTION_PAYLOAD_BUCKET')
+            )
+        return self._ingestion_queue
+
     def lambda_handler(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """
         Main Lambda handler with intelligent routing and error handling.
@@ -167,6 +284,10 @@ class IntegrationHandler:
 
             return self._create_response(500, error_details, request_id)
 
+        finally:
+            # Single flush per invocation instead of one API call per metric
+            self.metrics.flush()
+
     def _handle_webhook_optimized(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """
         Optimized webhook handling using ProviderAdapterRegistry.
@@ -189,13 +310,14 @@ class IntegrationHandler:
         # Emit arrival metric
         self._emit_metric('WebhookReceived', 1, provider_name)
 
-        # Get webhook body and headers
+        # Get webhook body and headers, normalized once for every step
         raw_body = event.get('body', '{}')
-        headers = event.get('headers', {})
+        headers = CaseInsensitiveHeaders(event.get('headers') or {})
+        pipeline = self.webhook_pipelines.get(provider_name)
 
         # SIGNATURE VERIFICATION - Security first!
         request_id = context.aws_request_id if context else 'local-test'
-        if not self._verify_webhook_signature(provider_name, headers, raw_body):
+        if not self._verify_webhook_signature(pipeline, headers, raw_body):
             logger.error(f"Invalid signature for webhook: {provider_name}", extra={
                 'provider': provider_name,
                 'request_id': request_id,
@@ -207,12 +329,12 @@ class IntegrationHandler:
                 'provider': provider_name,
                 'message': 'Webhook signature verification failed',
                 'security_note': 'Ensure webhook secret is correctly configured',
-                'expected_headers': self._get_expected_signature_headers(provider_name),
+                'expected_headers': list(pipeline.expected_headers),
                 'received_headers': list(headers.keys())
             }, request_id)
 
         # TIMESTAMP VALIDATION - Prevent replay attacks
-        if not self._validate_webhook_timestamp(provider_name, headers):
+        if not self._validate_webhook_timestamp(pipeline, headers):
             logger.warning(f"Webhook timestamp validation failed: {provider_name}", extra={
                 'provider': provider_name,
                 'request_id': request_id,
@@ -250,7 +372,7 @@ class IntegrationHandler:
             body = raw_body
 
         # IDEMPOTENCY CHECK - Prevent duplicate processing
-        if not self._check_and_record_idempotency(provider_name, headers, body):
+        if not self._check_and_record_idempotency(pipeline, headers, body):
             logger.info(f"Duplicate webhook ignored: {provider_name}", extra={
                 'provider': provider_name,
                 'request_id': request_id,
@@ -265,79 +387,17 @@ class IntegrationHandler:
                 'note': 'This prevents duplicate processing of the same webhook event'
             }, request_id)
 
+        # ASYNC INGESTION - Acknowledge now, normalize and store in the worker
+        if self.async_ingestion_enabled:
+            return self._accept_webhook_async(pipeline, raw_body, headers, body, request_id)
+
         logger.info(f"Processing webhook from {provider_name}")
 
         # Track processing start time for latency metrics
         processing_start_time = datetime.utcnow()
 
         try:
-            if self.provider_registry_enabled:
-                # OPTIMIZED: Use registry for content normalization
-                unified_content = self.provider_registry.normalize_content(
-                    provider_name=provider_name,
-                    webhook_data=body,
-                    headers=headers
-                )
-            else:
-                # Fallback to traditional processing
-                unified_content = self._normalize_content_traditional(provider_name, body, headers)
-
-            # Process normalized content with optimized operations
-            events_published = []
-            content_stored = 0
-
-            for content in unified_content:
-                try:
-                    # Store using optimized cache
-                    if self.cache_optimization_enabled:
-                        success = self.content_cache.put_content(content, self.client_id)
-                    else:
-                        success = self._store_content_traditional(content)
-
-                    if success:
-                        content_stored += 1
-
-                        # Publish filtered event
-                        event_type = self._determine_event_type(content)
-                        message_id = self._publish_filtered_content_event(event_type, content)
-
-                        if message_id:
-                            events_published.append({
-                                'content_id': content.id,
-                                'event_type': event_type,
-                                'message_id': message_id
-                            })
-
-                except Exception as content_error:
-                    logger.error(f"Failed to process content {content.id}: {str(content_error)}")
-                    # Continue processing other content items
-
-            # Emit success metrics
-            processing_time = (datetime.utcnow() - processing_start_time).total_seconds() * 1000  # Convert to milliseconds
-            self._emit_metric('WebhookProcessingLatency', processing_time, provider_name, 'Milliseconds')
-            self._emit_metric('WebhookProcessed', 1, provider_name)
-            self._emit_metric('ContentItemsProcessed', len(unified_content), provider_name)
-            self._emit_metric('ContentItemsStored', content_stored, provider_name)
-            self._emit_metric('EventsPublished', len(events_published), provider_name)
-
-            # Return comprehensive response
-            response_data = {
-                'message': f'Successfully processed {content_stored} content items from {provider_name}',
-                'provider_name': provider_name,
-                'provider_type': self.provider_registry.get_provider_type(provider_name),
-                'content_processed': len(unified_content),
-                'content_stored': content_stored,
-                'events_published': len(events_published),
-                'events': events_published[:5],  # First 5 for debugging
-                'timestamp': datetime.utcnow().isoformat(),
-                'processing_time_ms': round(processing_time, 2),
-                'optimization_stats': {
-                    'used_provider_registry': self.provider_registry_enabled,
-                    'used_cache_optimization': self.cache_optimization_enabled,
-                    'used_event_filtering': self.event_filtering_enabled
-                }
-            }
-
+            response_data = self.process_webhook_payload(provider_name, body, headers)
             return self._create_response(200, response_data, request_id)
 
         except ValueError as validation_error:
@@ -376,6 +436,159 @@ class IntegrationHandler:
                 'retry_guidance': 'Webhook will be retried automatically by most providers'
             }, request_id)
 
+    def process_webhook_payload(
+        self,
+        provider_name: str,
+        body: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Normalize, store and publish the content of a verified webhook.
+
+        Called inline for synchronous webhooks and by the ingestion worker for
+        webhooks accepted asynchronously.
+
+        Raises:
+            ValueError: The payload does not match the provider's format
+        """
+
+        processing_start_time = datetime.utcnow()
+        headers = CaseInsensitiveHeaders.of(headers)
+
+        if self.provider_registry_enabled:
+            # OPTIMIZED: Use the provider's compiled pipeline for content normalization
+            unified_content = self.webhook_pipelines.get(provider_name).normalize(body, headers)
+        else:
+            # Fallback to traditional processing
+            unified_content = self._normalize_content_traditional(provider_name, body, headers)
+
+        # A payload may repeat an item; only its last version is stored, so
+        # only that version may be published
+        unified_content = list({content.id: content for content in unified_content}.values())
+
+        # Store normalized content in bulk (25-item BatchWriteItem chunks)
+        if self.cache_optimization_enabled:
+            write_result = self.content_cache.put_content_batch(unified_content, self.client_id)
+            stored_ids = set(write_result.stored_ids)
+            # Resent payloads that change nothing the site renders
+            unchanged_ids = set(write_result.unchanged_ids)
+        else:
+            stored_ids = {content.id for content in unified_content if self._store_content_traditional(content)}
+            unchanged_ids = set()
+
+        # Collect events for stored content only
+        content_events = []
+        content_stored = 0
+
+        for content in unified_content:
+            if content.id not in stored_ids:
+                logger.error(f"Failed to store content {content.id}, skipping event publish")
+                continue
+
+            try:
+                content_stored += 1
+                event_type = self._determine_event_type(content)
+                content_events.append(
+                    self._build_content_event(event_type, content, unchanged=content.id in unchanged_ids)
+                )
+
+            except Exception as content_error:
+                logger.error(f"Failed to process content {content.id}: {str(content_error)}")
+                # Continue processing other content items
+
+        # Publish all events for this webhook in coalesced batches
+        message_ids = self._publish_filtered_content_events(content_events)
+        events_published = [
+            {
+                'content_id': event.content_id,
+                'event_type': event.event_type,
+                'message_id': message_ids[event.event_id]
+            }
+            for event in content_events
+            if event.event_id in message_ids
+        ]
+
+        # Only published changes are remembered, so a resend after a failed
+        # publish is still treated as a change and triggers its build
+        if self.cache_optimization_enabled:
+            published_ids = {event['content_id'] for event in events_published}
+            self.content_cache.commit_fingerprints([
+                content for content in unified_content
+                if content.id in published_ids and content.id not in unchanged_ids
+            ])
+
+        # Emit success metrics
+        processing_time = (datetime.utcnow() - processing_start_time).total_seconds() * 1000  # Convert to milliseconds
+        self._emit_metric('WebhookProcessingLatency', processing_time, provider_name, 'Milliseconds')
+        self._emit_metric('WebhookProcessed', 1, provider_name)
+        self._emit_metric('ContentItemsProcessed', len(unified_content), provider_name)
+        self._emit_metric('UnchangedContentSkipped', len(unchanged_ids), provider_name)
+        self._emit_metric('ContentItemsStored', content_stored, provider_name)
+        self._emit_metric('EventsPublished', len(events_published), provider_name)
+
+        return {
+            'message': f'Successfully processed {content_stored} content items from {provider_name}',
+            'provider_name': provider_name,
+            'provider_type': self.provider_registry.get_provider_type(provider_name),
+            'content_processed': len(unified_content),
+            'content_stored': content_stored,
+            'events_published': len(events_published),
+            'events': events_published[:5],  # First 5 for debugging
+            'timestamp': datetime.utcnow().isoformat(),
+            'processing_time_ms': round(processing_time, 2),
+            'optimization_stats': {
+                'used_provider_registry': self.provider_registry_enabled,
+                'used_cache_optimization': self.cache_optimization_enabled,
+                'used_event_filtering': self.event_filtering_enabled
+            }
+        }
+
+    def _accept_webhook_async(
+        self,
+        pipeline: WebhookPipeline,
+        raw_body: Any,
+        headers: CaseInsensitiveHeaders,
+        body: Dict[str, Any],
+        request_id: str
+    ) -> Dict[str, Any]:
+        """
+        Queue a verified webhook for the ingestion worker and acknowledge it.
+
+        If the webhook cannot be queued its idempotency receipt is released,
+        so the provider's retry is processed instead of ignored as a duplicate.
+        """
+
+        provider_name = pipeline.provider_name
+        if not isinstance(raw_body, str):
+            raw_body = json.dumps(raw_body)
+
+        try:
+            message_id = self.ingestion_queue.enqueue(provider_name, raw_body, dict(headers), request_id)
+
+        except Exception as enqueue_error:
+            logger.error(f"Failed to queue webhook from {provider_name}: {str(enqueue_error)}", exc_info=True, extra={
+                'provider': provider_name,
+                'request_id': request_id,
+                'body_length': len(raw_body)
+            })
+            self._release_idempotency(pipeline, headers, body)
+            self._emit_metric('WebhookEnqueueError', 1, provider_name)
+            return self._create_response(500, {
+                'error': 'Webhook could not be queued',
+                'provider': provider_name,
+                'message': 'The webhook was received but could not be queued for processing.',
+                'retry_guidance': 'Webhook will be retried automatically by most providers'
+            }, request_id)
+
+        self._emit_metric('WebhookAccepted', 1, provider_name)
+        return self._create_response(202, {
+            'status': 'accepted',
+            'message': f'Webhook from {provider_name} accepted for processing',
+            'provider': provider_name,
+            'message_id': message_id,
+            'timestamp': datetime.utcnow().isoformat()
+        }, request_id)
+
     def _handle_content_request_optimized(self, event: Dict[str, Any], context) -> Dict[str, Any]:
         """
         Optimized content retrieval using GSI queries.
@@ -432,6 +645,8 @@ class IntegrationHandler:
             return self._create_response(200, {
                 'content': result.get('items', []),
                 'count': result.get('count', 0),
+                'next_token': result.get('next_token'),
+                'has_more': result.get('next_token') is not None,
                 'query_stats': {
                     'query_time_ms': round(query_time * 1000, 2),
                     'query_type': result.get('query_type', 'unknown'),
@@ -443,6 +658,20 @@ class IntegrationHandler:
                 }
             })
 
+        except InvalidPageTokenError as e:
+            return self._create_response(400, {
+                'error': 'Invalid next_token',
+                'message': str(e)
+            }, context.aws_request_id if context else None)
+
+        except PaginationConfigurationError as e:
+            # Only listings need the signing key; webhooks keep working without it
+            logger.error(f"Content listing unavailable: {str(e)}")
+            return self._create_response(500, {
+                'error': 'Content pagination is not configured',
+                'message': str(e)
+            }, context.aws_request_id if context else None)
+
         except Exception as e:
             logger.error(f"Content request error: {str(e)}", exc_info=True, extra={
                 'request_id': context.aws_request_id if context else 'local-test',
@@ -457,9 +686,16 @@ class IntegrationHandler:
             }, context.aws_request_id if context else None)
 
     def _query_content_optimized(self, query_params: Dict[str, str]) -> Dict[str, Any]:
-        """Execute optimized content query using GSI."""
+        """
+        Execute optimized content query using GSI.
 
-        from shared.composition.optimized_content_cache import ContentQuery
+        A next_token query parameter resumes a previous listing,
+        fill_page=true keeps reading until limit items survive the filters,
+        and fields=summary returns compact items, served from a materialized
+        view when one holds the complete listing.
+        """
+
+        from shared.composition.optimized_content_cache import ContentQuery, MAX_PAGE_LIMIT
 
         # Build optimized query
         content_type = None
@@ -469,69 +705,139 @@ class IntegrationHandler:
             except ValueError:
                 content_type = None
 
+        # Tokens are only valid for the query shape they were issued for
+        token_scope = {
+            'client_id': self.client_id,
+            'content_type': content_type.value if content_type else None,
+            'provider': query_params.get('provider'),
+            'status': query_params.get('status')
+        }
+
+        exclusive_start_key = None
+        if query_params.get('next_token'):
+            exclusive_start_key = self._get_page_token_codec().decode(query_params['next_token'], token_scope)
+
         query = ContentQuery(
             client_id=self.client_id,
             content_type=content_type,
             provider_name=query_params.get('provider'),
             status=query_params.get('status'),
-            limit=int(query_params.get('limit', 100))
+            limit=min(int(query_params.get('limit', 100)), MAX_PAGE_LIMIT),
+            exclusive_start_key=exclusive_start_key,
+            fill_page=query_params.get('fill_page', 'false').lower() == 'true',
+            summary=query_params.get('fields') == 'summary'
         )
 
         # Execute optimized query
         result = self.content_cache.query_content_optimized(query)
 
+        next_token = None
+        if result.last_evaluated_key:
+            next_token = self._get_page_token_codec().encode(result.last_evaluated_key, token_scope)
+
         return {
             'items': result.items,
             'count': result.count,
             'query_type': result.query_stats.get('query_type', 'optimized_gsi'),
-            'last_evaluated_key': result.last_evaluated_key
+            'next_token': next_token
         }
 
-    def _publish_filtered_content_event(self, event_type: str, content: UnifiedContent) -> Optional[str]:
+    def _get_page_token_codec(self) -> PageTokenCodec:
         """
-        Publish content event with intelligent filtering.
+        Get the continuation token codec for the cached signing key.
 
-        OPTIMIZATION: Reduces Lambda invocations by 70% through message filtering
+        Resolved on the first listing rather than at init, so a missing or
+        temporarily unreadable pagination secret only affects GET /content.
+
+        Raises:
+            PaginationConfigurationError: If the pagination secret or its token_key is missing
+        """
+
+        token_key = signing_key_from_secret(self.secrets.get(self.pagination_secret_id), self.pagination_secret_id)
+
+        # Rebuild the codec only when the key was rotated
+        if not self._page_token_codec or self._page_token_codec[0] != token_key:
+            self._page_token_codec = (token_key, PageTokenCodec(token_key.encode('utf-8')))
+
+        return self._page_token_codec[1]
+
+    def _build_content_event(self, event_type: str, content: UnifiedContent, unchanged: bool = False) -> ContentEvent:
+        """
+        Build the content event published for a stored content item.
+
+        Unchanged content (same render fingerprint as the stored version) is
+        still published, but never requires a build. The event carries only
+        what build change manifests need: the slug, and the source file for
+        Git-based providers.
         """
 
-        event = ContentEvent(
+        content_data = {'slug': content.slug}
+        if content.provider_data.get('file_path'):
+            content_data['source_path'] = content.provider_data['file_path']
+
+        return ContentEvent(
             event_type=event_type,
             content_id=content.id,
             content_type=content.content_type,
             provider_name=content.provider_name,
             client_id=self.client_id,
             environment=self.environment,
-            requires_build=self._should_trigger_build(content, event_type)
+            requires_build=not unchanged and self._should_trigger_build(content, event_type),
+            content_data=content_data
         )
 
-        try:
-            if self.event_filtering_enabled:
-                # Use optimized event filtering
-                message_id = self.event_filter.publish_filtered_event(
+    def _publish_filtered_content_events(self, events: List[ContentEvent]) -> Dict[str, str]:
+        """
+        Publish content events with intelligent filtering.
+
+        OPTIMIZATION: Reduces Lambda invocations by 70% through message filtering
+        and publishes up to 10 events per SNS call via PublishBatch.
+
+        Returns mapping of event_id to SNS message ID for published events.
+        """
+
+        if not events:
+            return {}
+
+        if self.event_filtering_enabled:
+            # Use optimized event filtering with coalesced PublishBatch calls
+            try:
+                message_ids = self.event_filter.publish_filtered_events_batch(
                     topic_arn=self.events_topic_arn,
-                    event=event,
+                    events=events,
                     environment=self.environment
                 )
-            else:
+            except Exception as e:
+                logger.error(f"Failed to batch publish {len(events)} events: {str(e)}")
+                return {}
+
+            for event in events:
+                if event.event_id not in message_ids:
+                    logger.error(f"Failed to publish event for content {event.content_id}")
+
+            logger.info(f"Published {len(message_ids)} filtered events")
+            return message_ids
+
+        message_ids = {}
+        for event in events:
+            try:
                 # Traditional SNS publishing with schema versioning
-                event_data = event.model_dump()
+                event_data = event.model_dump(mode='json')
                 event_data["schema_version"] = "1.0"  # Future-proofing for schema evolution
                 response = self.sns.publish(
                     TopicArn=self.events_topic_arn,
                     Message=json.dumps(event_data),
                     MessageAttributes={
-                        'event_type': {'DataType': 'String', 'StringValue': event_type},
+                        'event_type': {'DataType': 'String', 'StringValue': event.event_type},
                         'requires_build': {'DataType': 'String', 'StringValue': str(event.requires_build).lower()}
                     }
                 )
-                message_id = response['MessageId']
+                message_ids[event.event_id] = response['MessageId']
 
-            logger.info(f"Published filtered event {event_type} for content {content.id}")
-            return message_id
+            except Exception as e:
+                logger.error(f"Failed to publish event for content {event.content_id}: {str(e)}")
 
-        except Exception as e:
-            logger.error(f"Failed to publish event for content {content.id}: {str(e)}")
-            return None
+        return message_ids
 
     def _determine_event_type(self, content: UnifiedContent) -> str:
         """Determine appropriate event type based on content state."""
@@ -557,7 +863,7 @@ class IntegrationHandler:
         # Skip builds for draft content
         return False
 
-    def _check_and_record_idempotency(self, provider: str, headers: Dict[str, str], body: Dict[str, Any]) -> bool:
+    def _check_and_record_idempotency(self, pipeline: WebhookPipeline, headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> bool:
         """
         Check if webhook has already been processed and record receipt if new.
 
@@ -567,9 +873,12 @@ class IntegrationHandler:
         if not self.idempotency_enabled:
             return True  # Skip idempotency check if disabled
 
+        from botocore.exceptions import ClientError
+
+        provider = pipeline.provider_name
         try:
             # Extract event ID based on provider
-            event_id = self._extract_event_id(provider, headers, body)
+            event_id = pipeline.event_id(headers, body)
             if not event_id:
                 logger.warning(f"Could not extract event ID for {provider}, allowing processing")
                 return True
@@ -613,37 +922,25 @@ class IntegrationHandler:
             logger.error(f"Idempotency check failed for {provider}: {str(e)}")
             return True  # Allow processing on unexpected errors
 
-    def _extract_event_id(self, provider: str, headers: Dict[str, str], body: Dict[str, Any]) -> str:
-        """Extract unique event ID based on provider-specific headers."""
-
-        # Convert headers to lowercase for case-insensitive matching
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-
-        if provider == "shopify_basic":
-            return headers_lower.get('x-shopify-webhook-id', '')
-        elif provider in ["decap", "tina"]:  # GitHub-based
-            return headers_lower.get('x-github-delivery', '')
-        elif provider == "sanity":
-            # Sanity might use document ID or custom header
-            return body.get('_id') or headers_lower.get('sanity-webhook-id', '')
-        elif provider == "contentful":
-            return headers_lower.get('x-contentful-webhook-name', '')
-        elif provider == "snipcart":
-            return body.get('eventName', '') + '_' + str(body.get('createdOn', ''))
-        elif provider == "foxy":
-            return body.get('id', '') or body.get('transaction_id', '')
-        else:
-            # Fallback: use request ID or generate from content
-            request_id = headers_lower.get('x-request-id', '')
-            if request_id:
-                return request_id
-            # Last resort: hash the body
-            import hashlib
-            return hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+    def _release_idempotency(self, pipeline: WebhookPipeline, headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> None:
+        """Delete the receipt of a webhook that was recorded but never handed on."""
+
+        if not self.idempotency_enabled:
+            return
+
+        provider = pipeline.provider_name
+        event_id = pipeline.event_id(headers, body)
+        if not event_id:
+            return
+
+        try:
+            self.webhook_receipts_table.delete_item(Key={"pk": f"{provider}#{event_id}"})
+        except Exception as e:
+            logger.error(f"Failed to release idempotency receipt {provider}#{event_id}: {str(e)}")
 
-    def _verify_webhook_signature(self, provider: str, headers: Dict[str, str], body: str) -> bool:
+    def _verify_webhook_signature(self, pipeline: WebhookPipeline, headers: CaseInsensitiveHeaders, body: str) -> bool:
         """
-        Verify webhook signature based on provider-specific algorithms.
+        Verify webhook signature with the provider's pipeline.
 
         Returns True if signature is valid, False otherwise.
         """
@@ -651,6 +948,11 @@ class IntegrationHandler:
         if not self.signature_verification_enabled:
             return True  # Skip verification if disabled
 
+        provider = pipeline.provider_name
+        if not pipeline.known:
+            logger.warning(f"Unknown provider for signature verification: {provider}")
+            return False
+
         try:
             # Get webhook secret for this provider
             secret = self._get_webhook_secret(provider)
@@ -658,160 +960,35 @@ class IntegrationHandler:
                 logger.error(f"No webhook secret configured for provider: {provider}")
                 return False
 
-            # Route to provider-specific verification
-            if provider == "shopify_basic":
-                return self._verify_shopify_signature(headers, body, secret)
-            elif provider in ["decap", "tina"]:  # GitHub-based
-                return self._verify_github_signature(headers, body, secret)
-            elif provider == "sanity":
-                return self._verify_sanity_signature(headers, body, secret)
-            elif provider == "contentful":
-                return self._verify_contentful_signature(headers, body, secret)
-            elif provider in ["snipcart", "foxy"]:
-                # These providers might not have signature verification
+            if not pipeline.verify_signature:
+                # These providers might not have signature verification; the secret still has to be configured
                 logger.warning(f"Signature verification not implemented for {provider}")
                 return True  # Allow for now, log for security review
-            else:
-                logger.warning(f"Unknown provider for signature verification: {provider}")
-                return True
+
+            return pipeline.verify(headers, body, secret)
 
         except Exception as e:
             logger.error(f"Signature verification failed for {provider}: {str(e)}")
             return False
 
     def _get_webhook_secret(self, provider: str) -> str:
-        """Get webhook secret from Secrets Manager with caching."""
-
-        import time
-        cache_key = f"webhook_secret_{provider}"
-        now = time.time()
-
-        # Check cache first
-        if cache_key in self.webhook_secret_cache:
-            cached_secret, cached_time = self.webhook_secret_cache[cache_key]
-            if now - cached_time < self.secret_cache_ttl:
-                return cached_secret
-
-        # Fetch from Secrets Manager
-        try:
-            secret_name = f"{self.client_id}/webhooks/{provider}"
-            response = self.secrets_manager.get_secret_value(SecretId=secret_name)
-            secret_data = json.loads(response['SecretString'])
-            secret = secret_data.get('webhook_secret', '')
-
-            # Cache the secret
-            self.webhook_secret_cache[cache_key] = (secret, now)
-            logger.info(f"Cached webhook secret for {provider}")
-            return secret
+        """Get webhook secret from the shared secrets cache."""
 
-        except Exception as e:
-            logger.error(f"Failed to fetch webhook secret for {provider}: {str(e)}")
-            return ""
-
-    def _verify_shopify_signature(self, headers: Dict[str, str], body: str, secret: str) -> bool:
-        """Verify Shopify HMAC-SHA256 signature."""
-
-        import hmac
-        import hashlib
-        import base64
-
-        # Convert headers to lowercase for case-insensitive lookup
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-        signature = headers_lower.get('x-shopify-hmac-sha256', '')
-
-        if not signature:
-            logger.warning("Missing Shopify signature header")
-            return False
-
-        # Compute expected signature
-        computed_signature = base64.b64encode(
-            hmac.new(secret.encode(), body.encode(), hashlib.sha256).digest()
-        ).decode()
-
-        # Use timing-safe comparison
-        is_valid = hmac.compare_digest(signature, computed_signature)
-        if not is_valid:
-            logger.warning("Shopify signature verification failed")
-
-        return is_valid
-
-    def _verify_github_signature(self, headers: Dict[str, str], body: str, secret: str) -> bool:
-        """Verify GitHub HMAC-SHA256 signature (for Decap/Tina)."""
-
-        import hmac
-        import hashlib
-
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-        signature = headers_lower.get('x-hub-signature-256', '')
+        secret_data = self.secrets.get(webhook_secret_id(provider, self.client_id))
+        return (secret_data or {}).get('webhook_secret', '')
 
-        if not signature:
-            logger.warning("Missing GitHub signature header")
-            return False
-
-        # GitHub format: "sha256=<hex_digest>"
-        if not signature.startswith('sha256='):
-            logger.warning("Invalid GitHub signature format")
-            return False
-
-        expected_signature = 'sha256=' + hmac.new(
-            secret.encode(), body.encode(), hashlib.sha256
-        ).hexdigest()
-
-        is_valid = hmac.compare_digest(signature, expected_signature)
-        if not is_valid:
-            logger.warning("GitHub signature verification failed")
-
-        return is_valid
-
-    def _verify_sanity_signature(self, headers: Dict[str, str], body: str, secret: str) -> bool:
-        """Verify Sanity webhook signature."""
-
-        import hmac
-        import hashlib
-
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-        signature = headers_lower.get('sanity-webhook-signature', '')
-
-        if not signature:
-            logger.warning("Missing Sanity signature header")
-            return False
+    def _webhook_secret_providers(self) -> List[str]:
+        """Providers whose webhook secrets are prefetched: the configured ones, or every known provider."""
 
-        # Sanity uses HMAC-SHA256
-        expected_signature = hmac.new(
-            secret.encode(), body.encode(), hashlib.sha256
-        ).hexdigest()
+        # Every provider needs a configured secret, whether or not it signs its webhooks
+        known_providers = self.webhook_pipelines.providers
 
-        is_valid = hmac.compare_digest(signature, expected_signature)
-        if not is_valid:
-            logger.warning("Sanity signature verification failed")
+        configured = [name.strip() for name in os.environ.get('WEBHOOK_PROVIDERS', '').split(',') if name.strip()]
+        if configured:
+            return [provider for provider in configured if provider in known_providers]
+        return known_providers
 
-        return is_valid
-
-    def _verify_contentful_signature(self, headers: Dict[str, str], body: str, secret: str) -> bool:
-        """Verify Contentful webhook signature."""
-
-        import hmac
-        import hashlib
-
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-        signature = headers_lower.get('x-contentful-signature', '')
-
-        if not signature:
-            logger.warning("Missing Contentful signature header")
-            return False
-
-        # Contentful uses HMAC-SHA256
-        expected_signature = hmac.new(
-            secret.encode(), body.encode(), hashlib.sha256
-        ).hexdigest()
-
-        is_valid = hmac.compare_digest(signature, expected_signature)
-        if not is_valid:
-            logger.warning("Contentful signature verification failed")
-
-        return is_valid
-
-    def _validate_webhook_timestamp(self, provider: str, headers: Dict[str, str]) -> bool:
+    def _validate_webhook_timestamp(self, pipeline: WebhookPipeline, headers: CaseInsensitiveHeaders) -> bool:
         """
         Validate webhook timestamp to prevent replay attacks.
 
@@ -821,15 +998,15 @@ class IntegrationHandler:
         if not self.timestamp_validation_enabled:
             return True  # Skip validation if disabled
 
+        provider = pipeline.provider_name
         try:
             # Extract timestamp based on provider
-            webhook_timestamp = self._extract_webhook_timestamp(provider, headers)
+            webhook_timestamp = pipeline.timestamp(headers)
             if not webhook_timestamp:
-                logger.warning(f"No timestamp found for {provider}, allowing request")
+                logger.debug(f"No timestamp found for {provider}, allowing request")
                 return True  # Allow if no timestamp available
 
             # Check if timestamp is within acceptable window
-            from datetime import datetime
             now = datetime.utcnow()
             time_diff_seconds = abs((now - webhook_timestamp).total_seconds())
             max_skew_seconds = self.max_timestamp_skew_minutes * 60
@@ -845,91 +1022,18 @@ class IntegrationHandler:
             logger.error(f"Timestamp validation failed for {provider}: {str(e)}")
             return False
 
-    def _get_expected_signature_headers(self, provider: str) -> List[str]:
-        """Get expected signature headers for a provider for debugging."""
-        header_map = {
-            "shopify_basic": ["x-shopify-hmac-sha256", "x-shopify-webhook-id", "x-shopify-topic"],
-            "decap": ["x-hub-signature-256", "x-github-delivery", "x-github-event"],
-            "tina": ["x-hub-signature-256", "x-github-delivery", "x-github-event"],
-            "sanity": ["sanity-webhook-signature", "sanity-webhook-id"],
-            "contentful": ["x-contentful-signature", "x-contentful-webhook-name"],
-            "snipcart": [],  # No signature verification implemented
-            "foxy": []       # No signature verification implemented
-        }
-        return header_map.get(provider, [])
-
-    def _extract_webhook_timestamp(self, provider: str, headers: Dict[str, str]) -> Optional[datetime]:
-        """Extract webhook timestamp from provider-specific headers."""
-
-        from datetime import datetime
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-
-        try:
-            if provider == "shopify_basic":
-                # Shopify sends Unix timestamp in X-Shopify-Webhook-Timestamp
-                timestamp_str = headers_lower.get('x-shopify-webhook-timestamp', '')
-                if timestamp_str:
-                    return datetime.fromtimestamp(int(timestamp_str))
-
-            elif provider in ["decap", "tina"]:  # GitHub-based
-                # GitHub might send timestamp in various headers
-                timestamp_str = headers_lower.get('x-github-delivery-timestamp', '')
-                if timestamp_str:
-                    # Parse ISO format: 2023-01-01T12:00:00Z
-                    return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).replace(tzinfo=None)
-
-                # Fallback: use current time (GitHub webhooks are typically immediate)
-                return datetime.utcnow()
-
-            elif provider == "sanity":
-                # Sanity might use custom timestamp headers
-                timestamp_str = headers_lower.get('sanity-webhook-timestamp', '')
-                if timestamp_str:
-                    return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).replace(tzinfo=None)
-
-            elif provider == "contentful":
-                # Contentful might include timestamp in headers
-                timestamp_str = headers_lower.get('x-contentful-timestamp', '')
-                if timestamp_str:
-                    return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).replace(tzinfo=None)
-
-            elif provider in ["snipcart", "foxy"]:
-                # These providers might not send timestamps
-                logger.debug(f"No timestamp validation implemented for {provider}")
-                return datetime.utcnow()  # Use current time
-
-            # Fallback: use current time for unknown providers
-            return datetime.utcnow()
-
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Failed to parse timestamp for {provider}: {str(e)}")
-            return None
-
     def _emit_metric(self, metric_name: str, value: float, provider: str, unit: str = 'Count') -> None:
         """
-        Emit CloudWatch metric with provider dimensions for operational monitoring.
+        Record CloudWatch metric with provider dimensions for operational monitoring.
+
+        Metrics are buffered and flushed once at the end of the invocation.
         """
 
         try:
-            self.cloudwatch.put_metric_data(
-                Namespace='WebhookRouter',
-                MetricData=[
-                    {
-                        'MetricName': metric_name,
-                        'Value': value,
-                        'Unit': unit,
-                        'Dimensions': [
-                            {'Name': 'Provider', 'Value': provider},
-                            {'Name': 'ClientId', 'Value': self.client_id},
-                            {'Name': 'Environment', 'Value': self.environment}
-                        ],
-                        'Timestamp': datetime.utcnow()
-                    }
-                ]
-            )
+            self.metrics.add_metric(metric_name, value, unit, {'Provider': provider})
         except Exception as e:
             # Don't fail webhook processing if metrics fail
-            logger.warning(f"Failed to emit metric {metric_name}: {str(e)}")
+            logger.warning(f"Failed to record metric {metric_name}: {str(e)}")
 
     def _handle_health_check(self) -> Dict[str, Any]:
         """Handle health check requests."""
@@ -944,7 +1048,8 @@ class IntegrationHandler:
                 "content_cache": "active",
                 "event_bus": "active",
                 "webhook_idempotency": "active"
-            }
+            },
+            "local_cache": self.content_cache.get_local_cache_stats()
         })
 
     def _send_error_notification(self, error_message: str, event: Dict[str, Any], request_id: str) -> None:
@@ -1039,6 +1144,10 @@ class IntegrationHandler:
 # Lambda entry point
 handler = IntegrationHandler()
 
+if SNAPSTART_HOOKS_AVAILABLE:
+    register_after_restore(handler.after_restore)
+
+
 def lambda_handler(event, context):
     """AWS Lambda entry point."""
     return handler.lambda_handler(event, context)
\ No newline at end of file
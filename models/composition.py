@@ -13,6 +13,8 @@ from pydantic import BaseModel, Field, ConfigDict, computed_field
 from typing import Optional, Dict, Any, List, Literal, Union
 from datetime import datetime
 from enum import Enum
+import hashlib
+import json
 import uuid
 
 # Import centralized enums for type safety
@@ -22,6 +24,11 @@ from models.component_enums import (
 )
 
 
+# UnifiedContent fields that change without changing the rendered site: sync
+# bookkeeping, timestamps bumped by no-op saves and the raw provider payload
+FINGERPRINT_EXCLUDED_FIELDS = {'synced_at', 'updated_at', 'provider_data'}
+
+
 class ContentType(str, Enum):
     """Content types supported across all providers"""
     PRODUCT = "product"           # E-commerce product
@@ -424,6 +431,21 @@ class UnifiedContent(BaseModel):
             return self.price.formatted_price
         return None
 
+    def render_fingerprint(self) -> str:
+        """
+        Stable hash of the fields the site renders.
+
+        Inventory is reduced to its in-stock flag: Shopify resends products on
+        every inventory touch, while pages only show availability.
+        """
+        data = self.model_dump(mode='json', exclude=FINGERPRINT_EXCLUDED_FIELDS)
+        for holder in [data, *data.get('variants', [])]:
+            if holder.get('inventory') is not None:
+                holder['inventory'] = holder['inventory']['in_stock']
+
+        payload = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 
 class ContentEvent(BaseModel):
     """Standard content event format for SNS messaging"""
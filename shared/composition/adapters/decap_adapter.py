@@ -25,6 +25,7 @@ from models.composition import ContentType, ContentStatus
 
 # Legacy interfaces for backward compatibility
 from shared.composition.provider_adapter_registry import IProviderHandler, BaseProviderHandler
+from shared.composition.secrets_cache import get_webhook_secret
 
 
 logger = logging.getLogger(__name__)
@@ -362,12 +363,11 @@ class DecapCMSHandler(ICMSAdapter):
         """
         Get webhook secret for signature validation.
 
-        In production, this would be retrieved from secure configuration
-        management (AWS Secrets Manager, environment variables, etc.)
+        Read from the shared secrets cache; DECAP_WEBHOOK_SECRET overrides
+        it for local development.
         """
 
-        import os
-        return os.environ.get('DECAP_WEBHOOK_SECRET')
+        return get_webhook_secret('decap', env_var='DECAP_WEBHOOK_SECRET')
 
     # ============================================================================
     # New IProviderAdapter Interface Methods
@@ -24,6 +24,7 @@ from blackwell_core.models.events import ContentEvent, UnifiedContent
 
 # Legacy interfaces for backward compatibility
 from shared.composition.provider_adapter_registry import IProviderHandler, BaseProviderHandler
+from shared.composition.secrets_cache import get_webhook_secret
 from models.composition import (
     ContentType, ContentStatus,
     MediaAsset, SEOMetadata
@@ -683,8 +684,7 @@ class SanityCMSHandler(ICMSAdapter):
 
     def _get_webhook_secret(self) -> Optional[str]:
         """Get webhook secret for signature validation."""
-        import os
-        return os.environ.get('SANITY_WEBHOOK_SECRET')
+        return get_webhook_secret('sanity', env_var='SANITY_WEBHOOK_SECRET')
 
 
 # Make handler available for registry
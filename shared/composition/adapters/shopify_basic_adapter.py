@@ -25,6 +25,7 @@ from blackwell_core.models.events import CommerceEvent, UnifiedContent
 
 # Legacy interfaces for backward compatibility
 from shared.composition.provider_adapter_registry import IProviderHandler, BaseProviderHandler
+from shared.composition.secrets_cache import get_webhook_secret
 from models.composition import (
     ContentType, ContentStatus,
     Price, Inventory, ProductVariant, MediaAsset
@@ -522,11 +523,11 @@ class ShopifyBasicHandler(IEcommerceAdapter):
         """
         Get webhook secret for signature validation.
 
-        In production, this would be retrieved from secure configuration.
+        Read from the shared secrets cache; SHOPIFY_WEBHOOK_SECRET overrides
+        it for local development.
         """
 
-        import os
-        return os.environ.get('SHOPIFY_WEBHOOK_SECRET')
+        return get_webhook_secret('shopify_basic', env_var='SHOPIFY_WEBHOOK_SECRET')
 
     # ============================================================================
     # New IProviderAdapter Interface Methods
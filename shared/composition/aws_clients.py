@@ -0,0 +1,102 @@
+"""
+Lazy AWS Client Registry
+
+Lambda containers pay for every boto3 client they create during init:
+creating a client loads and parses its service model and builds its
+endpoint resolver. This registry creates clients, resources and DynamoDB
+Table objects on first use, from one shared boto3 session, so a request only
+pays for the services it touches and no client is created twice.
+
+boto3 itself is imported on first use as well, so modules that only hold a
+registry reference stay cheap to import, and the integration handler's init
+does not load it: the shared secrets cache creates its Secrets Manager
+client on the first fetch, in warm_up or the first request.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+import threading
+
+
+class AWSClients:
+    """
+    Lazily created boto3 clients, resources and tables sharing one session.
+
+    Example:
+        aws = AWSClients()
+        aws.client('sns').publish(...)
+        aws.table('content-cache').get_item(...)
+    """
+
+    def __init__(self, region_name: Optional[str] = None, session=None):
+        self.region_name = region_name
+        self._session = session
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._tables: Dict[str, Any] = {}
+        # boto3 sessions are not thread-safe while creating clients
+        self._lock = threading.RLock()
+
+    @property
+    def session(self):
+        """The shared boto3 session, created on first use"""
+
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import boto3
+                    self._session = boto3.session.Session(region_name=self.region_name)
+        return self._session
+
+    def client(self, service_name: str):
+        """boto3 client for a service"""
+
+        return self._get('client', service_name)
+
+    def resource(self, service_name: str):
+        """boto3 resource for a service"""
+
+        return self._get('resource', service_name)
+
+    def table(self, table_name: str):
+        """DynamoDB Table from the shared DynamoDB resource"""
+
+        table = self._tables.get(table_name)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(table_name)
+                if table is None:
+                    table = self._tables[table_name] = self.resource('dynamodb').Table(table_name)
+        return table
+
+    def reset(self) -> None:
+        """
+        Drop every client, resource and table, e.g. after a SnapStart restore
+        when the connections in the snapshot are gone. The session and its
+        loaded service models are kept, so recreating clients is cheap.
+        """
+
+        with self._lock:
+            self._clients.clear()
+            self._tables.clear()
+
+    def _get(self, kind: str, service_name: str):
+        key = (kind, service_name)
+        instance = self._clients.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._clients.get(key)
+                if instance is None:
+                    factory = self.session.client if kind == 'client' else self.session.resource
+                    instance = self._clients[key] = factory(service_name)
+        return instance
+
+
+_shared_clients: Optional[AWSClients] = None
+
+
+def get_aws_clients() -> AWSClients:
+    """Process-wide registry shared by handlers and the shared modules they use"""
+
+    global _shared_clients
+    if _shared_clients is None:
+        _shared_clients = AWSClients()
+    return _shared_clients
@@ -0,0 +1,148 @@
+"""
+Batch Build Scheduler
+
+This module schedules batch builds with the build batching table itself
+instead of creating one EventBridge rule per batch.
+
+A batch header waiting for its build carries schedule_shard and due_at
+(epoch seconds), which makes it visible in the sparse DueBatchIndex. One
+fixed-rate tick sweeps the index for due batches and claims each with a
+conditional update that also removes the schedule attributes, so a batch is
+built exactly once even when ticks or handlers overlap. Scheduling a batch
+is part of the header write and costs no extra API calls.
+"""
+
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+import logging
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from shared.composition.build_batch_store import header_key
+
+
+logger = logging.getLogger(__name__)
+
+DUE_BATCH_INDEX = "DueBatchIndex"
+
+# All pending batches of a table share one index partition; the table holds
+# a single client's batches, so the partition stays small
+DEFAULT_SCHEDULE_SHARD = 'due'
+
+
+def epoch_seconds(moment: datetime) -> int:
+    """Epoch seconds of a naive UTC datetime"""
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+def schedule_fields(due_time: datetime, shard: str = DEFAULT_SCHEDULE_SHARD) -> Dict[str, Any]:
+    """Header attributes that schedule a batch build at due_time"""
+    return {'schedule_shard': shard, 'due_at': epoch_seconds(due_time)}
+
+
+class BatchScheduler:
+    """
+    Sweep and claim scheduled batch builds.
+
+    Example:
+        scheduler = BatchScheduler(batch_table)
+        for batch_id in scheduler.due_batch_ids(datetime.utcnow()):
+            if scheduler.claim(batch_id, datetime.utcnow()):
+                start_build(batch_id)
+    """
+
+    def __init__(self, table, shard: str = DEFAULT_SCHEDULE_SHARD):
+        self.table = table
+        self.shard = shard
+
+    def due_batch_ids(self, now: datetime) -> List[str]:
+        """Batches whose build time has passed, oldest first"""
+
+        query_params = {
+            'IndexName': DUE_BATCH_INDEX,
+            'KeyConditionExpression': Key('schedule_shard').eq(self.shard) & Key('due_at').lte(epoch_seconds(now))
+        }
+
+        batch_ids: List[str] = []
+        while True:
+            response = self.table.query(**query_params)
+            batch_ids.extend(item['batch_id'] for item in response.get('Items', []))
+
+            if not response.get('LastEvaluatedKey'):
+                return batch_ids
+
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def next_due_at(self, now: datetime) -> Optional[int]:
+        """Epoch seconds of the next batch due after now, if any"""
+
+        response = self.table.query(
+            IndexName=DUE_BATCH_INDEX,
+            KeyConditionExpression=Key('schedule_shard').eq(self.shard) & Key('due_at').gt(epoch_seconds(now)),
+            Limit=1
+        )
+
+        items = response.get('Items', [])
+        return int(items[0]['due_at']) if items else None
+
+    def claim(self, batch_id: str, now: datetime) -> bool:
+        """
+        Move an active batch to building and unschedule it.
+
+        Returns:
+            True if this caller claimed the batch, False if it was not active
+        """
+
+        try:
+            self.table.update_item(
+                Key=header_key(batch_id),
+                UpdateExpression='SET #status = :building, build_started_at = :started REMOVE schedule_shard, due_at',
+                ConditionExpression='#status = :active',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':building': 'building',
+                    ':active': 'active',
+                    ':started': now.isoformat()
+                }
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Batch {batch_id} was already claimed")
+            return False
+
+    def defer(self, batch_id: str, until: datetime) -> bool:
+        """
+        Hold an active batch back while another build of the client runs.
+
+        The batch keeps accepting events and is rescheduled for until (the
+        running build's lease expiry) as a fallback to being started when
+        that build finishes.
+
+        Returns:
+            True if deferred, False if the batch was no longer active
+        """
+
+        try:
+            self.table.update_item(
+                Key=header_key(batch_id),
+                UpdateExpression='SET waiting_for_build = :waiting, schedule_shard = :shard, due_at = :due',
+                ConditionExpression='#status = :active',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':waiting': True,
+                    ':shard': self.shard,
+                    ':due': epoch_seconds(until),
+                    ':active': 'active'
+                }
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Batch {batch_id} is no longer active, not deferring")
+            return False
@@ -0,0 +1,218 @@
+"""
+Adaptive Batch Windows
+
+This module picks how long the build batching Lambda holds a batch open for
+each client, from rolling statistics kept in the build batching table:
+
+- ewma_interarrival_seconds: smoothed gap between content event deliveries
+- build_durations: the most recent CodeBuild durations, for a p95 estimate
+
+Every build costs roughly the same CodeBuild minutes however many changes it
+carries, so the longest window that still meets the client's p95
+publish-to-live latency target builds the fewest times. Waiting only pays
+off when more events are likely to arrive, though: a batch closes once the
+client has been quiet for a few inter-arrival times, and builds immediately
+when the next event is not expected within the latency budget at all.
+
+The statistics item shares the batching table with batch headers under the
+key {'batch_id': 'stats#<client_id>', 'seq': 0}. Updates are plain
+read-modify-write; a lost update between overlapping invocations only makes
+the estimate marginally staler.
+"""
+
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+import logging
+import math
+
+from shared.composition.batch_scheduler import epoch_seconds
+from shared.composition.build_batch_store import HEADER_SEQ
+
+
+logger = logging.getLogger(__name__)
+
+STATS_PREFIX = 'stats#'
+
+# Weight of the newest inter-arrival gap in the moving average
+INTERARRIVAL_ALPHA = 0.3
+
+# Build durations kept for the p95 estimate
+BUILD_DURATION_SAMPLES = 20
+
+# A batch closes after this many average inter-arrival times without events
+QUIET_PERIOD_FACTOR = 3.0
+
+DEFAULT_LATENCY_TARGET_SECONDS = 600
+DEFAULT_BUILD_DURATION_SECONDS = 180
+MIN_QUIET_SECONDS = 5
+
+
+def stats_key(client_id: str) -> Dict[str, Any]:
+    """Key of a client's batching statistics item"""
+    return {'batch_id': f"{STATS_PREFIX}{client_id}", 'seq': HEADER_SEQ}
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of samples, or None without samples"""
+
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class BatchingStats:
+    """Rolling per-client batching statistics"""
+
+    ewma_interarrival_seconds: Optional[float] = None
+    last_event_at: Optional[int] = None
+    build_durations: List[float] = field(default_factory=list)
+
+    @property
+    def build_duration_p95(self) -> float:
+        """p95 of recent build durations, or the default before any build finished"""
+        observed = percentile(self.build_durations, 0.95)
+        return observed if observed is not None else DEFAULT_BUILD_DURATION_SECONDS
+
+    @classmethod
+    def from_item(cls, item: Optional[Dict[str, Any]]) -> 'BatchingStats':
+        if not item:
+            return cls()
+
+        ewma = item.get('ewma_interarrival_seconds')
+        last_event_at = item.get('last_event_at')
+        return cls(
+            ewma_interarrival_seconds=float(ewma) if ewma is not None else None,
+            last_event_at=int(last_event_at) if last_event_at is not None else None,
+            build_durations=[float(duration) for duration in item.get('build_durations', [])]
+        )
+
+
+@dataclass
+class WindowDecision:
+    """How long to hold a new batch open"""
+
+    window_seconds: int
+    quiet_seconds: int
+    build_immediately: bool
+    reason: str
+
+
+def choose_batch_window(
+    stats: BatchingStats,
+    latency_target_seconds: float = DEFAULT_LATENCY_TARGET_SECONDS,
+    max_window_seconds: int = DEFAULT_LATENCY_TARGET_SECONDS,
+    fallback_window_seconds: int = 30
+) -> WindowDecision:
+    """
+    Choose the batch window that minimizes builds within the latency target.
+
+    An event published at the start of a batch goes live after the window
+    plus the build, so the window may use whatever the p95 build duration
+    leaves of the latency target.
+
+    Args:
+        stats: Client batching statistics
+        latency_target_seconds: p95 publish-to-live target
+        max_window_seconds: Upper bound on any window
+        fallback_window_seconds: Window used before any events were observed
+
+    Returns:
+        Window decision
+    """
+
+    budget = int(min(max_window_seconds, latency_target_seconds - stats.build_duration_p95))
+
+    if budget <= 0:
+        return WindowDecision(0, 0, True, f"p95 build of {stats.build_duration_p95:.0f}s leaves no latency budget")
+
+    if stats.ewma_interarrival_seconds is None:
+        window = min(fallback_window_seconds, budget)
+        return WindowDecision(window, window, False, 'No arrival history yet')
+
+    quiet = max(MIN_QUIET_SECONDS, int(QUIET_PERIOD_FACTOR * stats.ewma_interarrival_seconds))
+
+    if quiet >= budget:
+        return WindowDecision(
+            0, 0, True,
+            f"Events arrive every {stats.ewma_interarrival_seconds:.0f}s on average, "
+            f"waiting {budget}s is unlikely to batch more"
+        )
+
+    return WindowDecision(
+        budget, quiet, False,
+        f"Holding up to {budget}s, closing after {quiet}s without events"
+    )
+
+
+class BatchingStatsStore:
+    """
+    Per-client batching statistics in the build batching table.
+
+    Example:
+        stats_store = BatchingStatsStore(batch_table)
+        stats = stats_store.record_arrival(client_id, datetime.utcnow())
+        decision = choose_batch_window(stats, latency_target_seconds=600)
+    """
+
+    def __init__(self, table, max_gap_seconds: int = 2 * DEFAULT_LATENCY_TARGET_SECONDS):
+        self.table = table
+        # Longer gaps (nights, weekends) are clamped so one of them does not
+        # dominate the average
+        self.max_gap_seconds = max_gap_seconds
+
+    def get(self, client_id: str) -> BatchingStats:
+        response = self.table.get_item(Key=stats_key(client_id))
+        return BatchingStats.from_item(response.get('Item'))
+
+    def record_arrival(self, client_id: str, now: datetime) -> BatchingStats:
+        """Fold an event delivery into the inter-arrival average"""
+
+        stats = self.get(client_id)
+        arrived_at = epoch_seconds(now)
+
+        if stats.last_event_at is not None:
+            gap = min(max(arrived_at - stats.last_event_at, 0), self.max_gap_seconds)
+            if stats.ewma_interarrival_seconds is None:
+                stats.ewma_interarrival_seconds = float(gap)
+            else:
+                stats.ewma_interarrival_seconds = (
+                    INTERARRIVAL_ALPHA * gap + (1 - INTERARRIVAL_ALPHA) * stats.ewma_interarrival_seconds
+                )
+
+        stats.last_event_at = arrived_at
+
+        update_expression = 'SET last_event_at = :last'
+        values: Dict[str, Any] = {':last': arrived_at}
+        if stats.ewma_interarrival_seconds is not None:
+            update_expression += ', ewma_interarrival_seconds = :ewma'
+            values[':ewma'] = Decimal(str(round(stats.ewma_interarrival_seconds, 3)))
+
+        self.table.update_item(
+            Key=stats_key(client_id),
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=values
+        )
+
+        return stats
+
+    def record_build_duration(self, client_id: str, duration_seconds: float) -> BatchingStats:
+        """Keep a finished build's duration among the recent samples"""
+
+        stats = self.get(client_id)
+        stats.build_durations = (stats.build_durations + [float(duration_seconds)])[-BUILD_DURATION_SAMPLES:]
+
+        self.table.update_item(
+            Key=stats_key(client_id),
+            UpdateExpression='SET build_durations = :durations',
+            ExpressionAttributeValues={
+                ':durations': [Decimal(str(round(duration, 1))) for duration in stats.build_durations]
+            }
+        )
+
+        logger.info(f"Recorded {duration_seconds:.0f}s build for {client_id}, p95 now {stats.build_duration_p95:.0f}s")
+        return stats
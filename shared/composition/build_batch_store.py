@@ -0,0 +1,497 @@
+"""
+Build Batch Store
+
+This module stores build batches as a header item plus one small child item
+per event, instead of appending full event payloads to a single batch item.
+
+Table layout (PK batch_id, SK seq):
+    seq = 0      Batch header: client_id, status, event_count, next_seq,
+                 committed_count, sealed_at, schedule
+    seq = 1..n   Compact event references (content_data reduced to the
+                 manifest fields, no previous_content)
+
+    active#{client_id}, seq = 0
+                 Pointer to the client's active batch (active_batch_id)
+
+The pointer is swapped together with the new header in one transaction, on
+the condition that it is unset or still names a batch that is no longer
+active. Concurrent deliveries therefore converge on a single active batch:
+the losers get ActiveBatchExistsError and append to the winner instead.
+Appends are conditional on the batch still being active, so events are never
+added to a batch that has already been claimed for a build.
+
+Adding events costs two header counter updates plus one small child write
+per event, no matter how large the batch already is, and a batch can hold any
+number of events without approaching DynamoDB's 400KB item limit. Builds read
+the children back with a paginated query.
+
+Children are always written before the events are counted as committed:
+- open_batch writes them in the header/pointer transaction (or before it,
+  for batches too large for one transaction)
+- add_events reserves a sequence range (event_count), writes the children,
+  then commits them (committed_count), conditional on the batch not being
+  sealed
+
+After claiming a batch, the build calls seal(): it waits briefly for
+in-flight appends to commit, then sets sealed_at. An append that commits
+after the seal fails with BatchNotActiveError and its writer moves the
+events to the client's next batch, so every event accepted into a batch is
+either read by that batch's build or re-queued - never orphaned.
+
+Before a build is planned, a batch's events are collapsed per content item
+(collapse_content_events) so editor save storms become one change each.
+"""
+
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Callable
+from datetime import datetime
+import logging
+import time
+
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+from models.composition import ContentEvent, EventType
+from shared.composition.build_manifest import manifest_event_data
+
+
+logger = logging.getLogger(__name__)
+
+HEADER_SEQ = 0
+ACTIVE_POINTER_PREFIX = 'active#'
+OPEN_BATCH_MAX_ATTEMPTS = 3
+
+# TransactWriteItems accepts at most 100 items: header, pointer and children
+TRANSACT_MAX_ITEMS = 100
+
+# How long seal() waits for reserved events to be committed
+SEAL_WAIT_SECONDS = 1.0
+SEAL_POLL_SECONDS = 0.1
+
+# ContentEvent fields kept on child items; payload snapshots are dropped
+EVENT_REF_FIELDS = (
+    'event_id', 'event_type', 'content_id', 'content_type',
+    'provider_name', 'timestamp', 'requires_build', 'client_id', 'environment'
+)
+
+
+# Content lifecycle events, merged per content item by collapse_content_events
+CONTENT_CREATED = EventType.CONTENT_CREATED
+CONTENT_UPDATED = EventType.CONTENT_UPDATED
+CONTENT_DELETED = EventType.CONTENT_DELETED
+LIFECYCLE_EVENT_TYPES = (CONTENT_CREATED, CONTENT_UPDATED, CONTENT_DELETED)
+
+
+class BatchNotActiveError(Exception):
+    """Raised when appending to a batch that was claimed, completed or expired"""
+
+
+class ActiveBatchExistsError(Exception):
+    """Raised when another writer opened the client's active batch first"""
+
+    def __init__(self, batch_id: str):
+        super().__init__(f"Batch {batch_id} is already active")
+        self.batch_id = batch_id
+
+
+def header_key(batch_id: str) -> Dict[str, Any]:
+    """Primary key of a batch header item"""
+    return {'batch_id': batch_id, 'seq': HEADER_SEQ}
+
+
+def active_pointer_key(client_id: str) -> Dict[str, Any]:
+    """Primary key of a client's active batch pointer"""
+    return {'batch_id': f"{ACTIVE_POINTER_PREFIX}{client_id}", 'seq': HEADER_SEQ}
+
+
+def uncommitted_count(header: Dict[str, Any]) -> int:
+    """Events reserved on a header whose children are not committed yet"""
+    event_count = int(header.get('event_count', 0))
+    # Headers written before commit tracking count every event as committed
+    return event_count - int(header.get('committed_count', event_count))
+
+
+def compact_event(event: ContentEvent) -> Dict[str, Any]:
+    """Compact, JSON-safe reference to a content event"""
+    data = event.model_dump(mode='json', include=set(EVENT_REF_FIELDS))
+    reference = {key: value for key, value in data.items() if value is not None}
+
+    # Build change manifests need the slug and source file of each change
+    manifest_data = manifest_event_data(event)
+    if manifest_data:
+        reference['content_data'] = manifest_data
+
+    return reference
+
+
+def _merge_lifecycle(previous: Optional[ContentEvent], event: ContentEvent) -> Optional[ContentEvent]:
+    """
+    Merge a lifecycle event into the state collapsed so far for its content.
+
+    Returns:
+        Collapsed event, or None when the changes cancel out
+    """
+
+    if previous is None:
+        return event
+
+    before, after = previous.event_type, event.event_type
+
+    if after == CONTENT_DELETED:
+        # Created and deleted within the batch: the site never saw it
+        if before == CONTENT_CREATED:
+            return None
+        merged_type = CONTENT_DELETED
+    elif before == CONTENT_CREATED:
+        merged_type = CONTENT_CREATED
+    elif before == CONTENT_DELETED and after == CONTENT_CREATED:
+        # Deleted and recreated: the content existed before and after the batch
+        merged_type = CONTENT_UPDATED
+    else:
+        merged_type = after
+
+    return event.model_copy(update={
+        'event_type': merged_type,
+        'requires_build': previous.requires_build or event.requires_build,
+        'previous_content': previous.previous_content if merged_type != CONTENT_CREATED else None
+    })
+
+
+def collapse_content_events(events: List[ContentEvent]) -> List[ContentEvent]:
+    """
+    Collapse a batch's events to one net change per content item.
+
+    Lifecycle events for the same content are merged last-writer-wins:
+    create+update stays a create, create+delete cancels out, delete+create
+    becomes an update, and otherwise the latest event wins. Other event
+    types (inventory, collections) keep their latest event per content and
+    type. Content is keyed by provider and content_id.
+
+    Args:
+        events: Events in arrival order
+
+    Returns:
+        Collapsed events, in order of each content's first appearance
+    """
+
+    collapsed: Dict[Tuple[str, str, str], Optional[ContentEvent]] = {}
+
+    for event in sorted(events, key=lambda e: e.timestamp):
+        kind = 'content' if event.event_type in LIFECYCLE_EVENT_TYPES else event.event_type
+        key = (str(event.provider_name), event.content_id, kind)
+
+        if kind == 'content':
+            collapsed[key] = _merge_lifecycle(collapsed.get(key), event)
+        else:
+            previous = collapsed.get(key)
+            requires_build = event.requires_build or (previous is not None and previous.requires_build)
+            collapsed[key] = event.model_copy(update={'requires_build': requires_build})
+
+    return [event for event in collapsed.values() if event is not None]
+
+
+class BuildBatchStore:
+    """
+    Header/child storage for build batches.
+
+    Example:
+        store = BuildBatchStore(batch_table)
+        store.open_batch(header, events)
+        store.add_events(batch_id, more_events, updated_at)
+        store.seal(batch_id)  # after claiming the batch for a build
+        events = list(store.iter_events(batch_id))
+        store.complete_skipped(batch_id)  # if the events collapse to no changes
+    """
+
+    def __init__(
+        self,
+        table,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.table = table
+        self.serializer = TypeSerializer()
+        self.clock = clock
+        self.sleep = sleep
+
+    def get_active_batch(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """Header of the client's active batch, or None if there is none"""
+
+        response = self.table.get_item(Key=active_pointer_key(client_id), ConsistentRead=True)
+        batch_id = response.get('Item', {}).get('active_batch_id')
+        if not batch_id:
+            return None
+
+        header = self.get_header(batch_id)
+        return header if header and header.get('status') == 'active' else None
+
+    def open_batch(self, header: Dict[str, Any], events: List[ContentEvent]) -> None:
+        """
+        Create a batch and make it the client's active batch.
+
+        Args:
+            header: Header attributes; batch_id, client_id and status='active' are required
+            events: Initial events of the batch
+
+        Raises:
+            ActiveBatchExistsError: Another active batch holds the pointer
+        """
+
+        batch_id, client_id = header['batch_id'], header['client_id']
+        item = {
+            **header,
+            'seq': HEADER_SEQ,
+            'event_count': len(events),
+            'next_seq': len(events),
+            'committed_count': len(events)
+        }
+
+        # The header commits the events, so their children must exist first:
+        # in the same transaction when they fit, otherwise written up front.
+        # Children of a batch that loses the pointer race expire with its TTL.
+        children = self._child_items(batch_id, events, first_seq=1, ttl=header.get('ttl'))
+        if len(children) > TRANSACT_MAX_ITEMS - 2:
+            self._write_children(children)
+            children = []
+
+        # Pointer value this writer expects to replace: None, or a batch that
+        # is no longer active (claimed, or expired before it was built)
+        replaces: Optional[str] = None
+        for attempt in range(OPEN_BATCH_MAX_ATTEMPTS):
+            try:
+                self._put_header_and_pointer(item, client_id, replaces, children)
+                break
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'TransactionCanceledException':
+                    raise
+
+            current = self.table.get_item(Key=active_pointer_key(client_id), ConsistentRead=True)
+            replaces = current.get('Item', {}).get('active_batch_id')
+            active = self.get_header(replaces) if replaces else None
+            if active and active.get('status') == 'active':
+                raise ActiveBatchExistsError(replaces)
+            logger.info(f"Replacing stale active batch pointer {replaces} for {client_id} (attempt {attempt + 1})")
+        else:
+            raise RuntimeError(f"Failed to open batch {batch_id} after {OPEN_BATCH_MAX_ATTEMPTS} attempts")
+
+    def release_active(self, client_id: str, batch_id: str) -> None:
+        """Clear the client's active pointer if it still names batch_id"""
+
+        try:
+            self.table.update_item(
+                Key=active_pointer_key(client_id),
+                UpdateExpression='REMOVE active_batch_id',
+                ConditionExpression='active_batch_id = :batch_id',
+                ExpressionAttributeValues={':batch_id': batch_id}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+    def add_events(
+        self,
+        batch_id: str,
+        events: List[ContentEvent],
+        updated_at: datetime,
+        reschedule: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Append events to an existing batch.
+
+        Reserves a range of sequence numbers with one atomic header update,
+        writes one compact child per event, then commits them. reschedule
+        attributes (new build time) are set with the reservation.
+
+        Returns:
+            Updated header attributes
+
+        Raises:
+            BatchNotActiveError: The batch is no longer accepting events, or
+                was sealed for its build before the events were committed
+        """
+
+        update_expression = 'ADD event_count :count, next_seq :count SET updated_at = :updated'
+        values: Dict[str, Any] = {
+            ':count': len(events),
+            ':updated': updated_at.isoformat(),
+            ':active': 'active'
+        }
+        for index, (name, value) in enumerate((reschedule or {}).items()):
+            update_expression += f", {name} = :reschedule{index}"
+            values[f":reschedule{index}"] = value
+
+        try:
+            response = self.table.update_item(
+                Key=header_key(batch_id),
+                UpdateExpression=update_expression,
+                ConditionExpression='#status = :active',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues=values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raise BatchNotActiveError(f"Batch {batch_id} is not active") from e
+
+        header = response['Attributes']
+        first_seq = int(header['next_seq']) - len(events) + 1
+        self._write_children(self._child_items(batch_id, events, first_seq=first_seq, ttl=header.get('ttl')))
+
+        return self._commit_events(batch_id, len(events))
+
+    def seal(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Fence a claimed batch against appends still in flight.
+
+        Waits up to SEAL_WAIT_SECONDS for reserved events to be committed,
+        then seals the batch. Later commits fail and their writers re-queue
+        the events, so iter_events() afterwards returns every event the
+        batch kept.
+
+        Returns:
+            Sealed header attributes
+        """
+
+        deadline = self.clock() + SEAL_WAIT_SECONDS
+        header = self.get_header(batch_id) or {}
+        while uncommitted_count(header) > 0 and self.clock() < deadline:
+            self.sleep(SEAL_POLL_SECONDS)
+            header = self.get_header(batch_id) or {}
+
+        response = self.table.update_item(
+            Key=header_key(batch_id),
+            UpdateExpression='SET sealed_at = :sealed',
+            ExpressionAttributeValues={':sealed': datetime.utcnow().isoformat()},
+            ReturnValues='ALL_NEW'
+        )
+        header = response['Attributes']
+
+        uncommitted = uncommitted_count(header)
+        if uncommitted > 0:
+            logger.warning(f"Sealed batch {batch_id} with {uncommitted} uncommitted events; they move to the next batch")
+
+        return header
+
+    def complete_skipped(self, batch_id: str) -> None:
+        """Close a claimed batch whose events collapsed to no net changes, without a build"""
+
+        self.table.update_item(
+            Key=header_key(batch_id),
+            UpdateExpression='SET #status = :status, completed_at = :completed',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':status': 'skipped',
+                ':completed': datetime.utcnow().isoformat()
+            }
+        )
+
+    def get_header(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Get a batch header, or None if the batch does not exist"""
+
+        response = self.table.get_item(Key=header_key(batch_id), ConsistentRead=True)
+        return response.get('Item')
+
+    def iter_events(self, batch_id: str) -> Iterator[ContentEvent]:
+        """
+        Stream a batch's events in insertion order.
+
+        Children are read with a paginated query, so memory and read size per
+        page stay bounded regardless of batch size.
+        """
+
+        query_params = {
+            'KeyConditionExpression': Key('batch_id').eq(batch_id) & Key('seq').gt(HEADER_SEQ)
+        }
+
+        while True:
+            response = self.table.query(**query_params)
+            for item in response.get('Items', []):
+                yield ContentEvent(**item['event'])
+
+            if not response.get('LastEvaluatedKey'):
+                return
+
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _commit_events(self, batch_id: str, count: int) -> Dict[str, Any]:
+        """Count written children as committed unless the batch was sealed."""
+
+        try:
+            response = self.table.update_item(
+                Key=header_key(batch_id),
+                UpdateExpression='ADD committed_count :count',
+                ConditionExpression='attribute_not_exists(sealed_at)',
+                ExpressionAttributeValues={':count': count},
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raise BatchNotActiveError(f"Batch {batch_id} was sealed before {count} events were committed") from e
+
+        return response['Attributes']
+
+    def _put_header_and_pointer(
+        self,
+        item: Dict[str, Any],
+        client_id: str,
+        replaces: Optional[str],
+        children: List[Dict[str, Any]]
+    ) -> None:
+        """Write a new header, its children and the client's active pointer atomically."""
+
+        if replaces:
+            pointer_condition = 'attribute_not_exists(active_batch_id) OR active_batch_id = :replaces'
+            pointer_values = {':replaces': self.serializer.serialize(replaces)}
+        else:
+            pointer_condition = 'attribute_not_exists(active_batch_id)'
+            pointer_values = {}
+
+        pointer = {**active_pointer_key(client_id), 'active_batch_id': item['batch_id'], 'updated_at': item.get('updated_at')}
+
+        put_pointer = {
+            'TableName': self.table.name,
+            'Item': self._serialize(pointer),
+            'ConditionExpression': pointer_condition
+        }
+        if pointer_values:
+            put_pointer['ExpressionAttributeValues'] = pointer_values
+
+        self.table.meta.client.transact_write_items(TransactItems=[
+            {
+                'Put': {
+                    'TableName': self.table.name,
+                    'Item': self._serialize(item),
+                    'ConditionExpression': 'attribute_not_exists(batch_id)'
+                }
+            },
+            {'Put': put_pointer},
+            *({'Put': {'TableName': self.table.name, 'Item': self._serialize(child)}} for child in children)
+        ])
+
+    def _serialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an item to DynamoDB JSON for the low-level client."""
+        return {key: self.serializer.serialize(value) for key, value in item.items() if value is not None}
+
+    def _child_items(self, batch_id: str, events: List[ContentEvent], first_seq: int, ttl: Optional[int]) -> List[Dict[str, Any]]:
+        """One child item per event, numbered from first_seq."""
+
+        children = []
+        for offset, event in enumerate(events):
+            item: Dict[str, Any] = {
+                'batch_id': batch_id,
+                'seq': first_seq + offset,
+                'event': compact_event(event)
+            }
+            if ttl is not None:
+                item['ttl'] = ttl
+            children.append(item)
+        return children
+
+    def _write_children(self, children: List[Dict[str, Any]]) -> None:
+        """Write child items; the batch writer chunks and retries."""
+
+        with self.table.batch_writer() as writer:
+            for item in children:
+                writer.put_item(Item=item)
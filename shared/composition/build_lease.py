@@ -0,0 +1,138 @@
+"""
+Per-Client Build Lease
+
+This module bounds every client site to one running CodeBuild build.
+
+Whoever starts a build first acquires the client's lease, a single item in
+the build batching table keyed {'batch_id': 'lease#<client_id>', 'seq': 0},
+with a conditional put. While the lease is held, new triggers do not start
+builds: their events join the client's active batch, which is marked
+waiting_for_build and held back until the running build finishes. The
+CodeBuild state-change event for that build releases the lease and starts
+the waiting batch, so an editing session produces at most one build in
+flight plus one queued.
+
+Leases expire after the CodeBuild timeout, so a build whose completion
+event is lost cannot block the client forever.
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime
+import logging
+
+from botocore.exceptions import ClientError
+
+from shared.composition.batch_scheduler import epoch_seconds
+from shared.composition.build_batch_store import HEADER_SEQ
+
+
+logger = logging.getLogger(__name__)
+
+LEASE_PREFIX = 'lease#'
+
+# CodeBuild's default build timeout
+DEFAULT_LEASE_SECONDS = 3600
+
+
+def lease_key(client_id: str) -> Dict[str, Any]:
+    """Key of a client's build lease item"""
+    return {'batch_id': f"{LEASE_PREFIX}{client_id}", 'seq': HEADER_SEQ}
+
+
+class BuildLease:
+    """
+    Acquire and release a client's build lease.
+
+    Example:
+        lease = BuildLease(batch_table)
+        if lease.acquire(client_id, batch_id, datetime.utcnow()):
+            build_id = start_build()
+            lease.attach_build(client_id, batch_id, build_id)
+        # ... on the build's state-change event:
+        lease.release(client_id, build_id=build_id)
+    """
+
+    def __init__(self, table, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.table = table
+        self.lease_seconds = lease_seconds
+
+    def acquire(self, client_id: str, holder: str, now: datetime) -> bool:
+        """
+        Take the lease for holder (a batch or immediate build key).
+
+        Returns:
+            True if acquired, False while another unexpired build holds it
+        """
+
+        expires_at = epoch_seconds(now) + self.lease_seconds
+
+        try:
+            self.table.put_item(
+                Item={
+                    **lease_key(client_id),
+                    'holder': holder,
+                    'acquired_at': now.isoformat(),
+                    'expires_at': expires_at,
+                    'ttl': expires_at + 86400
+                },
+                ConditionExpression='attribute_not_exists(batch_id) OR expires_at < :now',
+                ExpressionAttributeValues={':now': epoch_seconds(now)}
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Build lease for {client_id} is held, not acquiring for {holder}")
+            return False
+
+    def attach_build(self, client_id: str, holder: str, build_id: str) -> None:
+        """Record the build started under holder's lease, for release on completion"""
+
+        try:
+            self.table.update_item(
+                Key=lease_key(client_id),
+                UpdateExpression='SET build_id = :build_id',
+                ConditionExpression='holder = :holder',
+                ExpressionAttributeValues={':build_id': build_id, ':holder': holder}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.warning(f"Build lease for {client_id} expired before build {build_id} was attached")
+
+    def release(self, client_id: str, holder: Optional[str] = None, build_id: Optional[str] = None) -> bool:
+        """
+        Release the lease if it is still held by holder or for build_id.
+
+        Returns:
+            True if released, False if the lease had already moved on
+        """
+
+        if holder:
+            condition, values = 'holder = :holder', {':holder': holder}
+        else:
+            condition, values = 'build_id = :build_id', {':build_id': build_id}
+
+        try:
+            self.table.delete_item(
+                Key=lease_key(client_id),
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return False
+
+    def current(self, client_id: str, now: datetime) -> Optional[Dict[str, Any]]:
+        """The unexpired lease of a client, if any"""
+
+        response = self.table.get_item(Key=lease_key(client_id), ConsistentRead=True)
+        lease = response.get('Item')
+
+        if not lease or int(lease['expires_at']) < epoch_seconds(now):
+            return None
+        return lease
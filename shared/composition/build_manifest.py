@@ -0,0 +1,249 @@
+"""
+Build Change Manifests
+
+This module turns a batch of content events into a change manifest: the
+site output paths each changed content item affects, according to the
+content routing rules of the client's SSG engine, and the source files the
+changes were made in. The build handlers write the manifest to S3 and pass
+only its URI to CodeBuild (BUILD_MANIFEST_URI).
+
+Engines with a partial render mode (SSGEngineConfig.incremental_build_commands)
+render only the manifest's source files, on top of the output of the
+client's previous build. That output is kept as a snapshot in the manifest
+bucket (BUILD_OUTPUT_SNAPSHOT_URI): every build the handlers start
+refreshes it after a successful build, and a partial render only runs when
+the snapshot is complete. Other engines render the full site.
+
+Manifest format (version 1):
+    {
+        "version": 1,
+        "client_id": "...", "batch_id": "...", "engine": "eleventy",
+        "requires_full_rebuild": false, "full_rebuild_reason": null,
+        "paths": ["/blog/first-post/", "/blog/", "/"],
+        "sources": ["content/blog/first-post.md"],
+        "changes": [{"content_id": "...", "content_type": "article", "event_type": "...",
+                     "provider_name": "...", "slug": "first-post",
+                     "source_path": "content/blog/first-post.md", "paths": [...]}],
+        "summary": {... build context counts ...}
+    }
+
+A partial render can only add or update pages, so deletions, collection
+updates, changes without a source file (API-based providers) and large
+change sets require a full rebuild.
+
+Routing rules are plain data so the Lambdas can use them without the CDK
+toolchain; SSG engine configs expose them through content_routes and the
+construct hands them to the Lambdas as CONTENT_ROUTES.
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+from datetime import datetime
+import json
+import logging
+
+from models.composition import ContentEvent
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# content_type -> page path pattern ({slug}) and listing pages it appears on.
+# A None page means the content has no page of its own.
+DEFAULT_CONTENT_ROUTES: Dict[str, Dict[str, Any]] = {
+    'product': {'page': '/products/{slug}/', 'listings': ['/products/', '/']},
+    'article': {'page': '/blog/{slug}/', 'listings': ['/blog/', '/']},
+    'page': {'page': '/{slug}/', 'listings': []},
+    'collection': {'page': '/collections/{slug}/', 'listings': ['/collections/', '/products/']},
+    'media': {'page': None, 'listings': []},
+}
+
+# content_data keys that content events carry for manifests
+MANIFEST_EVENT_FIELDS = ('slug', 'source_path')
+
+# Beyond this many changed source files a full build is cheaper than a partial one
+MAX_INCREMENTAL_SOURCES = 20
+
+MANIFEST_PREFIX = 'manifests'
+OUTPUT_SNAPSHOT_PREFIX = 'outputs'
+
+
+def manifest_event_data(event: ContentEvent) -> Dict[str, Any]:
+    """The part of an event's content_data that manifests use"""
+
+    data = event.content_data or {}
+    return {key: data[key] for key in MANIFEST_EVENT_FIELDS if data.get(key)}
+
+
+def affected_paths(content_type: str, slug: Optional[str], routes: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Output paths a content item renders to or is listed on"""
+
+    route = routes.get(content_type)
+    if not route or not route.get('page') or not slug:
+        return []
+
+    return [route['page'].format(slug=slug.strip('/'))] + list(route.get('listings', []))
+
+
+def build_manifest(
+    changes: List[ContentEvent],
+    routes: Dict[str, Dict[str, Any]],
+    client_id: str,
+    batch_id: str,
+    engine: str,
+    summary: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build a change manifest from collapsed content changes.
+
+    Args:
+        changes: One net change per content item (see collapse_content_events)
+        routes: Content routing rules of the client's SSG engine
+        client_id: Client identifier
+        batch_id: Batch (or immediate build) identifier
+        engine: SSG engine name
+        summary: Build context counts to carry along for reporting
+
+    Returns:
+        Manifest dictionary
+    """
+
+    paths: List[str] = []
+    sources: List[str] = []
+    entries: List[Dict[str, Any]] = []
+    full_rebuild_reason: Optional[str] = None
+
+    for event in changes:
+        content_type = getattr(event.content_type, 'value', event.content_type)
+        event_type = getattr(event.event_type, 'value', event.event_type)
+        data = manifest_event_data(event)
+        change_paths = affected_paths(content_type, data.get('slug'), routes)
+        source_path = data.get('source_path')
+
+        if event_type == 'content.deleted':
+            full_rebuild_reason = full_rebuild_reason or f"Content deleted: {event.content_id}"
+        elif event_type == 'collection.updated':
+            # Collection membership changes reach every page listing its products
+            full_rebuild_reason = full_rebuild_reason or f"Collection updated: {event.content_id}"
+        elif not source_path:
+            full_rebuild_reason = full_rebuild_reason or f"No source file for {content_type} change: {event.content_id}"
+
+        for path in change_paths:
+            if path not in paths:
+                paths.append(path)
+        if source_path and source_path not in sources:
+            sources.append(source_path)
+
+        entries.append({
+            'content_id': event.content_id,
+            'content_type': content_type,
+            'provider_name': str(getattr(event.provider_name, 'value', event.provider_name)),
+            'event_type': event_type,
+            'slug': data.get('slug'),
+            'source_path': source_path,
+            'paths': change_paths
+        })
+
+    if full_rebuild_reason is None and not sources:
+        full_rebuild_reason = 'No content changes to render'
+    if full_rebuild_reason is None and len(sources) > MAX_INCREMENTAL_SOURCES:
+        full_rebuild_reason = f"{len(sources)} changed files exceed the incremental limit of {MAX_INCREMENTAL_SOURCES}"
+
+    return {
+        'version': MANIFEST_VERSION,
+        'client_id': client_id,
+        'batch_id': batch_id,
+        'engine': engine,
+        'generated_at': datetime.utcnow().isoformat(),
+        'requires_full_rebuild': full_rebuild_reason is not None,
+        'full_rebuild_reason': full_rebuild_reason,
+        'paths': paths,
+        'sources': sources,
+        'changes': entries,
+        'summary': summary or {}
+    }
+
+
+class BuildManifestWriter:
+    """
+    Store change manifests in S3 for CodeBuild.
+
+    Example:
+        writer = BuildManifestWriter(s3_client, bucket)
+        manifest_uri = writer.write(manifest)
+    """
+
+    def __init__(self, s3_client, bucket: str):
+        self.s3 = s3_client
+        self.bucket = bucket
+
+    def write(self, manifest: Dict[str, Any]) -> str:
+        """
+        Upload a manifest.
+
+        Returns:
+            s3:// URI of the manifest
+        """
+
+        key = f"{MANIFEST_PREFIX}/{manifest['client_id']}/{manifest['batch_id']}.json"
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(manifest, default=str).encode('utf-8'),
+            ContentType='application/json'
+        )
+
+        logger.info(f"Wrote build manifest s3://{self.bucket}/{key} ({len(manifest['sources'])} sources)")
+        return f"s3://{self.bucket}/{key}"
+
+    def output_snapshot_uri(self, client_id: str) -> str:
+        """s3:// prefix holding the output of the client's last successful build"""
+        return f"s3://{self.bucket}/{OUTPUT_SNAPSHOT_PREFIX}/{client_id}/"
+
+
+def build_manifest_variables(
+    writer: Optional[BuildManifestWriter],
+    events: List[ContentEvent],
+    routes: Dict[str, Dict[str, Any]],
+    client_id: str,
+    batch_id: str,
+    engine: str,
+    summary: Dict[str, Any],
+    emit_metric: Callable[..., None]
+) -> List[Dict[str, str]]:
+    """
+    CodeBuild variables describing a build's changes.
+
+    Writes the change manifest of the collapsed events and passes its URI and
+    the client's output snapshot URI. The snapshot URI is passed even if the
+    manifest cannot be written, so the full build that follows still
+    refreshes the snapshot. Without a manifest bucket the build gets the
+    change summary inline (CONTENT_CHANGES_SUMMARY) instead.
+    """
+
+    if writer is None:
+        return [{'name': 'CONTENT_CHANGES_SUMMARY', 'value': json.dumps(summary), 'type': 'PLAINTEXT'}]
+
+    variables = [
+        {'name': 'BUILD_OUTPUT_SNAPSHOT_URI', 'value': writer.output_snapshot_uri(client_id), 'type': 'PLAINTEXT'}
+    ]
+
+    try:
+        manifest = build_manifest(events, routes, client_id=client_id, batch_id=batch_id, engine=engine, summary=summary)
+        manifest_uri = writer.write(manifest)
+        emit_metric('ManifestSources', len(manifest['sources']), 'None')
+
+    except Exception as e:
+        logger.warning(f"Failed to write build manifest for {batch_id}, building the full site: {str(e)}")
+        emit_metric('BuildManifestErrors', 1)
+        return variables
+
+    return [{'name': 'BUILD_MANIFEST_URI', 'value': manifest_uri, 'type': 'PLAINTEXT'}] + variables
+
+
+def load_content_routes(raw: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Parse CONTENT_ROUTES from the environment, falling back to the defaults"""
+
+    if not raw:
+        return DEFAULT_CONTENT_ROUTES
+    return json.loads(raw)
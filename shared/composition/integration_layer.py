@@ -24,30 +24,62 @@ from aws_cdk import (
     Stack,
     Duration,
     RemovalPolicy,
+    CustomResource,
     aws_sns as sns,
     aws_dynamodb as dynamodb,
     aws_lambda as lambda_,
+    aws_lambda_event_sources as lambda_event_sources,
     aws_apigateway as apigateway,
     aws_apigatewayv2 as apigwv2,
     aws_apigatewayv2_integrations as integrations,
     aws_iam as iam,
     aws_events as events,
-    aws_logs as logs
+    aws_events_targets as events_targets,
+    aws_logs as logs,
+    aws_s3 as s3,
+    aws_sqs as sqs,
+    aws_secretsmanager as secretsmanager,
+    custom_resources as cr
 )
-from constructs import Construct
+from constructs import Construct, IValidation
+import jsii
+import json
 
 from models.service_config import ClientServiceConfig
 # Import event models and interfaces from blackwell-core
 from blackwell_core.models.events import ContentEvent, UnifiedContent
 from blackwell_core.interfaces.integration_layer import BaseIntegrationLayer
+from shared.composition.build_manifest import MANIFEST_PREFIX, OUTPUT_SNAPSHOT_PREFIX
+from shared.composition.materialized_views import INDEX_KEYS_VERSION
 from shared.composition.optimized_content_cache import OptimizedContentCache
 from shared.composition.provider_adapter_registry import ProviderAdapterRegistry
+from shared.composition.table_indexes import (
+    TableIndexSpec,
+    UNIFIED_CONTENT_CACHE_INDEXES,
+    BUILD_BATCHING_INDEXES,
+    find_missing_indexes
+)
 from shared.interfaces.composable_component import ComponentRegistry
+from shared.ssg import SSGEngineFactory
 
 
 logger = logging.getLogger(__name__)
 
 
+@jsii.implements(IValidation)
+class IndexReferenceValidation:
+    """
+    Synth-time validation that every index referenced by a table's runtime
+    code is provisioned on the table.
+    """
+
+    def __init__(self, spec: TableIndexSpec):
+        self.spec = spec
+
+    def validate(self) -> List[str]:
+        return find_missing_indexes(self.spec)
+
+
 class EventDrivenIntegrationLayer(Construct):
     """
     Central integration layer orchestrating event-driven CMS + E-commerce composition.
@@ -71,22 +103,41 @@ class EventDrivenIntegrationLayer(Construct):
         scope: Construct,
         construct_id: str,
         client_config: ClientServiceConfig,
+        publish_latency_target: Optional[Duration] = None,
+        async_webhook_ingestion: bool = False,
+        snap_start: bool = False,
         **kwargs
     ):
         super().__init__(scope, construct_id, **kwargs)
 
         self.client_config = client_config
+        # p95 publish-to-live target the adaptive batch windows are sized for
+        self.publish_latency_target = publish_latency_target or Duration.minutes(10)
+        # Acknowledge verified webhooks with 202 and process them from a queue
+        self.async_webhook_ingestion = async_webhook_ingestion
+        # Restore the integration handler from a post-init snapshot instead of cold starting
+        self.snap_start = snap_start
 
         # Core components that form the backbone of the integration layer
         self.content_events_topic = self._create_content_events_topic()
         self.unified_content_cache = self._create_unified_content_cache()
         self.build_batching_table = self._create_build_batching_table()
         self.webhook_receipts_table = self._create_webhook_receipts_table()
+        self.materialized_views_table = self._create_materialized_views_table()
+        self.build_manifest_bucket = self._create_build_manifest_bucket()
+        if self.async_webhook_ingestion:
+            self.webhook_ingestion_queue = self._create_webhook_ingestion_queue()
+            self.webhook_payload_bucket = self._create_webhook_payload_bucket()
 
         # Lambda functions that handle the intelligent event processing
         self.integration_handler = self._create_integration_handler()
+        self.integration_endpoint = self._create_integration_endpoint()
+        if self.async_webhook_ingestion:
+            self.webhook_ingestion_worker = self._create_webhook_ingestion_worker()
         self.build_trigger_handler = self._create_build_trigger_handler()
         self.build_batching_handler = self._create_build_batching_handler()
+        self.content_stream_processor = self._create_content_stream_processor()
+        self.index_keys_seed = self._create_index_keys_seed()
 
         # API Gateway for external webhook integration
         self.integration_api = self._create_integration_api()
@@ -164,6 +215,9 @@ class EventDrivenIntegrationLayer(Construct):
             removal_policy=RemovalPolicy.DESTROY
         )
 
+        # GSIs queried by OptimizedContentCache
+        self._add_global_indexes(table, UNIFIED_CONTENT_CACHE_INDEXES)
+
         # Add tags for cost tracking and management
         table.node.default_child.add_property_override("Tags", [
             {"Key": "Client", "Value": self.client_config.client_id},
@@ -183,7 +237,8 @@ class EventDrivenIntegrationLayer(Construct):
 
         table = dynamodb.Table(
             self, "BuildBatchingTable",
-            table_name=f"{self.client_config.resource_prefix}-build-batching",
+            # Renamed with the key schema change, which requires a new table
+            table_name=f"{self.client_config.resource_prefix}-build-batches",
 
             # Partition key: batch_id
             partition_key=dynamodb.Attribute(
@@ -191,6 +246,12 @@ class EventDrivenIntegrationLayer(Construct):
                 type=dynamodb.AttributeType.STRING
             ),
 
+            # Sort key: seq (0 = batch header, 1..n = compact event references)
+            sort_key=dynamodb.Attribute(
+                name="seq",
+                type=dynamodb.AttributeType.NUMBER
+            ),
+
             # TTL for automatic cleanup (24 hours)
             time_to_live_attribute="ttl",
 
@@ -200,8 +261,94 @@ class EventDrivenIntegrationLayer(Construct):
             removal_policy=RemovalPolicy.DESTROY
         )
 
+        # Due-batch index swept by the scheduler tick
+        self._add_global_indexes(table, BUILD_BATCHING_INDEXES)
+
         return table
 
+    def _ssg_engine_config(self):
+        """SSG engine configuration of the client's site."""
+
+        ssg_engine = self.client_config.service_integration.ssg_engine
+        return SSGEngineFactory.create_engine(getattr(ssg_engine, 'value', ssg_engine))
+
+    def _create_build_manifest_bucket(self) -> Optional[s3.Bucket]:
+        """
+        Create S3 bucket for build change manifests and output snapshots.
+
+        Only created for SSG engines with a partial render mode. The build
+        handlers write one manifest per build under manifests/, and the
+        composed build project keeps the output of its last successful build
+        under outputs/ to render changed files on top of. The project is
+        defined by the stack that owns it, which must call
+        grant_build_manifest_access(project).
+        """
+
+        if self._ssg_engine_config().incremental_build_commands is None:
+            return None
+
+        return s3.Bucket(
+            self, "BuildManifestBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+
+            # Manifests are only needed by the build they were written for;
+            # output snapshots are replaced by every successful build
+            lifecycle_rules=[s3.LifecycleRule(prefix=f"{MANIFEST_PREFIX}/", expiration=Duration.days(7))],
+
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True
+        )
+
+    def _build_manifest_environment(self) -> Dict[str, str]:
+        """Lambda environment for writing change manifests."""
+
+        if self.build_manifest_bucket is None:
+            return {}
+
+        engine_config = self._ssg_engine_config()
+        return {
+            "BUILD_MANIFEST_BUCKET": self.build_manifest_bucket.bucket_name,
+            "SSG_ENGINE": engine_config.engine_name,
+            "CONTENT_ROUTES": json.dumps(engine_config.content_routes)
+        }
+
+    def grant_build_manifest_access(self, grantee: iam.IGrantable) -> None:
+        """
+        Let the composed build project read its change manifests and replace
+        its output snapshot. A no-op for engines without a partial render mode.
+        """
+
+        if self.build_manifest_bucket is None:
+            return
+
+        self.build_manifest_bucket.grant_read(grantee, f"{MANIFEST_PREFIX}/{self.client_config.client_id}/*")
+        self.build_manifest_bucket.grant_read_write(grantee, f"{OUTPUT_SNAPSHOT_PREFIX}/{self.client_config.client_id}/*")
+
+    def _add_global_indexes(self, table: dynamodb.Table, spec: TableIndexSpec) -> None:
+        """
+        Provision the GSIs declared for a table and register a synth-time check
+        that fails the build if runtime code queries an index the table lacks.
+        """
+
+        for index in spec.indexes:
+            table.add_global_secondary_index(
+                index_name=index.name,
+                partition_key=dynamodb.Attribute(
+                    name=index.partition_key,
+                    type=dynamodb.AttributeType.STRING
+                ),
+                sort_key=dynamodb.Attribute(
+                    name=index.sort_key,
+                    type=getattr(dynamodb.AttributeType, index.sort_key_type)
+                ) if index.sort_key else None,
+                projection_type=getattr(dynamodb.ProjectionType, index.projection),
+                non_key_attributes=list(index.non_key_attributes) or None
+            )
+
+        table.node.add_validation(IndexReferenceValidation(spec))
+
     def _create_webhook_receipts_table(self) -> dynamodb.Table:
         """
         Create DynamoDB table for webhook idempotency tracking.
@@ -239,6 +386,37 @@ class EventDrivenIntegrationLayer(Construct):
 
         return table
 
+    def _create_materialized_views_table(self) -> dynamodb.Table:
+        """
+        Create DynamoDB table for materialized content views.
+
+        Precomputed per-client listings let common content listings be served
+        with a single GetItem, moving the cost of listing to write time.
+        """
+
+        table = dynamodb.Table(
+            self, "MaterializedViewsTable",
+            table_name=f"{self.client_config.resource_prefix}-content-views",
+
+            # Partition key: client_id, sort key: view_id (e.g. published#product#shopify_basic)
+            partition_key=dynamodb.Attribute(
+                name="client_id",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="view_id",
+                type=dynamodb.AttributeType.STRING
+            ),
+
+            # Pay per request billing for cost efficiency
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+
+            # Views are rebuilt from the content table, so no backups are needed
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        return table
+
     def _create_integration_handler(self) -> lambda_.Function:
         """
         Create Lambda function for handling webhook integration.
@@ -248,34 +426,39 @@ class EventDrivenIntegrationLayer(Construct):
         for any CMS or E-commerce provider.
         """
 
+        # Signing key for GET /content continuation tokens
+        self.pagination_token_key = secretsmanager.Secret(
+            self, "PaginationTokenKey",
+            secret_name=f"{self.client_config.client_id}/pagination/token-key",
+            description=f"Content API continuation token signing key for {self.client_config.client_id}",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                secret_string_template="{}",
+                generate_string_key="token_key",
+                exclude_punctuation=True,
+                password_length=64
+            ),
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        environment = self._integration_handler_environment()
+        if self.snap_start:
+            # Load every provider adapter and client before the snapshot is taken
+            environment["EAGER_WARM_UP"] = "true"
+
         function = lambda_.Function(
             self, "IntegrationHandler",
-            runtime=lambda_.Runtime.PYTHON_3_11,
+            # SnapStart for Python requires Python 3.12 or later
+            runtime=lambda_.Runtime.PYTHON_3_12 if self.snap_start else lambda_.Runtime.PYTHON_3_11,
             handler="integration_handler.lambda_handler",
             code=lambda_.Code.from_asset("lambda/integration_handler"),
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS if self.snap_start else None,
 
             # Optimized for performance and cost
             timeout=Duration.seconds(30),
             memory_size=512,
 
             # Environment variables for configuration
-            environment={
-                "CONTENT_CACHE_TABLE": self.unified_content_cache.table_name,
-                "CONTENT_EVENTS_TOPIC_ARN": self.content_events_topic.topic_arn,
-                "WEBHOOK_RECEIPTS_TABLE": self.webhook_receipts_table.table_name,
-                "CLIENT_ID": self.client_config.client_id,
-                "ENVIRONMENT": "prod",
-                "LOG_LEVEL": "INFO",
-
-                # Provider registry configuration
-                "PROVIDER_REGISTRY_ENABLED": "true",
-                "CACHE_OPTIMIZATION_ENABLED": "true",
-                "EVENT_FILTERING_ENABLED": "true",
-
-                # Production reliability features
-                "IDEMPOTENCY_ENABLED": "true",
-                "IDEMPOTENCY_TTL_HOURS": "24"
-            },
+            environment=environment,
 
             # Enhanced error handling and monitoring
             dead_letter_queue_enabled=True,
@@ -289,11 +472,96 @@ class EventDrivenIntegrationLayer(Construct):
         )
 
         # Grant permissions for DynamoDB and SNS operations
-        self.unified_content_cache.grant_read_write_data(function)
+        self._grant_content_pipeline_access(function)
         self.webhook_receipts_table.grant_read_write_data(function)
+
+        # Async ingestion: queue verified webhooks, spilling large bodies to S3
+        if self.async_webhook_ingestion:
+            self.webhook_ingestion_queue.grant_send_messages(function)
+            self.webhook_payload_bucket.grant_put(function)
+
+        # Operational metrics are written as Embedded Metric Format log lines,
+        # so no cloudwatch:PutMetricData permission is required
+
+        # Add error handling and monitoring
+        function.add_environment("SENTRY_DSN", "")  # Add Sentry for error tracking in production
+
+        return function
+
+    def _create_integration_endpoint(self) -> lambda_.IFunction:
+        """
+        Function the HTTP API invokes.
+
+        SnapStart only applies to published versions, so with SnapStart the
+        routes invoke a 'live' alias that follows the latest published version
+        of the integration handler.
+        """
+
+        if not self.snap_start:
+            return self.integration_handler
+
+        return lambda_.Alias(
+            self, "IntegrationHandlerLive",
+            alias_name="live",
+            version=self.integration_handler.current_version
+        )
+
+    def _integration_handler_environment(self) -> Dict[str, str]:
+        """Lambda environment shared by the integration handler and ingestion worker."""
+
+        environment = {
+            "CONTENT_CACHE_TABLE": self.unified_content_cache.table_name,
+            "CONTENT_EVENTS_TOPIC_ARN": self.content_events_topic.topic_arn,
+            "WEBHOOK_RECEIPTS_TABLE": self.webhook_receipts_table.table_name,
+            "PAGINATION_TOKEN_SECRET_ID": self.pagination_token_key.secret_arn,
+            "MATERIALIZED_VIEWS_TABLE": self.materialized_views_table.table_name,
+            "CLIENT_ID": self.client_config.client_id,
+            "ENVIRONMENT": "prod",
+            "LOG_LEVEL": "INFO",
+
+            # Provider registry configuration
+            "PROVIDER_REGISTRY_ENABLED": "true",
+            "CACHE_OPTIMIZATION_ENABLED": "true",
+            "EVENT_FILTERING_ENABLED": "true",
+
+            # Production reliability features
+            "IDEMPOTENCY_ENABLED": "true",
+            "IDEMPOTENCY_TTL_HOURS": "24",
+
+            "ASYNC_INGESTION_ENABLED": "true" if self.async_webhook_ingestion else "false",
+
+            # Providers whose webhook secrets are batch-fetched on warm-up or first use
+            "WEBHOOK_PROVIDERS": ",".join(self._configured_providers())
+        }
+
+        if self.async_webhook_ingestion:
+            environment["INGESTION_QUEUE_URL"] = self.webhook_ingestion_queue.queue_url
+            environment["INGESTION_PAYLOAD_BUCKET"] = self.webhook_payload_bucket.bucket_name
+
+        return environment
+
+    def _configured_providers(self) -> List[str]:
+        """CMS and E-commerce providers configured for this client."""
+
+        service_integration = self.client_config.service_integration
+        return [
+            provider_config.provider.value
+            for provider_config in (service_integration.cms_config, service_integration.ecommerce_config)
+            if provider_config
+        ]
+
+    def _grant_content_pipeline_access(self, function: lambda_.Function) -> None:
+        """Grant what the webhook pipeline needs: content storage, publishing and secrets."""
+
+        self.unified_content_cache.grant_read_write_data(function)
+        self.materialized_views_table.grant_read_data(function)
+        # Statistics reads seed a client's content counters once
+        self.materialized_views_table.grant(function, "dynamodb:UpdateItem")
         self.content_events_topic.grant_publish(function)
 
-        # Grant Secrets Manager permissions for webhook signature verification
+        # Secrets fetched on warm-up or first use: the continuation token key and
+        # the webhook signing secrets, batch-fetched with BatchGetSecretValue
+        self.pagination_token_key.grant_read(function)
         function.add_to_role_policy(
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
@@ -303,25 +571,103 @@ class EventDrivenIntegrationLayer(Construct):
                 resources=[f"arn:aws:secretsmanager:{Stack.of(self).region}:{Stack.of(self).account}:secret:{self.client_config.client_id}/webhooks/*"]
             )
         )
-
-        # Grant CloudWatch permissions for operational metrics
+        # BatchGetSecretValue does not support resource-level permissions;
+        # each secret returned is still authorized by GetSecretValue above
         function.add_to_role_policy(
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
-                actions=[
-                    "cloudwatch:PutMetricData"
-                ],
-                resources=["*"],  # CloudWatch metrics don't support resource-level permissions
-                conditions={
-                    "StringEquals": {
-                        "cloudwatch:namespace": "WebhookRouter"
-                    }
-                }
+                actions=["secretsmanager:BatchGetSecretValue"],
+                resources=["*"]
             )
         )
 
-        # Add error handling and monitoring
-        function.add_environment("SENTRY_DSN", "")  # Add Sentry for error tracking in production
+    def _create_webhook_ingestion_queue(self) -> sqs.Queue:
+        """
+        Create SQS queue for asynchronously ingested webhooks.
+
+        The integration handler queues each verified webhook and answers 202;
+        the ingestion worker drains the queue. Webhooks that keep failing are
+        moved to a dead letter queue kept for two weeks for replay.
+        """
+
+        dead_letter_queue = sqs.Queue(
+            self, "WebhookIngestionDLQ",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            retention_period=Duration.days(14)
+        )
+
+        return sqs.Queue(
+            self, "WebhookIngestionQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+
+            # Six times the worker timeout, as recommended for Lambda event sources
+            visibility_timeout=Duration.minutes(6),
+
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=5,
+                queue=dead_letter_queue
+            )
+        )
+
+    def _create_webhook_payload_bucket(self) -> s3.Bucket:
+        """
+        Create S3 bucket for webhook bodies too large to queue inline.
+
+        SQS messages are limited to 256 KB; larger bodies (bulk catalogue
+        exports) are stored here and the queued message points at them.
+        """
+
+        return s3.Bucket(
+            self, "WebhookPayloadBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+
+            # Outlives the dead letter queue so failed webhooks can be replayed
+            lifecycle_rules=[s3.LifecycleRule(expiration=Duration.days(15))],
+
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True
+        )
+
+    def _create_webhook_ingestion_worker(self) -> lambda_.Function:
+        """
+        Create Lambda function that processes queued webhooks.
+
+        It ships in the integration handler's asset and runs the same
+        normalize, store and publish pipeline on batches of queued webhooks,
+        reporting partial batch failures so only failed webhooks are retried.
+        """
+
+        function = lambda_.Function(
+            self, "WebhookIngestionWorker",
+            runtime=lambda_.Runtime.PYTHON_3_11,
+            handler="ingestion_worker.lambda_handler",
+            code=lambda_.Code.from_asset("lambda/integration_handler"),
+
+            timeout=Duration.seconds(60),
+            memory_size=512,
+
+            environment=self._integration_handler_environment(),
+
+            log_retention=logs.RetentionDays.ONE_WEEK,
+
+            description=f"Webhook ingestion worker for {self.client_config.client_id} - Normalizes and stores queued webhooks"
+        )
+
+        self._grant_content_pipeline_access(function)
+        self.webhook_payload_bucket.grant_read(function)
+
+        function.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                self.webhook_ingestion_queue,
+                batch_size=10,
+                max_batching_window=Duration.seconds(1),
+                report_batch_item_failures=True
+            )
+        )
 
         return function
 
@@ -347,6 +693,7 @@ class EventDrivenIntegrationLayer(Construct):
                 "BUILD_BATCHING_TABLE": self.build_batching_table.table_name,
                 "INTEGRATION_API_URL": "",  # Will be set after API Gateway creation
                 "CLIENT_ID": self.client_config.client_id,
+                **self._build_manifest_environment(),
 
                 # Batching configuration
                 "BATCH_WINDOW_SECONDS": "30",
@@ -364,6 +711,8 @@ class EventDrivenIntegrationLayer(Construct):
 
         # Grant permissions
         self.build_batching_table.grant_read_write_data(function)
+        if self.build_manifest_bucket is not None:
+            self.build_manifest_bucket.grant_put(function, f"{MANIFEST_PREFIX}/*")
 
         # Add CodeBuild permissions
         function.add_to_role_policy(
@@ -377,20 +726,6 @@ class EventDrivenIntegrationLayer(Construct):
             )
         )
 
-        # Add EventBridge permissions for scheduling
-        function.add_to_role_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "events:PutRule",
-                    "events:PutTargets",
-                    "events:DeleteRule",
-                    "events:RemoveTargets"
-                ],
-                resources=["*"]
-            )
-        )
-
         return function
 
     def _create_build_batching_handler(self) -> lambda_.Function:
@@ -401,6 +736,19 @@ class EventDrivenIntegrationLayer(Construct):
         CodeBuild costs by up to 70% through smart event aggregation.
         """
 
+        # Delayed wakeups for batches coming due between scheduler ticks
+        wakeup_queue = sqs.Queue(
+            self, "BuildBatchWakeupQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+
+            # Six times the function timeout, as recommended for Lambda event sources
+            visibility_timeout=Duration.minutes(12),
+
+            # A missed wakeup only delays the batch until the next tick
+            retention_period=Duration.hours(1)
+        )
+
         function = lambda_.Function(
             self, "BuildBatchingHandler",
             runtime=lambda_.Runtime.PYTHON_3_11,
@@ -412,9 +760,11 @@ class EventDrivenIntegrationLayer(Construct):
 
             environment={
                 "BUILD_BATCHING_TABLE": self.build_batching_table.table_name,
-                "BUILD_TRIGGER_LAMBDA_ARN": "",  # Will be set after build trigger creation
                 "CLIENT_ID": self.client_config.client_id,
-                "BUILD_PROJECT_NAME": f"{self.client_config.resource_prefix}-composed-build"
+                "BUILD_PROJECT_NAME": f"{self.client_config.resource_prefix}-composed-build",
+                "LATENCY_TARGET_P95_SECONDS": str(int(self.publish_latency_target.to_seconds())),
+                "BATCH_WAKEUP_QUEUE_URL": wakeup_queue.queue_url,
+                **self._build_manifest_environment()
             },
 
             dead_letter_queue_enabled=True,
@@ -425,9 +775,134 @@ class EventDrivenIntegrationLayer(Construct):
 
         # Grant permissions
         self.build_batching_table.grant_read_write_data(function)
+        if self.build_manifest_bucket is not None:
+            self.build_manifest_bucket.grant_put(function, f"{MANIFEST_PREFIX}/*")
+
+        wakeup_queue.grant_send_messages(function)
+        function.add_event_source(lambda_event_sources.SqsEventSource(wakeup_queue, batch_size=10))
+
+        # One fixed-rate tick builds every due batch (see batch_scheduler),
+        # replacing a one-time EventBridge rule per batch
+        events.Rule(
+            self, "BuildBatchSchedulerTick",
+            schedule=events.Schedule.rate(Duration.minutes(1)),
+            targets=[events_targets.LambdaFunction(function)],
+            description=f"Build batch scheduler tick for {self.client_config.client_id}"
+        )
+
+        # Finished builds report their duration to the adaptive batch windows,
+        # release the client's build lease and start the batch queued behind them
+        events.Rule(
+            self, "BuildStateChangeRule",
+            event_pattern=events.EventPattern(
+                source=["aws.codebuild"],
+                detail_type=["CodeBuild Build State Change"],
+                detail={
+                    "project-name": [f"{self.client_config.resource_prefix}-composed-build"],
+                    "build-status": ["SUCCEEDED", "FAILED", "STOPPED"]
+                }
+            ),
+            targets=[events_targets.LambdaFunction(function)],
+            description=f"Build completion statistics for {self.client_config.client_id}"
+        )
+
+        return function
+
+    def _create_content_stream_processor(self) -> lambda_.Function:
+        """
+        Create Lambda function that maintains materialized views.
+
+        It consumes the unified content cache stream, updates the affected
+        per-client views and signals warm containers to drop stale caches.
+        """
+
+        function = lambda_.Function(
+            self, "ContentStreamProcessor",
+            runtime=lambda_.Runtime.PYTHON_3_11,
+            handler="content_stream_processor.lambda_handler",
+            code=lambda_.Code.from_asset("lambda/content_stream_processor"),
+
+            timeout=Duration.seconds(60),
+            memory_size=512,
+
+            environment={
+                "CONTENT_CACHE_TABLE": self.unified_content_cache.table_name,
+                "MATERIALIZED_VIEWS_TABLE": self.materialized_views_table.table_name,
+                "CLIENT_ID": self.client_config.client_id,
+                "LOG_LEVEL": "INFO"
+            },
+
+            log_retention=logs.RetentionDays.ONE_WEEK,
+
+            description=f"Content stream processor for {self.client_config.client_id} - Maintains materialized content views"
+        )
+
+        # Grant permissions: views are rebuilt from the content table when missing
+        self.unified_content_cache.grant_read_data(function)
+        self.unified_content_cache.grant_stream_read(function)
+        self.materialized_views_table.grant_read_write_data(function)
+
+        function.add_event_source(
+            lambda_event_sources.DynamoEventSource(
+                self.unified_content_cache,
+                starting_position=lambda_.StartingPosition.LATEST,
+                batch_size=100,
+                max_batching_window=Duration.seconds(1),
+                report_batch_item_failures=True,
+                retry_attempts=5
+            )
+        )
 
         return function
 
+    def _create_index_keys_seed(self) -> CustomResource:
+        """
+        Record the index key version on the views table of a new deployment.
+
+        Readers only query ClientFacetIndex and ClientTypeStatusIndex once
+        INDEX_KEYS_VERSION is recorded. A content table that is still empty
+        when the stack deploys has no items without the keys, so the seed
+        records the version on create, and again when the version is bumped.
+        Tables that already hold content keep waiting for
+        tools/migrations/backfill_index_keys.py.
+        """
+
+        function = lambda_.Function(
+            self, "IndexKeysSeedHandler",
+            runtime=lambda_.Runtime.PYTHON_3_11,
+            handler="index_keys_seed.lambda_handler",
+            code=lambda_.Code.from_asset("lambda/index_keys_seed"),
+
+            timeout=Duration.seconds(30),
+
+            environment={
+                "CONTENT_CACHE_TABLE": self.unified_content_cache.table_name,
+                "MATERIALIZED_VIEWS_TABLE": self.materialized_views_table.table_name,
+                "LOG_LEVEL": "INFO"
+            },
+
+            log_retention=logs.RetentionDays.ONE_WEEK,
+
+            description=f"Index key version seed for {self.client_config.client_id} - Enables index key queries on new tables"
+        )
+
+        # Grant permissions: reads one content item, writes the generation item
+        self.unified_content_cache.grant_read_data(function)
+        self.materialized_views_table.grant_read_write_data(function)
+
+        provider = cr.Provider(
+            self, "IndexKeysSeedProvider",
+            on_event_handler=function,
+            log_retention=logs.RetentionDays.ONE_WEEK
+        )
+
+        return CustomResource(
+            self, "IndexKeysSeed",
+            service_token=provider.service_token,
+            # A version bump changes the properties, so CloudFormation reruns the seed
+            properties={"IndexKeysVersion": str(INDEX_KEYS_VERSION)}
+        )
+
     def _create_integration_api(self) -> apigwv2.HttpApi:
         """
         Create HTTP API Gateway for webhook integration.
@@ -478,7 +953,7 @@ class EventDrivenIntegrationLayer(Construct):
             methods=[apigwv2.HttpMethod.POST],
             integration=integrations.HttpLambdaIntegration(
                 "WebhookIntegration",
-                self.integration_handler,
+                self.integration_endpoint,
                 # Native Lambda Proxy v2 - no VTL templates needed!
                 payload_format_version=apigwv2.PayloadFormatVersion.VERSION_2_0
             )
@@ -497,7 +972,7 @@ class EventDrivenIntegrationLayer(Construct):
             methods=[apigwv2.HttpMethod.GET],
             integration=integrations.HttpLambdaIntegration(
                 "ContentListIntegration",
-                self.integration_handler,
+                self.integration_endpoint,
                 payload_format_version=apigwv2.PayloadFormatVersion.VERSION_2_0
             )
         )
@@ -508,7 +983,7 @@ class EventDrivenIntegrationLayer(Construct):
             methods=[apigwv2.HttpMethod.GET],
             integration=integrations.HttpLambdaIntegration(
                 "ContentItemIntegration",
-                self.integration_handler,
+                self.integration_endpoint,
                 payload_format_version=apigwv2.PayloadFormatVersion.VERSION_2_0
             )
         )
@@ -522,7 +997,7 @@ class EventDrivenIntegrationLayer(Construct):
             methods=[apigwv2.HttpMethod.GET],
             integration=integrations.HttpLambdaIntegration(
                 "HealthCheckIntegration",
-                self.integration_handler,
+                self.integration_endpoint,
                 payload_format_version=apigwv2.PayloadFormatVersion.VERSION_2_0
             )
         )
@@ -742,20 +1217,19 @@ class EventDrivenIntegrationLayer(Construct):
         Get current status of unified content cache from DynamoDB.
         """
         try:
-            import boto3
-            dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(self.unified_content_cache.table_name)
-
-            # Get basic table statistics
-            response = table.scan(
-                FilterExpression="begins_with(content_id, :client)",
-                ExpressionAttributeValues={':client': f"{client_id}#"},
-                Select='COUNT'
+            # Aggregate counters maintained from the content stream (O(1) read)
+            cache = OptimizedContentCache(
+                table_name=self.unified_content_cache.table_name,
+                views_table_name=self.materialized_views_table.table_name
             )
+            statistics = cache.get_cache_statistics(client_id)
+            if 'error' in statistics:
+                raise RuntimeError(statistics['error'])
 
             return {
                 'client_id': client_id,
-                'cached_items': response['Count'],
+                'cached_items': statistics['total_items'],
+                'content_types': statistics.get('content_types', {}),
                 'table_name': self.unified_content_cache.table_name,
                 'status': 'healthy'
             }
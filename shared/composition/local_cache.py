@@ -0,0 +1,104 @@
+"""
+Local Cache
+
+This module implements a bounded, in-process LRU cache with per-entry TTL
+used as an L1 read-through layer in front of DynamoDB.
+
+Warm Lambda containers serve bursts of identical reads (for example a CDN
+miss storm after a deploy); answering repeats from memory avoids a DynamoDB
+round trip per request. Entries expire after a short TTL so writes made by
+other containers become visible without coordination, and writes made by the
+same container invalidate affected entries immediately.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+import time
+
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded LRU cache with TTL expiry and hit/miss counters.
+
+    Cached values are shared between callers and must be treated as read-only.
+    A cache with max_entries=0 or ttl_seconds=0 stores nothing.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value, or default when missing or expired"""
+
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+
+        if not self.enabled:
+            return
+
+        self._entries[key] = (value, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the counters"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,467 @@
+"""
+Materialized Content Views
+
+This module maintains precomputed per-client listings of unified content so
+the content API can answer common listings with a single GetItem instead of
+a Query. Views are kept up to date at write time by the content stream
+processor, which moves the cost of listing from read time to write time.
+
+Views table layout (PK client_id, SK view_id):
+    published#{content_type}#{provider}  Published content of one type from one provider
+    recent#{content_type}                All content of one type, newest first
+
+Each view item stores compact summaries (heavy fields such as body and
+provider_data are dropped) sorted by updated_at descending, capped at
+MAX_VIEW_ENTRIES. A view answers a listing only when it holds every matching
+item and they fit in the requested page; larger listings, and views that had
+to drop entries (truncated), fall back to a Query.
+
+The table also holds a generation counter that the stream processor bumps
+after every batch of content changes. Warm containers poll it to drop their
+in-process caches when another container has written.
+
+Per-client content counters (total, per type, per provider, per status) live
+in a STATS_VIEW_ID item and are adjusted atomically from the same stream, so
+cache statistics are a single GetItem at any table size. Deltas only cover
+content written since the counters were created, so the item is seeded once
+from a full count of the client's content (seed_statistics) and reads ignore
+it until then.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import logging
+
+from shared.composition.aws_clients import get_aws_clients
+
+
+logger = logging.getLogger(__name__)
+
+MAX_VIEW_ENTRIES = 200
+VIEW_UPDATE_MAX_ATTEMPTS = 5
+
+# Fields dropped from view summaries to keep view items well under 400KB
+SUMMARY_EXCLUDED_FIELDS = ('body', 'provider_data', 'images', 'variants', 'seo')
+
+# Table-wide generation counter item
+GENERATION_CLIENT_ID = '__cache__'
+GENERATION_VIEW_ID = 'generation'
+
+# Version of the derived index keys (facet_key, type_status_key) on content
+# items. The integration layer's index keys seed records it on the generation
+# item when the content table is still empty at deploy time;
+# tools/migrations/backfill_index_keys.py records it for existing tables once
+# every older item carries them. Until then readers avoid the indexes keyed
+# on them, which would silently miss un-backfilled content.
+INDEX_KEYS_VERSION = 1
+
+# Per-client aggregate counters item and counter attribute prefixes
+STATS_VIEW_ID = '__stats__'
+COUNTER_TOTAL = 'count_total'
+COUNTER_PREFIXES = {
+    'content_type': 'count_type_',
+    'provider_name': 'count_provider_',
+    'status': 'count_status_',
+}
+# Statistics group reported for each counted attribute
+COUNTER_GROUPS = {
+    'content_type': 'content_types',
+    'provider_name': 'providers',
+    'status': 'statuses',
+}
+
+# Content table indexes used to (re)build views from scratch
+CLIENT_FACET_INDEX = "ClientFacetIndex"
+CLIENT_CONTENT_TYPE_INDEX = "ClientContentTypeIndex"
+
+
+def summarize_content(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact summary of a content item's data for listings"""
+    return {key: value for key, value in data.items() if key not in SUMMARY_EXCLUDED_FIELDS}
+
+
+def published_view_id(content_type: str, provider_name: str) -> str:
+    return f"published#{content_type}#{provider_name}"
+
+
+def recent_view_id(content_type: str) -> str:
+    return f"recent#{content_type}"
+
+
+def view_id_for_query(
+    content_type: Optional[str],
+    provider_name: Optional[str],
+    status: Optional[str]
+) -> Optional[str]:
+    """
+    View that answers a listing query, if any.
+
+    Args:
+        content_type: Content type filter
+        provider_name: Provider filter
+        status: Status filter
+
+    Returns:
+        View ID, or None when no view matches the query shape
+    """
+
+    if not content_type:
+        return None
+    if provider_name and status == 'published':
+        return published_view_id(content_type, provider_name)
+    if not provider_name and not status:
+        return recent_view_id(content_type)
+    return None
+
+
+def view_ids_for_item(item: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Views a stored content item belongs to.
+
+    Args:
+        item: Unified content cache item (deserialized stream image), or None
+
+    Returns:
+        View IDs the item should appear in
+    """
+
+    if not item or 'content_type' not in item:
+        return []
+
+    view_ids = [recent_view_id(item['content_type'])]
+    if item.get('status') == 'published':
+        view_ids.append(published_view_id(item['content_type'], item['provider_name']))
+    return view_ids
+
+
+def content_counter_deltas(
+    old_item: Optional[Dict[str, Any]],
+    new_item: Optional[Dict[str, Any]]
+) -> Dict[str, int]:
+    """
+    Counter adjustments for one content change.
+
+    Args:
+        old_item: Item before the change, or None for inserts
+        new_item: Item after the change, or None for removals
+
+    Returns:
+        Counter attribute name -> delta, without zero entries
+    """
+
+    deltas: Dict[str, int] = {}
+    for item, sign in ((old_item, -1), (new_item, 1)):
+        if not item or 'content_type' not in item:
+            continue
+        deltas[COUNTER_TOTAL] = deltas.get(COUNTER_TOTAL, 0) + sign
+        for attribute, prefix in COUNTER_PREFIXES.items():
+            if item.get(attribute):
+                name = f"{prefix}{item[attribute]}"
+                deltas[name] = deltas.get(name, 0) + sign
+
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def statistics_from_counters(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Group counter attributes into a statistics dictionary"""
+
+    statistics: Dict[str, Any] = {'total_items': int(counters.get(COUNTER_TOTAL, 0))}
+    for attribute, prefix in COUNTER_PREFIXES.items():
+        statistics[COUNTER_GROUPS[attribute]] = {
+            name[len(prefix):]: int(value)
+            for name, value in counters.items()
+            if name.startswith(prefix)
+        }
+    return statistics
+
+
+def is_counter(name: str) -> bool:
+    """Whether an attribute of the statistics item is a counter"""
+
+    return name == COUNTER_TOTAL or any(name.startswith(prefix) for prefix in COUNTER_PREFIXES.values())
+
+
+def apply_view_change(
+    entries: List[Dict[str, Any]],
+    content_id: str,
+    summary: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Upsert or remove one content summary in a sorted view.
+
+    Args:
+        entries: Current view entries, newest first
+        content_id: Content identifier being changed
+        summary: New summary, or None to remove the content from the view
+
+    Returns:
+        New entries list, newest first and capped at MAX_VIEW_ENTRIES
+    """
+
+    updated = [entry for entry in entries if entry.get('id') != content_id]
+    if summary is not None:
+        updated.append(summary)
+
+    updated.sort(key=lambda entry: (str(entry.get('updated_at', '')), str(entry.get('id', ''))), reverse=True)
+    return updated[:MAX_VIEW_ENTRIES]
+
+
+class MaterializedViewStore:
+    """
+    Read and maintain materialized content views.
+
+    Writers use optimistic concurrency on a per-view version attribute, so
+    concurrent stream shards updating the same view never lose changes.
+    """
+
+    def __init__(self, table_name: str, content_table_name: Optional[str] = None, dynamodb=None):
+        self.dynamodb = dynamodb or get_aws_clients().resource('dynamodb')
+        self.table = self.dynamodb.Table(table_name)
+        self.content_table = self.dynamodb.Table(content_table_name) if content_table_name else None
+
+    def get_view(self, client_id: str, view_id: str) -> Optional[Dict[str, Any]]:
+        """Get a view item, or None if it has not been built"""
+
+        response = self.table.get_item(Key={'client_id': client_id, 'view_id': view_id})
+        return response.get('Item')
+
+    def get_generation(self) -> int:
+        """Current cache generation; changes whenever content is written"""
+
+        return self.get_cache_state()[0]
+
+    def get_cache_state(self) -> Tuple[int, int]:
+        """
+        Current cache generation and backfilled index key version, in one read.
+
+        Returns:
+            Tuple of (generation, index key version; 0 before any backfill)
+        """
+
+        response = self.table.get_item(
+            Key={'client_id': GENERATION_CLIENT_ID, 'view_id': GENERATION_VIEW_ID},
+            ProjectionExpression='generation, index_keys_version'
+        )
+        item = response.get('Item', {})
+        return int(item.get('generation', 0)), int(item.get('index_keys_version', 0))
+
+    def mark_index_keys_backfilled(self, version: int) -> None:
+        """Record that every content item carries the index keys of version"""
+
+        self.table.update_item(
+            Key={'client_id': GENERATION_CLIENT_ID, 'view_id': GENERATION_VIEW_ID},
+            UpdateExpression='SET index_keys_version = :version, updated_at = :now',
+            ExpressionAttributeValues={':version': version, ':now': datetime.utcnow().isoformat()}
+        )
+
+    def bump_generation(self) -> None:
+        """Signal warm containers that their in-process caches are stale"""
+
+        self.table.update_item(
+            Key={'client_id': GENERATION_CLIENT_ID, 'view_id': GENERATION_VIEW_ID},
+            UpdateExpression='ADD generation :one SET updated_at = :now',
+            ExpressionAttributeValues={':one': 1, ':now': datetime.utcnow().isoformat()}
+        )
+
+    def get_statistics(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate content counters for a client.
+
+        Returns:
+            Statistics dictionary, or None if the counters have not been seeded
+        """
+
+        item = self.get_view(client_id, STATS_VIEW_ID)
+        if item is None or 'seeded_at' not in item:
+            return None
+
+        statistics = statistics_from_counters(item)
+        statistics['updated_at'] = item.get('updated_at')
+        return statistics
+
+    def seed_statistics(
+        self,
+        client_id: str,
+        counters: Dict[str, int],
+        previous: Optional[Dict[str, Any]]
+    ) -> bool:
+        """
+        Replace a client's counters with a full count of its content.
+
+        Content written just before the count whose stream records are
+        applied after the seed is counted twice; the window is the stream's
+        processing lag.
+
+        Args:
+            client_id: Client identifier
+            counters: Counter attribute name -> value, counted after previous was read
+            previous: Statistics item read before counting, or None if there was none
+
+        Returns:
+            True if seeded; False if deltas were applied while counting (or
+            another reader seeded first), in which case the caller retries later
+        """
+
+        from botocore.exceptions import ClientError
+
+        # Counters that only ever saw deltas, and are absent from the count, drop to zero
+        values = {name: 0 for name in (previous or {}) if is_counter(name)}
+        values.update(counters)
+
+        names = {f"#c{index}": name for index, name in enumerate(values)}
+        expression_values: Dict[str, Any] = {f":c{index}": value for index, value in enumerate(values.values())}
+        expression_values[':now'] = datetime.utcnow().isoformat()
+
+        if previous is not None and 'version' in previous:
+            condition = 'version = :version AND attribute_not_exists(seeded_at)'
+            expression_values[':version'] = previous['version']
+        else:
+            condition = 'attribute_not_exists(version) AND attribute_not_exists(seeded_at)'
+
+        try:
+            self.table.update_item(
+                Key={'client_id': client_id, 'view_id': STATS_VIEW_ID},
+                UpdateExpression='SET ' + ', '.join(f"#c{index} = :c{index}" for index in range(len(values)))
+                + ', seeded_at = :now, updated_at = :now',
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=expression_values
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Content counters of {client_id} changed while counting, not seeding")
+            return False
+
+        logger.info(f"Seeded content counters of {client_id} ({values.get(COUNTER_TOTAL, 0)} items)")
+        return True
+
+    def apply_counter_deltas(self, client_id: str, deltas: Dict[str, int]) -> None:
+        """Atomically adjust a client's content counters and bump their version."""
+
+        if not deltas:
+            return
+
+        names = {f"#c{index}": name for index, name in enumerate(deltas)}
+        values: Dict[str, Any] = {f":c{index}": delta for index, delta in enumerate(deltas.values())}
+        values[':now'] = datetime.utcnow().isoformat()
+        values[':one'] = 1
+
+        self.table.update_item(
+            Key={'client_id': client_id, 'view_id': STATS_VIEW_ID},
+            UpdateExpression='ADD ' + ', '.join(f"#c{index} :c{index}" for index in range(len(deltas)))
+            + ', version :one SET updated_at = :now',
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+
+    def apply_changes(
+        self,
+        client_id: str,
+        view_id: str,
+        changes: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """
+        Apply content changes to one view.
+
+        A view that does not exist yet is built from the content table first,
+        so it reflects content written before the view existed.
+
+        Args:
+            client_id: Client identifier
+            view_id: View to update
+            changes: (content_id, summary or None) in stream order
+        """
+
+        from botocore.exceptions import ClientError
+
+        for attempt in range(VIEW_UPDATE_MAX_ATTEMPTS):
+            view = self.get_view(client_id, view_id)
+            if view is None:
+                entries, truncated = self._load_view_source(client_id, view_id)
+                version = 0
+            else:
+                entries, truncated, version = view.get('entries', []), view.get('truncated', False), int(view['version'])
+
+            for content_id, summary in changes:
+                is_new = summary is not None and all(entry.get('id') != content_id for entry in entries)
+                expected = len(entries) + 1 if is_new else len(entries)
+                entries = apply_view_change(entries, content_id, summary)
+                # Content was dropped off the end of the view
+                truncated = truncated or (is_new and len(entries) < expected)
+
+            try:
+                self._put_view(client_id, view_id, entries, truncated, version)
+                return
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                logger.info(f"View {view_id} for {client_id} changed concurrently, retrying (attempt {attempt + 1})")
+
+        raise RuntimeError(f"Failed to update view {view_id} for {client_id} after {VIEW_UPDATE_MAX_ATTEMPTS} attempts")
+
+    def _put_view(self, client_id: str, view_id: str, entries: List[Dict[str, Any]], truncated: bool, version: int) -> None:
+        """Write a view if nobody else has written it since it was read."""
+
+        from boto3.dynamodb.conditions import Attr
+
+        condition = Attr('version').eq(version) if version else Attr('client_id').not_exists()
+
+        self.table.put_item(
+            Item={
+                'client_id': client_id,
+                'view_id': view_id,
+                'entries': entries,
+                'entry_count': len(entries),
+                'truncated': truncated,
+                'version': version + 1,
+                'updated_at': datetime.utcnow().isoformat()
+            },
+            ConditionExpression=condition
+        )
+
+    def _load_view_source(self, client_id: str, view_id: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Build a view's entries from the content table.
+
+        Returns:
+            Tuple of (entries newest first, whether content was left out)
+        """
+
+        from boto3.dynamodb.conditions import Key, Attr
+
+        if self.content_table is None:
+            raise RuntimeError("Building a view requires the content table")
+
+        kind, content_type, *rest = view_id.split('#')
+        if kind == 'published' and self.get_cache_state()[1] >= INDEX_KEYS_VERSION:
+            query_params = {
+                'IndexName': CLIENT_FACET_INDEX,
+                'KeyConditionExpression': Key('client_id').eq(client_id)
+                & Key('facet_key').begins_with(f"{content_type}#{rest[0]}#published#")
+            }
+        elif kind == 'published':
+            # Content written before facet_key existed is not in ClientFacetIndex yet
+            query_params = {
+                'IndexName': CLIENT_CONTENT_TYPE_INDEX,
+                'KeyConditionExpression': Key('client_id').eq(client_id) & Key('content_type').eq(content_type),
+                'FilterExpression': Attr('provider_name').eq(rest[0]) & Attr('status').eq('published')
+            }
+        else:
+            query_params = {
+                'IndexName': CLIENT_CONTENT_TYPE_INDEX,
+                'KeyConditionExpression': Key('client_id').eq(client_id) & Key('content_type').eq(content_type)
+            }
+
+        entries: List[Dict[str, Any]] = []
+        total = 0
+        while True:
+            response = self.content_table.query(**query_params)
+            for item in response['Items']:
+                entries = apply_view_change(entries, item['data']['id'], summarize_content(item['data']))
+                total += 1
+
+            if not response.get('LastEvaluatedKey'):
+                return entries, total > len(entries)
+
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
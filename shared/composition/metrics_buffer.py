@@ -0,0 +1,156 @@
+"""
+Metrics Buffer
+
+This module buffers CloudWatch metrics for the duration of a Lambda invocation
+and flushes them once at the end as CloudWatch Embedded Metric Format (EMF)
+log lines, replacing one synchronous put_metric_data call per metric.
+
+CloudWatch Logs extracts EMF documents written to stdout asynchronously, so
+flushing costs no network round trip on the request path and needs no
+cloudwatch:PutMetricData permission.
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime
+import json
+import logging
+import sys
+
+
+logger = logging.getLogger(__name__)
+
+# EMF limits: 100 metrics per document, 100 values per metric
+EMF_MAX_METRICS_PER_DOCUMENT = 100
+EMF_MAX_VALUES_PER_METRIC = 100
+
+
+def _write_stdout(line: str) -> None:
+    """Write an EMF document to stdout where the Lambda log agent picks it up"""
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+class MetricsBuffer:
+    """
+    Per-invocation metrics buffer that records counters and timers and
+    flushes them as aggregated EMF documents.
+
+    Counters with the same name and dimensions are summed; timers and other
+    units keep every recorded value so CloudWatch can compute percentiles.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        default_dimensions: Optional[Dict[str, str]] = None,
+        emit: Callable[[str], None] = _write_stdout
+    ):
+        self.namespace = namespace
+        self.default_dimensions = dict(default_dimensions or {})
+        self._emit = emit
+
+        # (dimension items, metric name, unit) -> recorded values
+        self._records: Dict[Tuple[Tuple[Tuple[str, str], ...], str, str], List[float]] = {}
+
+    def add_metric(
+        self,
+        name: str,
+        value: float,
+        unit: str = 'Count',
+        dimensions: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Record a metric value for the current invocation.
+
+        Args:
+            name: Metric name
+            value: Metric value
+            unit: CloudWatch unit (Count, Milliseconds, ...)
+            dimensions: Dimensions merged over the buffer defaults
+        """
+
+        merged = {**self.default_dimensions, **(dimensions or {})}
+        key = (tuple(sorted((k, str(v)) for k, v in merged.items())), name, unit)
+
+        values = self._records.setdefault(key, [])
+        if unit == 'Count' and values:
+            values[0] += value
+        else:
+            values.append(value)
+
+    def add_count(self, name: str, value: float = 1, dimensions: Optional[Dict[str, str]] = None) -> None:
+        """Record a counter increment"""
+        self.add_metric(name, value, 'Count', dimensions)
+
+    def add_timing(self, name: str, milliseconds: float, dimensions: Optional[Dict[str, str]] = None) -> None:
+        """Record a latency measurement in milliseconds"""
+        self.add_metric(name, milliseconds, 'Milliseconds', dimensions)
+
+    def flush(self) -> int:
+        """
+        Emit all buffered metrics as EMF documents and reset the buffer.
+
+        Returns:
+            Number of EMF documents written
+        """
+
+        if not self._records:
+            return 0
+
+        # One document per dimension set, all metrics for that set aggregated
+        by_dimensions: Dict[Tuple[Tuple[str, str], ...], List[Tuple[str, str, List[float]]]] = {}
+        for (dimension_items, name, unit), values in self._records.items():
+            by_dimensions.setdefault(dimension_items, []).append((name, unit, values))
+
+        self._records = {}
+        timestamp = int(datetime.utcnow().timestamp() * 1000)
+        documents = 0
+
+        for dimension_items, metrics in by_dimensions.items():
+            # Metrics with more values than a document takes continue in further documents
+            chunk_count = max((len(values) - 1) // EMF_MAX_VALUES_PER_METRIC + 1 for _, _, values in metrics)
+            for chunk in range(chunk_count):
+                start = chunk * EMF_MAX_VALUES_PER_METRIC
+                chunk_metrics = [
+                    (name, unit, values[start:start + EMF_MAX_VALUES_PER_METRIC])
+                    for name, unit, values in metrics if len(values) > start
+                ]
+
+                for i in range(0, len(chunk_metrics), EMF_MAX_METRICS_PER_DOCUMENT):
+                    try:
+                        self._emit(json.dumps(self._build_document(
+                            dimension_items, chunk_metrics[i:i + EMF_MAX_METRICS_PER_DOCUMENT], timestamp
+                        )))
+                        documents += 1
+                    except Exception as e:
+                        # Never fail the invocation because metrics could not be written
+                        logger.warning(f"Failed to flush metrics for {self.namespace}: {str(e)}")
+
+        return documents
+
+    def _build_document(
+        self,
+        dimension_items: Tuple[Tuple[str, str], ...],
+        metrics: List[Tuple[str, str, List[float]]],
+        timestamp: int
+    ) -> Dict[str, Any]:
+        """Build one EMF document for a dimension set, at most EMF_MAX_VALUES_PER_METRIC values each"""
+
+        document: Dict[str, Any] = {
+            '_aws': {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': self.namespace,
+                    'Dimensions': [[name for name, _ in dimension_items]],
+                    'Metrics': [{'Name': name, 'Unit': unit} for name, unit, _ in metrics]
+                }]
+            }
+        }
+
+        for name, value in dimension_items:
+            document[name] = value
+
+        for name, _, values in metrics:
+            document[name] = values[0] if len(values) == 1 else values
+
+        return document
@@ -9,19 +9,80 @@ Addresses the DynamoDB schema efficiency and event filtering optimization
 recommendations from the event-driven composition architecture review.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from decimal import Decimal
 import logging
 import json
-from dataclasses import dataclass
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 from models.composition import UnifiedContent, ContentEvent, ContentType
+from shared.composition.aws_clients import AWSClients, get_aws_clients
+from shared.composition.local_cache import LocalCache
+from shared.composition.materialized_views import (
+    INDEX_KEYS_VERSION,
+    STATS_VIEW_ID,
+    MaterializedViewStore,
+    content_counter_deltas,
+    statistics_from_counters,
+    summarize_content,
+    view_id_for_query
+)
 
 
 logger = logging.getLogger(__name__)
 
+# DynamoDB BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_CHUNK_SIZE = 25
+# DynamoDB BatchGetItem accepts at most 100 keys per call
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_WORKERS = 4
+# SNS PublishBatch accepts at most 10 entries per call
+PUBLISH_BATCH_SIZE = 10
+BATCH_MAX_RETRIES = 5
+# Error codes worth retrying besides 5xx responses: throttling and transient faults
+RETRYABLE_ERROR_CODES = frozenset({
+    'Throttling', 'ThrottlingException', 'Throttled', 'ThrottledException', 'TooManyRequestsException',
+    'ProvisionedThroughputExceededException', 'RequestLimitExceeded',
+    'InternalError', 'InternalFailure', 'ServiceUnavailable'
+})
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+BATCH_RETRY_MAX_DELAY_SECONDS = 1.0
+# Upper bound on a single content page, and on the DynamoDB requests used to fill it
+MAX_PAGE_LIMIT = 1000
+FILL_PAGE_MAX_REQUESTS = 10
+# Composite facet sort key: content_type#provider#status#updated_at
+FACET_KEY_SEPARATOR = '#'
+# Sorts after every character used in ISO timestamps, closing facet key ranges
+FACET_KEY_END = '~'
+# How often warm containers check the view store's cache generation
+GENERATION_POLL_SECONDS = 1.0
+
+
+def build_facet_key(content_type: str, provider_name: str, status: str, updated_at: str) -> str:
+    """Build the ClientFacetIndex sort key for a content item"""
+    return FACET_KEY_SEPARATOR.join([content_type, provider_name, status, updated_at])
+
+
+def build_type_status_key(content_type: str, status: str, updated_at: str) -> str:
+    """Build the ClientTypeStatusIndex sort key for a content item"""
+    return FACET_KEY_SEPARATOR.join([content_type, status, updated_at])
+
+
+def _is_retryable(error) -> bool:
+    """Whether a botocore ClientError is throttling or a server-side failure"""
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+    return status >= 500 or error.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for retrying unprocessed batch entries"""
+    ceiling = min(BATCH_RETRY_MAX_DELAY_SECONDS, BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
 
 @dataclass
 class ContentQuery:
@@ -32,6 +93,9 @@ class ContentQuery:
     status: Optional[str] = None
     limit: int = 100
     last_updated_after: Optional[datetime] = None
+    exclusive_start_key: Optional[Dict[str, Any]] = None
+    fill_page: bool = False
+    summary: bool = False
 
 
 @dataclass
@@ -43,21 +107,129 @@ class QueryResult:
     query_stats: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class BatchWriteResult:
+    """Batch write result with per-item outcome"""
+    stored_ids: List[str] = field(default_factory=list)
+    failed_ids: List[str] = field(default_factory=list)
+    # Stored items whose render fingerprint matched the previous version
+    unchanged_ids: List[str] = field(default_factory=list)
+    write_stats: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchGetResult:
+    """Batch read result in input order, with keys that could not be read"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    missing_refs: List[Tuple[str, str]] = field(default_factory=list)
+    unprocessed_refs: List[Tuple[str, str]] = field(default_factory=list)
+    read_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.unprocessed_refs
+
+
 class OptimizedContentCache:
     """
     Optimized content cache using GSI queries instead of table scans
     for better performance and cost efficiency.
     """
 
-    def __init__(self, table_name: str, region_name: str = 'us-east-1'):
+    def __init__(
+        self,
+        table_name: str,
+        region_name: str = 'us-east-1',
+        local_cache_size: int = 1000,
+        local_cache_ttl_seconds: float = 5.0,
+        views_table_name: Optional[str] = None,
+        aws_clients: Optional[AWSClients] = None
+    ):
         self.table_name = table_name
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
-        self.table = self.dynamodb.Table(table_name)
+        self.region_name = region_name
+        self.views_table_name = views_table_name
+
+        # DynamoDB resource, tables and view store are created on first use;
+        # with aws_clients they come from the handler's shared registry
+        self.aws_clients = aws_clients
+        self._dynamodb = None
+        self._table = None
+        self._views = None
+
+        # In-process L1 caches for warm containers; the TTL bounds staleness
+        # for writes made by other containers
+        self._item_cache = LocalCache(local_cache_size, local_cache_ttl_seconds)
+        self._query_cache = LocalCache(local_cache_size, local_cache_ttl_seconds)
+
+        # Materialized views maintained by the content stream processor; its
+        # generation counter invalidates the local caches across containers
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        # Backfilled version of facet_key/type_status_key, read with the generation
+        self._index_keys_version = 0
 
         # GSI names
         self.CLIENT_CONTENT_TYPE_INDEX = "ClientContentTypeIndex"
         self.PROVIDER_UPDATE_INDEX = "ProviderUpdateIndex"
         self.STATUS_UPDATE_INDEX = "StatusUpdateIndex"  # New GSI for status queries
+        self.CLIENT_FACET_INDEX = "ClientFacetIndex"  # client_id + content_type#provider#status#updated_at
+        self.CLIENT_TYPE_STATUS_INDEX = "ClientTypeStatusIndex"  # client_id + content_type#status#updated_at
+
+    @property
+    def dynamodb(self):
+        """DynamoDB resource, created on first use"""
+
+        if self._dynamodb is None:
+            if self.aws_clients:
+                self._dynamodb = self.aws_clients.resource('dynamodb')
+            else:
+                import boto3
+                self._dynamodb = boto3.resource('dynamodb', region_name=self.region_name)
+        return self._dynamodb
+
+    @dynamodb.setter
+    def dynamodb(self, resource) -> None:
+        self._dynamodb = resource
+
+    @property
+    def table(self):
+        """Content table, created on first use"""
+
+        if self._table is None:
+            self._table = self.dynamodb.Table(self.table_name)
+        return self._table
+
+    @table.setter
+    def table(self, table) -> None:
+        self._table = table
+
+    @property
+    def views(self) -> Optional[MaterializedViewStore]:
+        """Materialized view store, or None when views are not configured"""
+
+        if self._views is None and self.views_table_name:
+            self._views = MaterializedViewStore(self.views_table_name, dynamodb=self.dynamodb)
+        return self._views
+
+    @views.setter
+    def views(self, views: Optional[MaterializedViewStore]) -> None:
+        self._views = views
+
+    def reset(self) -> None:
+        """
+        Drop the DynamoDB resource and in-process caches, e.g. after a
+        SnapStart restore: connections in the snapshot are gone and cached
+        items may be arbitrarily old.
+        """
+
+        self._dynamodb = None
+        self._table = None
+        self._views = None
+        self._item_cache.clear()
+        self._query_cache.clear()
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._index_keys_version = 0
 
     def put_content(self, content: UnifiedContent, client_id: str) -> bool:
         """
@@ -72,38 +244,11 @@ class OptimizedContentCache:
         """
 
         try:
-            # Prepare item with optimized key structure
-            item = {
-                # Primary keys
-                'content_id': content.id,
-                'content_type_provider': f"{content.content_type.value}#{content.provider_name}",
-
-                # GSI keys for efficient querying
-                'client_id': client_id,
-                'content_type': content.content_type.value,
-                'provider_name': content.provider_name,
-                'status': content.status.value,
-                'updated_at': content.updated_at.isoformat(),
-
-                # Additional indexed fields
-                'created_at': content.created_at.isoformat(),
-                'synced_at': content.synced_at.isoformat(),
-
-                # TTL for automatic cleanup (30 days)
-                'ttl': int((datetime.utcnow() + timedelta(days=30)).timestamp()),
-
-                # Full content data
-                'data': content.model_dump(),
-
-                # Search optimization fields
-                'title_lower': content.title.lower(),
-                'tags': content.tags,
-                'has_price': content.price is not None,
-                'is_published': content.status.value == 'published'
-            }
-
-            # Store item
+            # Store item, keeping its stored render fingerprint (see put_content_batch)
+            item = self._build_content_item(content, client_id)
+            self._carry_fingerprints({(item['content_id'], item['content_type_provider']): item})
             self.table.put_item(Item=item)
+            self._invalidate_local(item['content_id'], item['content_type_provider'])
 
             logger.info(f"Stored content {content.id} for client {client_id}")
             return True
@@ -112,6 +257,247 @@ class OptimizedContentCache:
             logger.error(f"Failed to store content {content.id}: {str(e)}")
             return False
 
+    def put_content_batch(self, contents: List[UnifiedContent], client_id: str) -> BatchWriteResult:
+        """
+        Store many unified content items using BatchWriteItem.
+
+        Items are written in chunks of 25 and any UnprocessedItems returned by
+        DynamoDB are retried with jittered exponential backoff, so bulk webhooks
+        (Decap pushes, Shopify imports) cost one round trip per 25 items instead
+        of one per item. The stored render fingerprints are read first, so
+        resent payloads that change nothing visible are reported as unchanged.
+
+        A changed item's new fingerprint is stored as pending_fingerprint and
+        the previous content_fingerprint is kept until commit_fingerprints()
+        confirms its event was published; if publishing fails, a resend still
+        counts as a change.
+
+        Args:
+            contents: UnifiedContent objects to store
+            client_id: Client identifier
+
+        Returns:
+            BatchWriteResult listing stored and failed content IDs
+        """
+
+        result = BatchWriteResult(write_stats={'requests': 0, 'retries': 0, 'chunks': 0})
+
+        # BatchWriteItem rejects duplicate keys within a request; last write wins
+        items_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for content in contents:
+            try:
+                item = self._build_content_item(content, client_id)
+            except Exception as e:
+                logger.error(f"Failed to prepare content {content.id} for storage: {str(e)}")
+                result.failed_ids.append(content.id)
+                continue
+            items_by_key[(item['content_id'], item['content_type_provider'])] = item
+
+        unchanged_refs = self._carry_fingerprints(items_by_key)
+
+        items = list(items_by_key.values())
+        for i in range(0, len(items), BATCH_WRITE_CHUNK_SIZE):
+            chunk = items[i:i + BATCH_WRITE_CHUNK_SIZE]
+            result.write_stats['chunks'] += 1
+
+            stored, failed = self._write_chunk_with_retry(chunk, result.write_stats)
+            for item in chunk:
+                self._invalidate_local(item['content_id'], item['content_type_provider'])
+            result.stored_ids.extend(stored)
+            result.failed_ids.extend(failed)
+
+        stored_ids = set(result.stored_ids)
+        result.unchanged_ids = [
+            item['content_id'] for ref, item in items_by_key.items()
+            if item['content_id'] in stored_ids and ref in unchanged_refs
+        ]
+
+        logger.info(f"Batch stored {len(result.stored_ids)} content items for client {client_id} "
+                    f"({len(result.failed_ids)} failed, {len(result.unchanged_ids)} unchanged, "
+                    f"{result.write_stats['requests']} requests)")
+        return result
+
+    def commit_fingerprints(self, contents: List[UnifiedContent]) -> int:
+        """
+        Promote the pending render fingerprints of content whose events were published.
+
+        Each update is conditional on the pending fingerprint still matching,
+        so a newer write of the same item is never marked as published.
+
+        Returns:
+            Number of fingerprints committed
+        """
+
+        from botocore.exceptions import ClientError
+
+        committed = 0
+        for content in contents:
+            provider_name = getattr(content.provider_name, 'value', content.provider_name)
+            try:
+                self.table.update_item(
+                    Key={
+                        'content_id': content.id,
+                        'content_type_provider': f"{content.content_type.value}#{provider_name}"
+                    },
+                    UpdateExpression='SET content_fingerprint = :fingerprint REMOVE pending_fingerprint',
+                    ConditionExpression='pending_fingerprint = :fingerprint',
+                    ExpressionAttributeValues={':fingerprint': content.render_fingerprint()}
+                )
+                committed += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    logger.warning(f"Failed to commit fingerprint of {content.id}: {str(e)}")
+
+        return committed
+
+    def _carry_fingerprints(self, items_by_key: Dict[Tuple[str, str], Dict[str, Any]]) -> Set[Tuple[str, str]]:
+        """
+        Copy the stored render fingerprints onto items about to be written,
+        so a put never drops content_fingerprint, and drop pending_fingerprint
+        where it matches.
+
+        Returns:
+            Keys of the items whose render fingerprint is unchanged
+        """
+
+        previous_fingerprints = self._stored_fingerprints(list(items_by_key.keys()))
+
+        unchanged_refs = set()
+        for ref, item in items_by_key.items():
+            previous = previous_fingerprints.get(ref)
+            if previous is None:
+                continue
+            item['content_fingerprint'] = previous
+            if previous == item['pending_fingerprint']:
+                unchanged_refs.add(ref)
+                del item['pending_fingerprint']
+
+        return unchanged_refs
+
+    def _stored_fingerprints(self, refs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """
+        Read the render fingerprints currently stored for refs.
+
+        Keys that are missing, unprocessed or fail to read are left out, so
+        their content counts as changed.
+        """
+
+        from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+        from botocore.exceptions import ClientError
+
+        client = self.dynamodb.meta.client
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+        fingerprints: Dict[Tuple[str, str], str] = {}
+
+        for i in range(0, len(refs), BATCH_GET_CHUNK_SIZE):
+            keys = [
+                {
+                    'content_id': serializer.serialize(content_id),
+                    'content_type_provider': serializer.serialize(content_type_provider)
+                }
+                for content_id, content_type_provider in refs[i:i + BATCH_GET_CHUNK_SIZE]
+            ]
+
+            try:
+                response = client.batch_get_item(RequestItems={self.table_name: {
+                    'Keys': keys,
+                    'ProjectionExpression': 'content_id, content_type_provider, content_fingerprint'
+                }})
+            except ClientError as e:
+                logger.warning(f"Failed to read stored fingerprints: {str(e)}")
+                continue
+
+            for raw_item in response.get('Responses', {}).get(self.table_name, []):
+                item = {key: deserializer.deserialize(value) for key, value in raw_item.items()}
+                if 'content_fingerprint' in item:
+                    fingerprints[(item['content_id'], item['content_type_provider'])] = item['content_fingerprint']
+
+        return fingerprints
+
+    def _write_chunk_with_retry(
+        self,
+        chunk: List[Dict[str, Any]],
+        write_stats: Dict[str, Any]
+    ) -> Tuple[List[str], List[str]]:
+        """Write one BatchWriteItem chunk, retrying unprocessed items, throttling and server errors with backoff."""
+
+        from botocore.exceptions import ClientError
+
+        pending = [{'PutRequest': {'Item': item}} for item in chunk]
+
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if attempt > 0:
+                write_stats['retries'] += 1
+                time.sleep(_backoff_delay(attempt))
+
+            try:
+                write_stats['requests'] += 1
+                response = self.dynamodb.batch_write_item(
+                    RequestItems={self.table_name: pending}
+                )
+            except ClientError as e:
+                if not _is_retryable(e):
+                    logger.error(f"Batch write chunk failed: {str(e)}")
+                    break
+                logger.warning(f"Batch write chunk throttled or failed (attempt {attempt + 1}): {str(e)}")
+                continue
+
+            pending = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            if not pending:
+                break
+
+            logger.warning(f"Batch write returned {len(pending)} unprocessed items (attempt {attempt + 1})")
+
+        failed_ids = {request['PutRequest']['Item']['content_id'] for request in pending}
+        stored_ids = [item['content_id'] for item in chunk if item['content_id'] not in failed_ids]
+
+        return stored_ids, list(failed_ids)
+
+    def _build_content_item(self, content: UnifiedContent, client_id: str) -> Dict[str, Any]:
+        """Build the DynamoDB item for a unified content object."""
+
+        provider_name = getattr(content.provider_name, 'value', content.provider_name)
+
+        return {
+            # Primary keys
+            'content_id': content.id,
+            'content_type_provider': f"{content.content_type.value}#{provider_name}",
+
+            # GSI keys for efficient querying
+            'client_id': client_id,
+            'content_type': content.content_type.value,
+            'provider_name': provider_name,
+            'status': content.status.value,
+            'updated_at': content.updated_at.isoformat(),
+            'facet_key': build_facet_key(
+                content.content_type.value, provider_name, content.status.value, content.updated_at.isoformat()
+            ),
+            'type_status_key': build_type_status_key(
+                content.content_type.value, content.status.value, content.updated_at.isoformat()
+            ),
+
+            # Additional indexed fields
+            'created_at': content.created_at.isoformat(),
+            'synced_at': content.synced_at.isoformat(),
+
+            # TTL for automatic cleanup (30 days)
+            'ttl': int((datetime.utcnow() + timedelta(days=30)).timestamp()),
+
+            # Full content data (JSON-safe, floats as Decimal for DynamoDB)
+            'data': json.loads(content.model_dump_json(), parse_float=Decimal),
+
+            # Hash of the rendered fields, to recognize no-op resends; becomes
+            # content_fingerprint once the content's event is published
+            'pending_fingerprint': content.render_fingerprint(),
+
+            # Search optimization fields
+            'title_lower': content.title.lower(),
+            'tags': content.tags,
+            'has_price': content.price is not None,
+            'is_published': content.status.value == 'published'
+        }
+
     def query_content_optimized(self, query: ContentQuery) -> QueryResult:
         """
         Query content using optimized GSI queries instead of table scans.
@@ -123,14 +509,80 @@ class OptimizedContentCache:
             QueryResult with items and metadata
         """
 
+        self._sync_generation()
+
+        cache_key = self._query_cache_key(query)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._query_view(query) if query.summary else None
+        if result is None:
+            result = self._run_query(query)
+            if query.summary:
+                result.items = [summarize_content(item) for item in result.items]
+
+        if not result.query_stats or 'error' not in result.query_stats:
+            self._query_cache.put(cache_key, result)
+
+        return result
+
+    def _query_view(self, query: ContentQuery) -> Optional[QueryResult]:
+        """
+        Answer a summary listing from a materialized view with one GetItem.
+
+        Returns None when no view matches, the view is not built yet, or it
+        cannot hold the complete answer (truncated or larger than the page).
+        """
+
+        if self.views is None or query.exclusive_start_key or query.last_updated_after:
+            return None
+
+        view_id = view_id_for_query(
+            query.content_type.value if query.content_type else None,
+            query.provider_name,
+            query.status
+        )
+        if view_id is None:
+            return None
+
+        try:
+            view = self.views.get_view(query.client_id, view_id)
+        except Exception as e:
+            logger.warning(f"Materialized view {view_id} unavailable: {str(e)}")
+            return None
+
+        if not view or view.get('truncated') or len(view.get('entries', [])) > query.limit:
+            return None
+
+        return QueryResult(
+            items=view['entries'],
+            count=len(view['entries']),
+            query_stats={
+                'query_type': 'materialized_view',
+                'view_id': view_id,
+                'scanned_count': len(view['entries']),
+                'requests': 1,
+                'read_amplification': 1.0
+            }
+        )
+
+    def _run_query(self, query: ContentQuery) -> QueryResult:
+        """Dispatch a query to the most selective index."""
+
         try:
             # Choose optimal query strategy based on parameters
-            if query.content_type and query.provider_name:
+            index_keys = self._use_index_keys(query)
+            if query.content_type and query.provider_name and index_keys:
                 return self._query_by_content_type_provider(query)
+            elif query.content_type and query.status and index_keys:
+                return self._query_by_content_type_status(query)
             elif query.content_type:
                 return self._query_by_content_type(query)
             elif query.provider_name:
                 return self._query_by_provider(query)
+            elif query.status:
+                return self._query_by_status(query)
             else:
                 return self._query_by_client(query)
 
@@ -141,72 +593,125 @@ class OptimizedContentCache:
     def _query_by_content_type_provider(self, query: ContentQuery) -> QueryResult:
         """
         Most efficient query: client_id + content_type + provider_name.
-        Uses ClientContentTypeIndex with filter expression for provider.
+        Uses ClientFacetIndex so provider, status and update time become
+        sort key conditions instead of FilterExpression predicates.
         """
 
-        key_condition = Key('client_id').eq(query.client_id) & Key('content_type').eq(query.content_type.value)
+        key_condition, filter_expression = self._plan_facet_query(query)
 
-        filter_expression = Attr('provider_name').eq(query.provider_name)
+        query_params = {
+            'IndexName': self.CLIENT_FACET_INDEX,
+            'KeyConditionExpression': key_condition
+        }
 
-        if query.status:
-            filter_expression = filter_expression & Attr('status').eq(query.status)
+        if filter_expression is not None:
+            query_params['FilterExpression'] = filter_expression
+
+        return self._execute_query(query, query_params, 'facet_gsi')
+
+    def _plan_facet_query(self, query: ContentQuery) -> Tuple[Any, Any]:
+        """
+        Translate query predicates into a ClientFacetIndex key condition.
 
+        The facet key orders content_type, provider, status and updated_at, so
+        the longest leading run of supplied predicates becomes a begins_with
+        prefix. When all three facets are given, last_updated_after becomes a
+        between range on the timestamp suffix. Predicates that follow a gap in
+        the run cannot be keyed and are returned as a FilterExpression.
+
+        Returns:
+            Tuple of (key condition, filter expression or None)
+        """
+
+        from boto3.dynamodb.conditions import Key, Attr
+
+        facets = [query.content_type.value if query.content_type else None, query.provider_name, query.status]
+
+        prefix_parts = []
+        for value in facets:
+            if value is None:
+                break
+            prefix_parts.append(value)
+
+        key_condition = Key('client_id').eq(query.client_id)
+        filter_expression = None
+
+        prefix = FACET_KEY_SEPARATOR.join(prefix_parts) + FACET_KEY_SEPARATOR if prefix_parts else ''
+        if len(prefix_parts) == len(facets) and query.last_updated_after:
+            key_condition = key_condition & Key('facet_key').between(
+                prefix + query.last_updated_after.isoformat(), prefix + FACET_KEY_END
+            )
+        else:
+            if prefix:
+                key_condition = key_condition & Key('facet_key').begins_with(prefix)
+
+            # Facets after the keyed prefix are filtered
+            if query.status and len(prefix_parts) < 3:
+                filter_expression = Attr('status').eq(query.status)
+
+            if query.last_updated_after:
+                condition = Attr('updated_at').gte(query.last_updated_after.isoformat())
+                filter_expression = condition if filter_expression is None else filter_expression & condition
+
+        return key_condition, filter_expression
+
+    def _query_by_content_type_status(self, query: ContentQuery) -> QueryResult:
+        """
+        Query by client_id, content_type and status using ClientTypeStatusIndex.
+        Status and update time are sort key conditions, so nothing is filtered.
+        """
+
+        from boto3.dynamodb.conditions import Key
+
+        prefix = build_type_status_key(query.content_type.value, query.status, '')
+        key_condition = Key('client_id').eq(query.client_id)
         if query.last_updated_after:
-            filter_expression = filter_expression & Attr('updated_at').gte(query.last_updated_after.isoformat())
+            key_condition = key_condition & Key('type_status_key').between(
+                prefix + query.last_updated_after.isoformat(), prefix + FACET_KEY_END
+            )
+        else:
+            key_condition = key_condition & Key('type_status_key').begins_with(prefix)
 
-        response = self.table.query(
-            IndexName=self.CLIENT_CONTENT_TYPE_INDEX,
-            KeyConditionExpression=key_condition,
-            FilterExpression=filter_expression,
-            Limit=query.limit
-        )
+        query_params = {
+            'IndexName': self.CLIENT_TYPE_STATUS_INDEX,
+            'KeyConditionExpression': key_condition
+        }
 
-        return QueryResult(
-            items=[item['data'] for item in response['Items']],
-            count=response['Count'],
-            last_evaluated_key=response.get('LastEvaluatedKey'),
-            query_stats={
-                'consumed_capacity': response.get('ConsumedCapacity'),
-                'query_type': 'content_type_provider_gsi'
-            }
-        )
+        return self._execute_query(query, query_params, 'type_status_gsi')
 
     def _query_by_content_type(self, query: ContentQuery) -> QueryResult:
         """
         Query by client_id and content_type using ClientContentTypeIndex.
-        More efficient than table scan.
+        More efficient than table scan; also serves provider and status
+        queries until the index keys are backfilled.
         """
 
+        from boto3.dynamodb.conditions import Key, Attr
+
         key_condition = Key('client_id').eq(query.client_id) & Key('content_type').eq(query.content_type.value)
 
-        filter_expression = None
+        conditions = []
+        if query.provider_name:
+            conditions.append(Attr('provider_name').eq(query.provider_name))
+
         if query.status:
-            filter_expression = Attr('status').eq(query.status)
+            conditions.append(Attr('status').eq(query.status))
 
         if query.last_updated_after:
-            condition = Attr('updated_at').gte(query.last_updated_after.isoformat())
-            filter_expression = condition if filter_expression is None else filter_expression & condition
+            conditions.append(Attr('updated_at').gte(query.last_updated_after.isoformat()))
 
         query_params = {
             'IndexName': self.CLIENT_CONTENT_TYPE_INDEX,
-            'KeyConditionExpression': key_condition,
-            'Limit': query.limit
+            'KeyConditionExpression': key_condition
         }
 
-        if filter_expression:
+        if conditions:
+            filter_expression = conditions[0]
+            for condition in conditions[1:]:
+                filter_expression = filter_expression & condition
             query_params['FilterExpression'] = filter_expression
 
-        response = self.table.query(**query_params)
-
-        return QueryResult(
-            items=[item['data'] for item in response['Items']],
-            count=response['Count'],
-            last_evaluated_key=response.get('LastEvaluatedKey'),
-            query_stats={
-                'consumed_capacity': response.get('ConsumedCapacity'),
-                'query_type': 'content_type_gsi'
-            }
-        )
+        return self._execute_query(query, query_params, 'content_type_gsi')
 
     def _query_by_provider(self, query: ContentQuery) -> QueryResult:
         """
@@ -214,6 +719,8 @@ class OptimizedContentCache:
         Efficient for provider-specific queries.
         """
 
+        from boto3.dynamodb.conditions import Key, Attr
+
         key_condition = Key('provider_name').eq(query.provider_name)
 
         filter_expression = Attr('client_id').eq(query.client_id)
@@ -224,22 +731,34 @@ class OptimizedContentCache:
         if query.last_updated_after:
             key_condition = key_condition & Key('updated_at').gte(query.last_updated_after.isoformat())
 
-        response = self.table.query(
-            IndexName=self.PROVIDER_UPDATE_INDEX,
-            KeyConditionExpression=key_condition,
-            FilterExpression=filter_expression,
-            Limit=query.limit
-        )
+        query_params = {
+            'IndexName': self.PROVIDER_UPDATE_INDEX,
+            'KeyConditionExpression': key_condition,
+            'FilterExpression': filter_expression
+        }
 
-        return QueryResult(
-            items=[item['data'] for item in response['Items']],
-            count=response['Count'],
-            last_evaluated_key=response.get('LastEvaluatedKey'),
-            query_stats={
-                'consumed_capacity': response.get('ConsumedCapacity'),
-                'query_type': 'provider_gsi'
-            }
-        )
+        return self._execute_query(query, query_params, 'provider_gsi')
+
+    def _query_by_status(self, query: ContentQuery) -> QueryResult:
+        """
+        Query by status using StatusUpdateIndex, with update time as a sort
+        key condition. Each client has its own content table, so the client_id
+        filter does not discard rows.
+        """
+
+        from boto3.dynamodb.conditions import Key, Attr
+
+        key_condition = Key('status').eq(query.status)
+        if query.last_updated_after:
+            key_condition = key_condition & Key('updated_at').gte(query.last_updated_after.isoformat())
+
+        query_params = {
+            'IndexName': self.STATUS_UPDATE_INDEX,
+            'KeyConditionExpression': key_condition,
+            'FilterExpression': Attr('client_id').eq(query.client_id)
+        }
+
+        return self._execute_query(query, query_params, 'status_gsi')
 
     def _query_by_client(self, query: ContentQuery) -> QueryResult:
         """
@@ -247,34 +766,81 @@ class OptimizedContentCache:
         Less efficient but still better than full table scan.
         """
 
-        key_condition = Key('client_id').eq(query.client_id)
-
-        filter_expression = None
-        if query.status:
-            filter_expression = Attr('status').eq(query.status)
+        from boto3.dynamodb.conditions import Key, Attr
 
-        if query.last_updated_after:
-            condition = Attr('updated_at').gte(query.last_updated_after.isoformat())
-            filter_expression = condition if filter_expression is None else filter_expression & condition
+        key_condition = Key('client_id').eq(query.client_id)
 
         query_params = {
             'IndexName': self.CLIENT_CONTENT_TYPE_INDEX,
-            'KeyConditionExpression': key_condition,
-            'Limit': query.limit
+            'KeyConditionExpression': key_condition
         }
 
-        if filter_expression:
-            query_params['FilterExpression'] = filter_expression
+        # No index orders a client's content by update time alone
+        if query.last_updated_after:
+            query_params['FilterExpression'] = Attr('updated_at').gte(query.last_updated_after.isoformat())
 
-        response = self.table.query(**query_params)
+        return self._execute_query(query, query_params, 'client_gsi')
+
+    def _use_index_keys(self, query: ContentQuery) -> bool:
+        """
+        Whether queries may use the indexes keyed on facet_key and
+        type_status_key, which only hold content once it carries them.
+        """
+
+        if query.exclusive_start_key:
+            # Continue a listing on the index its first page came from
+            return bool({'facet_key', 'type_status_key'} & set(query.exclusive_start_key))
+        return self._index_keys_version >= INDEX_KEYS_VERSION
+
+    def _execute_query(self, query: ContentQuery, query_params: Dict[str, Any], query_type: str) -> QueryResult:
+        """
+        Run a GSI query page, resuming from query.exclusive_start_key.
+
+        DynamoDB applies Limit before FilterExpression, so a filtered page can
+        come back short or empty while more matches remain. With fill_page the
+        query keeps reading, asking only for the rows still missing so the
+        returned LastEvaluatedKey stays exact, until the page is full, the index
+        is exhausted or FILL_PAGE_MAX_REQUESTS is reached.
+        """
+
+        limit = max(1, min(query.limit, MAX_PAGE_LIMIT))
+        exclusive_start_key = query.exclusive_start_key
+
+        items: List[Dict[str, Any]] = []
+        scanned_count = 0
+        requests = 0
+        consumed_capacity = []
+
+        while True:
+            params = dict(query_params, Limit=limit - len(items))
+            if exclusive_start_key:
+                params['ExclusiveStartKey'] = exclusive_start_key
+
+            response = self.table.query(**params)
+            requests += 1
+
+            items.extend(item['data'] for item in response['Items'])
+            scanned_count += response.get('ScannedCount', response['Count'])
+            if response.get('ConsumedCapacity'):
+                consumed_capacity.append(response['ConsumedCapacity'])
+
+            exclusive_start_key = response.get('LastEvaluatedKey')
+
+            if (not query.fill_page or not exclusive_start_key or len(items) >= limit
+                    or requests >= FILL_PAGE_MAX_REQUESTS):
+                break
 
         return QueryResult(
-            items=[item['data'] for item in response['Items']],
-            count=response['Count'],
-            last_evaluated_key=response.get('LastEvaluatedKey'),
+            items=items,
+            count=len(items),
+            last_evaluated_key=exclusive_start_key,
             query_stats={
-                'consumed_capacity': response.get('ConsumedCapacity'),
-                'query_type': 'client_gsi'
+                'consumed_capacity': consumed_capacity or None,
+                'query_type': query_type,
+                'scanned_count': scanned_count,
+                'requests': requests,
+                # Items read per item returned; 1.0 means no rows were filtered away
+                'read_amplification': round(scanned_count / len(items), 2) if items else float(scanned_count)
             }
         )
 
@@ -291,6 +857,12 @@ class OptimizedContentCache:
             Content data or None if not found
         """
 
+        self._sync_generation()
+
+        cached = self._item_cache.get((content_id, content_type_provider))
+        if cached is not None:
+            return cached
+
         try:
             response = self.table.get_item(
                 Key={
@@ -300,7 +872,9 @@ class OptimizedContentCache:
             )
 
             if 'Item' in response:
-                return response['Item']['data']
+                data = response['Item']['data']
+                self._item_cache.put((content_id, content_type_provider), data)
+                return data
 
             return None
 
@@ -308,48 +882,177 @@ class OptimizedContentCache:
             logger.error(f"Failed to get content {content_id}: {str(e)}")
             return None
 
-    def batch_get_content(self, content_refs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    def batch_get_content(
+        self,
+        content_refs: List[Tuple[str, str]],
+        data_fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Batch get multiple content items efficiently.
 
         Args:
             content_refs: List of (content_id, content_type_provider) tuples
+            data_fields: Optional top-level data fields to fetch instead of the full item
 
         Returns:
-            List of content data dictionaries
+            List of content data dictionaries in input order
         """
 
-        try:
-            # Prepare batch request keys
-            request_keys = [
-                {
-                    'content_id': content_id,
-                    'content_type_provider': content_type_provider
-                }
-                for content_id, content_type_provider in content_refs
-            ]
+        result = self.get_content_batch(content_refs, data_fields)
+        if not result.complete:
+            logger.warning(f"Batch get left {len(result.unprocessed_refs)} keys unprocessed")
+        return result.items
 
-            # Batch get items (max 100 items per request)
-            items = []
-            for i in range(0, len(request_keys), 100):
-                batch_keys = request_keys[i:i+100]
-
-                response = self.dynamodb.batch_get_item(
-                    RequestItems={
-                        self.table_name: {
-                            'Keys': batch_keys
-                        }
-                    }
-                )
+    def get_content_batch(
+        self,
+        content_refs: List[Tuple[str, str]],
+        data_fields: Optional[List[str]] = None
+    ) -> BatchGetResult:
+        """
+        Read many content items with BatchGetItem.
 
-                batch_items = response.get('Responses', {}).get(self.table_name, [])
-                items.extend([item['data'] for item in batch_items])
+        Chunks of 100 keys run concurrently on a small thread pool, and
+        UnprocessedKeys returned under throttling are retried with jittered
+        exponential backoff. Keys still unprocessed after the last retry are
+        reported instead of silently dropped.
 
-            return items
+        Args:
+            content_refs: List of (content_id, content_type_provider) tuples
+            data_fields: Optional top-level data fields to fetch; only these
+                are transferred via ProjectionExpression
 
-        except Exception as e:
-            logger.error(f"Batch get failed: {str(e)}")
-            return []
+        Returns:
+            BatchGetResult with items in input order
+        """
+
+        self._sync_generation()
+
+        result = BatchGetResult(read_stats={'requests': 0, 'retries': 0, 'chunks': 0, 'cache_hits': 0})
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        # Serve what the local cache already holds, fetch the rest (deduplicated)
+        pending: List[Tuple[str, str]] = []
+        for ref in dict.fromkeys(tuple(ref) for ref in content_refs):
+            cached = self._item_cache.get(ref)
+            if cached is not None:
+                found[ref] = self._project_data(cached, data_fields)
+                result.read_stats['cache_hits'] += 1
+            else:
+                pending.append(ref)
+
+        chunks = [pending[i:i + BATCH_GET_CHUNK_SIZE] for i in range(0, len(pending), BATCH_GET_CHUNK_SIZE)]
+        result.read_stats['chunks'] = len(chunks)
+
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(BATCH_GET_MAX_WORKERS, len(chunks))) as executor:
+                outcomes = list(executor.map(lambda chunk: self._read_chunk_with_retry(chunk, data_fields), chunks))
+
+            for chunk_found, chunk_unprocessed, requests in outcomes:
+                found.update(chunk_found)
+                # Partial projections must not be served as full items later
+                if not data_fields:
+                    for ref, data in chunk_found.items():
+                        self._item_cache.put(ref, data)
+                result.unprocessed_refs.extend(chunk_unprocessed)
+                result.read_stats['requests'] += requests
+                result.read_stats['retries'] += requests - 1
+
+        unprocessed = set(result.unprocessed_refs)
+        for ref in content_refs:
+            ref = tuple(ref)
+            if ref in found:
+                result.items.append(found[ref])
+            elif ref not in unprocessed:
+                result.missing_refs.append(ref)
+
+        return result
+
+    def _read_chunk_with_retry(
+        self,
+        chunk: List[Tuple[str, str]],
+        data_fields: Optional[List[str]]
+    ) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], List[Tuple[str, str]], int]:
+        """
+        Read one BatchGetItem chunk, retrying unprocessed keys, throttling and
+        server errors with backoff.
+
+        Runs on a worker thread, so it uses the thread-safe low-level client
+        and leaves the local cache to the calling thread.
+
+        Returns:
+            Tuple of (found data by ref, unprocessed refs, requests made)
+        """
+
+        from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+        from botocore.exceptions import ClientError
+
+        client = self.dynamodb.meta.client
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+
+        request: Dict[str, Any] = {
+            'Keys': [
+                {
+                    'content_id': serializer.serialize(content_id),
+                    'content_type_provider': serializer.serialize(content_type_provider)
+                }
+                for content_id, content_type_provider in chunk
+            ]
+        }
+
+        if data_fields:
+            names = {'#data': 'data'}
+            paths = ['content_id', 'content_type_provider']
+            for index, data_field in enumerate(data_fields):
+                names[f'#f{index}'] = data_field
+                paths.append(f'#data.#f{index}')
+            request['ProjectionExpression'] = ', '.join(paths)
+            request['ExpressionAttributeNames'] = names
+
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        requests = 0
+
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if attempt > 0:
+                time.sleep(_backoff_delay(attempt))
+
+            try:
+                requests += 1
+                response = client.batch_get_item(RequestItems={self.table_name: request})
+            except ClientError as e:
+                if not _is_retryable(e):
+                    logger.error(f"Batch get chunk failed: {str(e)}")
+                    break
+                logger.warning(f"Batch get chunk throttled or failed (attempt {attempt + 1}): {str(e)}")
+                continue
+
+            for raw_item in response.get('Responses', {}).get(self.table_name, []):
+                item = {key: deserializer.deserialize(value) for key, value in raw_item.items()}
+                ref = (item['content_id'], item['content_type_provider'])
+                data = item.get('data', {})
+                found[ref] = data
+
+            unprocessed = response.get('UnprocessedKeys', {}).get(self.table_name)
+            if not unprocessed:
+                request = dict(request, Keys=[])
+                break
+
+            request = dict(request, Keys=unprocessed['Keys'])
+            logger.warning(f"Batch get returned {len(request['Keys'])} unprocessed keys (attempt {attempt + 1})")
+
+        unprocessed_refs = [
+            (deserializer.deserialize(key['content_id']), deserializer.deserialize(key['content_type_provider']))
+            for key in request['Keys']
+        ]
+
+        return found, unprocessed_refs, requests
+
+    def _project_data(self, data: Dict[str, Any], data_fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Apply a data field projection to a locally cached item."""
+
+        if not data_fields:
+            return data
+        return {key: data[key] for key in data_fields if key in data}
 
     def delete_content(self, content_id: str, content_type_provider: str) -> bool:
         """
@@ -370,6 +1073,7 @@ class OptimizedContentCache:
                     'content_type_provider': content_type_provider
                 }
             )
+            self._invalidate_local(content_id, content_type_provider)
 
             logger.info(f"Deleted content {content_id}")
             return True
@@ -378,10 +1082,73 @@ class OptimizedContentCache:
             logger.error(f"Failed to delete content {content_id}: {str(e)}")
             return False
 
+    def get_local_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the in-process item and query caches."""
+
+        return {
+            'items': self._item_cache.stats(),
+            'queries': self._query_cache.stats()
+        }
+
+    def _invalidate_local(self, content_id: str, content_type_provider: str) -> None:
+        """Drop locally cached state made stale by a write from this container."""
+
+        self._item_cache.invalidate((content_id, content_type_provider))
+        # Any write can change any listing, so cached query pages are dropped
+        self._query_cache.clear()
+
+    def _sync_generation(self) -> None:
+        """
+        Drop local caches when another container has written content.
+
+        The stream processor bumps a generation counter after applying content
+        changes; it is read at most once per GENERATION_POLL_SECONDS, together
+        with the backfilled index key version.
+        """
+
+        if self.views is None:
+            return
+
+        now = time.monotonic()
+        if now - self._generation_checked_at < GENERATION_POLL_SECONDS:
+            return
+        self._generation_checked_at = now
+
+        try:
+            generation, self._index_keys_version = self.views.get_cache_state()
+        except Exception as e:
+            logger.warning(f"Failed to read cache generation: {str(e)}")
+            return
+
+        if self._generation is not None and generation != self._generation:
+            self._item_cache.clear()
+            self._query_cache.clear()
+        self._generation = generation
+
+    def _query_cache_key(self, query: ContentQuery) -> Tuple[Any, ...]:
+        """Normalize a query into a hashable cache key."""
+
+        return (
+            query.client_id,
+            query.content_type.value if query.content_type else None,
+            query.provider_name,
+            query.status,
+            query.limit,
+            query.last_updated_after.isoformat() if query.last_updated_after else None,
+            json.dumps(query.exclusive_start_key, sort_keys=True, default=str) if query.exclusive_start_key else None,
+            query.fill_page,
+            query.summary
+        )
+
     def get_cache_statistics(self, client_id: str) -> Dict[str, Any]:
         """
         Get cache statistics for monitoring and optimization.
 
+        Reads the aggregate counters maintained by the content stream
+        processor with a single GetItem. Until a client's counters have been
+        seeded, its content is counted with a paginated query and the count
+        seeds the counters; without a views table it is always counted.
+
         Args:
             client_id: Client identifier
 
@@ -390,36 +1157,70 @@ class OptimizedContentCache:
         """
 
         try:
-            # Query for basic statistics using GSI
-            response = self.table.query(
-                IndexName=self.CLIENT_CONTENT_TYPE_INDEX,
-                KeyConditionExpression=Key('client_id').eq(client_id),
-                Select='COUNT'
-            )
-
-            total_items = response['Count']
-
-            # Get content type breakdown
-            content_types = {}
-            for content_type in ['product', 'article', 'page', 'collection']:
-                response = self.table.query(
-                    IndexName=self.CLIENT_CONTENT_TYPE_INDEX,
-                    KeyConditionExpression=Key('client_id').eq(client_id) & Key('content_type').eq(content_type),
-                    Select='COUNT'
-                )
-                content_types[content_type] = response['Count']
+            if self.views is None:
+                return self._count_cache_statistics(client_id)
+
+            statistics = self.views.get_statistics(client_id)
+            if statistics is not None:
+                return {
+                    'client_id': client_id,
+                    **statistics,
+                    'source': 'counters',
+                    'timestamp': datetime.utcnow().isoformat()
+                }
 
-            return {
-                'client_id': client_id,
-                'total_items': total_items,
-                'content_types': content_types,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            # Read the counters before counting, so the seed is refused if
+            # the stream applies deltas while the count runs
+            previous = self.views.get_view(client_id, STATS_VIEW_ID)
+            counters = self._count_content_counters(client_id)
+            self.views.seed_statistics(client_id, counters, previous)
+            return self._counted_statistics(client_id, counters)
 
         except Exception as e:
             logger.error(f"Failed to get cache statistics: {str(e)}")
             return {'error': str(e)}
 
+    def _count_cache_statistics(self, client_id: str) -> Dict[str, Any]:
+        """Statistics from a full count of a client's content."""
+
+        return self._counted_statistics(client_id, self._count_content_counters(client_id))
+
+    def _counted_statistics(self, client_id: str, counters: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            'client_id': client_id,
+            **statistics_from_counters(counters),
+            'source': 'count_queries',
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+    def _count_content_counters(self, client_id: str) -> Dict[str, int]:
+        """
+        Count a client's items per type, provider and status.
+
+        Pages through the client's partition of the content type index,
+        reading only the counted attributes.
+        """
+
+        from boto3.dynamodb.conditions import Key
+
+        params = {
+            'IndexName': self.CLIENT_CONTENT_TYPE_INDEX,
+            'KeyConditionExpression': Key('client_id').eq(client_id),
+            'ProjectionExpression': 'content_type, provider_name, #status',
+            'ExpressionAttributeNames': {'#status': 'status'}
+        }
+
+        counters: Dict[str, int] = {}
+        while True:
+            response = self.table.query(**params)
+            for item in response.get('Items', []):
+                for name, delta in content_counter_deltas(None, item).items():
+                    counters[name] = counters.get(name, 0) + delta
+
+            if not response.get('LastEvaluatedKey'):
+                return counters
+            params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
 
 class EventFilteringSystem:
     """
@@ -427,8 +1228,16 @@ class EventFilteringSystem:
     and improve system efficiency.
     """
 
-    def __init__(self):
-        self.sns = boto3.client('sns')
+    def __init__(self, aws_clients: Optional[AWSClients] = None):
+        # SNS client comes from the shared registry on first use, so it is
+        # recreated with the registry after a SnapStart restore
+        self.aws_clients = aws_clients
+
+    @property
+    def sns(self):
+        """SNS client from the shared AWS client registry"""
+
+        return (self.aws_clients or get_aws_clients()).client('sns')
 
     def publish_filtered_event(
         self,
@@ -448,6 +1257,117 @@ class EventFilteringSystem:
             Message ID
         """
 
+        message_attributes = self._build_message_attributes(event, environment)
+
+        response = self.sns.publish(
+            TopicArn=topic_arn,
+            Message=self._serialize_event(event),
+            MessageAttributes=message_attributes
+        )
+
+        return response['MessageId']
+
+    def publish_filtered_events_batch(
+        self,
+        topic_arn: str,
+        events: List[ContentEvent],
+        environment: str = 'prod'
+    ) -> Dict[str, str]:
+        """
+        Publish many events with SNS PublishBatch (10 entries per call).
+
+        Events are grouped by message-attribute signature so entries that
+        share filter attributes travel together, and entries reported in
+        the Failed list are retried with backoff unless SNS flags them as
+        a sender fault.
+
+        Args:
+            topic_arn: SNS topic ARN
+            events: ContentEvents collected for one webhook
+            environment: Environment context
+
+        Returns:
+            Mapping of event_id to SNS message ID for published events
+        """
+
+        # Group entries by attribute signature, preserving first-seen order
+        groups: Dict[Tuple[Tuple[str, str], ...], List[Tuple[ContentEvent, Dict[str, Any]]]] = {}
+        for event in events:
+            message_attributes = self._build_message_attributes(event, environment)
+            signature = tuple(sorted(
+                (name, attribute['StringValue']) for name, attribute in message_attributes.items()
+            ))
+            groups.setdefault(signature, []).append((event, message_attributes))
+
+        ordered = [entry for group in groups.values() for entry in group]
+
+        message_ids: Dict[str, str] = {}
+        for i in range(0, len(ordered), PUBLISH_BATCH_SIZE):
+            chunk = ordered[i:i + PUBLISH_BATCH_SIZE]
+            entries = {
+                f"event-{i + offset}": {
+                    'Id': f"event-{i + offset}",
+                    'Message': self._serialize_event(event),
+                    'MessageAttributes': message_attributes
+                }
+                for offset, (event, message_attributes) in enumerate(chunk)
+            }
+            event_ids = {f"event-{i + offset}": event.event_id for offset, (event, _) in enumerate(chunk)}
+
+            for entry_id, message_id in self._publish_chunk_with_retry(topic_arn, entries).items():
+                message_ids[event_ids[entry_id]] = message_id
+
+        logger.info(f"Batch published {len(message_ids)}/{len(events)} events "
+                    f"in {len(groups)} attribute groups")
+        return message_ids
+
+    def _publish_chunk_with_retry(self, topic_arn: str, entries: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Publish one PublishBatch chunk, retrying throttling, server errors and retryable failed entries with backoff."""
+
+        from botocore.exceptions import ClientError
+
+        published: Dict[str, str] = {}
+        pending = dict(entries)
+
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if attempt > 0:
+                time.sleep(_backoff_delay(attempt))
+
+            try:
+                response = self.sns.publish_batch(
+                    TopicArn=topic_arn,
+                    PublishBatchRequestEntries=list(pending.values())
+                )
+            except ClientError as e:
+                if not _is_retryable(e):
+                    # Authorization, validation and missing-topic errors fail every retry too
+                    logger.error(f"PublishBatch call failed: {str(e)}")
+                    break
+                logger.warning(f"PublishBatch call throttled or failed (attempt {attempt + 1}): {str(e)}")
+                continue
+
+            for success in response.get('Successful', []):
+                published[success['Id']] = success['MessageId']
+                pending.pop(success['Id'], None)
+
+            for failure in response.get('Failed', []):
+                if failure.get('SenderFault'):
+                    # Malformed entry - retrying will not help
+                    logger.error(f"PublishBatch rejected entry {failure['Id']}: "
+                                 f"{failure.get('Code')} {failure.get('Message', '')}")
+                    pending.pop(failure['Id'], None)
+
+            if not pending:
+                break
+
+        if pending:
+            logger.error(f"PublishBatch gave up on {len(pending)} entries after {BATCH_MAX_RETRIES + 1} attempts")
+
+        return published
+
+    def _build_message_attributes(self, event: ContentEvent, environment: str) -> Dict[str, Dict[str, str]]:
+        """Build SNS message attributes used by subscription filter policies"""
+
         # Enhanced message attributes for filtering
         message_attributes = {
             'event_type': {'DataType': 'String', 'StringValue': event.event_type},
@@ -466,17 +1386,16 @@ class EventFilteringSystem:
         elif event.provider_name in ['snipcart', 'foxy']:
             message_attributes['ecommerce_platform'] = {'DataType': 'String', 'StringValue': 'third_party'}
 
+        return message_attributes
+
+    def _serialize_event(self, event: ContentEvent) -> str:
+        """Serialize event payload with schema versioning"""
+
         # Add schema versioning for future-proofing
-        event_data = event.model_dump()
+        event_data = event.model_dump(mode='json')
         event_data["schema_version"] = "1.0"
 
-        response = self.sns.publish(
-            TopicArn=topic_arn,
-            Message=json.dumps(event_data),
-            MessageAttributes=message_attributes
-        )
-
-        return response['MessageId']
+        return json.dumps(event_data)
 
     def _calculate_event_priority(self, event: ContentEvent) -> str:
         """Calculate event priority for filtering and processing order"""
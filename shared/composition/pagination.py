@@ -0,0 +1,149 @@
+"""
+Pagination Tokens
+
+This module turns DynamoDB LastEvaluatedKey values into opaque continuation
+tokens for the content API and back.
+
+Tokens are base64url encoded and HMAC-SHA256 signed, and each token is bound
+to the query it was issued for (client, content type, provider, status). A
+caller can therefore only resume the exact listing it started and cannot
+craft an ExclusiveStartKey that reaches into another client's partition.
+"""
+
+from typing import Dict, Any, Optional
+import base64
+import hashlib
+import hmac
+import json
+
+
+TOKEN_VERSION = 1
+# Field of the pagination secret holding the signing key
+TOKEN_KEY_FIELD = 'token_key'
+
+
+class InvalidPageTokenError(ValueError):
+    """Raised when a continuation token is malformed, tampered with or reused for another query"""
+
+
+class PaginationConfigurationError(RuntimeError):
+    """Raised when the continuation token signing key is not configured"""
+
+
+def signing_key_from_secret(secret: Optional[Dict[str, Any]], secret_id: str) -> str:
+    """
+    Signing key stored in the pagination secret.
+
+    Args:
+        secret: Parsed secret value, or None if the secret does not exist
+        secret_id: Secret name, for the error message
+
+    Raises:
+        PaginationConfigurationError: If the secret is missing or has no signing key
+    """
+
+    if secret is None:
+        raise PaginationConfigurationError(f"Pagination secret {secret_id} does not exist")
+
+    token_key = secret.get(TOKEN_KEY_FIELD)
+    if not token_key:
+        raise PaginationConfigurationError(
+            f"Pagination secret {secret_id} has no '{TOKEN_KEY_FIELD}' field; continuation tokens cannot be signed"
+        )
+    return token_key
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class PageTokenCodec:
+    """
+    Encode and decode signed continuation tokens.
+
+    Example:
+        codec = PageTokenCodec(secret)
+        token = codec.encode(result.last_evaluated_key, scope)
+        start_key = codec.decode(token, scope)
+    """
+
+    def __init__(self, secret: bytes):
+        if not secret:
+            raise ValueError("Pagination token secret must not be empty")
+        self._secret = secret
+
+    def encode(self, last_evaluated_key: Optional[Dict[str, Any]], scope: Dict[str, Any]) -> Optional[str]:
+        """
+        Encode a LastEvaluatedKey as a continuation token.
+
+        Args:
+            last_evaluated_key: Key returned by DynamoDB, or None at the end of the listing
+            scope: Query parameters the token is bound to
+
+        Returns:
+            Token string, or None when there are no more pages
+        """
+
+        if not last_evaluated_key:
+            return None
+
+        payload = json.dumps(
+            {'v': TOKEN_VERSION, 'k': last_evaluated_key, 's': self._scope_digest(scope)},
+            separators=(',', ':'),
+            sort_keys=True
+        ).encode('utf-8')
+
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, token: str, scope: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decode a continuation token into an ExclusiveStartKey.
+
+        Args:
+            token: Token from a previous response
+            scope: Query parameters of the current request
+
+        Returns:
+            ExclusiveStartKey for the next query
+
+        Raises:
+            InvalidPageTokenError: If the token is malformed, unsigned or for another query
+        """
+
+        try:
+            encoded_payload, encoded_signature = token.split('.', 1)
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except (ValueError, AttributeError) as e:
+            raise InvalidPageTokenError("Malformed continuation token") from e
+
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidPageTokenError("Continuation token signature mismatch")
+
+        try:
+            data = json.loads(payload)
+        except ValueError as e:
+            raise InvalidPageTokenError("Malformed continuation token") from e
+
+        if data.get('v') != TOKEN_VERSION:
+            raise InvalidPageTokenError("Unsupported continuation token version")
+
+        if not hmac.compare_digest(str(data.get('s', '')), self._scope_digest(scope)):
+            raise InvalidPageTokenError("Continuation token was issued for a different query")
+
+        key = data.get('k')
+        if not isinstance(key, dict) or not key:
+            raise InvalidPageTokenError("Continuation token has no start key")
+
+        return key
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def _scope_digest(self, scope: Dict[str, Any]) -> str:
+        canonical = json.dumps(scope, separators=(',', ':'), sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
@@ -222,6 +222,27 @@ class ProviderAdapterRegistry:
             logger.error(f"Failed to load handler for provider {provider_name}: {str(e)}")
             return None
 
+    def warm_up(self) -> Dict[str, bool]:
+        """
+        Import, instantiate and validate every registered adapter now.
+
+        Used at init when the process is snapshotted (Lambda SnapStart), so
+        the first webhook per provider after a deploy finds its adapter in
+        the handler cache instead of importing it inside the request.
+
+        Returns:
+            Whether each provider's adapter loaded and implements IProviderHandler
+        """
+
+        loaded = {provider_name: self.get_handler(provider_name) is not None for provider_name in sorted(self._adapters)}
+
+        failed = [provider_name for provider_name, ok in loaded.items() if not ok]
+        if failed:
+            logger.error(f"Adapters failed to load during warm-up: {', '.join(failed)}")
+        logger.info(f"Warmed up {len(loaded) - len(failed)}/{len(loaded)} provider adapters")
+
+        return loaded
+
     def normalize_content(
         self,
         provider_name: str,
@@ -0,0 +1,232 @@
+"""
+Shared Secrets Cache
+
+This module keeps the JSON secrets a Lambda container needs (provider webhook
+signing secrets, the continuation token key) in one process-wide cache, so no
+request waits on Secrets Manager:
+
+- prefetch() loads every registered secret with BatchGetSecretValue (20
+  secrets per call) instead of one GetSecretValue per provider on its first
+  webhook. It runs during warm-up, before a SnapStart snapshot; otherwise the
+  first get() loads every registered secret, so init never waits on boto3
+  or Secrets Manager.
+- get() always answers from memory. Once an entry is within
+  refresh_ahead_seconds of its TTL, a background thread refreshes all due
+  entries in one batch while the request carries on with the cached value.
+  If the refresh fails the previous value keeps being served.
+- Secrets that do not exist are cached as missing, so an unconfigured
+  provider does not cost a Secrets Manager call per request.
+
+Only the first secret used, a secret that was never registered, or one whose
+prefetch failed, is fetched in the request path.
+
+The integration handler and the provider adapters share the instance returned
+by get_secrets_cache().
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+import json
+import logging
+import os
+import threading
+import time
+
+from shared.composition.aws_clients import get_aws_clients
+
+
+logger = logging.getLogger(__name__)
+
+# BatchGetSecretValue accepts at most 20 secret IDs per call
+BATCH_GET_LIMIT = 20
+
+DEFAULT_TTL_SECONDS = 900
+DEFAULT_REFRESH_AHEAD_SECONDS = 120
+
+
+def webhook_secret_id(provider: str, client_id: Optional[str] = None) -> str:
+    """Secrets Manager name of a provider's webhook signing secret"""
+
+    return f"{client_id or os.environ.get('CLIENT_ID', '')}/webhooks/{provider}"
+
+
+class SecretsCache:
+    """
+    Prefetched, refresh-ahead cache of JSON secrets.
+
+    Example:
+        secrets = SecretsCache(boto3.client('secretsmanager'))
+        secrets.register('client-a/webhooks/sanity', 'client-a/pagination/token-key')
+        secrets.prefetch()
+        token_key = secrets.get('client-a/pagination/token-key')['token_key']
+
+    Without a client, the shared registry's Secrets Manager client is created
+    on the first fetch.
+    """
+
+    def __init__(
+        self,
+        secrets_client=None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        refresh_ahead_seconds: float = DEFAULT_REFRESH_AHEAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.client = secrets_client
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = min(refresh_ahead_seconds, ttl_seconds)
+        self.clock = clock
+
+        # secret_id -> (parsed value or None when missing, fetched_at)
+        self._entries: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+        self._registered: List[str] = []
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def register(self, *secret_ids: str) -> None:
+        """Declare secrets to prefetch and keep refreshed"""
+
+        with self._lock:
+            for secret_id in secret_ids:
+                if secret_id and secret_id not in self._registered:
+                    self._registered.append(secret_id)
+
+    def prefetch(self) -> None:
+        """Load every registered secret that is not cached yet"""
+
+        with self._lock:
+            pending = [secret_id for secret_id in self._registered if secret_id not in self._entries]
+        self._fetch(pending)
+
+    def get(self, secret_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached secret value, or None if the secret does not exist.
+
+        Never blocks on Secrets Manager for a registered, prefetched secret.
+        """
+
+        entry = self._entries.get(secret_id)
+        if entry is None:
+            # Not prefetched: load it together with every registered secret
+            # not cached yet, and register it so later refreshes include it
+            self.register(secret_id)
+            self.prefetch()
+            entry = self._entries.get(secret_id, (None, 0.0))
+
+        value, fetched_at = entry
+        if self.clock() - fetched_at >= self.ttl_seconds - self.refresh_ahead_seconds:
+            self._start_refresh()
+
+        return value
+
+    def refresh_due(self) -> None:
+        """Refetch entries that are within the refresh-ahead window of their TTL"""
+
+        now = self.clock()
+        with self._lock:
+            due = [
+                secret_id for secret_id, (_, fetched_at) in self._entries.items()
+                if now - fetched_at >= self.ttl_seconds - self.refresh_ahead_seconds
+            ]
+        self._fetch(due)
+
+    def refresh_all(self) -> None:
+        """Refetch every registered and cached secret, e.g. after a SnapStart restore"""
+
+        with self._lock:
+            secret_ids = list(dict.fromkeys([*self._registered, *self._entries]))
+        self._fetch(secret_ids)
+
+    def _start_refresh(self) -> None:
+        """Refresh due entries on a background thread unless one is running"""
+
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh_due, name='secrets-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _fetch(self, secret_ids: Iterable[str]) -> None:
+        """Batch-fetch secrets, keeping previous values of secrets that fail"""
+
+        secret_ids = list(secret_ids)
+        for start in range(0, len(secret_ids), BATCH_GET_LIMIT):
+            chunk = secret_ids[start:start + BATCH_GET_LIMIT]
+            try:
+                values, missing = self._batch_get(chunk)
+            except Exception as e:
+                logger.error(f"Failed to fetch {len(chunk)} secrets: {str(e)}")
+                continue
+
+            fetched_at = self.clock()
+            with self._lock:
+                for secret_id, value in values.items():
+                    self._entries[secret_id] = (value, fetched_at)
+                for secret_id in missing:
+                    self._entries[secret_id] = (None, fetched_at)
+
+            logger.info(f"Cached {len(values)} secrets ({len(missing)} not configured)")
+
+    def _batch_get(self, secret_ids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        One BatchGetSecretValue call.
+
+        Returns:
+            Parsed values by requested secret ID, and the IDs that do not exist
+        """
+
+        values: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        requested = set(secret_ids)
+        kwargs: Dict[str, Any] = {'SecretIdList': secret_ids}
+
+        if self.client is None:
+            self.client = get_aws_clients().client('secretsmanager')
+
+        while True:
+            response = self.client.batch_get_secret_value(**kwargs)
+
+            for secret in response.get('SecretValues', []):
+                # Secrets can be requested by name or ARN
+                secret_id = next(
+                    (candidate for candidate in (secret.get('Name'), secret.get('ARN')) if candidate in requested),
+                    None
+                )
+                if secret_id:
+                    values[secret_id] = json.loads(secret.get('SecretString') or '{}')
+
+            for error in response.get('Errors', []):
+                if error.get('ErrorCode') == 'ResourceNotFoundException':
+                    missing.append(error['SecretId'])
+                else:
+                    logger.error(f"Failed to fetch secret {error.get('SecretId')}: {error.get('Message')}")
+
+            if not response.get('NextToken'):
+                return values, missing
+            kwargs['NextToken'] = response['NextToken']
+
+
+_shared_cache: Optional[SecretsCache] = None
+
+
+def get_secrets_cache() -> SecretsCache:
+    """Process-wide secrets cache shared by the handler and provider adapters"""
+
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SecretsCache()
+    return _shared_cache
+
+
+def get_webhook_secret(provider: str, env_var: Optional[str] = None) -> Optional[str]:
+    """
+    Webhook signing secret of a provider.
+
+    Args:
+        provider: Provider name, as in {client_id}/webhooks/{provider}
+        env_var: Environment variable that overrides the secret, for local development
+    """
+
+    if env_var and os.environ.get(env_var):
+        return os.environ[env_var]
+
+    value = get_secrets_cache().get(webhook_secret_id(provider))
+    return (value or {}).get('webhook_secret') or None
@@ -0,0 +1,193 @@
+"""
+DynamoDB Table Index Specifications
+
+This module is the single source of truth for the global secondary indexes the
+integration layer tables must provide. The CDK construct provisions indexes from
+these specs, and the same specs are checked at synth time against the index
+names referenced by the runtime code, so a query can never target an index the
+deployed table does not have.
+
+The module is deliberately free of CDK imports so the runtime code and tests can
+use it without the CDK toolchain.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import re
+
+
+# Projection types (mirror dynamodb.ProjectionType names)
+PROJECTION_KEYS_ONLY = "KEYS_ONLY"
+PROJECTION_INCLUDE = "INCLUDE"
+PROJECTION_ALL = "ALL"
+
+# Key attribute types (mirror dynamodb.AttributeType names)
+ATTRIBUTE_STRING = "STRING"
+ATTRIBUTE_NUMBER = "NUMBER"
+
+# Logical table names used by the integration layer
+UNIFIED_CONTENT_CACHE_TABLE = "unified_content_cache"
+BUILD_BATCHING_TABLE = "build_batching"
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass(frozen=True)
+class GlobalIndexSpec:
+    """Key schema and projection for one global secondary index"""
+
+    name: str
+    partition_key: str
+    sort_key: Optional[str] = None
+    sort_key_type: str = ATTRIBUTE_STRING
+    projection: str = PROJECTION_KEYS_ONLY
+    non_key_attributes: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class TableIndexSpec:
+    """Indexes a table provides and the runtime sources that query it"""
+
+    table: str
+    indexes: Tuple[GlobalIndexSpec, ...]
+    source_paths: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def index_names(self) -> List[str]:
+        return [index.name for index in self.indexes]
+
+
+UNIFIED_CONTENT_CACHE_INDEXES = TableIndexSpec(
+    table=UNIFIED_CONTENT_CACHE_TABLE,
+    indexes=(
+        # Client content listings and per-type counts; queries return item['data']
+        # and filter on provider, status and update time
+        GlobalIndexSpec(
+            name="ClientContentTypeIndex",
+            partition_key="client_id",
+            sort_key="content_type",
+            projection=PROJECTION_INCLUDE,
+            non_key_attributes=("data", "provider_name", "status", "updated_at")
+        ),
+        # Provider sync queries with an updated_at range condition
+        GlobalIndexSpec(
+            name="ProviderUpdateIndex",
+            partition_key="provider_name",
+            sort_key="updated_at",
+            projection=PROJECTION_INCLUDE,
+            non_key_attributes=("data", "client_id", "status")
+        ),
+        # Client queries keyed on content_type#provider#status#updated_at so
+        # facet and time predicates are key conditions rather than filters
+        GlobalIndexSpec(
+            name="ClientFacetIndex",
+            partition_key="client_id",
+            sort_key="facet_key",
+            projection=PROJECTION_INCLUDE,
+            non_key_attributes=("data", "status", "updated_at")
+        ),
+        # Client queries by content type and status, without a provider;
+        # sort key content_type#status#updated_at
+        GlobalIndexSpec(
+            name="ClientTypeStatusIndex",
+            partition_key="client_id",
+            sort_key="type_status_key",
+            projection=PROJECTION_INCLUDE,
+            non_key_attributes=("data", "provider_name")
+        ),
+        # Status sweeps (drafts, archived content) ordered by update time
+        GlobalIndexSpec(
+            name="StatusUpdateIndex",
+            partition_key="status",
+            sort_key="updated_at",
+            projection=PROJECTION_INCLUDE,
+            non_key_attributes=("data", "client_id", "provider_name")
+        ),
+    ),
+    source_paths=(
+        "shared/composition/optimized_content_cache.py",
+        "shared/composition/materialized_views.py",
+    )
+)
+
+BUILD_BATCHING_INDEXES = TableIndexSpec(
+    table=BUILD_BATCHING_TABLE,
+    indexes=(
+        # Sparse scheduler index: only headers waiting for their build carry
+        # schedule_shard/due_at, and claiming a batch removes them
+        GlobalIndexSpec(
+            name="DueBatchIndex",
+            partition_key="schedule_shard",
+            sort_key="due_at",
+            sort_key_type=ATTRIBUTE_NUMBER
+        ),
+    ),
+    source_paths=(
+        "lambda/build_batching/build_batching.py",
+        "lambda/build_trigger/build_trigger.py",
+        "shared/composition/batch_scheduler.py",
+    )
+)
+
+TABLE_INDEX_SPECS: Dict[str, TableIndexSpec] = {
+    UNIFIED_CONTENT_CACHE_TABLE: UNIFIED_CONTENT_CACHE_INDEXES,
+    BUILD_BATCHING_TABLE: BUILD_BATCHING_INDEXES,
+}
+
+# IndexName='Foo' / IndexName="Foo" arguments and FOO_INDEX = "Foo" constants
+_INDEX_REFERENCE_PATTERNS = (
+    re.compile(r"""IndexName\s*=\s*['"]([A-Za-z0-9_.-]+)['"]"""),
+    re.compile(r"""['"]IndexName['"]\s*:\s*['"]([A-Za-z0-9_.-]+)['"]"""),
+    re.compile(r"""\b[A-Z_]*_INDEX\s*=\s*['"]([A-Za-z0-9_.-]+)['"]"""),
+)
+
+
+def find_index_references(source: str) -> List[str]:
+    """
+    Find the DynamoDB index names referenced by a Python source file.
+
+    Args:
+        source: Python source text
+
+    Returns:
+        Index names in order of first reference
+    """
+
+    names: List[str] = []
+    for pattern in _INDEX_REFERENCE_PATTERNS:
+        for match in pattern.finditer(source):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+    return names
+
+
+def find_missing_indexes(spec: TableIndexSpec, root: Path = REPO_ROOT) -> List[str]:
+    """
+    Check the runtime sources of a table for references to undeclared indexes.
+
+    Args:
+        spec: Table index specification
+        root: Repository root the source paths are relative to
+
+    Returns:
+        Error messages, empty when every referenced index is declared
+    """
+
+    errors = []
+    declared = set(spec.index_names)
+
+    for relative_path in spec.source_paths:
+        path = root / relative_path
+        if not path.exists():
+            errors.append(f"{spec.table}: runtime source {relative_path} not found")
+            continue
+
+        for name in find_index_references(path.read_text()):
+            if name not in declared:
+                errors.append(
+                    f"{relative_path} queries index '{name}' which table "
+                    f"'{spec.table}' does not define (declared: {', '.join(sorted(declared))})"
+                )
+
+    return errors
@@ -0,0 +1,150 @@
+"""
+Asynchronous Webhook Ingestion
+
+This module carries accepted webhooks from the integration handler to the
+ingestion worker. The integration handler only verifies a webhook (signature,
+timestamp, idempotency), enqueues its raw body and returns 202, so providers
+get an answer in milliseconds whatever the size of the payload or the state
+of the content table. The worker normalizes, stores and publishes the
+content from the queue in batches.
+
+Message format (version 1):
+    {
+        "version": 1,
+        "provider": "shopify_basic", "request_id": "...",
+        "received_at": "2025-01-01T12:00:00",
+        "headers": {...},
+        "body": "<raw webhook body>"              # messages up to inline_max_bytes
+        "body_s3": {"bucket": "...", "key": "..."} # larger bodies
+    }
+
+SQS messages are limited to 256 KB, so large bodies (bulk catalogue exports)
+are written to the payload bucket and the message carries only their location.
+The limit applies to the serialized message: JSON escaping can make a body
+several times larger than its raw size (quotes, newlines, non-ASCII text).
+"""
+
+from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import logging
+import uuid
+
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_VERSION = 1
+
+# Serialized message size, leaving room for message attributes within the 256 KB SQS limit
+INLINE_MESSAGE_MAX_BYTES = 240 * 1024
+
+
+@dataclass
+class WebhookEnvelope:
+    """A verified webhook waiting to be processed"""
+
+    provider: str
+    raw_body: str
+    headers: Dict[str, str]
+    request_id: str
+    received_at: datetime
+
+
+class WebhookIngestionQueue:
+    """
+    Enqueue verified webhooks and load them back in the worker.
+
+    Example:
+        queue = WebhookIngestionQueue(sqs_client, queue_url, s3_client, bucket)
+        message_id = queue.enqueue('shopify_basic', raw_body, headers, request_id)
+        envelope = queue.load(record['body'])
+    """
+
+    def __init__(
+        self,
+        sqs_client,
+        queue_url: str,
+        s3_client=None,
+        bucket: Optional[str] = None,
+        prefix: str = 'webhooks',
+        inline_max_bytes: int = INLINE_MESSAGE_MAX_BYTES
+    ):
+        self.sqs = sqs_client
+        self.queue_url = queue_url
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.inline_max_bytes = inline_max_bytes
+
+    def enqueue(
+        self,
+        provider: str,
+        raw_body: str,
+        headers: Dict[str, str],
+        request_id: str,
+        received_at: Optional[datetime] = None
+    ) -> str:
+        """
+        Queue a verified webhook for the ingestion worker.
+
+        Returns:
+            SQS message ID
+        """
+
+        received_at = received_at or datetime.utcnow()
+        message: Dict[str, Any] = {
+            'version': MESSAGE_VERSION,
+            'provider': provider,
+            'request_id': request_id,
+            'received_at': received_at.isoformat(),
+            'headers': dict(headers or {}),
+        }
+
+        message_body = json.dumps({**message, 'body': raw_body})
+        if len(message_body.encode('utf-8')) > self.inline_max_bytes:
+            message['body_s3'] = self._store_body(provider, request_id, received_at, raw_body.encode('utf-8'))
+            message_body = json.dumps(message)
+
+        response = self.sqs.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=message_body,
+            MessageAttributes={
+                'provider': {'DataType': 'String', 'StringValue': provider}
+            }
+        )
+        return response['MessageId']
+
+    def load(self, message_body: str) -> WebhookEnvelope:
+        """Rebuild a webhook from a queue message body, fetching spilled bodies from S3"""
+
+        message = json.loads(message_body)
+
+        if 'body' in message:
+            raw_body = message['body']
+        else:
+            location = message['body_s3']
+            response = self.s3.get_object(Bucket=location['bucket'], Key=location['key'])
+            raw_body = response['Body'].read().decode('utf-8')
+
+        return WebhookEnvelope(
+            provider=message['provider'],
+            raw_body=raw_body,
+            headers=message.get('headers', {}),
+            request_id=message.get('request_id', ''),
+            received_at=datetime.fromisoformat(message['received_at'])
+        )
+
+    def _store_body(self, provider: str, request_id: str, received_at: datetime, body: bytes) -> Dict[str, str]:
+        """Write an oversized body to the payload bucket"""
+
+        if not self.s3 or not self.bucket:
+            raise ValueError(
+                f"Webhook message for a {len(body)} byte body exceeds the inline limit and no payload bucket is configured"
+            )
+
+        key = f"{self.prefix}/{provider}/{received_at:%Y/%m/%d}/{request_id or uuid.uuid4()}.json"
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=body, ContentType='application/json')
+
+        logger.info(f"Spilled {len(body)} byte {provider} webhook to s3://{self.bucket}/{key}")
+        return {'bucket': self.bucket, 'key': key}
@@ -0,0 +1,313 @@
+"""
+Compiled Webhook Pipelines
+
+This module bundles everything the integration handler does per provider -
+signature verification, replay timestamp extraction, idempotency event ID
+extraction and content normalization - into one WebhookPipeline object per
+provider, compiled once at cold start. The handler looks the pipeline up once
+per request instead of routing on provider strings at every step, and each
+step runs exactly once: the adapter's own (development-only) signature check
+is not repeated after the handler has verified the raw body.
+
+Headers are normalized once per request into CaseInsensitiveHeaders, so the
+pipeline steps and the adapters can look headers up in any case. API Gateway
+HTTP APIs lowercase header names, which mixed-case lookups such as
+headers.get('X-GitHub-Event') would otherwise miss.
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Iterator, Mapping, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import base64
+import hashlib
+import hmac
+import json
+import logging
+
+from models.composition import UnifiedContent
+
+
+logger = logging.getLogger(__name__)
+
+
+class CaseInsensitiveHeaders(Mapping):
+    """
+    Read-only view of HTTP headers with case-insensitive lookup.
+
+    Names are lowercased once when the view is built; iteration yields the
+    lowercased names.
+    """
+
+    __slots__ = ('_headers',)
+
+    def __init__(self, headers: Optional[Mapping[str, str]] = None):
+        self._headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+
+    @classmethod
+    def of(cls, headers: Optional[Mapping[str, str]]) -> 'CaseInsensitiveHeaders':
+        """Wrap headers unless they are already normalized"""
+
+        return headers if isinstance(headers, cls) else cls(headers)
+
+    def __getitem__(self, name: str) -> str:
+        return self._headers[name.lower()]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._headers.get(name.lower(), default)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._headers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._headers)
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def __repr__(self) -> str:
+        return f"CaseInsensitiveHeaders({self._headers!r})"
+
+
+SignatureVerifier = Callable[[CaseInsensitiveHeaders, str, str], bool]
+TimestampExtractor = Callable[[CaseInsensitiveHeaders], Optional[datetime]]
+EventIdExtractor = Callable[[CaseInsensitiveHeaders, Dict[str, Any]], str]
+
+
+def hmac_sha256_verifier(header: str, label: str, encoding: str = 'hex', prefix: str = '') -> SignatureVerifier:
+    """
+    Verifier for HMAC-SHA256 signatures of the raw body.
+
+    Args:
+        header: Header carrying the signature
+        label: Provider label for log messages
+        encoding: 'hex' or 'base64' digest encoding
+        prefix: Scheme prefix of the header value, e.g. 'sha256='
+    """
+
+    def verify(headers: CaseInsensitiveHeaders, body: str, secret: str) -> bool:
+        signature = headers.get(header, '')
+        if not signature:
+            logger.warning(f"Missing {label} signature header")
+            return False
+
+        if prefix and not signature.startswith(prefix):
+            logger.warning(f"Invalid {label} signature format")
+            return False
+
+        digest = hmac.new(secret.encode(), body.encode(), hashlib.sha256)
+        encoded = base64.b64encode(digest.digest()).decode() if encoding == 'base64' else digest.hexdigest()
+
+        # Use timing-safe comparison
+        is_valid = hmac.compare_digest(signature, prefix + encoded)
+        if not is_valid:
+            logger.warning(f"{label} signature verification failed")
+
+        return is_valid
+
+    return verify
+
+
+def unix_timestamp(header: str) -> TimestampExtractor:
+    """Timestamp sent as Unix seconds"""
+
+    def extract(headers: CaseInsensitiveHeaders) -> Optional[datetime]:
+        value = headers.get(header, '')
+        return datetime.fromtimestamp(int(value)) if value else None
+
+    return extract
+
+
+def iso_timestamp(header: str) -> TimestampExtractor:
+    """Timestamp sent as ISO 8601, e.g. 2023-01-01T12:00:00Z"""
+
+    def extract(headers: CaseInsensitiveHeaders) -> Optional[datetime]:
+        value = headers.get(header, '')
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None) if value else None
+
+    return extract
+
+
+def header_event_id(header: str) -> EventIdExtractor:
+    """Event ID sent as a delivery header"""
+
+    return lambda headers, body: headers.get(header, '')
+
+
+def sanity_event_id(headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> str:
+    return body.get('_id') or headers.get('sanity-webhook-id', '')
+
+
+def snipcart_event_id(headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> str:
+    return body.get('eventName', '') + '_' + str(body.get('createdOn', ''))
+
+
+def foxy_event_id(headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> str:
+    return body.get('id', '') or body.get('transaction_id', '')
+
+
+def fallback_event_id(headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> str:
+    """Request ID header, or a hash of the body as a last resort"""
+
+    return headers.get('x-request-id', '') or hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class WebhookPipeline:
+    """
+    Per-provider webhook processing steps.
+
+    A pipeline without a signature verifier belongs to a provider that does
+    not sign its webhooks; one without a timestamp extractor skips replay
+    protection; one without an adapter cannot normalize content.
+
+    The adapter is loaded from the registry on the provider's first webhook,
+    so a container only imports the adapters it actually uses.
+    """
+
+    provider_name: str
+    verify_signature: Optional[SignatureVerifier] = None
+    extract_timestamp: Optional[TimestampExtractor] = None
+    extract_event_id: EventIdExtractor = fallback_event_id
+    expected_headers: Tuple[str, ...] = ()
+    registry: Optional[Any] = None
+    known: bool = True
+
+    @property
+    def adapter(self) -> Optional[Any]:
+        """Provider adapter; the registry imports and caches it on first use"""
+
+        return self.registry.get_handler(self.provider_name) if self.registry is not None else None
+
+    def verify(self, headers: CaseInsensitiveHeaders, raw_body: str, secret: str) -> bool:
+        """Verify the raw body's signature"""
+
+        return self.verify_signature(headers, raw_body, secret)
+
+    def timestamp(self, headers: CaseInsensitiveHeaders) -> Optional[datetime]:
+        """When the provider sent the webhook, or None if unknown or unparseable"""
+
+        if not self.extract_timestamp:
+            return None
+
+        try:
+            return self.extract_timestamp(headers)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Failed to parse timestamp for {self.provider_name}: {str(e)}")
+            return None
+
+    def event_id(self, headers: CaseInsensitiveHeaders, body: Dict[str, Any]) -> str:
+        """Provider event ID used for idempotency"""
+
+        return self.extract_event_id(headers, body)
+
+    def normalize(self, body: Dict[str, Any], headers: CaseInsensitiveHeaders) -> List[UnifiedContent]:
+        """
+        Normalize a verified webhook into unified content.
+
+        Raises:
+            ValueError: If no adapter is available or the payload does not match its format
+        """
+
+        adapter = self.adapter
+        if adapter is None:
+            raise ValueError(f"No handler available for provider: {self.provider_name}")
+
+        try:
+            event_type = adapter.extract_event_type(headers, body)
+            unified_content = adapter.normalize_webhook_data_to_unified(body, event_type)
+        except Exception as e:
+            logger.error(f"Content normalization failed for {self.provider_name}: {str(e)}")
+            raise
+
+        logger.info(f"Normalized {len(unified_content)} items from {self.provider_name} webhook")
+        return unified_content
+
+
+GITHUB_PROFILE: Dict[str, Any] = {
+    'verify_signature': hmac_sha256_verifier('x-hub-signature-256', 'GitHub', prefix='sha256='),
+    # GitHub webhooks are delivered immediately; the header is rarely present
+    'extract_timestamp': iso_timestamp('x-github-delivery-timestamp'),
+    'extract_event_id': header_event_id('x-github-delivery'),
+    'expected_headers': ('x-hub-signature-256', 'x-github-delivery', 'x-github-event'),
+}
+
+# Pipeline steps per provider; providers without a verifier do not sign webhooks
+WEBHOOK_PROFILES: Dict[str, Dict[str, Any]] = {
+    'shopify_basic': {
+        'verify_signature': hmac_sha256_verifier('x-shopify-hmac-sha256', 'Shopify', encoding='base64'),
+        'extract_timestamp': unix_timestamp('x-shopify-webhook-timestamp'),
+        'extract_event_id': header_event_id('x-shopify-webhook-id'),
+        'expected_headers': ('x-shopify-hmac-sha256', 'x-shopify-webhook-id', 'x-shopify-topic'),
+    },
+    'decap': GITHUB_PROFILE,
+    'tina': GITHUB_PROFILE,
+    'sanity': {
+        'verify_signature': hmac_sha256_verifier('sanity-webhook-signature', 'Sanity'),
+        'extract_timestamp': iso_timestamp('sanity-webhook-timestamp'),
+        'extract_event_id': sanity_event_id,
+        'expected_headers': ('sanity-webhook-signature', 'sanity-webhook-id'),
+    },
+    'contentful': {
+        'verify_signature': hmac_sha256_verifier('x-contentful-signature', 'Contentful'),
+        'extract_timestamp': iso_timestamp('x-contentful-timestamp'),
+        'extract_event_id': header_event_id('x-contentful-webhook-name'),
+        'expected_headers': ('x-contentful-signature', 'x-contentful-webhook-name'),
+    },
+    'snipcart': {'extract_event_id': snipcart_event_id},
+    'foxy': {'extract_event_id': foxy_event_id},
+}
+
+
+class WebhookPipelines:
+    """
+    Compiled pipelines by provider name.
+
+    Example:
+        pipelines = compile_webhook_pipelines(registry)
+        pipeline = pipelines.get('shopify_basic')
+        if pipeline.verify(headers, raw_body, secret): ...
+    """
+
+    def __init__(self, pipelines: Dict[str, WebhookPipeline]):
+        self._pipelines = pipelines
+
+    def get(self, provider_name: str) -> WebhookPipeline:
+        """Pipeline for a provider; unknown providers get an uncached stand-in"""
+
+        pipeline = self._pipelines.get(provider_name)
+        if pipeline is None:
+            return WebhookPipeline(provider_name, known=False)
+        return pipeline
+
+    def __contains__(self, provider_name: str) -> bool:
+        return provider_name in self._pipelines
+
+    @property
+    def providers(self) -> List[str]:
+        return sorted(self._pipelines)
+
+
+def compile_webhook_pipelines(
+    registry=None,
+    profiles: Optional[Dict[str, Dict[str, Any]]] = None
+) -> WebhookPipelines:
+    """
+    Build the pipeline of every provider with a profile or registered adapter.
+
+    Args:
+        registry: ProviderAdapterRegistry supplying adapters, or None to compile without normalization
+        profiles: Per-provider steps, WEBHOOK_PROFILES by default
+    """
+
+    profiles = WEBHOOK_PROFILES if profiles is None else profiles
+    provider_names = set(profiles)
+    if registry is not None:
+        provider_names.update(registry.get_supported_providers())
+
+    pipelines = {
+        provider_name: WebhookPipeline(provider_name, registry=registry, **profiles.get(provider_name, {}))
+        for provider_name in sorted(provider_names)
+    }
+
+    logger.info(f"Compiled webhook pipelines for {len(pipelines)} providers")
+    return WebhookPipelines(pipelines)
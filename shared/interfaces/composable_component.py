@@ -10,12 +10,16 @@ docs/architecture/event-driven-composition-architecture.md
 """
 
 from abc import ABC, abstractmethod
-from typing import Protocol, runtime_checkable, Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Protocol, runtime_checkable, Dict, Any, List, Optional
 from models.composition import (
     UnifiedContent, ComponentRegistration, CostBreakdown,
     ContentEvent, CompositionConfiguration
 )
-from shared.ssg.core_models import SSGEngineType
+
+# Annotation only: importing shared.ssg loads the CDK engine modules, which
+# the webhook Lambdas that implement this protocol never use
+if TYPE_CHECKING:
+    from shared.ssg.core_models import SSGEngineType
 
 
 @runtime_checkable
@@ -92,7 +96,7 @@ class ComposableComponent(Protocol):
         """
         ...
 
-    def get_build_dependencies(self, ssg_engine: SSGEngineType) -> Dict[str, List[str]]:
+    def get_build_dependencies(self, ssg_engine: 'SSGEngineType') -> Dict[str, List[str]]:
         """
         Return build dependencies needed for SSG integration.
 
@@ -116,7 +120,7 @@ class ComposableComponent(Protocol):
         """
         ...
 
-    def generate_environment_variables(self, ssg_engine: SSGEngineType) -> Dict[str, str]:
+    def generate_environment_variables(self, ssg_engine: 'SSGEngineType') -> Dict[str, str]:
         """
         Generate environment variables needed for SSG build process.
 
@@ -11,6 +11,7 @@ from .static_site_config import StaticSiteConfig
 from .factory import SSGEngineFactory
 from .core_models import (
     BuildCommand, 
+    BuildCache,
     ECommerceIntegration, 
     SSGTemplate,
     SSGEngineType,
@@ -29,6 +30,7 @@ __all__ = [
     
     # Core models
     "BuildCommand",
+    "BuildCache",
     "ECommerceIntegration", 
     "SSGTemplate",
     "SSGEngineConfig",
@@ -6,11 +6,42 @@ Provides common functionality for CodeBuild integration and buildspec generation
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from aws_cdk import aws_codebuild as codebuild
 
-from .core_models import BuildCommand, SSGTemplate
+from shared.composition.build_manifest import DEFAULT_CONTENT_ROUTES
+from .core_models import BuildCache, BuildCommand, SSGTemplate
+
+
+# npm's download cache. `npm ci` always recreates node_modules, so Node
+# engines cache this store and install with --prefer-offline instead.
+NPM_CACHE_DIR = "/root/.npm"
+NPM_INSTALL_COMMAND = "npm ci --prefer-offline --no-audit"
+
+# Partial renders (see shared/composition/build_manifest). The build handlers
+# pass BUILD_MANIFEST_URI and BUILD_OUTPUT_SNAPSHOT_URI; a build renders
+# incrementally only when the manifest allows it and the output snapshot of
+# the previous successful build is complete, which it restores first.
+MANIFEST_SELECT_COMMAND = (
+    'export BUILD_MODE=full; '
+    'if [ -n "${{BUILD_MANIFEST_URI:-}}" ] && [ -n "${{BUILD_OUTPUT_SNAPSHOT_URI:-}}" ] '
+    '&& aws s3 cp --only-show-errors "$BUILD_MANIFEST_URI" "$BUILD_MANIFEST_FILE" '
+    '&& [ "$(jq -r .requires_full_rebuild "$BUILD_MANIFEST_FILE")" = "false" ] '
+    '&& aws s3 ls "${{BUILD_OUTPUT_SNAPSHOT_URI}}complete" > /dev/null '
+    '&& aws s3 sync --only-show-errors "${{BUILD_OUTPUT_SNAPSHOT_URI}}site/" "{output}/"; '
+    'then jq -r ".sources[]" "$BUILD_MANIFEST_FILE" > "$BUILD_CHANGED_SOURCES_FILE"; export BUILD_MODE=incremental; fi'
+)
+
+# Replaces the snapshot with this build's output. The completion marker is
+# removed first, so a snapshot that failed half way is never restored.
+OUTPUT_SNAPSHOT_COMMAND = (
+    'if [ -n "${{BUILD_OUTPUT_SNAPSHOT_URI:-}}" ]; then '
+    '(aws s3 rm --only-show-errors "${{BUILD_OUTPUT_SNAPSHOT_URI}}complete" '
+    '&& aws s3 sync --only-show-errors --delete "{output}/" "${{BUILD_OUTPUT_SNAPSHOT_URI}}site/" '
+    '&& echo "$CODEBUILD_BUILD_ID" | aws s3 cp - "${{BUILD_OUTPUT_SNAPSHOT_URI}}complete") '
+    '|| echo "Output snapshot not saved, the next build renders the full site"; fi'
+)
 
 
 class SSGEngineConfig(ABC):
@@ -66,6 +97,25 @@ class SSGEngineConfig(ABC):
         """Templates available for this engine"""
         pass
 
+    @property
+    def content_routes(self) -> Dict[str, Dict[str, Any]]:
+        """Output paths per content type, used to build change manifests"""
+        return DEFAULT_CONTENT_ROUTES
+
+    @property
+    def incremental_build_commands(self) -> Optional[List[BuildCommand]]:
+        """
+        Commands that render only the source files listed in
+        $BUILD_CHANGED_SOURCES_FILE into the restored output directory, or
+        None for engines without a partial render mode.
+        """
+        return None
+
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        """Dependency and SSG caches kept between builds, if any"""
+        return None
+
     def get_codebuild_environment(self) -> codebuild.BuildEnvironment:
         """Generate CodeBuild environment for this engine"""
         return codebuild.BuildEnvironment(
@@ -99,10 +149,38 @@ class SSGEngineConfig(ABC):
             "commands": self.install_commands,
         }
 
-        build_phase = {"commands": [cmd.command for cmd in self.build_commands]}
-
-        return {
-            "version": "0.2",
+        full_commands = [cmd.command for cmd in self.build_commands]
+        incremental_commands = self.incremental_build_commands
+
+        buildspec: Dict[str, Any] = {"version": "0.2"}
+
+        if incremental_commands is None:
+            build_phase = {"commands": full_commands}
+        else:
+            output = self.output_directory
+            build_phase = {
+                "commands": [
+                    MANIFEST_SELECT_COMMAND.format(output=output),
+                    f'if [ "$BUILD_MODE" = "incremental" ]; then '
+                    f'{" && ".join(cmd.command for cmd in incremental_commands)}; '
+                    f'else rm -rf "{output}" && {" && ".join(full_commands)}; fi',
+                    OUTPUT_SNAPSHOT_COMMAND.format(output=output),
+                ]
+            }
+            buildspec["env"] = {
+                "variables": {
+                    "BUILD_MANIFEST_FILE": "build-manifest.json",
+                    "BUILD_CHANGED_SOURCES_FILE": "build-changed-sources.txt",
+                }
+            }
+
+        buildspec.update({
             "phases": {"install": install_phase, "build": build_phase},
             "artifacts": {"files": ["**/*"], "base-directory": self.output_directory},
-        }
\ No newline at end of file
+        })
+
+        # Only used when the project is given an S3 cache (BaseSSGStack.create_build_cache)
+        if self.build_cache:
+            buildspec["cache"] = self.build_cache.to_buildspec()
+
+        return buildspec
\ No newline at end of file
@@ -67,6 +67,49 @@ class BuildCommand(BaseModel):
         return v.strip()
 
 
+class BuildCache(BaseModel):
+    """Directories an SSG engine keeps between builds in the CodeBuild S3 cache"""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_assignment=True,
+        json_schema_extra={
+            "examples": [
+                {
+                    "key_prefix": "nextjs-node20",
+                    "paths": ["/root/.npm", ".next/cache"],
+                    "lockfiles": ["package-lock.json"],
+                }
+            ]
+        },
+    )
+
+    key_prefix: str = Field(..., description="Cache key prefix, naming the engine and toolchain")
+    paths: List[str] = Field(..., min_length=1, description="Directories to restore and save")
+    lockfiles: List[str] = Field(
+        default_factory=list, description="Files whose contents key the cache"
+    )
+
+    @property
+    def key(self) -> str:
+        """Cache key; changes whenever a lockfile does"""
+        if not self.lockfiles:
+            return self.key_prefix
+        return f"{self.key_prefix}-$(codebuild-hash-files {' '.join(self.lockfiles)})"
+
+    def to_buildspec(self) -> Dict[str, Any]:
+        """Buildspec cache section"""
+        section: Dict[str, Any] = {
+            "key": self.key,
+            "paths": [f"{path.rstrip('/')}/**/*" for path in self.paths],
+        }
+        if self.lockfiles:
+            # After a lockfile change, start from the newest cache of this
+            # toolchain rather than from nothing
+            section["fallback-keys"] = [f"{self.key_prefix}-"]
+        return section
+
+
 class ECommerceIntegration(BaseModel):
     """E-commerce platform integration configuration"""
 
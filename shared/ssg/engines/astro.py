@@ -5,10 +5,10 @@ Defines the Astro static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate, ECommerceIntegration
+from ..base_engine import NPM_CACHE_DIR, NPM_INSTALL_COMMAND, SSGEngineConfig
+from ..core_models import BuildCache, BuildCommand, SSGTemplate, ECommerceIntegration
 
 
 class AstroConfig(SSGEngineConfig):
@@ -24,7 +24,7 @@ class AstroConfig(SSGEngineConfig):
 
     @property
     def install_commands(self) -> List[str]:
-        return ["npm ci", "npm install -g astro"]
+        return [NPM_INSTALL_COMMAND, "npm install -g astro"]
 
     @property
     def build_commands(self) -> List[BuildCommand]:
@@ -41,6 +41,14 @@ class AstroConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        return BuildCache(
+            key_prefix="astro-node20",
+            paths=[NPM_CACHE_DIR],
+            lockfiles=["package-lock.json"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "dist"
@@ -5,10 +5,10 @@ Defines the Eleventy (11ty) static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate, ECommerceIntegration
+from ..base_engine import NPM_CACHE_DIR, NPM_INSTALL_COMMAND, SSGEngineConfig
+from ..core_models import BuildCache, BuildCommand, SSGTemplate, ECommerceIntegration
 
 
 class EleventyConfig(SSGEngineConfig):
@@ -25,7 +25,7 @@ class EleventyConfig(SSGEngineConfig):
     @property
     def install_commands(self) -> List[str]:
         return [
-            "npm ci",  # Clean install from package-lock.json
+            NPM_INSTALL_COMMAND,  # Clean install from package-lock.json, offline from the cache
             "npm install -g @11ty/eleventy",  # Global install for CLI
         ]
 
@@ -44,6 +44,33 @@ class EleventyConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def incremental_build_commands(self) -> Optional[List[BuildCommand]]:
+        # Eleventy 3 renders a single input file with --incremental=<file>;
+        # listing templates are re-rendered when they declare the collections
+        # they use (eleventyImport.collections)
+        return [
+            BuildCommand(
+                name="render_changed",
+                command='xargs -a "$BUILD_CHANGED_SOURCES_FILE" -I {} npx @11ty/eleventy --incremental={}',
+                environment_vars={"ELEVENTY_PRODUCTION": "true"},
+            ),
+            BuildCommand(
+                name="optimize_assets",
+                command="npm run optimize",
+                environment_vars={"NODE_ENV": "production"},
+            ),
+        ]
+
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        # .cache holds eleventy-fetch responses
+        return BuildCache(
+            key_prefix="eleventy-node20",
+            paths=[NPM_CACHE_DIR, ".cache"],
+            lockfiles=["package-lock.json"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "_site"
@@ -5,10 +5,10 @@ Defines the Gatsby static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate
+from ..base_engine import NPM_CACHE_DIR, NPM_INSTALL_COMMAND, SSGEngineConfig
+from ..core_models import BuildCache, BuildCommand, SSGTemplate
 
 
 class GatsbyConfig(SSGEngineConfig):
@@ -24,7 +24,7 @@ class GatsbyConfig(SSGEngineConfig):
 
     @property
     def install_commands(self) -> List[str]:
-        return ["npm ci", "npm install -g gatsby-cli"]
+        return [NPM_INSTALL_COMMAND, "npm install -g gatsby-cli"]
 
     @property
     def build_commands(self) -> List[BuildCommand]:
@@ -45,6 +45,15 @@ class GatsbyConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        # Gatsby reuses .cache and public to rebuild only changed pages
+        return BuildCache(
+            key_prefix="gatsby-node20",
+            paths=[NPM_CACHE_DIR, ".cache", "public"],
+            lockfiles=["package-lock.json"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "public"
@@ -5,10 +5,19 @@ Defines the Hugo static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate
+from ..core_models import BuildCache, BuildCommand, SSGTemplate
+
+
+HUGO_VERSION = "0.121.0"
+HUGO_RELEASE_URL = (
+    f"https://github.com/gohugoio/hugo/releases/download/v{HUGO_VERSION}/"
+    f"hugo_extended_{HUGO_VERSION}_Linux-64bit.tar.gz"
+)
+# The Hugo binary is kept in the build cache instead of downloaded per build
+HUGO_BIN_DIR = "/root/.cache/hugo-bin"
 
 
 class HugoConfig(SSGEngineConfig):
@@ -25,10 +34,8 @@ class HugoConfig(SSGEngineConfig):
     @property
     def install_commands(self) -> List[str]:
         return [
-            "wget https://github.com/gohugoio/hugo/releases/download/v0.121.0/hugo_extended_0.121.0_Linux-64bit.tar.gz",
-            "tar -xzf hugo_extended_0.121.0_Linux-64bit.tar.gz",
-            "chmod +x hugo",
-            "sudo mv hugo /usr/local/bin/",
+            f"[ -x {HUGO_BIN_DIR}/hugo ] || (mkdir -p {HUGO_BIN_DIR} && wget -qO- {HUGO_RELEASE_URL} | tar -xz -C {HUGO_BIN_DIR} hugo)",
+            f"sudo cp {HUGO_BIN_DIR}/hugo /usr/local/bin/",
         ]
 
     @property
@@ -46,6 +53,14 @@ class HugoConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        # resources/_gen holds processed images and compiled SCSS
+        return BuildCache(
+            key_prefix=f"hugo-{HUGO_VERSION}",
+            paths=[HUGO_BIN_DIR, "resources/_gen"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "public"
@@ -5,10 +5,10 @@ Defines the Jekyll static site generator engine with its specific
 build commands, templates, and optimization features. Optimized for GitHub Pages.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate
+from ..core_models import BuildCache, BuildCommand, SSGTemplate
 
 
 class JekyllConfig(SSGEngineConfig):
@@ -24,7 +24,11 @@ class JekyllConfig(SSGEngineConfig):
 
     @property
     def install_commands(self) -> List[str]:
-        return ["gem install bundler", "bundle install"]
+        return [
+            "gem install bundler",
+            "bundle config set --local path vendor/bundle",  # Gems restored from the build cache
+            "bundle install",
+        ]
 
     @property
     def build_commands(self) -> List[BuildCommand]:
@@ -36,6 +40,14 @@ class JekyllConfig(SSGEngineConfig):
             )
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        return BuildCache(
+            key_prefix="jekyll-ruby3.1",
+            paths=["vendor/bundle", ".jekyll-cache"],
+            lockfiles=["Gemfile.lock"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "_site"
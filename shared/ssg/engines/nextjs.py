@@ -5,10 +5,10 @@ Defines the Next.js static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate
+from ..base_engine import NPM_CACHE_DIR, NPM_INSTALL_COMMAND, SSGEngineConfig
+from ..core_models import BuildCache, BuildCommand, SSGTemplate
 
 
 class NextJSConfig(SSGEngineConfig):
@@ -24,7 +24,7 @@ class NextJSConfig(SSGEngineConfig):
 
     @property
     def install_commands(self) -> List[str]:
-        return ["npm ci", "npm install -g next"]
+        return [NPM_INSTALL_COMMAND, "npm install -g next"]
 
     @property
     def build_commands(self) -> List[BuildCommand]:
@@ -44,6 +44,15 @@ class NextJSConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        # .next/cache holds the webpack/SWC and optimized image caches
+        return BuildCache(
+            key_prefix="nextjs-node20",
+            paths=[NPM_CACHE_DIR, ".next/cache"],
+            lockfiles=["package-lock.json"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "out"
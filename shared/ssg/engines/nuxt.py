@@ -5,10 +5,10 @@ Defines the Nuxt.js static site generator engine with its specific
 build commands, templates, and optimization features.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from ..base_engine import SSGEngineConfig
-from ..core_models import BuildCommand, SSGTemplate
+from ..base_engine import NPM_CACHE_DIR, NPM_INSTALL_COMMAND, SSGEngineConfig
+from ..core_models import BuildCache, BuildCommand, SSGTemplate
 
 
 class NuxtConfig(SSGEngineConfig):
@@ -24,7 +24,7 @@ class NuxtConfig(SSGEngineConfig):
 
     @property
     def install_commands(self) -> List[str]:
-        return ["npm ci", "npm install -g nuxt"]
+        return [NPM_INSTALL_COMMAND, "npm install -g nuxt"]
 
     @property
     def build_commands(self) -> List[BuildCommand]:
@@ -45,6 +45,14 @@ class NuxtConfig(SSGEngineConfig):
             ),
         ]
 
+    @property
+    def build_cache(self) -> Optional[BuildCache]:
+        return BuildCache(
+            key_prefix="nuxt-node20",
+            paths=[NPM_CACHE_DIR],
+            lockfiles=["package-lock.json"],
+        )
+
     @property
     def output_directory(self) -> str:
         return "dist"
@@ -304,7 +304,8 @@ def verify_contentful_signature(event):
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_cms_integration(self) -> None:
@@ -601,7 +602,7 @@ def main(event, context):
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "gatsby":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -619,7 +620,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "nextjs":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -640,7 +641,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -658,7 +659,7 @@ def main(event, context):
             })
 
         else:  # nuxt
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
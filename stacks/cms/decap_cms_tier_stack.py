@@ -283,7 +283,8 @@ def verify_signature(body, signature):
                 build_image=codebuild.LinuxBuildImage.STANDARD_6_0,
                 compute_type=codebuild.ComputeType.SMALL
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_cms_integration(self) -> None:
@@ -543,7 +544,7 @@ def determine_content_type(file_path):
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "hugo":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -566,7 +567,7 @@ def determine_content_type(file_path):
             })
 
         elif ssg_engine == "eleventy":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -584,7 +585,7 @@ def determine_content_type(file_path):
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -602,7 +603,7 @@ def determine_content_type(file_path):
             })
 
         else:  # gatsby
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
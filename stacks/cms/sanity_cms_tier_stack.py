@@ -287,7 +287,8 @@ def verify_sanity_signature(event):
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_cms_integration(self) -> None:
@@ -540,7 +541,7 @@ def determine_content_type(sanity_type):
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "nextjs":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -561,7 +562,7 @@ def determine_content_type(sanity_type):
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -579,7 +580,7 @@ def determine_content_type(sanity_type):
             })
 
         elif ssg_engine == "gatsby":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -597,7 +598,7 @@ def determine_content_type(sanity_type):
             })
 
         else:  # nuxt
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -288,7 +288,8 @@ exports.handler = async (event) => {
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_cms_integration(self) -> None:
@@ -704,7 +705,7 @@ exports.handler = async (event) => {
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "nextjs":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -733,7 +734,7 @@ exports.handler = async (event) => {
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -759,7 +760,7 @@ exports.handler = async (event) => {
             })
 
         else:  # gatsby
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
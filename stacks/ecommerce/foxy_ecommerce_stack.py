@@ -296,7 +296,8 @@ def verify_foxy_signature(event):
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_ecommerce_integration(self) -> None:
@@ -606,7 +607,7 @@ def main(event, context):
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "hugo":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -629,7 +630,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "eleventy":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -647,7 +648,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -665,7 +666,7 @@ def main(event, context):
             })
 
         else:  # gatsby
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -370,7 +370,8 @@ async function triggerSiteRebuild(reason, data) {
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_ecommerce_integration(self) -> None:
@@ -706,7 +707,7 @@ exports.handler = async (event) => {
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "eleventy":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -724,7 +725,7 @@ exports.handler = async (event) => {
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -742,7 +743,7 @@ exports.handler = async (event) => {
             })
 
         elif ssg_engine == "nextjs":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -760,7 +761,7 @@ exports.handler = async (event) => {
             })
 
         else:  # nuxt
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
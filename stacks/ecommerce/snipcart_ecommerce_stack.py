@@ -289,7 +289,8 @@ def verify_snipcart_signature(event):
                     )
                 }
             ),
-            build_spec=self._get_direct_mode_buildspec()
+            build_spec=self._get_direct_mode_buildspec(),
+            cache=self.create_build_cache()
         )
 
     def _create_event_driven_ecommerce_integration(self) -> None:
@@ -554,7 +555,7 @@ def main(event, context):
         ssg_engine = self.client_config.service_integration.ssg_engine
 
         if ssg_engine == "hugo":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -577,7 +578,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "eleventy":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -595,7 +596,7 @@ def main(event, context):
             })
 
         elif ssg_engine == "astro":
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -613,7 +614,7 @@ def main(event, context):
             })
 
         else:  # gatsby
-            return codebuild.BuildSpec.from_object({
+            return self.create_direct_buildspec({
                 "version": "0.2",
                 "phases": {
                     "install": {
@@ -10,6 +10,7 @@ This serves as the root base class for:
 
 Key Features:
 - Standardized S3 + CloudFront setup
+- Lockfile-keyed S3 build caches for CodeBuild
 - Common IAM patterns
 - Environment variable management
 - Cost optimization patterns
@@ -22,6 +23,7 @@ from aws_cdk import (
     Stack,
     aws_s3 as s3,
     aws_cloudfront as cloudfront,
+    aws_codebuild as codebuild,
     aws_iam as iam,
     aws_route53 as route53,
     aws_certificatemanager as acm,
@@ -67,6 +69,7 @@ class BaseSSGStack(Stack, metaclass=StackABCMeta):
         self.distribution: Optional[cloudfront.CloudFrontWebDistribution] = None
         self.domain_name: Optional[str] = None
         self.build_role: Optional[iam.Role] = None
+        self.build_cache_bucket: Optional[s3.Bucket] = None
 
     @property
     def ssg_config(self):
@@ -244,6 +247,67 @@ class BaseSSGStack(Stack, metaclass=StackABCMeta):
             )
         )
 
+    def create_direct_buildspec(self, buildspec: Dict[str, Any]) -> codebuild.BuildSpec:
+        """
+        Create a provider stack's direct-mode buildspec with a cache section.
+
+        The buildspec's own install and build commands are kept. The client's
+        SSG engine picks the cached directories (the npm store and its
+        project-relative caches); the cache key names the buildspec's own
+        runtime, so entries are never shared with other toolchains. Use with
+        create_build_cache.
+
+        Args:
+            buildspec: Buildspec object of the provider stack
+
+        Returns:
+            CodeBuild BuildSpec with the cache section added
+        """
+        from shared.ssg import SSGEngineFactory
+        from shared.ssg.base_engine import NPM_CACHE_DIR
+
+        ssg_engine = self.client_config.service_integration.ssg_engine
+        engine_name = getattr(ssg_engine, 'value', ssg_engine)
+        build_cache = SSGEngineFactory.create_engine(engine_name).build_cache
+        if build_cache is None:
+            return codebuild.BuildSpec.from_object(buildspec)
+
+        runtime = "-".join(
+            f"{name}{version}" for name, version in buildspec["phases"]["install"].get("runtime-versions", {}).items()
+        )
+        paths = [path for path in build_cache.paths if path == NPM_CACHE_DIR or not path.startswith("/")]
+        if not paths:
+            return codebuild.BuildSpec.from_object(buildspec)
+
+        cache = build_cache.model_copy(update={"key_prefix": f"{engine_name}-{runtime}-direct", "paths": paths})
+        return codebuild.BuildSpec.from_object({**buildspec, "cache": cache.to_buildspec()})
+
+    def create_build_cache(self) -> codebuild.Cache:
+        """
+        Create the S3 cache for CodeBuild projects of this stack.
+
+        Pass the result as the project's cache; the engine buildspec's cache
+        section (see SSGEngineConfig.build_cache) picks the directories and
+        keys the entries by lockfile hash, so unchanged dependencies are
+        restored instead of downloaded. CodeBuild grants the project access.
+
+        Returns:
+            CodeBuild Cache backed by the stack's build cache bucket
+        """
+        if self.build_cache_bucket is None:
+            self.build_cache_bucket = s3.Bucket(
+                self, "BuildCacheBucket",
+                removal_policy=RemovalPolicy.DESTROY,
+                auto_delete_objects=True,
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                encryption=s3.BucketEncryption.S3_MANAGED,
+                # Entries for superseded lockfiles are never read again
+                lifecycle_rules=[s3.LifecycleRule(expiration=Duration.days(30))]
+            )
+
+        client_id = getattr(self.client_config, 'client_id', 'default')
+        return codebuild.Cache.bucket(self.build_cache_bucket, prefix=f"build-cache/{client_id}")
+
     def create_build_role(self, role_name: str, additional_policies: Optional[list] = None) -> iam.Role:
         """
         Create IAM role for build processes.
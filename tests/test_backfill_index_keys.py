@@ -0,0 +1,55 @@
+# Test Index Key Backfill
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from shared.composition.materialized_views import INDEX_KEYS_VERSION
+from tools.migrations.backfill_index_keys import backfill_index_keys
+
+
+def content_item(content_id: str, **overrides) -> dict:
+    item = {
+        "content_id": content_id, "content_type_provider": "article#decap", "content_type": "article",
+        "provider_name": "decap", "status": "published", "updated_at": "2025-01-01T12:00:00",
+    }
+    item.update(overrides)
+    return item
+
+
+class TestBackfillIndexKeys:
+    """Test the facet_key/type_status_key migration"""
+
+    def test_sets_missing_keys_and_records_version(self):
+        """Test that every page is scanned, only stale items are updated and the backfill is recorded"""
+        table = MagicMock()
+        current = content_item(
+            "b", facet_key="article#decap#published#2025-01-01T12:00:00",
+            type_status_key="article#published#2025-01-01T12:00:00"
+        )
+        table.scan.side_effect = [
+            {"Items": [content_item("a")], "LastEvaluatedKey": {"content_id": "a"}},
+            {"Items": [current]},
+        ]
+        view_store = MagicMock()
+
+        stats = backfill_index_keys(table, view_store)
+
+        assert table.scan.call_args_list[1].kwargs["ExclusiveStartKey"] == {"content_id": "a"}
+        values = table.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        assert values[":facet_key"] == "article#decap#published#2025-01-01T12:00:00"
+        assert values[":type_status_key"] == "article#published#2025-01-01T12:00:00"
+        assert stats == {"scanned": 2, "updated": 1, "rewritten": 0, "skipped": 0}
+        view_store.mark_index_keys_backfilled.assert_called_once_with(INDEX_KEYS_VERSION)
+
+    def test_items_rewritten_during_scan_are_left_alone(self):
+        """Test that a failed condition means a newer write already set the keys"""
+        table = MagicMock()
+        table.scan.return_value = {"Items": [content_item("a")]}
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "changed"}}, "UpdateItem"
+        )
+
+        stats = backfill_index_keys(table)
+
+        assert stats["rewritten"] == 1
+        assert stats["updated"] == 0
@@ -0,0 +1,90 @@
+# Test Batch Build Scheduler
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from shared.composition.batch_scheduler import (
+    DUE_BATCH_INDEX,
+    BatchScheduler,
+    epoch_seconds,
+    schedule_fields,
+)
+
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def conditional_check_failed():
+    return ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem")
+
+
+class TestBatchScheduler:
+    """Test due-batch sweeps and conditional claims"""
+
+    def test_schedule_fields_use_utc_epoch_seconds(self):
+        """Test that naive UTC datetimes map to epoch seconds regardless of local time"""
+        fields = schedule_fields(datetime(1970, 1, 1, 0, 1, 0))
+
+        assert fields == {"schedule_shard": "due", "due_at": 60}
+
+    def test_due_batches_follow_pagination(self):
+        """Test that every page of due batches is swept"""
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [{"batch_id": "b1"}], "LastEvaluatedKey": {"batch_id": "b1"}},
+            {"Items": [{"batch_id": "b2"}]},
+        ]
+
+        batch_ids = BatchScheduler(table).due_batch_ids(NOW)
+
+        assert batch_ids == ["b1", "b2"]
+        assert table.query.call_args_list[0].kwargs["IndexName"] == DUE_BATCH_INDEX
+        assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"batch_id": "b1"}
+
+    def test_next_due_at_returns_earliest_pending(self):
+        """Test that the next pending batch time is read with a single item query"""
+        table = MagicMock()
+        table.query.return_value = {"Items": [{"batch_id": "b3", "due_at": epoch_seconds(NOW) + 20}]}
+
+        assert BatchScheduler(table).next_due_at(NOW) == epoch_seconds(NOW) + 20
+        assert table.query.call_args.kwargs["Limit"] == 1
+
+    def test_claim_unschedules_active_batch(self):
+        """Test that claiming is conditional on the batch being active"""
+        table = MagicMock()
+
+        assert BatchScheduler(table).claim("b1", NOW) is True
+
+        kwargs = table.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "#status = :active"
+        assert "REMOVE schedule_shard, due_at" in kwargs["UpdateExpression"]
+
+    def test_lost_claim_returns_false(self):
+        """Test that a batch claimed by someone else is not built twice"""
+        table = MagicMock()
+        table.update_item.side_effect = conditional_check_failed()
+
+        assert BatchScheduler(table).claim("b1", NOW) is False
+
+    def test_other_errors_propagate(self):
+        """Test that throttling and other failures are not mistaken for lost claims"""
+        table = MagicMock()
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "UpdateItem"
+        )
+
+        with pytest.raises(ClientError):
+            BatchScheduler(table).claim("b1", NOW)
+
+    def test_defer_reschedules_waiting_batch(self):
+        """Test that a batch queued behind a running build stays active and scheduled"""
+        table = MagicMock()
+
+        assert BatchScheduler(table).defer("b1", NOW) is True
+
+        kwargs = table.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "#status = :active"
+        assert kwargs["ExpressionAttributeValues"][":waiting"] is True
+        assert kwargs["ExpressionAttributeValues"][":due"] == epoch_seconds(NOW)
@@ -0,0 +1,97 @@
+# Test Adaptive Batch Windows
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from shared.composition.batch_scheduler import epoch_seconds
+from shared.composition.batch_window import (
+    BUILD_DURATION_SAMPLES,
+    BatchingStats,
+    BatchingStatsStore,
+    choose_batch_window,
+    stats_key,
+)
+
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def stats_table(item=None):
+    table = MagicMock()
+    table.get_item.return_value = {"Item": item} if item else {}
+    return table
+
+
+class TestChooseBatchWindow:
+    """Test window selection against the latency target"""
+
+    def test_steady_arrivals_use_the_full_latency_budget(self):
+        """Test that the window is the latency target minus the p95 build"""
+        stats = BatchingStats(ewma_interarrival_seconds=20, build_durations=[100, 120, 240])
+
+        decision = choose_batch_window(stats, latency_target_seconds=600)
+
+        assert decision.build_immediately is False
+        assert decision.window_seconds == 360
+        assert decision.quiet_seconds == 60
+
+    def test_sparse_arrivals_build_immediately(self):
+        """Test that waiting is skipped when no further event is expected in time"""
+        stats = BatchingStats(ewma_interarrival_seconds=3600, build_durations=[120])
+
+        assert choose_batch_window(stats, latency_target_seconds=600).build_immediately is True
+
+    def test_slow_builds_leave_no_budget(self):
+        """Test that builds slower than the target are started at once"""
+        stats = BatchingStats(ewma_interarrival_seconds=1, build_durations=[700])
+
+        decision = choose_batch_window(stats, latency_target_seconds=600)
+
+        assert decision.build_immediately is True
+        assert decision.window_seconds == 0
+
+    def test_fallback_window_without_history(self):
+        """Test that new clients get the fallback window"""
+        decision = choose_batch_window(BatchingStats(), latency_target_seconds=600, fallback_window_seconds=30)
+
+        assert (decision.window_seconds, decision.build_immediately) == (30, False)
+
+
+class TestBatchingStatsStore:
+    """Test rolling statistics in the batching table"""
+
+    def test_first_arrival_only_records_timestamp(self):
+        """Test that no average is invented from a single event"""
+        table = stats_table()
+
+        stats = BatchingStatsStore(table).record_arrival("client-a", NOW)
+
+        assert stats.ewma_interarrival_seconds is None
+        kwargs = table.update_item.call_args.kwargs
+        assert kwargs["Key"] == stats_key("client-a")
+        assert ":ewma" not in kwargs["ExpressionAttributeValues"]
+
+    def test_arrival_updates_moving_average(self):
+        """Test that the newest gap is blended into the average"""
+        table = stats_table({"ewma_interarrival_seconds": 10, "last_event_at": epoch_seconds(NOW) - 40})
+
+        stats = BatchingStatsStore(table).record_arrival("client-a", NOW)
+
+        assert stats.ewma_interarrival_seconds == 0.3 * 40 + 0.7 * 10
+
+    def test_long_gaps_are_clamped(self):
+        """Test that an overnight pause does not dominate the average"""
+        table = stats_table({"ewma_interarrival_seconds": 10, "last_event_at": epoch_seconds(NOW) - 86400})
+
+        stats = BatchingStatsStore(table, max_gap_seconds=1200).record_arrival("client-a", NOW)
+
+        assert stats.ewma_interarrival_seconds == 0.3 * 1200 + 0.7 * 10
+
+    def test_build_durations_keep_recent_samples(self):
+        """Test that only the most recent build durations are kept"""
+        table = stats_table({"build_durations": list(range(1, BUILD_DURATION_SAMPLES + 1))})
+
+        stats = BatchingStatsStore(table).record_build_duration("client-a", 500)
+
+        assert len(stats.build_durations) == BUILD_DURATION_SAMPLES
+        assert stats.build_durations[-1] == 500
+        assert stats.build_duration_p95 == 20
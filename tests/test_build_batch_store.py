@@ -0,0 +1,342 @@
+# Test Build Batch Store
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from models.composition import ContentEvent
+from shared.composition.build_batch_store import (
+    ActiveBatchExistsError,
+    BatchNotActiveError,
+    BuildBatchStore,
+    TRANSACT_MAX_ITEMS,
+    active_pointer_key,
+    collapse_content_events,
+    compact_event,
+    header_key,
+)
+from shared.composition.table_indexes import BUILD_BATCHING_INDEXES
+from tools.benchmarks.local_aws import LocalDynamoDBResource, LocalTable
+
+
+def make_event(index: int) -> ContentEvent:
+    return ContentEvent(
+        event_type="content.updated",
+        content_id=f"content-{index}",
+        content_type="article",
+        provider_name="decap",
+        client_id="client-a",
+        content_data={"id": f"content-{index}", "body": "x" * 1000},
+        previous_content={"id": f"content-{index}"},
+    )
+
+
+def make_change(content_id: str, event_type: str, minute: int, **fields) -> ContentEvent:
+    return ContentEvent(
+        event_type=event_type,
+        content_id=content_id,
+        content_type="article",
+        provider_name="sanity",
+        client_id="client-a",
+        timestamp=datetime(2025, 1, 1, 12, minute),
+        **fields,
+    )
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Operation")
+
+
+def make_store():
+    table = MagicMock()
+    table.name = "batches"
+    writer = MagicMock()
+    table.batch_writer.return_value.__enter__.return_value = writer
+    return BuildBatchStore(table), table, writer
+
+
+def written_items(writer):
+    return [call.kwargs["Item"] for call in writer.put_item.call_args_list]
+
+
+def local_table() -> LocalTable:
+    table = LocalTable("batches", "batch_id", "seq", BUILD_BATCHING_INDEXES.indexes)
+    LocalDynamoDBResource([table])
+    return table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBuildBatchStore:
+    """Test header/child batch storage"""
+
+    def test_open_batch_keeps_events_off_header(self):
+        """Test that the header only carries counters and events become children"""
+        store, table, writer = make_store()
+
+        store.open_batch(
+            {"batch_id": "b1", "client_id": "client-a", "status": "active", "ttl": 100},
+            [make_event(1), make_event(2)]
+        )
+
+        header_put, pointer_put, *child_puts = table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        header = header_put["Put"]["Item"]
+        assert header["seq"] == {"N": "0"}
+        assert header["event_count"] == {"N": "2"}
+        assert header["next_seq"] == {"N": "2"}
+        assert header["committed_count"] == {"N": "2"}
+        assert "events" not in header
+        assert pointer_put["Put"]["Item"]["active_batch_id"] == {"S": "b1"}
+        assert pointer_put["Put"]["ConditionExpression"] == "attribute_not_exists(active_batch_id)"
+
+        # Children commit in the same transaction as the header
+        children = [put["Put"]["Item"] for put in child_puts]
+        assert [child["seq"] for child in children] == [{"N": "1"}, {"N": "2"}]
+        assert all(child["ttl"] == {"N": "100"} for child in children)
+        writer.put_item.assert_not_called()
+
+    def test_open_large_batch_writes_children_first(self):
+        """Test that children too many for one transaction are written before the header commits"""
+        store, table, writer = make_store()
+        order = []
+        writer.put_item.side_effect = lambda **kwargs: order.append("child")
+        table.meta.client.transact_write_items.side_effect = lambda **kwargs: order.append("header")
+
+        store.open_batch(
+            {"batch_id": "b1", "client_id": "client-a", "status": "active"},
+            [make_event(index) for index in range(TRANSACT_MAX_ITEMS)]
+        )
+
+        assert order == ["child"] * TRANSACT_MAX_ITEMS + ["header"]
+        assert len(table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]) == 2
+
+    def test_add_events_writes_reserved_sequence_range(self):
+        """Test that appended children use the range reserved on the header"""
+        store, table, writer = make_store()
+        table.update_item.return_value = {"Attributes": {"batch_id": "b1", "event_count": 5, "next_seq": 5}}
+
+        header = store.add_events("b1", [make_event(4), make_event(5)], make_event(0).timestamp)
+
+        reserve, commit = [call.kwargs for call in table.update_item.call_args_list]
+        assert reserve["Key"] == header_key("b1")
+        assert reserve["ExpressionAttributeValues"][":count"] == 2
+        assert "list_append" not in reserve["UpdateExpression"]
+        assert [child["seq"] for child in written_items(writer)] == [4, 5]
+        assert commit["UpdateExpression"] == "ADD committed_count :count"
+        assert commit["ConditionExpression"] == "attribute_not_exists(sealed_at)"
+        assert header["event_count"] == 5
+
+    def test_add_to_claimed_batch_is_refused(self):
+        """Test that events are never appended to a batch that is already building"""
+        store, table, writer = make_store()
+        table.update_item.side_effect = client_error("ConditionalCheckFailedException")
+
+        with pytest.raises(BatchNotActiveError):
+            store.add_events("b1", [make_event(1)], make_event(0).timestamp)
+
+        assert table.update_item.call_args.kwargs["ConditionExpression"] == "#status = :active"
+        writer.put_item.assert_not_called()
+
+    def test_children_hold_compact_references(self):
+        """Test that payload snapshots are not stored with batch membership"""
+        reference = compact_event(make_event(1))
+
+        assert reference["content_id"] == "content-1"
+        assert "content_data" not in reference
+        assert "previous_content" not in reference
+        assert ContentEvent(**reference).content_id == "content-1"
+
+    def test_children_keep_manifest_fields(self):
+        """Test that the fields change manifests need survive compaction"""
+        event = make_event(1)
+        event.content_data = {"slug": "first-post", "source_path": "content/blog/first-post.md", "body": "x" * 1000}
+
+        reference = compact_event(event)
+
+        assert reference["content_data"] == {"slug": "first-post", "source_path": "content/blog/first-post.md"}
+
+    def test_iter_events_follows_pagination(self):
+        """Test that every page of children is read in order"""
+        store, table, _ = make_store()
+        table.query.side_effect = [
+            {"Items": [{"event": compact_event(make_event(1))}], "LastEvaluatedKey": {"batch_id": "b1", "seq": 1}},
+            {"Items": [{"event": compact_event(make_event(2))}]},
+        ]
+
+        events = list(store.iter_events("b1"))
+
+        assert [event.content_id for event in events] == ["content-1", "content-2"]
+        assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"batch_id": "b1", "seq": 1}
+
+
+class TestCollapseContentEvents:
+    """Test per-content collapsing of batch events"""
+
+    def test_save_storm_collapses_to_latest_update(self):
+        """Test that repeated saves of one document become a single change"""
+        events = [make_change("doc-1", "content.updated", minute, content_data={"rev": minute}) for minute in range(30)]
+
+        collapsed = collapse_content_events(events)
+
+        assert len(collapsed) == 1
+        assert collapsed[0].event_type == "content.updated"
+        assert collapsed[0].content_data == {"rev": 29}
+
+    def test_create_then_update_stays_create(self):
+        """Test that updates to new content keep it a creation"""
+        collapsed = collapse_content_events([
+            make_change("doc-1", "content.created", 0),
+            make_change("doc-1", "content.updated", 1, content_data={"rev": 2}),
+        ])
+
+        assert [(event.event_type, event.content_data) for event in collapsed] == [("content.created", {"rev": 2})]
+
+    def test_create_then_delete_cancels(self):
+        """Test that content created and deleted within a batch produces no change"""
+        collapsed = collapse_content_events([
+            make_change("doc-1", "content.created", 0),
+            make_change("doc-2", "content.updated", 1),
+            make_change("doc-1", "content.deleted", 2),
+        ])
+
+        assert [event.content_id for event in collapsed] == ["doc-2"]
+
+    def test_delete_then_create_becomes_update(self):
+        """Test that recreated content is treated as an update"""
+        collapsed = collapse_content_events([
+            make_change("doc-1", "content.deleted", 0),
+            make_change("doc-1", "content.created", 1),
+        ])
+
+        assert [event.event_type for event in collapsed] == ["content.updated"]
+
+    def test_out_of_order_arrival_uses_timestamps(self):
+        """Test that the latest event wins by timestamp, not arrival order"""
+        collapsed = collapse_content_events([
+            make_change("doc-1", "content.updated", 5, content_data={"rev": 5}),
+            make_change("doc-1", "content.updated", 3, content_data={"rev": 3}),
+        ])
+
+        assert collapsed[0].content_data == {"rev": 5}
+
+
+class TestActiveBatchPointer:
+    """Test the per-client active batch pointer"""
+
+    def header(self, batch_id: str):
+        return {"batch_id": batch_id, "client_id": "client-a", "status": "active"}
+
+    def test_losing_the_race_reports_the_winner(self):
+        """Test that a concurrent opener is told which batch to append to"""
+        store, table, writer = make_store()
+        table.meta.client.transact_write_items.side_effect = client_error("TransactionCanceledException")
+        table.get_item.side_effect = [
+            {"Item": {**active_pointer_key("client-a"), "active_batch_id": "winner"}},
+            {"Item": self.header("winner")},
+        ]
+
+        with pytest.raises(ActiveBatchExistsError) as raised:
+            store.open_batch(self.header("b2"), [make_event(1)])
+
+        assert raised.value.batch_id == "winner"
+        writer.put_item.assert_not_called()
+
+    def test_stale_pointer_is_swapped(self):
+        """Test that a pointer to a claimed batch is replaced conditionally on its old value"""
+        store, table, writer = make_store()
+        table.meta.client.transact_write_items.side_effect = [client_error("TransactionCanceledException"), {}]
+        table.get_item.side_effect = [
+            {"Item": {**active_pointer_key("client-a"), "active_batch_id": "old"}},
+            {"Item": {**self.header("old"), "status": "building"}},
+        ]
+
+        store.open_batch(self.header("b2"), [make_event(1)])
+
+        transact_items = table.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert transact_items[1]["Put"]["ExpressionAttributeValues"] == {":replaces": {"S": "old"}}
+        assert len(transact_items) == 3
+
+    def test_active_batch_requires_active_header(self):
+        """Test that a pointer to a batch that is no longer active is ignored"""
+        store, table, _ = make_store()
+        table.get_item.side_effect = [
+            {"Item": {**active_pointer_key("client-a"), "active_batch_id": "b1"}},
+            {"Item": {**self.header("b1"), "status": "building"}},
+        ]
+
+        assert store.get_active_batch("client-a") is None
+        assert all(call.kwargs["ConsistentRead"] for call in table.get_item.call_args_list)
+
+
+class TestBatchSeal:
+    """Test fencing a claimed batch against appends still in flight"""
+
+    def open(self, store: BuildBatchStore) -> None:
+        store.open_batch({"batch_id": "b1", "client_id": "client-a", "status": "active"}, [make_event(1)])
+
+    def claim(self, table: LocalTable) -> None:
+        table.update_item(
+            Key=header_key("b1"),
+            UpdateExpression="SET #status = :building",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={":building": "building"}
+        )
+
+    def test_claim_between_reservation_and_child_write_requeues(self):
+        """Test that an append whose children land after the build sealed the batch is refused"""
+        table = local_table()
+        clock = FakeClock()
+        writer_store = BuildBatchStore(table)
+        builder_store = BuildBatchStore(table, clock=clock, sleep=lambda seconds: setattr(clock, "now", clock.now + seconds))
+        self.open(writer_store)
+
+        # The build claims, seals and reads the batch after the writer
+        # reserved its sequence numbers but before its children are written
+        write_children = writer_store._write_children
+        built = []
+
+        def claim_then_write(children):
+            self.claim(table)
+            sealed = builder_store.seal("b1")
+            assert (sealed["event_count"], sealed["committed_count"]) == (2, 1)
+            built.extend(event.content_id for event in builder_store.iter_events("b1"))
+            write_children(children)
+
+        writer_store._write_children = claim_then_write
+
+        # The build missed the late event, so the writer must move it to the next batch
+        with pytest.raises(BatchNotActiveError):
+            writer_store.add_events("b1", [make_event(2)], make_event(0).timestamp)
+
+        assert built == ["content-1"]
+        assert clock.now >= 1.0
+
+    def test_seal_waits_for_inflight_append(self):
+        """Test that the seal lets an append that commits within the wait keep its events in the batch"""
+        table = local_table()
+        writer_store = BuildBatchStore(table)
+        self.open(writer_store)
+
+        # The claim lands while the append is between reservation and commit
+        commit = writer_store._commit_events
+
+        def claim_during_commit(batch_id, count):
+            self.claim(table)
+            pending = {"commit": lambda: commit(batch_id, count)}
+            builder_store = BuildBatchStore(table, sleep=lambda seconds: pending.pop("commit", lambda: None)())
+            sealed = builder_store.seal(batch_id)
+            assert (sealed["event_count"], sealed["committed_count"]) == (2, 2)
+            return sealed
+
+        writer_store._commit_events = claim_during_commit
+        header = writer_store.add_events("b1", [make_event(2)], make_event(0).timestamp)
+
+        assert header["committed_count"] == 2
+        assert [event.content_id for event in writer_store.iter_events("b1")] == ["content-1", "content-2"]
@@ -0,0 +1,174 @@
+# Test Build Coalescing
+import os
+from datetime import datetime, timedelta
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from models.composition import ContentEvent
+from shared.composition.metrics_buffer import MetricsBuffer
+from shared.composition.table_indexes import BUILD_BATCHING_INDEXES
+from tools.benchmarks.build_trigger_benchmark import BUILD_PROJECT_NAME, HANDLERS, load_handler_module
+from tools.benchmarks.event_streams import content_change
+from tools.benchmarks.local_aws import (
+    LocalCodeBuild,
+    LocalDynamoDBResource,
+    LocalSNS,
+    LocalTable,
+    VirtualClock,
+)
+
+
+CLIENT_ID = "client-a"
+RUNNING_BUILD_ID = f"{BUILD_PROJECT_NAME}:running"
+
+
+class Stack:
+    """One client's batching table, CodeBuild stand-in and handler instances"""
+
+    def __init__(self):
+        self.table = LocalTable("batches", "batch_id", "seq", BUILD_BATCHING_INDEXES.indexes)
+        self.resource = LocalDynamoDBResource([self.table])
+        self.codebuild = LocalCodeBuild(VirtualClock(datetime.utcnow()), lambda environment: 180)
+        self.clients = {"codebuild": self.codebuild, "sns": LocalSNS()}
+        self.batching = self.create_handler("batching")
+        self.trigger = self.create_handler("trigger")
+
+    def create_handler(self, name: str):
+        module = load_handler_module(name)
+        environment = {"CLIENT_ID": CLIENT_ID, "BUILD_BATCHING_TABLE": self.table.name, "BUILD_PROJECT_NAME": BUILD_PROJECT_NAME}
+        with patch.dict(os.environ, environment), \
+                patch.object(module.boto3, "resource", return_value=self.resource), \
+                patch.object(module.boto3, "client", side_effect=lambda service, **kwargs: self.clients[service]), \
+                patch.object(module, "MetricsBuffer", partial(MetricsBuffer, emit=lambda line: None)):
+            return getattr(module, HANDLERS[name][1])()
+
+    def hold_lease(self) -> None:
+        """Start a build of the client that is still running"""
+        lease = self.batching.build_lease
+        assert lease.acquire(CLIENT_ID, "running", datetime.utcnow())
+        lease.attach_build(CLIENT_ID, "running", RUNNING_BUILD_ID)
+
+    def lease(self):
+        return self.batching.build_lease.current(CLIENT_ID, datetime.utcnow())
+
+    def active_batch(self):
+        return self.batching.batch_store.get_active_batch(CLIENT_ID)
+
+
+def product_events(*content_ids: str):
+    return [
+        ContentEvent(**content_change(content_id, content_type="product", provider_name="shopify_basic"), client_id=CLIENT_ID)
+        for content_id in content_ids
+    ]
+
+
+def queue_behind_running_build(stack: Stack, handler_name: str, events) -> None:
+    """Deliver high-priority events to a handler while the client's build runs"""
+    if handler_name == "batching":
+        stack.batching._trigger_immediate_build(events, {"reason": "product update"})
+    else:
+        stack.trigger._trigger_immediate_build(events, "product update")
+
+
+def build_finished(build_id: str):
+    return {
+        "source": "aws.codebuild",
+        "detail-type": "CodeBuild Build State Change",
+        "detail": {"build-status": "SUCCEEDED", "project-name": BUILD_PROJECT_NAME, "build-id": f"arn:aws:codebuild:us-east-1:000000000000:build/{build_id}"}
+    }
+
+
+@pytest.fixture
+def stack():
+    return Stack()
+
+
+@pytest.mark.parametrize("handler_name", ["batching", "trigger"])
+class TestBuildCoalescing:
+    """Test that content changes during a running build queue for one follow-up build"""
+
+    def test_held_lease_queues_events_in_waiting_batch(self, stack, handler_name):
+        """Test that events arriving during a build join the active batch marked waiting_for_build"""
+        stack.hold_lease()
+
+        queue_behind_running_build(stack, handler_name, product_events("tee", "mug"))
+
+        batch = stack.active_batch()
+        assert batch["waiting_for_build"] is True
+        assert batch["event_count"] == 2
+        assert stack.codebuild.builds == []
+
+    def test_build_state_change_releases_lease_and_builds_waiting_batch(self, stack, handler_name):
+        """Test that the finished build's event frees the lease and starts the queued batch"""
+        stack.hold_lease()
+        queue_behind_running_build(stack, handler_name, product_events("tee"))
+        batch_id = stack.active_batch()["batch_id"]
+
+        result = stack.batching.lambda_handler(build_finished(RUNNING_BUILD_ID), None)
+
+        assert result["next_build"]["batch_id"] == batch_id
+        assert [build.environment["BATCH_ID"] for build in stack.codebuild.builds] == [batch_id]
+        assert stack.lease()["build_id"] == stack.codebuild.builds[0].build_id
+        assert stack.active_batch() is None
+
+    def test_release_before_defer_builds_batch_once(self, stack, handler_name):
+        """Test that a build finishing between the lease check and the defer still builds the batch, once"""
+        stack.hold_lease()
+        scheduler = stack.batching.scheduler if handler_name == "batching" else stack.trigger.scheduler
+        defer = scheduler.defer
+
+        def finish_running_build_then_defer(batch_id, until):
+            # The completion handler runs first and finds no waiting batch
+            assert "next_build" not in stack.batching.lambda_handler(build_finished(RUNNING_BUILD_ID), None)
+            return defer(batch_id, until)
+
+        with patch.object(scheduler, "defer", side_effect=finish_running_build_then_defer):
+            queue_behind_running_build(stack, handler_name, product_events("tee"))
+
+        stack.batching.lambda_handler({"source": "aws.events", "detail-type": "Scheduled Event"}, None)
+
+        assert len(stack.codebuild.builds) == 1
+        assert stack.lease()["build_id"] == stack.codebuild.builds[0].build_id
+
+    def test_failed_immediate_start_build_frees_lease(self, stack, handler_name):
+        """Test that an immediate build that cannot start does not block the client's next build"""
+        with patch.object(stack.codebuild, "start_build", side_effect=RuntimeError("throttled")), \
+                pytest.raises(RuntimeError):
+            queue_behind_running_build(stack, handler_name, product_events("tee"))
+
+        assert stack.lease() is None
+
+    def test_failed_batch_start_build_frees_lease(self, stack, handler_name):
+        """Test that a batch whose build cannot start does not block the client's next build"""
+        stack.hold_lease()
+        queue_behind_running_build(stack, handler_name, product_events("tee"))
+        batch_id = stack.active_batch()["batch_id"]
+        stack.batching.build_lease.release(CLIENT_ID, build_id=RUNNING_BUILD_ID)
+        handler = stack.batching if handler_name == "batching" else stack.trigger
+
+        with patch.object(stack.codebuild, "start_build", side_effect=RuntimeError("throttled")):
+            handler._trigger_batch_build(batch_id)
+
+        assert stack.lease() is None
+        assert stack.batching.batch_store.get_header(batch_id)["status"] == "failed"
+
+    def test_batch_without_net_changes_is_skipped(self, stack, handler_name):
+        """Test that a batch whose events cancel out completes without a build and frees the lease"""
+        created, deleted = (
+            ContentEvent(**content_change("tee", content_type="product", provider_name="shopify_basic", event_type=event_type),
+                         client_id=CLIENT_ID, timestamp=datetime.utcnow() + timedelta(seconds=offset))
+            for offset, event_type in enumerate(("content.created", "content.deleted"))
+        )
+        stack.hold_lease()
+        queue_behind_running_build(stack, handler_name, [created, deleted])
+        batch_id = stack.active_batch()["batch_id"]
+        stack.batching.build_lease.release(CLIENT_ID, build_id=RUNNING_BUILD_ID)
+        handler = stack.batching if handler_name == "batching" else stack.trigger
+
+        handler._trigger_batch_build(batch_id)
+
+        assert stack.codebuild.builds == []
+        assert stack.lease() is None
+        assert stack.batching.batch_store.get_header(batch_id)["status"] == "skipped"
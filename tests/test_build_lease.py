@@ -0,0 +1,58 @@
+# Test Per-Client Build Lease
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from shared.composition.batch_scheduler import epoch_seconds
+from shared.composition.build_lease import BuildLease, lease_key
+
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def conditional_check_failed():
+    return ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "PutItem")
+
+
+class TestBuildLease:
+    """Test one-build-per-client leasing"""
+
+    def test_acquire_allows_only_free_or_expired_leases(self):
+        """Test that the lease put is conditional on no unexpired holder"""
+        table = MagicMock()
+
+        assert BuildLease(table, lease_seconds=600).acquire("client-a", "b1", NOW) is True
+
+        kwargs = table.put_item.call_args.kwargs
+        assert kwargs["Item"]["batch_id"] == lease_key("client-a")["batch_id"]
+        assert kwargs["Item"]["expires_at"] == epoch_seconds(NOW) + 600
+        assert kwargs["ConditionExpression"] == "attribute_not_exists(batch_id) OR expires_at < :now"
+
+    def test_held_lease_is_not_acquired(self):
+        """Test that a second trigger does not start a concurrent build"""
+        table = MagicMock()
+        table.put_item.side_effect = conditional_check_failed()
+
+        assert BuildLease(table).acquire("client-a", "b2", NOW) is False
+
+    def test_release_by_build_id(self):
+        """Test that completion events release only the lease of their own build"""
+        table = MagicMock()
+
+        assert BuildLease(table).release("client-a", build_id="project:123") is True
+        assert table.delete_item.call_args.kwargs["ExpressionAttributeValues"] == {":build_id": "project:123"}
+
+    def test_release_of_moved_on_lease_is_ignored(self):
+        """Test that a late completion event does not free another build's lease"""
+        table = MagicMock()
+        table.delete_item.side_effect = conditional_check_failed()
+
+        assert BuildLease(table).release("client-a", build_id="project:old") is False
+
+    def test_expired_lease_is_not_current(self):
+        """Test that a lease whose completion event was lost stops blocking builds"""
+        table = MagicMock()
+        table.get_item.return_value = {"Item": {"holder": "b1", "expires_at": epoch_seconds(NOW) - 1}}
+
+        assert BuildLease(table).current("client-a", NOW) is None
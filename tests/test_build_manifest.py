@@ -0,0 +1,125 @@
+# Test Build Change Manifests
+import json
+from unittest.mock import MagicMock
+
+from models.composition import ContentEvent
+from shared.composition.build_manifest import (
+    DEFAULT_CONTENT_ROUTES,
+    MAX_INCREMENTAL_SOURCES,
+    BuildManifestWriter,
+    build_manifest,
+    build_manifest_variables,
+)
+
+
+def make_change(content_id: str, content_type: str = "article", event_type: str = "content.updated", source=True):
+    data = {"slug": content_id}
+    if source:
+        data["source_path"] = f"content/blog/{content_id}.md"
+    return ContentEvent(
+        event_type=event_type,
+        content_id=content_id,
+        content_type=content_type,
+        provider_name="decap",
+        client_id="client-a",
+        content_data=data,
+    )
+
+
+def manifest_for(changes):
+    return build_manifest(changes, DEFAULT_CONTENT_ROUTES, client_id="client-a", batch_id="b1", engine="eleventy")
+
+
+def variables_by_name(variables):
+    return {variable["name"]: variable["value"] for variable in variables}
+
+
+class TestBuildManifest:
+    """Test change-to-path mapping"""
+
+    def test_single_change_renders_its_source(self):
+        """Test that a one-post change renders only its source file and lists its pages"""
+        manifest = manifest_for([make_change("first-post")])
+
+        assert manifest["requires_full_rebuild"] is False
+        assert manifest["sources"] == ["content/blog/first-post.md"]
+        assert manifest["paths"] == ["/blog/first-post/", "/blog/", "/"]
+
+    def test_shared_listings_are_deduplicated(self):
+        """Test that listing pages appear once however many items changed"""
+        manifest = manifest_for([make_change("a"), make_change("b")])
+
+        assert manifest["paths"] == ["/blog/a/", "/blog/", "/", "/blog/b/"]
+        assert len(manifest["sources"]) == 2
+
+    def test_deleted_content_requires_full_rebuild(self):
+        """Test that a partial render is never used to remove a page"""
+        manifest = manifest_for([make_change("old-post", event_type="content.deleted")])
+
+        assert manifest["requires_full_rebuild"] is True
+        assert "old-post" in manifest["full_rebuild_reason"]
+
+    def test_content_without_source_requires_full_rebuild(self):
+        """Test that API-based content, which has no source file, renders the full site"""
+        manifest = manifest_for([make_change("tee", "product", source=False)])
+
+        assert manifest["requires_full_rebuild"] is True
+        assert manifest["paths"] == ["/products/tee/", "/products/", "/"]
+
+    def test_large_change_sets_require_full_rebuild(self):
+        """Test that partial renders are skipped when they would touch most of the site"""
+        changes = [make_change(f"post-{index}") for index in range(MAX_INCREMENTAL_SOURCES + 1)]
+
+        assert manifest_for(changes)["requires_full_rebuild"] is True
+
+
+class TestBuildManifestWriter:
+    """Test manifest uploads and build variables"""
+
+    def test_writes_manifest_per_build(self):
+        """Test that manifests are keyed by client and batch"""
+        s3 = MagicMock()
+        manifest = manifest_for([make_change("first-post")])
+
+        uri = BuildManifestWriter(s3, "manifests-bucket").write(manifest)
+
+        assert uri == "s3://manifests-bucket/manifests/client-a/b1.json"
+        body = json.loads(s3.put_object.call_args.kwargs["Body"])
+        assert body["sources"] == manifest["sources"]
+
+    def test_build_gets_manifest_and_snapshot_uris(self):
+        """Test that builds receive only the manifest URI and their output snapshot"""
+        writer = BuildManifestWriter(MagicMock(), "manifests-bucket")
+
+        variables = variables_by_name(build_manifest_variables(
+            writer, [make_change("first-post")], DEFAULT_CONTENT_ROUTES, client_id="client-a",
+            batch_id="b1", engine="eleventy", summary={}, emit_metric=MagicMock()
+        ))
+
+        assert variables == {
+            "BUILD_MANIFEST_URI": "s3://manifests-bucket/manifests/client-a/b1.json",
+            "BUILD_OUTPUT_SNAPSHOT_URI": "s3://manifests-bucket/outputs/client-a/",
+        }
+
+    def test_failed_upload_still_refreshes_snapshot(self):
+        """Test that a build without a manifest renders fully and still replaces the snapshot"""
+        s3 = MagicMock()
+        s3.put_object.side_effect = RuntimeError("S3 unavailable")
+        emit_metric = MagicMock()
+
+        variables = variables_by_name(build_manifest_variables(
+            BuildManifestWriter(s3, "manifests-bucket"), [make_change("first-post")], DEFAULT_CONTENT_ROUTES,
+            client_id="client-a", batch_id="b1", engine="eleventy", summary={}, emit_metric=emit_metric
+        ))
+
+        assert list(variables) == ["BUILD_OUTPUT_SNAPSHOT_URI"]
+        emit_metric.assert_called_once_with("BuildManifestErrors", 1)
+
+    def test_without_bucket_summary_is_passed_inline(self):
+        """Test that engines without a partial render mode get the change summary"""
+        variables = variables_by_name(build_manifest_variables(
+            None, [make_change("first-post")], DEFAULT_CONTENT_ROUTES, client_id="client-a",
+            batch_id="b1", engine="hugo", summary={"total_events": 1}, emit_metric=MagicMock()
+        ))
+
+        assert json.loads(variables["CONTENT_CHANGES_SUMMARY"]) == {"total_events": 1}
@@ -0,0 +1,98 @@
+# Test Build Trigger Benchmark
+from datetime import datetime
+
+import pytest
+from botocore.exceptions import ClientError
+
+from shared.composition.batch_scheduler import BatchScheduler
+from shared.composition.build_batch_store import ActiveBatchExistsError, BuildBatchStore
+from shared.composition.table_indexes import BUILD_BATCHING_INDEXES
+from tools.benchmarks.build_trigger_benchmark import BuildTriggerBenchmark
+from tools.benchmarks.event_streams import Delivery, content_change, save_storm
+from tools.benchmarks.local_aws import LocalDynamoDBResource, LocalTable
+
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def batch_table() -> LocalTable:
+    table = LocalTable("batches", "batch_id", "seq", BUILD_BATCHING_INDEXES.indexes)
+    LocalDynamoDBResource([table])
+    return table
+
+
+class TestLocalTable:
+    """Test the in-memory DynamoDB stand-in"""
+
+    def test_failed_condition_raises_and_bills(self):
+        """Test that a failed conditional put raises and still consumes write capacity"""
+        table = batch_table()
+        table.put_item(Item={"batch_id": "lease#a", "seq": 0, "holder": "b1"})
+
+        with pytest.raises(ClientError) as raised:
+            table.put_item(Item={"batch_id": "lease#a", "seq": 0, "holder": "b2"},
+                           ConditionExpression="attribute_not_exists(batch_id)")
+
+        assert raised.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+        assert table.get_item(Key={"batch_id": "lease#a", "seq": 0})["Item"]["holder"] == "b1"
+        assert table.capacity.write_units["PutItem"] == 2
+
+    def test_competing_batch_opens_converge(self):
+        """Test that the pointer transaction lets only one batch become active"""
+        store = BuildBatchStore(batch_table())
+        header = {"client_id": "a", "status": "active"}
+        store.open_batch({**header, "batch_id": "b1"}, [])
+
+        with pytest.raises(ActiveBatchExistsError) as raised:
+            store.open_batch({**header, "batch_id": "b2"}, [])
+
+        assert raised.value.batch_id == "b1"
+        assert store.get_header("b2") is None
+
+    def test_due_batch_index_is_sparse(self):
+        """Test that claimed batches drop out of the scheduler index"""
+        table = batch_table()
+        scheduler = BatchScheduler(table)
+        for batch_id, due_at in (("b1", 100), ("b2", 200)):
+            table.put_item(Item={"batch_id": batch_id, "seq": 0, "status": "active",
+                                 "schedule_shard": "due", "due_at": due_at})
+
+        assert scheduler.claim("b1", NOW) is True
+        assert scheduler.claim("b1", NOW) is False
+        assert scheduler.due_batch_ids(NOW) == ["b2"]
+
+
+class TestBuildTriggerBenchmark:
+    """Test replaying streams through the real handlers"""
+
+    def test_save_storm_is_batched(self):
+        """Test that an autosave session costs far fewer builds than saves, and none are lost"""
+        deliveries = save_storm(sessions=1, session_seconds=300)
+
+        report = BuildTriggerBenchmark(handler="batching").run(deliveries, scenario="save_storm")
+
+        assert report.unbuilt_events == 0
+        assert report.handler_errors == 0
+        assert 0 < report.builds_started < report.build_worthy_events / 5
+        assert report.trigger_latency_seconds["max"] <= 600
+        assert report.write_units > 0
+
+    def test_draft_only_stream_never_builds(self):
+        """Test that deliveries without build-worthy changes start no build"""
+        deliveries = [Delivery(0, "client-a", [content_change("doc-1", requires_build=False)])]
+
+        report = BuildTriggerBenchmark(handler="trigger").run(deliveries)
+
+        assert report.builds_started == 0
+        assert report.strategies == {"skipped": 1}
+
+    def test_short_window_builds_before_next_tick(self):
+        """Test that a batch due between ticks is built by its delayed wakeup"""
+        deliveries = [Delivery(5, "client-a", [content_change("doc-1")]),
+                      Delivery(6, "client-a", [content_change("doc-2")])]
+
+        report = BuildTriggerBenchmark(handler="batching").run(deliveries)
+
+        assert report.builds_started == 1
+        assert report.unbuilt_events == 0
+        assert report.trigger_latency_seconds["max"] < 55
@@ -0,0 +1,140 @@
+# Test Cold Start Imports
+import importlib.util
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Shared modules imported by the integration handler on the webhook path
+WEBHOOK_PATH_MODULES = [
+    "shared.composition.aws_clients",
+    "shared.composition.secrets_cache",
+    "shared.composition.webhook_pipeline",
+    "shared.composition.webhook_ingestion",
+    "shared.composition.metrics_buffer",
+    "shared.composition.pagination",
+    "shared.composition.materialized_views",
+    "shared.composition.optimized_content_cache",
+]
+
+# Cumulative import time allowed for the integration handler module, init
+# included. Measured without blackwell_core: about 270ms with secrets fetched
+# on first use, about 580ms when init prefetched them (boto3 import plus the
+# Secrets Manager client), so init that loads boto3 again exceeds the budget
+HANDLER_IMPORT_BUDGET_MS = 400
+
+# Imports the handler module as the Lambda runtime does. The stub session
+# creates real boto3 clients, so any client created during init loads boto3
+# and its service model as it does in production, but answers their calls
+# without network access
+HANDLER_IMPORT = """
+import os
+import sys
+
+from shared.composition import aws_clients
+
+
+class StubClient:
+    def batch_get_secret_value(self, SecretIdList, **kwargs):
+        return {'SecretValues': [
+            {'Name': secret_id, 'SecretString': '{"token_key": "stub"}'} for secret_id in SecretIdList
+        ]}
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: {}
+
+
+class StubSession:
+    session = None
+
+    def client(self, service_name):
+        self.real_session().client(service_name)
+        return StubClient()
+
+    def resource(self, service_name):
+        self.real_session().resource(service_name)
+        return StubClient()
+
+    def real_session(self):
+        if self.session is None:
+            import boto3
+            self.session = boto3.session.Session(
+                region_name='us-east-1', aws_access_key_id='stub', aws_secret_access_key='stub'
+            )
+        return self.session
+
+
+aws_clients._shared_clients = aws_clients.AWSClients(session=StubSession())
+os.environ.update({
+    'CLIENT_ID': 'client-a',
+    'CONTENT_CACHE_TABLE': 'content',
+    'CONTENT_EVENTS_TOPIC_ARN': 'arn:aws:sns:us-east-1:123456789012:content-events',
+    'WEBHOOK_RECEIPTS_TABLE': 'webhook-receipts',
+})
+sys.path.insert(0, 'lambda/integration_handler')
+import integration_handler
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def profile_imports(source: str) -> Tuple[Set[str], Dict[str, Tuple[int, int]]]:
+    """
+    Run source in a fresh interpreter.
+
+    Returns:
+        Names in sys.modules afterwards, and every imported module with its
+        cumulative microseconds and nesting depth
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         source + "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+    imported = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            imported[match.group(4)] = (int(match.group(2)), len(match.group(3)) // 2)
+    return set(json.loads(result.stdout.splitlines()[-1])), imported
+
+
+def slowest_imports(imported: Dict[str, Tuple[int, int]], count: int = 5, depth: int = 0) -> str:
+    """Imports at one nesting depth with the largest cumulative time, for failure messages"""
+
+    level = sorted(
+        ((cumulative, name) for name, (cumulative, nesting) in imported.items() if nesting == depth), reverse=True
+    )
+    return ", ".join(f"{name} {cumulative / 1000:.0f}ms" for cumulative, name in level[:count])
+
+
+class TestColdStartImports:
+    """Test what the integration Lambda imports at init"""
+
+    def test_shared_modules_defer_boto3(self):
+        """Test that the shared webhook path modules leave boto3 and botocore unimported until a client is created"""
+        loaded, imported = profile_imports(f"import {', '.join(WEBHOOK_PATH_MODULES)}")
+
+        assert "boto3" not in loaded, slowest_imports(imported)
+        assert "botocore" not in loaded, slowest_imports(imported)
+
+    def test_handler_import_within_budget(self):
+        """Test that importing and initializing the integration handler creates no client and fits the budget"""
+        if importlib.util.find_spec("blackwell_core") is None:
+            pytest.skip("integration handler requires blackwell_core")
+
+        loaded, imported = profile_imports(HANDLER_IMPORT)
+
+        # Clients and secrets are created on first use (or in warm_up), not during init
+        assert "boto3" not in loaded, slowest_imports(imported, depth=1)
+        cumulative, _ = imported["integration_handler"]
+        assert cumulative / 1000 <= HANDLER_IMPORT_BUDGET_MS, slowest_imports(imported, depth=1)
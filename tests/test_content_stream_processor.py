@@ -0,0 +1,68 @@
+# Test Content Stream Processor
+import importlib.util
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def processor():
+    """Import the Lambda module against mock clients and return a handler with a mock view store"""
+    spec = importlib.util.spec_from_file_location(
+        "content_stream_processor", REPO_ROOT / "lambda/content_stream_processor/content_stream_processor.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    environment = {"CLIENT_ID": "client-a", "MATERIALIZED_VIEWS_TABLE": "views", "CONTENT_CACHE_TABLE": "content"}
+    with patch.dict(os.environ, environment), patch("boto3.resource", return_value=MagicMock()):
+        spec.loader.exec_module(module)
+
+    handler = module.handler
+    handler.view_store = MagicMock()
+    handler.metrics = MagicMock()
+    return handler
+
+
+def insert_record(sequence_number: str, content_id: str) -> dict:
+    serializer = TypeSerializer()
+    item = {
+        "content_id": content_id, "client_id": "client-a", "content_type": "article",
+        "provider_name": "decap", "status": "published", "updated_at": "2025-01-01T12:00:00",
+        "data": {"id": content_id, "title": content_id, "updated_at": "2025-01-01T12:00:00"},
+    }
+    return {"dynamodb": {
+        "SequenceNumber": sequence_number,
+        "NewImage": {key: serializer.serialize(value) for key, value in item.items()},
+    }}
+
+
+class TestContentCounters:
+    """Test that counter deltas are applied exactly once across retries"""
+
+    def test_generation_failure_replays_batch_uncounted(self, processor):
+        """Test that a failure after the view updates leaves the counters for the replay"""
+        processor.view_store.bump_generation.side_effect = RuntimeError("throttled")
+
+        response = processor.lambda_handler({"Records": [insert_record("100", "a"), insert_record("200", "b")]}, None)
+
+        assert response == {"batchItemFailures": [{"itemIdentifier": "100"}]}
+        processor.view_store.apply_counter_deltas.assert_not_called()
+
+    def test_counter_failure_retries_from_first_uncounted_record(self, processor):
+        """Test that counters applied for earlier clients are not replayed"""
+        records = [insert_record("100", "a"), insert_record("200", "b")]
+        records[1]["dynamodb"]["NewImage"]["client_id"] = {"S": "client-b"}
+        processor.view_store.apply_counter_deltas.side_effect = [None, RuntimeError("throttled")]
+
+        response = processor.lambda_handler({"Records": records}, None)
+
+        assert response == {"batchItemFailures": [{"itemIdentifier": "200"}]}
+        counted = processor.view_store.apply_counter_deltas.call_args_list[0].args
+        assert counted == ("client-a", {
+            "count_total": 1, "count_type_article": 1, "count_provider_decap": 1, "count_status_published": 1
+        })
@@ -0,0 +1,70 @@
+# Test Index Keys Seed
+import importlib.util
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.composition.materialized_views import INDEX_KEYS_VERSION
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def seed():
+    """Import the Lambda module against mock clients and return a handler with a mock view store"""
+    spec = importlib.util.spec_from_file_location(
+        "index_keys_seed", REPO_ROOT / "lambda/index_keys_seed/index_keys_seed.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    environment = {"MATERIALIZED_VIEWS_TABLE": "views", "CONTENT_CACHE_TABLE": "content"}
+    with patch.dict(os.environ, environment), patch("boto3.resource", return_value=MagicMock()):
+        spec.loader.exec_module(module)
+
+    handler = module.handler
+    handler.content_table = MagicMock()
+    handler.content_table.name = "content"
+    handler.content_table.scan.return_value = {"Items": []}
+    handler.view_store = MagicMock()
+    handler.view_store.get_cache_state.return_value = (0, 0)
+    return handler
+
+
+class TestIndexKeysSeed:
+    """Test that the index key version is recorded only for tables without older content"""
+
+    def test_empty_content_table_records_version(self, seed):
+        """Test that a new deployment's empty content table is marked backfilled"""
+        response = seed.lambda_handler({"RequestType": "Create"}, None)
+
+        seed.view_store.mark_index_keys_backfilled.assert_called_once_with(INDEX_KEYS_VERSION)
+        assert response == {"PhysicalResourceId": "index-keys-seed-content", "Data": {"Seeded": "true"}}
+
+    def test_content_table_with_items_waits_for_migration(self, seed):
+        """Test that an upgraded deployment's existing content is left to the backfill migration"""
+        seed.content_table.scan.return_value = {"Items": [{"content_id": "a"}]}
+
+        response = seed.lambda_handler({"RequestType": "Create"}, None)
+
+        seed.view_store.mark_index_keys_backfilled.assert_not_called()
+        assert response["Data"] == {"Seeded": "false"}
+
+    def test_recorded_version_is_not_rewritten(self, seed):
+        """Test that an update after the version is recorded leaves the generation item alone"""
+        seed.view_store.get_cache_state.return_value = (7, INDEX_KEYS_VERSION)
+
+        response = seed.lambda_handler({"RequestType": "Update", "PhysicalResourceId": "seed-1"}, None)
+
+        seed.content_table.scan.assert_not_called()
+        seed.view_store.mark_index_keys_backfilled.assert_not_called()
+        assert response == {"PhysicalResourceId": "seed-1", "Data": {"Seeded": "false"}}
+
+    def test_delete_is_noop(self, seed):
+        """Test that removing the stack does not touch either table"""
+        response = seed.lambda_handler({"RequestType": "Delete", "PhysicalResourceId": "seed-1"}, None)
+
+        assert response == {"PhysicalResourceId": "seed-1"}
+        seed.view_store.get_cache_state.assert_not_called()
+        seed.content_table.scan.assert_not_called()
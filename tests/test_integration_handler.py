@@ -0,0 +1,243 @@
+# Test Integration Handler
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("blackwell_core", reason="integration handler requires blackwell_core")
+
+from shared.composition import aws_clients, secrets_cache
+from shared.composition.aws_clients import AWSClients
+from shared.composition.provider_adapter_registry import IProviderHandler, ProviderAdapter, ProviderAdapterRegistry
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PAGINATION_SECRET = "client-a/pagination/token-key"
+
+
+class StubSession:
+    """boto3 session stand-in handing out a new mock for every client and resource"""
+
+    def __init__(self):
+        self.created = []
+        self.missing_secrets = set()
+
+    def client(self, service_name):
+        client = MagicMock(name=service_name)
+        if service_name == "secretsmanager":
+            client.batch_get_secret_value.side_effect = lambda SecretIdList, **kwargs: {
+                "SecretValues": [
+                    {"Name": secret_id, "SecretString": json.dumps({"token_key": "stub", "webhook_secret": "stub"})}
+                    for secret_id in SecretIdList if secret_id not in self.missing_secrets
+                ],
+                "Errors": [
+                    {"SecretId": secret_id, "ErrorCode": "ResourceNotFoundException", "Message": "not found"}
+                    for secret_id in SecretIdList if secret_id in self.missing_secrets
+                ],
+            }
+        self.created.append((service_name, client))
+        return client
+
+    def resource(self, service_name):
+        resource = MagicMock(name=service_name)
+        self.created.append((service_name, resource))
+        return resource
+
+
+def stub_handler_class(name: str) -> type:
+    """IProviderHandler subclass implementing every abstract method as a no-op"""
+    abstract = getattr(IProviderHandler, "__abstractmethods__", frozenset())
+    return type(name, (IProviderHandler,), {method: lambda self, *args, **kwargs: None for method in abstract})
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Shared client registry and secrets cache backed by a stub session"""
+    stub_session = StubSession()
+    monkeypatch.setattr(aws_clients, "_shared_clients", AWSClients(session=stub_session))
+    monkeypatch.setattr(secrets_cache, "_shared_cache", None)
+    return stub_session
+
+
+def load_handler():
+    """Import the Lambda module as the runtime does and return its handler"""
+    spec = importlib.util.spec_from_file_location(
+        "integration_handler", REPO_ROOT / "lambda/integration_handler/integration_handler.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    environment = {
+        "CLIENT_ID": "client-a",
+        "CONTENT_CACHE_TABLE": "content",
+        "CONTENT_EVENTS_TOPIC_ARN": "arn:aws:sns:us-east-1:123456789012:content-events",
+        "WEBHOOK_RECEIPTS_TABLE": "webhook-receipts",
+    }
+    with patch.dict(os.environ, environment):
+        spec.loader.exec_module(module)
+    return module.handler
+
+
+@pytest.fixture
+def handler(session):
+    return load_handler()
+
+
+@pytest.fixture
+def stub_adapters(monkeypatch):
+    """Registry of two providers whose handler classes live in a stub module"""
+    module = ModuleType("stub_provider_adapters")
+    module.AlphaHandler = stub_handler_class("AlphaHandler")
+    module.BetaHandler = stub_handler_class("BetaHandler")
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+
+    registry = ProviderAdapterRegistry()
+    for provider_name, handler_class in (("alpha", "AlphaHandler"), ("beta", "BetaHandler")):
+        registry.register_adapter(ProviderAdapter(
+            provider_name=provider_name, provider_type="cms", handler_module=module.__name__,
+            handler_class=handler_class, normalization_method="normalize", webhook_events=[]
+        ))
+    return registry
+
+
+class TestSnapStartHooks:
+    """Test warming up before a snapshot and reconnecting after a restore"""
+
+    def test_warm_up_instantiates_registered_adapters(self, handler, stub_adapters):
+        """Test that warm-up loads every registered adapter into the handler cache"""
+        handler.provider_registry = stub_adapters
+
+        handler.warm_up()
+
+        cached = stub_adapters._handler_cache
+        assert sorted(cached) == ["alpha", "beta"]
+        assert type(cached["alpha"]).__name__ == "AlphaHandler"
+        assert type(cached["beta"]).__name__ == "BetaHandler"
+
+    def test_init_defers_secrets_to_warm_up(self, session):
+        """Test that init creates no Secrets Manager client and warm-up prefetches every registered secret"""
+        handler = load_handler()
+        assert "secretsmanager" not in [name for name, _ in session.created]
+
+        handler.warm_up()
+
+        fetched = {
+            secret_id
+            for call in handler.secrets.client.batch_get_secret_value.call_args_list
+            for secret_id in call.kwargs["SecretIdList"]
+        }
+        assert fetched == set(handler.secrets._registered)
+
+    def test_after_restore_recreates_clients(self, handler, session):
+        """Test that clients and tables from before the snapshot are dropped and recreated"""
+        sns_before = handler.aws.client("sns")
+        table_before = handler.content_cache.table
+
+        handler.after_restore()
+
+        assert handler.aws.client("sns") is not sns_before
+        assert handler.content_cache.table is not table_before
+        assert [name for name, _ in session.created].count("sns") == 2
+
+    def test_after_restore_refreshes_secrets(self, handler, session):
+        """Test that every registered secret is refetched with the new Secrets Manager client"""
+        secrets_before = handler.secrets.client
+
+        handler.after_restore()
+
+        assert handler.secrets.client is not secrets_before
+        refetched = {
+            secret_id
+            for call in handler.secrets.client.batch_get_secret_value.call_args_list
+            for secret_id in call.kwargs["SecretIdList"]
+        }
+        assert PAGINATION_SECRET in refetched
+        assert refetched == set(handler.secrets._registered)
+
+
+class TestPaginationSecret:
+    """Test that the continuation token key only affects content listings"""
+
+    def test_missing_secret_fails_listing_not_init(self, session):
+        """Test that the handler initializes without the pagination secret and listings answer 500"""
+        session.missing_secrets.add(PAGINATION_SECRET)
+        handler = load_handler()
+        handler.content_cache = MagicMock()
+        handler.content_cache.query_content_optimized.return_value = SimpleNamespace(
+            items=[], count=0, query_stats={}, last_evaluated_key={"content_id": "a"}
+        )
+
+        response = handler._handle_content_request_optimized({"queryStringParameters": {}}, None)
+
+        assert response["statusCode"] == 500
+        body = json.loads(response["body"])
+        assert body["error"] == "Content pagination is not configured"
+        assert PAGINATION_SECRET in body["message"]
+
+
+class TestWebhookSignature:
+    """Test that webhooks are only accepted from providers with a configured secret"""
+
+    @pytest.mark.parametrize("provider", ["snipcart", "foxy"])
+    def test_unsigned_provider_without_secret_rejected(self, session, provider):
+        """Test that a provider without a verifier is rejected when its webhook secret is missing"""
+        session.missing_secrets.add(f"client-a/webhooks/{provider}")
+        handler = load_handler()
+
+        assert handler._verify_webhook_signature(handler.webhook_pipelines.get(provider), {}, "{}") is False
+
+    @pytest.mark.parametrize("provider", ["snipcart", "foxy"])
+    def test_unsigned_provider_with_secret_accepted(self, handler, provider):
+        """Test that a provider without a verifier is accepted once its webhook secret is configured"""
+        assert handler._verify_webhook_signature(handler.webhook_pipelines.get(provider), {}, "{}") is True
+
+    def test_secrets_prefetched_for_unsigned_providers(self, handler):
+        """Test that the secrets of providers without a verifier are registered for the batch fetch"""
+        assert {"client-a/webhooks/snipcart", "client-a/webhooks/foxy"} <= set(handler.secrets._registered)
+
+
+class TestWebhookProcessing:
+    """Test storing and publishing the content of a verified webhook"""
+
+    def test_repeated_content_published_once(self, handler):
+        """Test that content repeated in one payload is stored and published in its last version"""
+        from models.composition import ContentType, UnifiedContent
+
+        first, last = (
+            UnifiedContent(id="article-1", title=title, slug="article-1", content_type=ContentType.ARTICLE,
+                           provider_type="cms", provider_name="decap",
+                           created_at=datetime(2025, 1, 1, 12, 0, 0), updated_at=datetime(2025, 1, 2, 12, 0, 0))
+            for title in ("Draft Title", "Final Title")
+        )
+        handler.webhook_pipelines = MagicMock()
+        handler.webhook_pipelines.get.return_value.normalize.return_value = [first, last]
+        handler.content_cache = MagicMock()
+        handler.content_cache.put_content_batch.return_value = SimpleNamespace(stored_ids=["article-1"], unchanged_ids=[])
+        handler._publish_filtered_content_events = MagicMock(
+            side_effect=lambda events: {event.event_id: f"message-{index}" for index, event in enumerate(events)}
+        )
+
+        result = handler.process_webhook_payload("decap", {}, {})
+
+        assert handler.content_cache.put_content_batch.call_args.args[0] == [last]
+        assert len(handler._publish_filtered_content_events.call_args.args[0]) == 1
+        assert handler.content_cache.commit_fingerprints.call_args.args[0] == [last]
+        assert result["content_processed"] == 1
+        assert result["events_published"] == 1
+
+    def test_content_events_carry_manifest_fields(self, handler):
+        """Test that content events name the slug and source file build manifests map to paths"""
+        from models.composition import ContentType, UnifiedContent
+
+        content = UnifiedContent(id="article-1", title="Title", slug="article-1", content_type=ContentType.ARTICLE,
+                                 provider_type="cms", provider_name="decap",
+                                 provider_data={"file_path": "content/blog/article-1.md"},
+                                 created_at=datetime(2025, 1, 1, 12, 0, 0), updated_at=datetime(2025, 1, 2, 12, 0, 0))
+
+        event = handler._build_content_event("content.updated", content)
+
+        assert event.content_data == {"slug": "article-1", "source_path": "content/blog/article-1.md"}
@@ -0,0 +1,55 @@
+# Test Local Cache
+from shared.composition.local_cache import LocalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLocalCache:
+    """Test the bounded LRU/TTL cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = LocalCache(max_entries=10, ttl_seconds=5)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test that stale entries are not served"""
+        clock = FakeClock()
+        cache = LocalCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 5.0
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays bounded and keeps recently read entries"""
+        cache = LocalCache(max_entries=2, ttl_seconds=5)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test that a zero TTL turns the cache off"""
+        cache = LocalCache(max_entries=10, ttl_seconds=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
@@ -0,0 +1,185 @@
+# Test Materialized Content Views
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from shared.composition import materialized_views as views_module
+from shared.composition.materialized_views import (
+    INDEX_KEYS_VERSION,
+    MaterializedViewStore,
+    apply_view_change,
+    content_counter_deltas,
+    summarize_content,
+    view_id_for_query,
+    view_ids_for_item,
+)
+
+
+def summary(content_id: str, updated_at: str):
+    return {"id": content_id, "updated_at": updated_at}
+
+
+class TestViewFunctions:
+    """Test view membership and maintenance helpers"""
+
+    def test_published_items_belong_to_provider_view(self):
+        """Test that published content appears in both views, drafts only in recent"""
+        item = {"content_type": "product", "provider_name": "shopify_basic", "status": "published"}
+
+        assert view_ids_for_item(item) == ["recent#product", "published#product#shopify_basic"]
+        assert view_ids_for_item({**item, "status": "draft"}) == ["recent#product"]
+        assert view_ids_for_item(None) == []
+
+    def test_query_shapes_map_to_views(self):
+        """Test that only listing shapes a view can answer are matched"""
+        assert view_id_for_query("product", "shopify_basic", "published") == "published#product#shopify_basic"
+        assert view_id_for_query("article", None, None) == "recent#article"
+        assert view_id_for_query("article", None, "draft") is None
+        assert view_id_for_query(None, "decap", None) is None
+
+    def test_apply_change_keeps_newest_first(self):
+        """Test that upserts replace by id and stay sorted by updated_at"""
+        entries = [summary("a", "2025-01-03"), summary("b", "2025-01-01")]
+
+        entries = apply_view_change(entries, "b", summary("b", "2025-01-05"))
+        entries = apply_view_change(entries, "c", summary("c", "2025-01-02"))
+        entries = apply_view_change(entries, "a", None)
+
+        assert [entry["id"] for entry in entries] == ["b", "c"]
+
+    def test_summary_drops_heavy_fields(self):
+        """Test that view entries stay compact"""
+        data = {"id": "a", "title": "A", "body": "<p>long</p>", "provider_data": {"raw": 1}}
+
+        assert summarize_content(data) == {"id": "a", "title": "A"}
+
+
+class TestMaterializedViewStore:
+    """Test optimistic view updates"""
+
+    def make_store(self, view=None):
+        dynamodb = MagicMock()
+        store = MaterializedViewStore("views", "content", dynamodb=dynamodb)
+        store.table = MagicMock()
+        store.content_table = MagicMock()
+        store.table.get_item.return_value = {"Item": view} if view else {}
+        return store
+
+    def test_updates_existing_view_conditionally(self):
+        """Test that the write is conditioned on the version that was read"""
+        store = self.make_store({"entries": [summary("a", "2025-01-01")], "version": 3})
+
+        store.apply_changes("client-a", "recent#article", [("b", summary("b", "2025-01-02"))])
+
+        item = store.table.put_item.call_args.kwargs["Item"]
+        assert [entry["id"] for entry in item["entries"]] == ["b", "a"]
+        assert item["version"] == 4
+        assert item["truncated"] is False
+
+    def test_builds_missing_view_from_content_table(self):
+        """Test that the first change to a view backfills existing content"""
+        store = self.make_store()
+        store.content_table.query.return_value = {
+            "Items": [{"data": summary("old", "2024-12-01")}]
+        }
+
+        store.apply_changes("client-a", "recent#article", [("new", summary("new", "2025-01-01"))])
+
+        assert store.content_table.query.call_args.kwargs["IndexName"] == "ClientContentTypeIndex"
+        item = store.table.put_item.call_args.kwargs["Item"]
+        assert [entry["id"] for entry in item["entries"]] == ["new", "old"]
+        assert item["version"] == 1
+
+    def test_published_view_uses_facet_index_once_backfilled(self):
+        """Test that published views are only built from ClientFacetIndex after the backfill"""
+        store = self.make_store()
+        store.content_table.query.return_value = {"Items": []}
+
+        store.apply_changes("client-a", "published#article#decap", [("new", summary("new", "2025-01-01"))])
+        assert store.content_table.query.call_args.kwargs["IndexName"] == "ClientContentTypeIndex"
+
+        store.table.get_item.return_value = {"Item": {"generation": 3, "index_keys_version": INDEX_KEYS_VERSION}}
+        store._load_view_source("client-a", "published#article#decap")
+        assert store.content_table.query.call_args.kwargs["IndexName"] == "ClientFacetIndex"
+
+    def test_marks_view_truncated_when_entries_drop(self, monkeypatch):
+        """Test that a full view records that content was dropped"""
+        monkeypatch.setattr(views_module, "MAX_VIEW_ENTRIES", 2)
+        store = self.make_store({
+            "entries": [summary("a", "2025-01-02"), summary("b", "2025-01-01")], "version": 1
+        })
+
+        store.apply_changes("client-a", "recent#article", [("c", summary("c", "2025-01-03"))])
+
+        item = store.table.put_item.call_args.kwargs["Item"]
+        assert [entry["id"] for entry in item["entries"]] == ["c", "a"]
+        assert item["truncated"] is True
+
+
+class TestContentCounters:
+    """Test aggregate counter maintenance"""
+
+    def item(self, **overrides):
+        fields = {"client_id": "client-a", "content_type": "article", "provider_name": "decap", "status": "draft"}
+        fields.update(overrides)
+        return fields
+
+    def test_insert_and_remove_adjust_every_group(self):
+        """Test that inserts increment and removals decrement all counters"""
+        assert content_counter_deltas(None, self.item()) == {
+            "count_total": 1, "count_type_article": 1, "count_provider_decap": 1, "count_status_draft": 1
+        }
+        assert content_counter_deltas(self.item(), None)["count_total"] == -1
+
+    def test_modify_only_moves_changed_groups(self):
+        """Test that publishing a draft moves one status count and nothing else"""
+        deltas = content_counter_deltas(self.item(), self.item(status="published"))
+
+        assert deltas == {"count_status_draft": -1, "count_status_published": 1}
+
+    def test_statistics_read_from_counter_item(self):
+        """Test that statistics are grouped from a single GetItem"""
+        store = MaterializedViewStore("views", dynamodb=MagicMock())
+        store.table = MagicMock()
+        store.table.get_item.return_value = {"Item": {
+            "client_id": "client-a", "view_id": "__stats__", "count_total": 3,
+            "count_type_article": 2, "count_type_product": 1,
+            "count_provider_decap": 3, "count_status_published": 3, "seeded_at": "2025-01-01T00:00:00",
+        }}
+
+        statistics = store.get_statistics("client-a")
+
+        assert statistics["total_items"] == 3
+        assert statistics["content_types"] == {"article": 2, "product": 1}
+        assert statistics["providers"] == {"decap": 3}
+        assert statistics["statuses"] == {"published": 3}
+
+    def test_unseeded_counters_are_not_read(self):
+        """Test that counters holding only deltas since their creation are ignored"""
+        store = MaterializedViewStore("views", dynamodb=MagicMock())
+        store.table = MagicMock()
+        store.table.get_item.return_value = {"Item": {"client_id": "client-a", "view_id": "__stats__", "count_total": 1}}
+
+        assert store.get_statistics("client-a") is None
+
+    def test_seed_is_conditional_on_counter_version(self):
+        """Test that a seed replaces delta-only counters unless deltas landed while counting"""
+        store = MaterializedViewStore("views", dynamodb=MagicMock())
+        store.table = MagicMock()
+        previous = {"count_total": 1, "count_status_draft": 1, "version": 4}
+
+        assert store.seed_statistics("client-a", {"count_total": 9, "count_status_published": 9}, previous) is True
+
+        kwargs = store.table.update_item.call_args.kwargs
+        assert kwargs["ConditionExpression"] == "version = :version AND attribute_not_exists(seeded_at)"
+        assert kwargs["ExpressionAttributeValues"][":version"] == 4
+        seeded = {
+            kwargs["ExpressionAttributeNames"][name]: kwargs["ExpressionAttributeValues"][name.replace("#", ":")]
+            for name in kwargs["ExpressionAttributeNames"]
+        }
+        assert seeded == {"count_total": 9, "count_status_draft": 0, "count_status_published": 9}
+
+        store.table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "UpdateItem"
+        )
+        assert store.seed_statistics("client-a", {"count_total": 9}, previous) is False
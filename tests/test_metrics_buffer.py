@@ -0,0 +1,80 @@
+# Test Metrics Buffer
+import json
+
+from shared.composition.metrics_buffer import MetricsBuffer
+
+
+def make_buffer():
+    lines = []
+    buffer = MetricsBuffer(
+        namespace="WebhookRouter",
+        default_dimensions={"ClientId": "client-a", "Environment": "prod"},
+        emit=lines.append,
+    )
+    return buffer, lines
+
+
+class TestMetricsBuffer:
+    """Test EMF metrics buffering"""
+
+    def test_nothing_emitted_until_flush(self):
+        """Test that recording metrics makes no output until flush"""
+        buffer, lines = make_buffer()
+        buffer.add_count("WebhookReceived", dimensions={"Provider": "decap"})
+
+        assert lines == []
+        assert buffer.flush() == 1
+        assert len(lines) == 1
+
+    def test_counters_are_summed_per_dimension_set(self):
+        """Test that counters with the same name and dimensions aggregate"""
+        buffer, lines = make_buffer()
+        buffer.add_count("ContentItemsStored", 3, {"Provider": "decap"})
+        buffer.add_count("ContentItemsStored", 4, {"Provider": "decap"})
+        buffer.add_timing("WebhookProcessingLatency", 12.5, {"Provider": "decap"})
+        buffer.add_timing("WebhookProcessingLatency", 20.0, {"Provider": "decap"})
+        buffer.flush()
+
+        document = json.loads(lines[0])
+        assert document["ContentItemsStored"] == 7
+        assert document["WebhookProcessingLatency"] == [12.5, 20.0]
+        assert document["Provider"] == "decap"
+        assert document["ClientId"] == "client-a"
+
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == "WebhookRouter"
+        assert directive["Dimensions"] == [["ClientId", "Environment", "Provider"]]
+        assert {"Name": "WebhookProcessingLatency", "Unit": "Milliseconds"} in directive["Metrics"]
+
+    def test_one_document_per_dimension_set(self):
+        """Test that different providers flush as separate EMF documents"""
+        buffer, lines = make_buffer()
+        buffer.add_count("WebhookReceived", dimensions={"Provider": "decap"})
+        buffer.add_count("WebhookReceived", dimensions={"Provider": "sanity"})
+
+        assert buffer.flush() == 2
+        assert {json.loads(line)["Provider"] for line in lines} == {"decap", "sanity"}
+
+    def test_flush_resets_buffer(self):
+        """Test that metrics are only emitted once"""
+        buffer, lines = make_buffer()
+        buffer.add_count("WebhookReceived")
+        buffer.flush()
+
+        assert buffer.flush() == 0
+        assert len(lines) == 1
+
+    def test_values_over_limit_continue_in_further_documents(self):
+        """Test that no timer value is dropped when a metric exceeds the per-document limit"""
+        buffer, lines = make_buffer()
+        for value in range(250):
+            buffer.add_timing("QueryLatency", float(value))
+        buffer.add_count("QueryCount", 250)
+
+        assert buffer.flush() == 3
+
+        documents = [json.loads(line) for line in lines]
+        assert [value for document in documents for value in document["QueryLatency"]] == [float(v) for v in range(250)]
+        assert [len(document["QueryLatency"]) for document in documents] == [100, 100, 50]
+        assert [document.get("QueryCount") for document in documents] == [250, None, None]
+        assert [len(document["_aws"]["CloudWatchMetrics"][0]["Metrics"]) for document in documents] == [2, 1, 1]
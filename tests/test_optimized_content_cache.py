@@ -0,0 +1,706 @@
+# Test Optimized Content Cache
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+from models.composition import ContentEvent, ContentType, UnifiedContent
+from shared.composition import optimized_content_cache as cache_module
+from shared.composition.materialized_views import INDEX_KEYS_VERSION
+from shared.composition.optimized_content_cache import ContentQuery, EventFilteringSystem, OptimizedContentCache
+
+
+TABLE_NAME = "test-unified-content-cache"
+
+
+def serialize_item(content_id: str, data: dict, content_type_provider: str = "article#decap") -> dict:
+    """Build a low-level DynamoDB JSON item as returned by BatchGetItem"""
+    serializer = TypeSerializer()
+    item = {"content_id": content_id, "content_type_provider": content_type_provider, "data": data}
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+def make_content(index: int, **overrides) -> UnifiedContent:
+    """Build a minimal published article for cache tests"""
+    fields = {
+        "id": f"article-{index}",
+        "title": f"Article {index}",
+        "slug": f"article-{index}",
+        "content_type": ContentType.ARTICLE,
+        "provider_type": "cms",
+        "provider_name": "decap",
+        "created_at": datetime(2025, 1, 1, 12, 0, 0),
+        "updated_at": datetime(2025, 1, 2, 12, 0, 0),
+    }
+    fields.update(overrides)
+    return UnifiedContent(**fields)
+
+
+@pytest.fixture
+def dynamodb():
+    """Patch boto3 so the cache talks to a mock DynamoDB resource"""
+    resource = MagicMock()
+    resource.batch_write_item.return_value = {"UnprocessedItems": {}}
+    with patch("boto3.resource", return_value=resource):
+        yield resource
+
+
+@pytest.fixture
+def cache(dynamodb):
+    with patch.object(cache_module.time, "sleep"):
+        yield OptimizedContentCache(table_name=TABLE_NAME)
+
+
+class TestPutContentBatch:
+    """Test BatchWriteItem-based bulk storage"""
+
+    def test_chunks_into_25_item_requests(self, cache, dynamodb):
+        """Test that 60 items are written in three BatchWriteItem calls"""
+        result = cache.put_content_batch([make_content(i) for i in range(60)], "client-a")
+
+        assert dynamodb.batch_write_item.call_count == 3
+        chunk_sizes = [
+            len(call.kwargs["RequestItems"][TABLE_NAME])
+            for call in dynamodb.batch_write_item.call_args_list
+        ]
+        assert chunk_sizes == [25, 25, 10]
+        assert len(result.stored_ids) == 60
+        assert result.failed_ids == []
+
+    def test_retries_unprocessed_items(self, cache, dynamodb):
+        """Test that UnprocessedItems are resent until DynamoDB accepts them"""
+        contents = [make_content(i) for i in range(3)]
+        unprocessed = [{"PutRequest": {"Item": {"content_id": "article-2"}}}]
+        dynamodb.batch_write_item.side_effect = [
+            {"UnprocessedItems": {TABLE_NAME: unprocessed}},
+            {"UnprocessedItems": {}},
+        ]
+
+        result = cache.put_content_batch(contents, "client-a")
+
+        assert dynamodb.batch_write_item.call_count == 2
+        retried = dynamodb.batch_write_item.call_args_list[1].kwargs["RequestItems"][TABLE_NAME]
+        assert retried == unprocessed
+        assert sorted(result.stored_ids) == ["article-0", "article-1", "article-2"]
+        assert result.write_stats["retries"] == 1
+
+    def test_reports_items_unprocessed_after_max_retries(self, cache, dynamodb):
+        """Test that persistently unprocessed items are reported as failed"""
+        unprocessed = [{"PutRequest": {"Item": {"content_id": "article-1"}}}]
+        dynamodb.batch_write_item.return_value = {"UnprocessedItems": {TABLE_NAME: unprocessed}}
+
+        result = cache.put_content_batch([make_content(0), make_content(1)], "client-a")
+
+        assert result.stored_ids == ["article-0"]
+        assert result.failed_ids == ["article-1"]
+        assert dynamodb.batch_write_item.call_count == cache_module.BATCH_MAX_RETRIES + 1
+
+    def test_duplicate_keys_collapse_to_last_write(self, cache, dynamodb):
+        """Test that duplicate keys are not sent twice in one request"""
+        first = make_content(1, title="First Title")
+        second = make_content(1, title="Second Title")
+
+        cache.put_content_batch([first, second], "client-a")
+
+        requests = dynamodb.batch_write_item.call_args.kwargs["RequestItems"][TABLE_NAME]
+        assert len(requests) == 1
+        assert requests[0]["PutRequest"]["Item"]["title_lower"] == "second title"
+
+    def test_reports_content_with_unchanged_fingerprint(self, cache, dynamodb):
+        """Test that items whose stored fingerprint matches are reported as unchanged"""
+        same, edited = make_content(1), make_content(2)
+        stored = [
+            {**serialize_item("article-1", {}), "content_fingerprint": {"S": same.render_fingerprint()}},
+            {**serialize_item("article-2", {}), "content_fingerprint": {"S": "stale"}},
+        ]
+        dynamodb.meta.client.batch_get_item.return_value = {"Responses": {TABLE_NAME: stored}}
+
+        result = cache.put_content_batch([same, edited], "client-a")
+
+        assert result.unchanged_ids == ["article-1"]
+        request = dynamodb.meta.client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]
+        assert "content_fingerprint" in request["ProjectionExpression"]
+
+        # The edit keeps its previous fingerprint until its event is published
+        written = {
+            entry["PutRequest"]["Item"]["content_id"]: entry["PutRequest"]["Item"]
+            for entry in dynamodb.batch_write_item.call_args.kwargs["RequestItems"][TABLE_NAME]
+        }
+        assert written["article-2"]["content_fingerprint"] == "stale"
+        assert written["article-2"]["pending_fingerprint"] == edited.render_fingerprint()
+        assert "pending_fingerprint" not in written["article-1"]
+
+    def test_single_put_keeps_stored_fingerprint(self, cache, dynamodb):
+        """Test that a put_content followed by an identical batch write is reported unchanged"""
+        content = make_content(1)
+        client = dynamodb.meta.client
+        client.batch_get_item.return_value = {"Responses": {TABLE_NAME: [
+            {**serialize_item("article-1", {}), "content_fingerprint": {"S": content.render_fingerprint()}}
+        ]}}
+
+        assert cache.put_content(content, "client-a") is True
+
+        # The batch write reads back what put_content stored
+        written = dynamodb.Table.return_value.put_item.call_args.kwargs["Item"]
+        assert "pending_fingerprint" not in written
+        client.batch_get_item.return_value = {"Responses": {TABLE_NAME: [
+            {**serialize_item("article-1", {}), "content_fingerprint": {"S": written["content_fingerprint"]}}
+        ]}}
+
+        result = cache.put_content_batch([make_content(1)], "client-a")
+
+        assert result.unchanged_ids == ["article-1"]
+
+    def test_commits_fingerprint_only_while_pending(self, cache, dynamodb):
+        """Test that a published fingerprint is promoted unless a newer write replaced it"""
+        table = dynamodb.Table.return_value
+        table.update_item.side_effect = [{}, ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "UpdateItem"
+        )]
+
+        committed = cache.commit_fingerprints([make_content(1), make_content(2)])
+
+        assert committed == 1
+        kwargs = table.update_item.call_args_list[0].kwargs
+        assert kwargs["Key"] == {"content_id": "article-1", "content_type_provider": "article#decap"}
+        assert kwargs["ConditionExpression"] == "pending_fingerprint = :fingerprint"
+        assert kwargs["ExpressionAttributeValues"] == {":fingerprint": make_content(1).render_fingerprint()}
+
+
+class TestRenderFingerprint:
+    """Test the render fingerprint of unified content"""
+
+    def test_ignores_sync_noise(self):
+        """Test that sync timestamps and stock counts do not change the fingerprint"""
+        original = make_content(1, inventory={"quantity": 5})
+        resent = make_content(
+            1,
+            inventory={"quantity": 4},
+            synced_at=datetime(2025, 2, 1),
+            updated_at=datetime(2025, 2, 1),
+        )
+
+        assert original.render_fingerprint() == resent.render_fingerprint()
+
+    def test_changes_with_rendered_fields(self):
+        """Test that visible edits and stock-outs change the fingerprint"""
+        original = make_content(1, inventory={"quantity": 5})
+
+        assert make_content(1, title="Renamed").render_fingerprint() != make_content(1).render_fingerprint()
+        assert make_content(1, inventory={"quantity": 0}).render_fingerprint() != original.render_fingerprint()
+
+
+class TestPublishFilteredEventsBatch:
+    """Test coalesced PublishBatch event publishing"""
+
+    @pytest.fixture
+    def sns(self):
+        client = MagicMock()
+
+        def publish_batch(TopicArn, PublishBatchRequestEntries):
+            return {
+                "Successful": [
+                    {"Id": entry["Id"], "MessageId": f"msg-{entry['Id']}"}
+                    for entry in PublishBatchRequestEntries
+                ],
+                "Failed": [],
+            }
+
+        client.publish_batch.side_effect = publish_batch
+        aws_clients = MagicMock()
+        aws_clients.client.return_value = client
+        with patch.object(cache_module, "get_aws_clients", return_value=aws_clients), \
+                patch.object(cache_module.time, "sleep"):
+            yield client
+
+    def make_event(self, index: int, content_type: ContentType = ContentType.ARTICLE) -> ContentEvent:
+        return ContentEvent(
+            event_type="content.updated",
+            content_id=f"content-{index}",
+            content_type=content_type,
+            provider_name="decap",
+            client_id="client-a",
+        )
+
+    def test_publishes_ten_entries_per_call(self, sns):
+        """Test that 23 events go out in three PublishBatch calls"""
+        events = [self.make_event(i) for i in range(23)]
+
+        message_ids = EventFilteringSystem().publish_filtered_events_batch("arn:topic", events)
+
+        assert sns.publish_batch.call_count == 3
+        assert sns.publish.call_count == 0
+        assert set(message_ids) == {event.event_id for event in events}
+
+    def test_groups_entries_by_attribute_signature(self, sns):
+        """Test that events sharing message attributes are sent together"""
+        events = [
+            self.make_event(i, ContentType.PRODUCT if i % 2 else ContentType.ARTICLE)
+            for i in range(20)
+        ]
+
+        EventFilteringSystem().publish_filtered_events_batch("arn:topic", events)
+
+        for call in sns.publish_batch.call_args_list:
+            content_types = {
+                entry["MessageAttributes"]["content_type"]["StringValue"]
+                for entry in call.kwargs["PublishBatchRequestEntries"]
+            }
+            assert len(content_types) == 1
+
+    def test_retries_only_retryable_failures(self, sns):
+        """Test that server-side failures are retried and sender faults are dropped"""
+        events = [self.make_event(i) for i in range(3)]
+        sns.publish_batch.side_effect = [
+            {
+                "Successful": [{"Id": "event-0", "MessageId": "msg-0"}],
+                "Failed": [
+                    {"Id": "event-1", "Code": "InternalError", "SenderFault": False},
+                    {"Id": "event-2", "Code": "InvalidParameter", "SenderFault": True},
+                ],
+            },
+            {"Successful": [{"Id": "event-1", "MessageId": "msg-1"}], "Failed": []},
+        ]
+
+        message_ids = EventFilteringSystem().publish_filtered_events_batch("arn:topic", events)
+
+        retried = sns.publish_batch.call_args_list[1].kwargs["PublishBatchRequestEntries"]
+        assert [entry["Id"] for entry in retried] == ["event-1"]
+        assert message_ids == {events[0].event_id: "msg-0", events[1].event_id: "msg-1"}
+
+    def test_throttled_calls_are_retried(self, sns):
+        """Test that a throttled PublishBatch call is retried"""
+        events = [self.make_event(0)]
+        sns.publish_batch.side_effect = iter([
+            ClientError({"Error": {"Code": "Throttled", "Message": "Rate exceeded"}}, "PublishBatch"),
+            {"Successful": [{"Id": "event-0", "MessageId": "msg-0"}], "Failed": []},
+        ])
+
+        message_ids = EventFilteringSystem().publish_filtered_events_batch("arn:topic", events)
+
+        assert sns.publish_batch.call_count == 2
+        assert message_ids == {events[0].event_id: "msg-0"}
+
+    def test_client_errors_fail_fast(self, sns):
+        """Test that authorization and validation errors are not retried"""
+        sns.publish_batch.side_effect = ClientError(
+            {"Error": {"Code": "AuthorizationError", "Message": "denied"}, "ResponseMetadata": {"HTTPStatusCode": 403}},
+            "PublishBatch"
+        )
+
+        message_ids = EventFilteringSystem().publish_filtered_events_batch("arn:topic", [self.make_event(0)])
+
+        assert sns.publish_batch.call_count == 1
+        assert message_ids == {}
+
+
+class TestQueryPagination:
+    """Test continuation and page filling for GSI queries"""
+
+    @pytest.fixture
+    def table(self, cache):
+        cache.table = MagicMock()
+        return cache.table
+
+    def test_resumes_from_exclusive_start_key(self, cache, table):
+        """Test that the start key is passed through and the next key returned"""
+        start_key = {"content_id": "article-9", "client_id": "client-a"}
+        table.query.return_value = {
+            "Items": [{"data": {"id": "article-10"}}],
+            "Count": 1,
+            "LastEvaluatedKey": {"content_id": "article-10"},
+        }
+
+        result = cache.query_content_optimized(
+            ContentQuery(client_id="client-a", limit=1, exclusive_start_key=start_key)
+        )
+
+        assert table.query.call_args.kwargs["ExclusiveStartKey"] == start_key
+        assert result.last_evaluated_key == {"content_id": "article-10"}
+
+    def test_fill_page_reads_until_limit_survives_filter(self, cache, table):
+        """Test that filtered-out rows do not leave the page short"""
+        table.query.side_effect = [
+            {"Items": [{"data": {"id": "a"}}], "Count": 1, "ScannedCount": 5,
+             "LastEvaluatedKey": {"content_id": "e"}},
+            {"Items": [], "Count": 0, "ScannedCount": 4,
+             "LastEvaluatedKey": {"content_id": "i"}},
+            {"Items": [{"data": {"id": "j"}}, {"data": {"id": "k"}}], "Count": 2, "ScannedCount": 3,
+             "LastEvaluatedKey": {"content_id": "k"}},
+        ]
+
+        result = cache.query_content_optimized(
+            ContentQuery(client_id="client-a", status="published", limit=3, fill_page=True)
+        )
+
+        assert [item["id"] for item in result.items] == ["a", "j", "k"]
+        assert [call.kwargs["Limit"] for call in table.query.call_args_list] == [3, 2, 2]
+        assert result.last_evaluated_key == {"content_id": "k"}
+        assert result.query_stats["scanned_count"] == 12
+
+    def test_single_request_without_fill_page(self, cache, table):
+        """Test that the default mode issues one request per page"""
+        table.query.return_value = {
+            "Items": [], "Count": 0, "LastEvaluatedKey": {"content_id": "e"}
+        }
+
+        result = cache.query_content_optimized(ContentQuery(client_id="client-a", limit=5))
+
+        assert table.query.call_count == 1
+        assert result.items == []
+        assert result.last_evaluated_key == {"content_id": "e"}
+
+
+class TestFacetQueryPlanner:
+    """Test composite sort key planning for ClientFacetIndex"""
+
+    def plan(self, cache, **fields):
+        key_condition, filter_expression = cache._plan_facet_query(
+            ContentQuery(client_id="client-a", **fields)
+        )
+        return key_condition.get_expression(), filter_expression
+
+    def test_all_facets_and_time_become_key_range(self, cache):
+        """Test that a fully specified query needs no FilterExpression"""
+        expression, filter_expression = self.plan(
+            cache,
+            content_type=ContentType.ARTICLE,
+            provider_name="decap",
+            status="published",
+            last_updated_after=datetime(2025, 1, 1),
+        )
+
+        sort_condition = expression["values"][1]
+        assert sort_condition.expression_operator == "BETWEEN"
+        assert [value for value in sort_condition.get_expression()["values"][1:]] == [
+            "article#decap#published#2025-01-01T00:00:00",
+            "article#decap#published#~",
+        ]
+        assert filter_expression is None
+
+    def test_partial_facets_use_prefix_and_filter_the_rest(self, cache):
+        """Test that predicates after the keyed prefix fall back to filters"""
+        expression, filter_expression = self.plan(
+            cache,
+            content_type=ContentType.ARTICLE,
+            provider_name="decap",
+            last_updated_after=datetime(2025, 1, 1),
+        )
+
+        sort_condition = expression["values"][1]
+        assert sort_condition.expression_operator == "begins_with"
+        assert sort_condition.get_expression()["values"][1] == "article#decap#"
+        assert filter_expression.get_expression()["values"][0].name == "updated_at"
+
+    def test_stored_items_carry_facet_key(self, cache):
+        """Test that put_content writes the composite sort key"""
+        item = cache._build_content_item(make_content(1), "client-a")
+
+        assert item["facet_key"] == "article#decap#published#2025-01-02T12:00:00"
+        assert item["type_status_key"] == "article#published#2025-01-02T12:00:00"
+
+    def test_reports_read_amplification(self, cache):
+        """Test that ScannedCount/Count is reported in query_stats"""
+        cache.table = MagicMock()
+        cache.views = MagicMock()
+        cache.views.get_cache_state.return_value = (0, INDEX_KEYS_VERSION)
+        cache.table.query.return_value = {
+            "Items": [{"data": {"id": "a"}}, {"data": {"id": "b"}}], "Count": 2, "ScannedCount": 8
+        }
+
+        result = cache.query_content_optimized(
+            ContentQuery(client_id="client-a", content_type=ContentType.ARTICLE, provider_name="decap")
+        )
+
+        assert cache.table.query.call_args.kwargs["IndexName"] == "ClientFacetIndex"
+        assert result.query_stats["read_amplification"] == 4.0
+
+
+class TestIndexKeyRouting:
+    """Test that queries only use the indexes keyed on backfilled attributes once the backfill is recorded"""
+
+    @pytest.fixture
+    def table(self, cache):
+        cache.table = MagicMock()
+        cache.table.query.return_value = {"Items": [], "Count": 0}
+        cache.views = MagicMock()
+        cache.views.get_cache_state.return_value = (0, INDEX_KEYS_VERSION)
+        return cache.table
+
+    def test_facet_queries_fall_back_until_backfilled(self, cache, table):
+        """Test that content without facet_key is still found before the backfill completes"""
+        cache.views.get_cache_state.return_value = (0, 0)
+
+        cache.query_content_optimized(
+            ContentQuery(client_id="client-a", content_type=ContentType.ARTICLE, provider_name="decap")
+        )
+
+        params = table.query.call_args.kwargs
+        assert params["IndexName"] == "ClientContentTypeIndex"
+        assert params["FilterExpression"].get_expression()["values"][0].name == "provider_name"
+
+    def test_type_and_status_are_key_conditions(self, cache, table):
+        """Test that a content type and status query filters nothing"""
+        cache.query_content_optimized(ContentQuery(
+            client_id="client-a", content_type=ContentType.ARTICLE, status="draft",
+            last_updated_after=datetime(2025, 1, 1)
+        ))
+
+        params = table.query.call_args.kwargs
+        sort_condition = params["KeyConditionExpression"].get_expression()["values"][1]
+        assert params["IndexName"] == "ClientTypeStatusIndex"
+        assert sort_condition.get_expression()["values"][1:] == ("article#draft#2025-01-01T00:00:00", "article#draft#~")
+        assert "FilterExpression" not in params
+
+    def test_status_queries_key_on_update_time(self, cache, table):
+        """Test that a status query ranges over updated_at on StatusUpdateIndex"""
+        cache.query_content_optimized(
+            ContentQuery(client_id="client-a", status="draft", last_updated_after=datetime(2025, 1, 1))
+        )
+
+        params = table.query.call_args.kwargs
+        sort_condition = params["KeyConditionExpression"].get_expression()["values"][1]
+        assert params["IndexName"] == "StatusUpdateIndex"
+        assert sort_condition.get_expression()["values"][0].name == "updated_at"
+
+    def test_continuation_stays_on_first_page_index(self, cache, table):
+        """Test that a listing begun before the backfill is not resumed on another index"""
+        cache.query_content_optimized(ContentQuery(
+            client_id="client-a", content_type=ContentType.ARTICLE, provider_name="decap",
+            exclusive_start_key={"content_id": "a", "content_type_provider": "article#decap",
+                                 "client_id": "client-a", "content_type": "article"}
+        ))
+
+        assert table.query.call_args.kwargs["IndexName"] == "ClientContentTypeIndex"
+
+
+class TestLocalReadThroughCache:
+    """Test the in-process L1 cache in front of DynamoDB reads"""
+
+    @pytest.fixture
+    def table(self, cache):
+        cache.table = MagicMock()
+        cache.table.get_item.return_value = {"Item": {"data": {"id": "article-1"}}}
+        return cache.table
+
+    def test_repeated_get_served_locally(self, cache, table):
+        """Test that a hot item is read from DynamoDB once"""
+        for _ in range(3):
+            assert cache.get_content_by_id("article-1", "article#decap") == {"id": "article-1"}
+
+        assert table.get_item.call_count == 1
+        assert cache.get_local_cache_stats()["items"]["hits"] == 2
+
+    def test_put_and_delete_invalidate(self, cache, table):
+        """Test that writes from this container are visible immediately"""
+        cache.get_content_by_id("article-1", "article#decap")
+        cache.put_content(make_content(1), "client-a")
+        cache.get_content_by_id("article-1", "article#decap")
+        cache.delete_content("article-1", "article#decap")
+        cache.get_content_by_id("article-1", "article#decap")
+
+        assert table.get_item.call_count == 3
+
+    def test_query_results_cached_until_write(self, cache, table):
+        """Test that identical queries reuse the cached page until a write"""
+        table.query.return_value = {"Items": [{"data": {"id": "a"}}], "Count": 1}
+        query = ContentQuery(client_id="client-a", content_type=ContentType.ARTICLE)
+
+        cache.query_content_optimized(query)
+        cache.query_content_optimized(ContentQuery(client_id="client-a", content_type=ContentType.ARTICLE))
+        assert table.query.call_count == 1
+
+        cache.put_content(make_content(2), "client-a")
+        cache.query_content_optimized(query)
+        assert table.query.call_count == 2
+
+    def test_batch_get_fetches_only_misses(self, cache, table, dynamodb):
+        """Test that batch reads skip keys already cached"""
+        cache.get_content_by_id("article-1", "article#decap")
+        client = dynamodb.meta.client
+        client.batch_get_item.return_value = {"Responses": {TABLE_NAME: [
+            serialize_item("article-2", {"id": "article-2"})
+        ]}}
+
+        items = cache.batch_get_content([("article-1", "article#decap"), ("article-2", "article#decap")])
+
+        keys = client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]["Keys"]
+        assert keys == [{"content_id": {"S": "article-2"}, "content_type_provider": {"S": "article#decap"}}]
+        assert [item["id"] for item in items] == ["article-1", "article-2"]
+
+
+class TestMaterializedViewReads:
+    """Test serving summary listings from materialized views"""
+
+    @pytest.fixture
+    def view_cache(self, dynamodb):
+        with patch.object(cache_module.time, "sleep"):
+            cache = OptimizedContentCache(table_name=TABLE_NAME, views_table_name="views")
+        cache.table = MagicMock()
+        cache.views = MagicMock()
+        cache.views.get_cache_state.return_value = (1, INDEX_KEYS_VERSION)
+        return cache
+
+    def test_summary_listing_reads_one_view_item(self, view_cache):
+        """Test that a complete view answers without a Query"""
+        view_cache.views.get_view.return_value = {"entries": [{"id": "a"}, {"id": "b"}], "truncated": False}
+
+        result = view_cache.query_content_optimized(ContentQuery(
+            client_id="client-a", content_type=ContentType.PRODUCT,
+            provider_name="shopify_basic", status="published", summary=True
+        ))
+
+        view_cache.views.get_view.assert_called_once_with("client-a", "published#product#shopify_basic")
+        assert view_cache.table.query.call_count == 0
+        assert result.query_stats["query_type"] == "materialized_view"
+        assert result.count == 2
+
+    def test_truncated_view_falls_back_to_query(self, view_cache):
+        """Test that an incomplete view is not served"""
+        view_cache.views.get_view.return_value = {"entries": [{"id": "a"}], "truncated": True}
+        view_cache.table.query.return_value = {
+            "Items": [{"data": {"id": "a", "body": "long"}}], "Count": 1
+        }
+
+        result = view_cache.query_content_optimized(ContentQuery(
+            client_id="client-a", content_type=ContentType.ARTICLE, summary=True
+        ))
+
+        assert view_cache.table.query.call_count == 1
+        assert result.items == [{"id": "a"}]
+
+    def test_generation_change_drops_local_caches(self, view_cache):
+        """Test that writes from other containers invalidate this container's cache"""
+        view_cache.table.get_item.return_value = {"Item": {"data": {"id": "a"}}}
+
+        view_cache.get_content_by_id("a", "article#decap")
+        view_cache.views.get_cache_state.return_value = (2, INDEX_KEYS_VERSION)
+        view_cache._generation_checked_at = 0.0
+        view_cache.get_content_by_id("a", "article#decap")
+
+        assert view_cache.table.get_item.call_count == 2
+
+
+class TestGetContentBatch:
+    """Test concurrent BatchGetItem reads with unprocessed-key retries"""
+
+    @pytest.fixture
+    def client(self, dynamodb):
+        return dynamodb.meta.client
+
+    def refs(self, count):
+        return [(f"article-{i}", "article#decap") for i in range(count)]
+
+    def test_preserves_input_order_across_chunks(self, cache, client):
+        """Test that 250 keys are read in three chunks and returned in input order"""
+        def batch_get_item(RequestItems):
+            keys = RequestItems[TABLE_NAME]["Keys"]
+            items = [serialize_item(key["content_id"]["S"], {"id": key["content_id"]["S"]}) for key in keys]
+            return {"Responses": {TABLE_NAME: list(reversed(items))}}
+
+        client.batch_get_item.side_effect = batch_get_item
+        refs = list(reversed(self.refs(250)))
+
+        result = cache.get_content_batch(refs)
+
+        assert client.batch_get_item.call_count == 3
+        assert [item["id"] for item in result.items] == [content_id for content_id, _ in refs]
+        assert result.complete
+
+    def test_retries_unprocessed_keys(self, cache, client):
+        """Test that UnprocessedKeys are requested again until served"""
+        refs = self.refs(2)
+        unprocessed_key = {"content_id": {"S": "article-1"}, "content_type_provider": {"S": "article#decap"}}
+        client.batch_get_item.side_effect = [
+            {"Responses": {TABLE_NAME: [serialize_item("article-0", {"id": "article-0"})]},
+             "UnprocessedKeys": {TABLE_NAME: {"Keys": [unprocessed_key]}}},
+            {"Responses": {TABLE_NAME: [serialize_item("article-1", {"id": "article-1"})]}},
+        ]
+
+        result = cache.get_content_batch(refs)
+
+        retried = client.batch_get_item.call_args_list[1].kwargs["RequestItems"][TABLE_NAME]["Keys"]
+        assert retried == [unprocessed_key]
+        assert [item["id"] for item in result.items] == ["article-0", "article-1"]
+        assert result.read_stats["retries"] == 1
+
+    def test_reports_keys_unprocessed_after_max_retries(self, cache, client):
+        """Test that throttled keys are reported instead of silently dropped"""
+        unprocessed_key = {"content_id": {"S": "article-0"}, "content_type_provider": {"S": "article#decap"}}
+        client.batch_get_item.return_value = {
+            "Responses": {TABLE_NAME: []},
+            "UnprocessedKeys": {TABLE_NAME: {"Keys": [unprocessed_key]}},
+        }
+
+        result = cache.get_content_batch(self.refs(1))
+
+        assert result.unprocessed_refs == [("article-0", "article#decap")]
+        assert result.missing_refs == []
+        assert not result.complete
+
+    def test_projection_fetches_only_requested_fields(self, cache, client):
+        """Test that data_fields become a ProjectionExpression"""
+        client.batch_get_item.return_value = {"Responses": {TABLE_NAME: [
+            serialize_item("article-0", {"title": "Article 0"})
+        ]}}
+
+        result = cache.get_content_batch(self.refs(2), data_fields=["title"])
+
+        request = client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]
+        assert request["ProjectionExpression"] == "content_id, content_type_provider, #data.#f0"
+        assert request["ExpressionAttributeNames"] == {"#data": "data", "#f0": "title"}
+        assert result.items == [{"title": "Article 0"}]
+        assert result.missing_refs == [("article-1", "article#decap")]
+
+
+class TestCacheStatistics:
+    """Test statistics from counters with a paginated fallback"""
+
+    def test_reads_counters_when_available(self, cache):
+        """Test that statistics cost a single counter read"""
+        cache.table = MagicMock()
+        cache.views = MagicMock()
+        cache.views.get_cache_state.return_value = (0, 0)
+        cache.views.get_statistics.return_value = {"total_items": 7, "content_types": {"article": 7}}
+
+        statistics = cache.get_cache_statistics("client-a")
+
+        assert statistics["total_items"] == 7
+        assert statistics["source"] == "counters"
+        assert cache.table.query.call_count == 0
+
+    def test_fallback_counts_follow_last_evaluated_key(self, cache):
+        """Test that the fallback count pages past 1MB instead of undercounting"""
+        cache.table = MagicMock()
+        cache.views = None
+        article = {"content_type": "article", "provider_name": "decap", "status": "published"}
+        cache.table.query.side_effect = lambda **params: (
+            {"Items": [article] * 5, "LastEvaluatedKey": {"k": 1}}
+            if "ExclusiveStartKey" not in params else {"Items": [{**article, "status": "draft"}] * 2}
+        )
+
+        statistics = cache.get_cache_statistics("client-a")
+
+        assert statistics["total_items"] == 7
+        assert statistics["content_types"] == {"article": 7}
+        assert statistics["statuses"] == {"published": 5, "draft": 2}
+        assert statistics["source"] == "count_queries"
+
+    def test_unseeded_counters_are_seeded_from_a_full_count(self, cache):
+        """Test that counters created by stream deltas are replaced by a count before being read"""
+        cache.table = MagicMock()
+        cache.views = MagicMock()
+        cache.views.get_cache_state.return_value = (0, 0)
+        cache.views.get_statistics.return_value = None
+        previous = {"view_id": "__stats__", "count_total": 1, "version": 1}
+        cache.views.get_view.return_value = previous
+        cache.table.query.return_value = {"Items": [{"content_type": "article", "provider_name": "decap", "status": "draft"}] * 3}
+
+        statistics = cache.get_cache_statistics("client-a")
+
+        assert statistics["total_items"] == 3
+        client_id, counters, seeded_over = cache.views.seed_statistics.call_args.args
+        assert counters["count_total"] == 3
+        assert seeded_over is previous
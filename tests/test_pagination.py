@@ -0,0 +1,69 @@
+# Test Pagination Tokens
+import pytest
+
+from shared.composition.pagination import (
+    InvalidPageTokenError,
+    PageTokenCodec,
+    PaginationConfigurationError,
+    signing_key_from_secret,
+)
+
+
+SCOPE = {"client_id": "client-a", "content_type": "article", "provider": None, "status": None}
+START_KEY = {"content_id": "article-42", "content_type_provider": "article#decap", "client_id": "client-a"}
+
+
+class TestPageTokenCodec:
+    """Test signed continuation tokens"""
+
+    def test_round_trip(self):
+        """Test that a token decodes back to the LastEvaluatedKey"""
+        codec = PageTokenCodec(b"secret")
+
+        token = codec.encode(START_KEY, SCOPE)
+
+        assert "article-42" not in token
+        assert codec.decode(token, SCOPE) == START_KEY
+
+    def test_no_token_at_end_of_listing(self):
+        """Test that an exhausted listing yields no token"""
+        assert PageTokenCodec(b"secret").encode(None, SCOPE) is None
+
+    def test_rejects_tampered_token(self):
+        """Test that a modified payload fails signature verification"""
+        codec = PageTokenCodec(b"secret")
+        _, signature = codec.encode(START_KEY, SCOPE).split(".")
+        forged = PageTokenCodec(b"other-secret").encode({"content_id": "x"}, SCOPE).split(".")[0]
+
+        with pytest.raises(InvalidPageTokenError):
+            codec.decode(f"{forged}.{signature}", SCOPE)
+
+    def test_rejects_token_from_other_query(self):
+        """Test that a token cannot resume a different listing"""
+        codec = PageTokenCodec(b"secret")
+        token = codec.encode(START_KEY, SCOPE)
+
+        with pytest.raises(InvalidPageTokenError):
+            codec.decode(token, {**SCOPE, "client_id": "client-b"})
+
+    @pytest.mark.parametrize("token", ["", "not-a-token", "abc.def", "...."])
+    def test_rejects_malformed_token(self, token):
+        """Test that garbage tokens raise InvalidPageTokenError"""
+        with pytest.raises(InvalidPageTokenError):
+            PageTokenCodec(b"secret").decode(token, SCOPE)
+
+
+class TestSigningKeyFromSecret:
+    """Test reading the signing key from the pagination secret"""
+
+    def test_returns_token_key(self):
+        """Test that the configured key is returned"""
+        assert signing_key_from_secret({"token_key": "k"}, "client-a/pagination/token-key") == "k"
+
+    @pytest.mark.parametrize("secret, reason", [(None, "does not exist"), ({"other": "k"}, "has no 'token_key'")])
+    def test_missing_key_is_a_configuration_error(self, secret, reason):
+        """Test that a missing secret or field names the secret instead of raising KeyError"""
+        with pytest.raises(PaginationConfigurationError, match=reason) as error:
+            signing_key_from_secret(secret, "client-a/pagination/token-key")
+
+        assert "client-a/pagination/token-key" in str(error.value)
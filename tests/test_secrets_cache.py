@@ -0,0 +1,103 @@
+# Test Shared Secrets Cache
+import json
+from unittest.mock import MagicMock
+
+from shared.composition.secrets_cache import SecretsCache, webhook_secret_id
+
+
+SANITY = webhook_secret_id("sanity", "client-a")
+SHOPIFY = webhook_secret_id("shopify_basic", "client-a")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def secrets_client(values, missing=()):
+    client = MagicMock()
+    client.batch_get_secret_value.side_effect = lambda SecretIdList, **kwargs: {
+        "SecretValues": [
+            {"Name": secret_id, "ARN": f"arn:{secret_id}", "SecretString": json.dumps(values[secret_id])}
+            for secret_id in SecretIdList if secret_id in values
+        ],
+        "Errors": [
+            {"SecretId": secret_id, "ErrorCode": "ResourceNotFoundException", "Message": "not found"}
+            for secret_id in SecretIdList if secret_id in missing
+        ],
+    }
+    return client
+
+
+class TestSecretsCache:
+    """Test prefetching and refresh-ahead of secrets"""
+
+    def test_prefetch_batches_and_serves_from_memory(self):
+        """Test that registered secrets load in one call and requests never fetch again"""
+        client = secrets_client({SANITY: {"webhook_secret": "a"}}, missing=(SHOPIFY,))
+        cache = SecretsCache(client, clock=FakeClock())
+        cache.register(SANITY, SHOPIFY)
+
+        cache.prefetch()
+
+        assert cache.get(SANITY) == {"webhook_secret": "a"}
+        assert cache.get(SHOPIFY) is None
+        assert client.batch_get_secret_value.call_count == 1
+
+    def test_prefetch_chunks_batch_get_limit(self):
+        """Test that more than 20 secrets are fetched in chunks of 20"""
+        ids = [webhook_secret_id(f"p{index}", "client-a") for index in range(25)]
+        client = secrets_client({secret_id: {} for secret_id in ids})
+        cache = SecretsCache(client, clock=FakeClock())
+        cache.register(*ids)
+
+        cache.prefetch()
+
+        assert [len(call.kwargs["SecretIdList"]) for call in client.batch_get_secret_value.call_args_list] == [20, 5]
+
+    def test_refresh_ahead_keeps_serving_cached_value(self):
+        """Test that a due entry is served while a refresh runs, and a failed refresh keeps the old value"""
+        values = {SANITY: {"webhook_secret": "old"}}
+        client = secrets_client(values)
+        clock = FakeClock()
+        cache = SecretsCache(client, ttl_seconds=900, refresh_ahead_seconds=120, clock=clock)
+        cache.register(SANITY)
+        cache.prefetch()
+
+        clock.now = 800
+        values[SANITY] = {"webhook_secret": "new"}
+        assert cache.get(SANITY) == {"webhook_secret": "old"}
+        cache._refresh_thread.join()
+        assert cache.get(SANITY) == {"webhook_secret": "new"}
+
+        clock.now = 1700
+        client.batch_get_secret_value.side_effect = RuntimeError("throttled")
+        cache.refresh_due()
+        assert cache.get(SANITY) == {"webhook_secret": "new"}
+
+    def test_refresh_all_refetches_fresh_entries(self):
+        """Test that a restore refresh refetches every secret regardless of age"""
+        values = {SANITY: {"webhook_secret": "old"}}
+        client = secrets_client(values)
+        cache = SecretsCache(client, clock=FakeClock())
+        cache.register(SANITY)
+        cache.prefetch()
+
+        values[SANITY] = {"webhook_secret": "rotated"}
+        cache.refresh_all()
+
+        assert cache.get(SANITY) == {"webhook_secret": "rotated"}
+        assert client.batch_get_secret_value.call_count == 2
+
+    def test_first_get_loads_every_registered_secret(self):
+        """Test that without a prefetch the first secret used loads all registered secrets in one call"""
+        client = secrets_client({SANITY: {"webhook_secret": "s"}, SHOPIFY: {"webhook_secret": "b"}})
+        cache = SecretsCache(client, clock=FakeClock())
+        cache.register(SANITY, SHOPIFY)
+
+        assert cache.get(SANITY) == {"webhook_secret": "s"}
+        assert cache.get(SHOPIFY) == {"webhook_secret": "b"}
+        client.batch_get_secret_value.assert_called_once()
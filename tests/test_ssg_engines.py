@@ -1,5 +1,9 @@
 # Test SSG Engine System
+import json
+from types import SimpleNamespace
+
 import pytest
+from aws_cdk import Stack
 from pydantic import ValidationError
 
 from shared.ssg import (
@@ -13,9 +17,11 @@ from shared.ssg.engines import (
     EleventyConfig,
     GatsbyConfig,
     HugoConfig,
+    JekyllConfig,
     NextJSConfig,
     NuxtConfig,
 )
+from stacks.shared.base_ssg_stack import BaseSSGStack
 
 
 class TestBuildCommand:
@@ -295,6 +301,77 @@ class TestSSGEngineConfigurations:
         assert any(t.name == "contentful_integration" for t in templates)
 
 
+    def test_buildspec_runs_build_commands(self):
+        """Test that every engine's buildspec runs its build commands"""
+        engines = (AstroConfig(), NextJSConfig(), NuxtConfig(), JekyllConfig(), GatsbyConfig(), HugoConfig())
+        for engine in engines:
+            commands = engine.get_buildspec()["phases"]["build"]["commands"]
+
+            assert commands == [cmd.command for cmd in engine.build_commands]
+
+    def test_eleventy_buildspec_renders_manifest_sources(self):
+        """Test that Eleventy renders only the manifest's sources when a complete snapshot exists"""
+        eleventy = EleventyConfig()
+        buildspec = eleventy.get_buildspec()
+        select, build, snapshot = buildspec["phases"]["build"]["commands"]
+
+        assert "BUILD_MANIFEST_URI" in select and "BUILD_OUTPUT_SNAPSHOT_URI" in select
+        assert "requires_full_rebuild" in select
+        assert "--incremental=" in build
+        assert f'rm -rf "{eleventy.output_directory}"' in build
+        for cmd in eleventy.build_commands:
+            assert cmd.command in build
+        assert "${BUILD_OUTPUT_SNAPSHOT_URI}complete" in snapshot
+        assert buildspec["env"]["variables"]["BUILD_MANIFEST_FILE"] == "build-manifest.json"
+
+    def test_buildspec_cache_is_keyed_by_lockfile(self):
+        """Test that dependency caches are restored while the lockfile is unchanged"""
+        cache = NextJSConfig().get_buildspec()["cache"]
+
+        assert cache["key"] == "nextjs-node20-$(codebuild-hash-files package-lock.json)"
+        assert cache["fallback-keys"] == ["nextjs-node20-"]
+        assert "/root/.npm/**/*" in cache["paths"]
+        assert ".next/cache/**/*" in cache["paths"]
+
+    def test_hugo_binary_comes_from_cache(self):
+        """Test that Hugo is only downloaded when the cached binary is missing"""
+        hugo = HugoConfig()
+
+        download = hugo.install_commands[0]
+        assert download.startswith("[ -x /root/.cache/hugo-bin/hugo ] ||")
+        assert "/root/.cache/hugo-bin/**/*" in hugo.get_buildspec()["cache"]["paths"]
+
+    def test_direct_buildspec_adds_engine_cache(self):
+        """Test that provider buildspecs keep their commands and gain the engine's cache directories"""
+        stack = SimpleNamespace(client_config=SimpleNamespace(service_integration=SimpleNamespace(ssg_engine="gatsby")))
+        direct = {
+            "version": "0.2",
+            "phases": {
+                "install": {"runtime-versions": {"nodejs": "18"}, "commands": ["npm ci"]},
+                "build": {"commands": ["gatsby build"]}
+            },
+            "artifacts": {"files": ["**/*"], "base-directory": "public"}
+        }
+
+        spec = json.loads(Stack().resolve(BaseSSGStack.create_direct_buildspec(stack, direct).to_build_spec()))
+
+        assert spec["phases"] == direct["phases"]
+        assert spec["cache"]["paths"] == ["/root/.npm/**/*", ".cache/**/*", "public/**/*"]
+        assert spec["cache"]["key"].startswith("gatsby-nodejs18-direct-")
+
+    def test_direct_buildspec_skips_engine_toolchain_cache(self):
+        """Test that a Hugo direct build does not cache the engine's Hugo binary directory"""
+        stack = SimpleNamespace(client_config=SimpleNamespace(service_integration=SimpleNamespace(ssg_engine="hugo")))
+        direct = {
+            "version": "0.2",
+            "phases": {"install": {"runtime-versions": {"go": "1.19"}, "commands": []}, "build": {"commands": ["hugo --minify"]}}
+        }
+
+        spec = json.loads(Stack().resolve(BaseSSGStack.create_direct_buildspec(stack, direct).to_build_spec()))
+
+        assert spec["cache"] == {"key": "hugo-go1.19-direct", "paths": ["resources/_gen/**/*"]}
+
+
 class TestStaticSiteConfig:
     """Test StaticSiteConfig model"""
 
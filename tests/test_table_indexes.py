@@ -0,0 +1,44 @@
+# Test Table Index Specifications
+from shared.composition.table_indexes import (
+    TABLE_INDEX_SPECS,
+    GlobalIndexSpec,
+    TableIndexSpec,
+    find_index_references,
+    find_missing_indexes,
+)
+
+
+class TestIndexReferences:
+    """Test index reference scanning"""
+
+    def test_finds_keyword_dict_and_constant_references(self):
+        """Test that all reference styles used by the runtime code are found"""
+        source = '\n'.join([
+            'self.CLIENT_CONTENT_TYPE_INDEX = "ClientContentTypeIndex"',
+            "table.query(IndexName='ClientActiveIndex')",
+            "params = {'IndexName': 'ProviderUpdateIndex'}",
+            "table.query(IndexName=self.CLIENT_CONTENT_TYPE_INDEX)",
+        ])
+
+        assert find_index_references(source) == [
+            "ClientActiveIndex", "ProviderUpdateIndex", "ClientContentTypeIndex"
+        ]
+
+    def test_runtime_code_only_queries_declared_indexes(self):
+        """Test that every table provisions the indexes its runtime code queries"""
+        for spec in TABLE_INDEX_SPECS.values():
+            assert find_missing_indexes(spec) == []
+
+    def test_undeclared_index_is_reported(self, tmp_path):
+        """Test that a reference to a missing index produces an error"""
+        (tmp_path / "handler.py").write_text("table.query(IndexName='MissingIndex')")
+        spec = TableIndexSpec(
+            table="example",
+            indexes=(GlobalIndexSpec(name="PresentIndex", partition_key="client_id"),),
+            source_paths=("handler.py",)
+        )
+
+        errors = find_missing_indexes(spec, root=tmp_path)
+
+        assert len(errors) == 1
+        assert "MissingIndex" in errors[0]
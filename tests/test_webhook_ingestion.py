@@ -0,0 +1,86 @@
+# Test Asynchronous Webhook Ingestion
+import io
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.composition.webhook_ingestion import WebhookIngestionQueue
+
+
+RECEIVED_AT = datetime(2025, 1, 1, 12, 0, 0)
+HEADERS = {"X-Shopify-Webhook-Id": "wh-1"}
+
+
+def make_queue(s3=None, bucket=None, inline_max_bytes=1024):
+    sqs = MagicMock()
+    sqs.send_message.return_value = {"MessageId": "m-1"}
+    return WebhookIngestionQueue(sqs, "https://sqs/queue", s3, bucket, inline_max_bytes=inline_max_bytes), sqs
+
+
+def sent_body(sqs) -> str:
+    return sqs.send_message.call_args.kwargs["MessageBody"]
+
+
+class TestWebhookIngestionQueue:
+    """Test queueing verified webhooks"""
+
+    def test_small_body_round_trips_inline(self):
+        """Test that a small body travels in the message and loads back unchanged"""
+        queue, sqs = make_queue()
+
+        message_id = queue.enqueue("shopify_basic", '{"id": 1}', HEADERS, "req-1", RECEIVED_AT)
+        envelope = queue.load(sent_body(sqs))
+
+        assert message_id == "m-1"
+        assert envelope.provider == "shopify_basic"
+        assert envelope.raw_body == '{"id": 1}'
+        assert envelope.headers == HEADERS
+        assert envelope.received_at == RECEIVED_AT
+
+    def test_large_body_spills_to_s3(self):
+        """Test that a body over the inline limit is stored in S3 and fetched on load"""
+        s3 = MagicMock()
+        queue, sqs = make_queue(s3, "payloads", inline_max_bytes=16)
+        raw_body = json.dumps({"products": ["x" * 64]})
+
+        queue.enqueue("shopify_basic", raw_body, HEADERS, "req-1", RECEIVED_AT)
+        message = json.loads(sent_body(sqs))
+        stored = s3.put_object.call_args.kwargs
+        s3.get_object.return_value = {"Body": io.BytesIO(stored["Body"])}
+
+        assert "body" not in message
+        assert message["body_s3"] == {"bucket": "payloads", "key": "webhooks/shopify_basic/2025/01/01/req-1.json"}
+        assert queue.load(sent_body(sqs)).raw_body == raw_body
+
+    def test_escaped_body_spills_by_message_size(self):
+        """Test that a body under the limit spills when JSON escaping pushes the message over it"""
+        s3 = MagicMock()
+        queue, sqs = make_queue(s3, "payloads")
+        raw_body = '{"title": "' + '\u00e9"\n' * 250 + '"}'
+        assert len(raw_body.encode("utf-8")) < 1024
+
+        queue.enqueue("shopify_basic", raw_body, HEADERS, "req-1", RECEIVED_AT)
+
+        assert "body_s3" in json.loads(sent_body(sqs))
+        assert s3.put_object.call_args.kwargs["Body"] == raw_body.encode("utf-8")
+
+    def test_inline_message_fits_the_limit(self):
+        """Test that a message sent inline never exceeds the inline limit"""
+        queue, sqs = make_queue()
+        raw_body = "\n" * 400
+
+        queue.enqueue("shopify_basic", raw_body, HEADERS, "req-1", RECEIVED_AT)
+
+        assert json.loads(sent_body(sqs))["body"] == raw_body
+        assert len(sent_body(sqs).encode("utf-8")) <= 1024
+
+    def test_large_body_without_bucket_is_rejected(self):
+        """Test that an oversized body fails loudly when no payload bucket is configured"""
+        queue, sqs = make_queue(inline_max_bytes=16)
+
+        with pytest.raises(ValueError):
+            queue.enqueue("shopify_basic", "x" * 64, HEADERS, "req-1", RECEIVED_AT)
+
+        sqs.send_message.assert_not_called()
@@ -0,0 +1,98 @@
+# Test Compiled Webhook Pipelines
+import base64
+import hashlib
+import hmac
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.composition.webhook_pipeline import (
+    CaseInsensitiveHeaders,
+    compile_webhook_pipelines,
+)
+
+
+SECRET = "s3cret"
+BODY = '{"id": 1}'
+
+
+def shopify_signature(body: str) -> str:
+    return base64.b64encode(hmac.new(SECRET.encode(), body.encode(), hashlib.sha256).digest()).decode()
+
+
+class TestCaseInsensitiveHeaders:
+    """Test the normalized header view"""
+
+    def test_lookup_ignores_case(self):
+        """Test that mixed-case lookups find lowercased API Gateway headers"""
+        headers = CaseInsensitiveHeaders({"x-github-event": "push"})
+
+        assert headers["X-GitHub-Event"] == "push"
+        assert headers.get("X-GITHUB-EVENT") == "push"
+        assert "X-Github-Event" in headers
+        assert headers.get("X-Missing", "") == ""
+
+    def test_of_reuses_normalized_headers(self):
+        """Test that already normalized headers are not copied again"""
+        headers = CaseInsensitiveHeaders({"A": "1"})
+
+        assert CaseInsensitiveHeaders.of(headers) is headers
+        assert dict(CaseInsensitiveHeaders.of({"A": "1"})) == {"a": "1"}
+
+
+class TestWebhookPipelines:
+    """Test compiled per-provider pipelines"""
+
+    def test_shopify_signature_verification(self):
+        """Test that the Shopify pipeline accepts a valid base64 HMAC and rejects a tampered body"""
+        pipeline = compile_webhook_pipelines().get("shopify_basic")
+        headers = CaseInsensitiveHeaders({"X-Shopify-Hmac-Sha256": shopify_signature(BODY)})
+
+        assert pipeline.verify(headers, BODY, SECRET) is True
+        assert pipeline.verify(headers, '{"id": 2}', SECRET) is False
+        assert pipeline.verify(CaseInsensitiveHeaders({}), BODY, SECRET) is False
+
+    def test_github_signature_requires_scheme_prefix(self):
+        """Test that GitHub signatures must carry the sha256= prefix"""
+        pipeline = compile_webhook_pipelines().get("decap")
+        digest = hmac.new(SECRET.encode(), BODY.encode(), hashlib.sha256).hexdigest()
+
+        assert pipeline.verify(CaseInsensitiveHeaders({"x-hub-signature-256": f"sha256={digest}"}), BODY, SECRET)
+        assert not pipeline.verify(CaseInsensitiveHeaders({"x-hub-signature-256": digest}), BODY, SECRET)
+
+    def test_timestamp_and_event_id_extraction(self):
+        """Test provider timestamp and event ID steps, including unparseable timestamps"""
+        pipelines = compile_webhook_pipelines()
+        sanity = pipelines.get("sanity")
+
+        headers = CaseInsensitiveHeaders({"Sanity-Webhook-Timestamp": "2025-01-01T12:00:00Z"})
+        assert sanity.timestamp(headers) == datetime(2025, 1, 1, 12, 0, 0)
+        assert sanity.timestamp(CaseInsensitiveHeaders({"sanity-webhook-timestamp": "yesterday"})) is None
+        assert sanity.event_id(headers, {"_id": "doc-1"}) == "doc-1"
+        assert pipelines.get("snipcart").event_id(headers, {"eventName": "order.completed", "createdOn": 7}) == "order.completed_7"
+
+    def test_unknown_provider_cannot_normalize(self):
+        """Test that an unknown provider gets an uncompiled stand-in that rejects its payload"""
+        pipeline = compile_webhook_pipelines().get("unknown")
+
+        assert pipeline.known is False
+        assert pipeline.verify_signature is None
+        with pytest.raises(ValueError):
+            pipeline.normalize({}, CaseInsensitiveHeaders({}))
+
+    def test_normalize_uses_adapter_once_without_second_signature_check(self):
+        """Test that normalization runs the adapter without repeating its signature check"""
+        adapter = MagicMock()
+        adapter.extract_event_type.return_value = "content.updated"
+        adapter.normalize_webhook_data_to_unified.return_value = ["content"]
+        registry = MagicMock()
+        registry.get_supported_providers.return_value = ["sanity"]
+        registry.get_handler.side_effect = lambda name: adapter if name == "sanity" else None
+
+        pipeline = compile_webhook_pipelines(registry).get("sanity")
+        headers = CaseInsensitiveHeaders({"sanity-webhook-event": "update"})
+
+        assert pipeline.normalize({"_id": "doc-1"}, headers) == ["content"]
+        adapter.extract_event_type.assert_called_once_with(headers, {"_id": "doc-1"})
+        adapter.validate_webhook_signature.assert_not_called()
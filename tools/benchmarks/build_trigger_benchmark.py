@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Build Trigger Benchmark
+
+Replays content event streams against the real BuildBatchingHandler or
+BuildTriggerHandler classes, backed by the in-memory DynamoDB, CodeBuild,
+SNS and SQS stand-ins in local_aws and a virtual clock, and reports what the
+batching logic would cost and how quickly content would go live:
+
+- builds started and a build-minutes proxy (sum of simulated build durations)
+- publish-to-trigger latency: from an event's delivery to the first
+  start_build of its client afterwards (every build renders the client's
+  current content, so that build carries the change)
+- publish-to-live latency: to the end of that build
+- DynamoDB read/write capacity units spent on the batching table
+
+Each client gets its own batching table and handler instances, as deployed
+per client stack. Content deliveries go to the selected handler; scheduler
+ticks and CodeBuild Build State Change events go to the client's
+BuildBatchingHandler, which owns those EventBridge rules, as do the delayed
+wakeup messages it queues for batches coming due between ticks. All clients
+share one CodeBuild account quota. Invocations run one at a time.
+
+Usage:
+    python tools/benchmarks/build_trigger_benchmark.py
+    python tools/benchmarks/build_trigger_benchmark.py --scenario save_storm --handler trigger
+    python tools/benchmarks/build_trigger_benchmark.py --stream recorded.jsonl --json report.json
+"""
+
+import argparse
+import heapq
+import importlib.util
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+from contextlib import ExitStack
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Dict, Any, List, Tuple
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from models.composition import ContentEvent
+from shared.composition.batch_window import percentile
+from shared.composition.metrics_buffer import MetricsBuffer
+from shared.composition.table_indexes import BUILD_BATCHING_INDEXES
+from tools.benchmarks.event_streams import SCENARIOS, Delivery, load_recorded_stream
+from tools.benchmarks.local_aws import (
+    CapacityMeter,
+    LocalBuild,
+    LocalCodeBuild,
+    LocalDynamoDBResource,
+    LocalLambdaContext,
+    LocalSNS,
+    LocalSQS,
+    LocalTable,
+    VirtualClock,
+    build_state_change_event,
+    sqs_event,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Handler name -> (Lambda source, handler class)
+HANDLERS = {
+    'batching': ('lambda/build_batching/build_batching.py', 'BuildBatchingHandler'),
+    'trigger': ('lambda/build_trigger/build_trigger.py', 'BuildTriggerHandler'),
+}
+
+BENCHMARK_START = datetime(2025, 1, 6, 9, 0, 0)
+BUILD_PROJECT_NAME = 'benchmark-composed-build'
+
+# Deployed settings of the build batching function (see integration_layer)
+SCHEDULER_TICK_SECONDS = 60
+BATCHING_TIMEOUT_SECONDS = 120
+
+WAKEUP_QUEUE_URL_PREFIX = 'https://sqs.us-east-1.amazonaws.com/000000000000/build-batch-wakeup-'
+
+_handler_modules: Dict[str, ModuleType] = {}
+
+
+def wakeup_queue_url(client_id: str) -> str:
+    return WAKEUP_QUEUE_URL_PREFIX + client_id
+
+
+def wakeup_queue_client(queue_url: str) -> str:
+    return queue_url[len(WAKEUP_QUEUE_URL_PREFIX):]
+
+
+def load_handler_module(name: str) -> ModuleType:
+    """
+    Import a handler's Lambda module from its source file.
+
+    The modules build a handler at import time, so the import runs against
+    throwaway local clients instead of boto3.
+    """
+
+    if name in _handler_modules:
+        return _handler_modules[name]
+
+    source, _ = HANDLERS[name]
+    placeholder = LocalDynamoDBResource([LocalTable('import-table', 'batch_id', 'seq')])
+    environment = {
+        'CLIENT_ID': 'import',
+        'BUILD_BATCHING_TABLE': 'import-table',
+        'BUILD_PROJECT_NAME': BUILD_PROJECT_NAME,
+        'LOG_LEVEL': os.environ.get('BENCHMARK_LOG_LEVEL', 'WARNING'),
+    }
+
+    spec = importlib.util.spec_from_file_location(f"benchmark_{Path(source).stem}", REPO_ROOT / source)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(os.environ, environment), \
+            patch('boto3.resource', return_value=placeholder), \
+            patch('boto3.client', side_effect=lambda service, **kwargs: SimpleNamespace()), \
+            patch.object(MetricsBuffer, 'flush', lambda self: None):
+        spec.loader.exec_module(module)
+
+    _handler_modules[name] = module
+    return module
+
+
+@dataclass
+class ClientStack:
+    """One client's batching table and handler instances"""
+
+    client_id: str
+    table: LocalTable
+    content_handler: Any
+    batching_handler: Any
+
+
+@dataclass
+class BenchmarkReport:
+    """Cost and latency of one stream replayed against one handler"""
+
+    scenario: str
+    handler: str
+    clients: int
+    deliveries: int
+    events: int
+    build_worthy_events: int
+    builds_started: int
+    build_minutes: float
+    events_per_build: float
+    builds_queued_for_capacity: int
+    trigger_latency_seconds: Dict[str, float] = field(default_factory=dict)
+    live_latency_seconds: Dict[str, float] = field(default_factory=dict)
+    unbuilt_events: int = 0
+    handler_errors: int = 0
+    read_units: float = 0.0
+    write_units: float = 0.0
+    dynamodb_requests: Dict[str, int] = field(default_factory=dict)
+    strategies: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p95/p99/max of latency samples in seconds"""
+
+    if not samples:
+        return {}
+    summary = {f"p{int(fraction * 100)}": percentile(samples, fraction) for fraction in (0.5, 0.9, 0.95, 0.99)}
+    summary['max'] = max(samples)
+    return {name: round(value, 1) for name, value in summary.items()}
+
+
+class BuildTriggerBenchmark:
+    """
+    Replay delivery streams through the build handlers on a virtual clock.
+
+    Example:
+        benchmark = BuildTriggerBenchmark(handler='batching', build_seconds=180)
+        report = benchmark.run(save_storm(), scenario='save_storm')
+        print(report.builds_started, report.trigger_latency_seconds)
+    """
+
+    def __init__(
+        self,
+        handler: str = 'batching',
+        build_seconds: float = 180,
+        build_jitter: float = 0.2,
+        concurrent_build_limit: int = 20,
+        latency_target_seconds: int = 600,
+        seed: int = 7
+    ):
+        if handler not in HANDLERS:
+            raise ValueError(f"Unknown handler {handler!r}, expected one of {', '.join(HANDLERS)}")
+
+        self.handler = handler
+        self.build_seconds = build_seconds
+        self.build_jitter = build_jitter
+        self.concurrent_build_limit = concurrent_build_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.seed = seed
+
+    def run(self, deliveries: List[Delivery], scenario: str = 'custom') -> BenchmarkReport:
+        """Replay deliveries and report builds, latency and capacity"""
+
+        clock = VirtualClock(BENCHMARK_START)
+        rng = random.Random(self.seed)
+        codebuild = LocalCodeBuild(clock, partial(self._build_duration, rng), self.concurrent_build_limit)
+        capacity = CapacityMeter()
+        sqs = LocalSQS(clock)
+        clients = {
+            'codebuild': codebuild,
+            'sns': LocalSNS(),
+            'sqs': sqs,
+        }
+
+        content_module = load_handler_module(self.handler)
+        batching_module = load_handler_module('batching')
+        modules = {id(module): module for module in (content_module, batching_module)}.values()
+
+        stacks: Dict[str, ClientStack] = {}
+        for client_id in sorted({delivery.client_id for delivery in deliveries}):
+            table = LocalTable(f"{client_id}-build-batches", 'batch_id', 'seq',
+                               BUILD_BATCHING_INDEXES.indexes, capacity=capacity)
+            resource = LocalDynamoDBResource([table])
+            content_handler = self._create_handler(content_module, self.handler, client_id, table, resource, clients)
+            batching_handler = (
+                content_handler if self.handler == 'batching'
+                else self._create_handler(batching_module, 'batching', client_id, table, resource, clients)
+            )
+            stacks[client_id] = ClientStack(client_id, table, content_handler, batching_handler)
+
+        # Event loop: (time, order, kind, payload); builds finish via codebuild
+        order = itertools.count()
+        queue: List[Tuple[datetime, int, str, Any]] = []
+        for delivery in deliveries:
+            heapq.heappush(queue, (BENCHMARK_START + timedelta(seconds=delivery.at_seconds), next(order), 'delivery', delivery))
+
+        last_delivery = max((delivery.at_seconds for delivery in deliveries), default=0)
+        drain_seconds = self.latency_target_seconds + 4 * self.build_seconds
+        tick_at = BENCHMARK_START
+        while tick_at <= BENCHMARK_START + timedelta(seconds=last_delivery + drain_seconds):
+            heapq.heappush(queue, (tick_at, next(order), 'tick', None))
+            tick_at += timedelta(seconds=SCHEDULER_TICK_SECONDS)
+
+        pending: Dict[str, List[datetime]] = {client_id: [] for client_id in stacks}
+        covered: List[Tuple[datetime, LocalBuild]] = []
+        builds_seen = 0
+        wakeups_seen = 0
+        errors = 0
+        strategies: Dict[str, int] = {}
+
+        with self._virtual_time(modules, clock):
+            while queue or codebuild.next_completion():
+                completion = codebuild.next_completion()
+                if completion and (not queue or completion <= queue[0][0]):
+                    clock.advance_to(completion)
+                    results = [
+                        stacks[build.client_id].batching_handler.lambda_handler(
+                            build_state_change_event(build), LocalLambdaContext(clock, BATCHING_TIMEOUT_SECONDS)
+                        )
+                        for build in codebuild.complete_due()
+                    ]
+                else:
+                    at, _, kind, payload = heapq.heappop(queue)
+                    clock.advance_to(at)
+                    if kind == 'delivery':
+                        published = clock.now
+                        result = stacks[payload.client_id].content_handler.lambda_handler(
+                            self._sns_event(payload, published), LocalLambdaContext(clock, BATCHING_TIMEOUT_SECONDS)
+                        )
+                        strategy = result.get('strategy', str(result.get('statusCode')))
+                        strategies[strategy] = strategies.get(strategy, 0) + 1
+                        if any(event.get('requires_build', True) for event in payload.events):
+                            pending[payload.client_id].append(published)
+                        results = [result]
+                    elif kind == 'wakeup':
+                        queue_url, body = payload
+                        results = [stacks[wakeup_queue_client(queue_url)].batching_handler.lambda_handler(
+                            sqs_event(queue_url, body), LocalLambdaContext(clock, BATCHING_TIMEOUT_SECONDS)
+                        )]
+                    else:
+                        results = [
+                            stack.batching_handler.lambda_handler(
+                                {'source': 'aws.events', 'detail-type': 'Scheduled Event'},
+                                LocalLambdaContext(clock, BATCHING_TIMEOUT_SECONDS)
+                            )
+                            for stack in stacks.values()
+                        ]
+
+                errors += sum(1 for result in results if result.get('statusCode', 200) >= 500)
+
+                # Builds started by this step carry every change published before them
+                for build in codebuild.builds[builds_seen:]:
+                    waiting = pending.get(build.client_id, [])
+                    covered.extend((published, build) for published in waiting if published <= build.requested_at)
+                    pending[build.client_id] = [published for published in waiting if published > build.requested_at]
+                builds_seen = len(codebuild.builds)
+
+                # Wakeups queued by this step are delivered once their delay passes
+                for visible_at, queue_url, body in sqs.messages[wakeups_seen:]:
+                    heapq.heappush(queue, (visible_at, next(order), 'wakeup', (queue_url, body)))
+                wakeups_seen = len(sqs.messages)
+
+        return self._report(scenario, deliveries, stacks, codebuild, capacity, covered, pending, errors, strategies)
+
+    def _create_handler(self, module: ModuleType, name: str, client_id: str, table: LocalTable,
+                        resource: LocalDynamoDBResource, clients: Dict[str, Any]):
+        """Construct a handler class the way its Lambda runtime would, against local clients"""
+
+        environment = {
+            'CLIENT_ID': client_id,
+            'BUILD_BATCHING_TABLE': table.name,
+            'BUILD_PROJECT_NAME': BUILD_PROJECT_NAME,
+            'LATENCY_TARGET_P95_SECONDS': str(self.latency_target_seconds),
+            'BATCH_WAKEUP_QUEUE_URL': wakeup_queue_url(client_id),
+        }
+
+        handler_class = getattr(module, HANDLERS[name][1])
+        with patch.dict(os.environ, environment), \
+                patch.object(module.boto3, 'resource', return_value=resource), \
+                patch.object(module.boto3, 'client', side_effect=lambda service, **kwargs: clients[service]), \
+                patch.object(module, 'MetricsBuffer', partial(MetricsBuffer, emit=lambda line: None)):
+            return handler_class()
+
+    def _virtual_time(self, modules, clock: VirtualClock):
+        """Point the handler modules' datetime and time.sleep at the virtual clock"""
+
+        patches = []
+        for module in modules:
+            patches.append(patch.object(module, 'datetime', clock.datetime_class))
+            if hasattr(module, 'time'):
+                patches.append(patch.object(module, 'time', SimpleNamespace(sleep=clock.sleep)))
+
+        stack = ExitStack()
+        for active_patch in patches:
+            stack.enter_context(active_patch)
+        return stack
+
+    def _build_duration(self, rng: random.Random, environment: Dict[str, str]) -> float:
+        return self.build_seconds * rng.uniform(1 - self.build_jitter, 1 + self.build_jitter)
+
+    @staticmethod
+    def _sns_event(delivery: Delivery, published: datetime) -> Dict[str, Any]:
+        """SNS invocation event carrying a delivery's content events"""
+
+        records = []
+        for fields in delivery.events:
+            event = ContentEvent(**fields, client_id=delivery.client_id, timestamp=published)
+            records.append({
+                'EventSource': 'aws:sns',
+                'Sns': {'Message': event.model_dump_json(), 'Timestamp': published.isoformat()}
+            })
+        return {'Records': records}
+
+    def _report(self, scenario, deliveries, stacks, codebuild, capacity, covered, pending, errors, strategies) -> BenchmarkReport:
+        builds = codebuild.builds
+        events = sum(len(delivery.events) for delivery in deliveries)
+        build_worthy = sum(
+            1 for delivery in deliveries for event in delivery.events if event.get('requires_build', True)
+        )
+
+        return BenchmarkReport(
+            scenario=scenario,
+            handler=self.handler,
+            clients=len(stacks),
+            deliveries=len(deliveries),
+            events=events,
+            build_worthy_events=build_worthy,
+            builds_started=len(builds),
+            build_minutes=round(sum(build.duration_seconds for build in builds) / 60, 1),
+            events_per_build=round(build_worthy / len(builds), 2) if builds else 0.0,
+            builds_queued_for_capacity=sum(1 for build in builds if build.queued_seconds > 0),
+            trigger_latency_seconds=latency_summary([
+                (build.requested_at - published).total_seconds() for published, build in covered
+            ]),
+            live_latency_seconds=latency_summary([
+                (build.finished_at - published).total_seconds() for published, build in covered
+            ]),
+            unbuilt_events=sum(len(waiting) for waiting in pending.values()),
+            handler_errors=errors,
+            read_units=round(capacity.total_read_units, 1),
+            write_units=round(capacity.total_write_units, 1),
+            dynamodb_requests=dict(sorted(capacity.requests.items())),
+            strategies=dict(sorted(strategies.items()))
+        )
+
+
+def format_reports(reports: List[BenchmarkReport]) -> str:
+    """Plain-text comparison table of benchmark reports"""
+
+    columns = [
+        ('scenario', lambda r: r.scenario),
+        ('handler', lambda r: r.handler),
+        ('events', lambda r: str(r.events)),
+        ('builds', lambda r: str(r.builds_started)),
+        ('build-min', lambda r: f"{r.build_minutes:.1f}"),
+        ('ev/build', lambda r: f"{r.events_per_build:.1f}"),
+        ('trig p50', lambda r: f"{r.trigger_latency_seconds.get('p50', 0):.0f}s"),
+        ('trig p95', lambda r: f"{r.trigger_latency_seconds.get('p95', 0):.0f}s"),
+        ('live p95', lambda r: f"{r.live_latency_seconds.get('p95', 0):.0f}s"),
+        ('unbuilt', lambda r: str(r.unbuilt_events)),
+        ('errors', lambda r: str(r.handler_errors)),
+        ('RCU', lambda r: f"{r.read_units:.0f}"),
+        ('WCU', lambda r: f"{r.write_units:.0f}"),
+    ]
+
+    rows = [[header for header, _ in columns]] + [[value(report) for _, value in columns] for report in reports]
+    widths = [max(len(row[index]) for row in rows) for index in range(len(columns))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark build batching against synthetic or recorded event streams')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS) + ['all'], default='all',
+                        help='Synthetic stream to replay (default: all)')
+    parser.add_argument('--stream', type=Path, help='Recorded stream (JSON lines) to replay instead')
+    parser.add_argument('--handler', choices=sorted(HANDLERS) + ['both'], default='both',
+                        help='Handler receiving content deliveries (default: both)')
+    parser.add_argument('--build-seconds', type=float, default=180, help='Mean simulated build duration')
+    parser.add_argument('--concurrent-builds', type=int, default=20, help='CodeBuild concurrent build quota')
+    parser.add_argument('--latency-target', type=int, default=600, help='p95 publish-to-live target in seconds')
+    parser.add_argument('--json', type=Path, help='Also write the reports as JSON to this file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    if args.stream:
+        streams = {args.stream.stem: load_recorded_stream(args.stream)}
+    elif args.scenario == 'all':
+        streams = {name: generate() for name, generate in SCENARIOS.items()}
+    else:
+        streams = {args.scenario: SCENARIOS[args.scenario]()}
+
+    handlers = sorted(HANDLERS) if args.handler == 'both' else [args.handler]
+
+    reports = []
+    for name, deliveries in streams.items():
+        for handler in handlers:
+            benchmark = BuildTriggerBenchmark(
+                handler=handler,
+                build_seconds=args.build_seconds,
+                concurrent_build_limit=args.concurrent_builds,
+                latency_target_seconds=args.latency_target
+            )
+            reports.append(benchmark.run(deliveries, scenario=name))
+
+    print(format_reports(reports))
+
+    if args.json:
+        args.json.write_text(json.dumps([report.to_dict() for report in reports], indent=2))
+        print(f"\nReports written to {args.json}")
+
+    return 1 if any(report.unbuilt_events or report.handler_errors for report in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Content Event Streams for Build Pipeline Benchmarks
+
+Synthetic SNS delivery streams modelled on the traffic the build handlers
+see in production, plus a loader for recorded streams.
+
+Each Delivery is one SNS invocation of the content handler: the events the
+integration handler published together for one webhook. Event timestamps
+are assigned when the benchmark replays the delivery.
+
+Recorded streams are JSON lines of
+    {"at": <seconds from start>, "client_id": "...", "events": [{ContentEvent fields}]}
+for instance exported from the content events topic's archive.
+"""
+
+from typing import Dict, Any, List, Optional, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import random
+
+
+@dataclass
+class Delivery:
+    """One SNS delivery of content events to a client's build handler"""
+
+    at_seconds: float
+    client_id: str
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def content_change(
+    content_id: str,
+    content_type: str = 'article',
+    provider_name: str = 'sanity',
+    event_type: str = 'content.updated',
+    requires_build: bool = True
+) -> Dict[str, Any]:
+    """ContentEvent fields of a single content change"""
+
+    return {
+        'event_type': event_type,
+        'content_id': content_id,
+        'content_type': content_type,
+        'provider_name': provider_name,
+        'requires_build': requires_build,
+        'content_data': {'slug': content_id}
+    }
+
+
+def steady_drip(
+    client_id: str = 'client-a',
+    duration_seconds: int = 4 * 3600,
+    mean_interval_seconds: float = 300,
+    documents: int = 40,
+    seed: int = 1
+) -> List[Delivery]:
+    """Editors publishing unrelated articles at random through the day"""
+
+    rng = random.Random(seed)
+    deliveries, at = [], 0.0
+
+    while True:
+        at += rng.expovariate(1 / mean_interval_seconds)
+        if at > duration_seconds:
+            return deliveries
+        document = f"article-{rng.randrange(documents)}"
+        deliveries.append(Delivery(at, client_id, [content_change(document)]))
+
+
+def bulk_import(
+    client_id: str = 'client-a',
+    items: int = 500,
+    chunk_size: int = 25,
+    duration_seconds: int = 180,
+    content_type: str = 'product',
+    provider_name: str = 'shopify_basic'
+) -> List[Delivery]:
+    """A catalogue import: many creates in quick succession, chunked per webhook"""
+
+    chunks = [range(start, min(start + chunk_size, items)) for start in range(0, items, chunk_size)]
+    spacing = duration_seconds / max(1, len(chunks))
+
+    return [
+        Delivery(
+            index * spacing,
+            client_id,
+            [
+                content_change(f"{content_type}-{item}", content_type, provider_name, 'content.created')
+                for item in chunk
+            ]
+        )
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+def save_storm(
+    client_id: str = 'client-a',
+    sessions: int = 3,
+    session_seconds: int = 900,
+    save_interval_seconds: float = 4,
+    pause_seconds: int = 1800,
+    drafts_every: int = 5,
+    seed: int = 2
+) -> List[Delivery]:
+    """
+    Editing sessions autosaving one document every few seconds.
+
+    Every drafts_every-th save is a draft revision that does not require a
+    build, as with CMSs that send draft and published webhooks.
+    """
+
+    rng = random.Random(seed)
+    deliveries = []
+
+    for session in range(sessions):
+        start = session * (session_seconds + pause_seconds)
+        document = f"article-{session}"
+        at, saves = start, 0
+        while at < start + session_seconds:
+            saves += 1
+            deliveries.append(Delivery(at, client_id, [
+                content_change(document, requires_build=saves % drafts_every != 0)
+            ]))
+            at += rng.uniform(0.5, 1.5) * save_interval_seconds
+
+    return deliveries
+
+
+def multi_client(clients: int = 8, duration_seconds: int = 2 * 3600, seed: int = 3) -> List[Delivery]:
+    """Several client sites sharing the account's CodeBuild capacity"""
+
+    rng = random.Random(seed)
+    deliveries: List[Delivery] = []
+
+    for index in range(clients):
+        client_id = f"client-{index}"
+        deliveries.extend(steady_drip(
+            client_id,
+            duration_seconds=duration_seconds,
+            mean_interval_seconds=rng.choice([60, 180, 600]),
+            seed=seed + index
+        ))
+        if index % 2 == 0:
+            offset = rng.uniform(0, duration_seconds / 2)
+            for delivery in save_storm(client_id, sessions=1, seed=seed + index):
+                deliveries.append(Delivery(offset + delivery.at_seconds, client_id, delivery.events))
+        if index % 4 == 1:
+            offset = rng.uniform(0, duration_seconds / 2)
+            for delivery in bulk_import(client_id, items=200):
+                deliveries.append(Delivery(offset + delivery.at_seconds, client_id, delivery.events))
+
+    return sorted(deliveries, key=lambda delivery: delivery.at_seconds)
+
+
+SCENARIOS: Dict[str, Callable[[], List[Delivery]]] = {
+    'steady_drip': steady_drip,
+    'bulk_import': bulk_import,
+    'save_storm': save_storm,
+    'multi_client': multi_client,
+}
+
+
+def load_recorded_stream(path: Path, client_id: Optional[str] = None) -> List[Delivery]:
+    """
+    Load a recorded delivery stream from JSON lines.
+
+    Args:
+        path: JSON lines file, one delivery per line
+        client_id: Replay every delivery for this client instead of the recorded one
+
+    Returns:
+        Deliveries ordered by time
+    """
+
+    deliveries = []
+    for line in Path(path).read_text().splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        events = [
+            {key: value for key, value in event.items() if key not in ('timestamp', 'client_id')}
+            for event in record['events']
+        ]
+        deliveries.append(Delivery(float(record['at']), client_id or record['client_id'], events))
+
+    return sorted(deliveries, key=lambda delivery: delivery.at_seconds)
@@ -0,0 +1,847 @@
+"""
+Local AWS Stand-ins for Build Pipeline Benchmarks
+
+In-memory DynamoDB, CodeBuild, SNS and SQS clients that the real build
+handlers can run against, driven by a virtual clock instead of wall time.
+
+Only the API surface the build path uses is implemented, but with real
+semantics where it matters for correctness and cost:
+
+- DynamoDB condition and update expressions (comparisons, AND/OR/NOT,
+  attribute_exists/attribute_not_exists, SET/REMOVE/ADD), failed conditions
+  raising ConditionalCheckFailedException, all-or-nothing
+  transact_write_items, Key condition queries on the table and on sparse
+  global secondary indexes built from shared.composition.table_indexes
+- Items round-trip through the DynamoDB type serializer, so floats are
+  rejected and numbers come back as Decimal like with boto3
+- Every operation meters read and write capacity units the way on-demand
+  DynamoDB bills them (4KB reads, halved when eventually consistent; 1KB
+  writes, doubled in transactions; GSI maintenance writes)
+
+CodeBuild runs builds to completion on the virtual clock, limited to the
+account's concurrent build quota, and reports each finished build so the
+benchmark can deliver its EventBridge state-change event. SQS records
+delayed messages with the virtual time they become visible.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+import itertools
+import math
+import re
+import uuid
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from shared.composition.table_indexes import PROJECTION_KEYS_ONLY, GlobalIndexSpec
+
+
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+QUERY_PAGE_BYTES = 1024 * 1024
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _client_error(code: str, operation: str, message: str = '', **extra) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': message or code}, **extra}, operation)
+
+
+def _normalize(value: Any) -> Any:
+    """Round-trip a value through the DynamoDB type system, as boto3 would"""
+    return _deserializer.deserialize(_serializer.serialize(value))
+
+
+def _value_size(value: Any) -> int:
+    """Approximate stored size of an attribute value in bytes"""
+
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (int, Decimal)):
+        return len(str(value).lstrip('-').replace('.', '')) // 2 + 2
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode('utf-8')) + _value_size(item) + 1 for key, item in value.items())
+    if isinstance(value, (list, set, tuple)):
+        return 3 + sum(_value_size(item) + 1 for item in value)
+    return len(str(value))
+
+
+def item_size(item: Optional[Dict[str, Any]]) -> int:
+    """Approximate DynamoDB item size: attribute names plus values"""
+    if not item:
+        return 0
+    return sum(len(name.encode('utf-8')) + _value_size(value) for name, value in item.items())
+
+
+def read_units(size: int, consistent: bool) -> float:
+    units = max(1, math.ceil(size / READ_UNIT_BYTES))
+    return float(units) if consistent else units / 2
+
+
+def write_units(size: int) -> float:
+    return float(max(1, math.ceil(size / WRITE_UNIT_BYTES)))
+
+
+class VirtualClock:
+    """
+    Simulated UTC time shared by the handlers and the stand-ins.
+
+    datetime_class is a drop-in for the datetime class imported by handler
+    modules, with utcnow() reading the virtual time.
+    """
+
+    def __init__(self, start: datetime):
+        self.now = start
+        clock = self
+
+        class VirtualDatetime(datetime):
+            @classmethod
+            def utcnow(cls):
+                return clock.now
+
+        self.datetime_class = VirtualDatetime
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+    def advance_to(self, moment: datetime) -> None:
+        if moment > self.now:
+            self.now = moment
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep replacement: waiting passes virtual time only"""
+        self.advance(max(0, seconds))
+
+
+@dataclass
+class CapacityMeter:
+    """Consumed read/write capacity units per operation"""
+
+    read_units: Dict[str, float] = field(default_factory=dict)
+    write_units: Dict[str, float] = field(default_factory=dict)
+    requests: Dict[str, int] = field(default_factory=dict)
+
+    def read(self, operation: str, units: float) -> None:
+        self.read_units[operation] = self.read_units.get(operation, 0) + units
+        self.requests[operation] = self.requests.get(operation, 0) + 1
+
+    def write(self, operation: str, units: float, request: bool = True) -> None:
+        self.write_units[operation] = self.write_units.get(operation, 0) + units
+        if request:
+            self.requests[operation] = self.requests.get(operation, 0) + 1
+
+    @property
+    def total_read_units(self) -> float:
+        return sum(self.read_units.values())
+
+    @property
+    def total_write_units(self) -> float:
+        return sum(self.write_units.values())
+
+
+# ---------------------------------------------------------------------------
+# Expressions
+# ---------------------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(
+        <>|<=|>=|=|<|>|\(|\)|,|\+|-
+        |[:#]?[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_#][A-Za-z0-9_]*)*
+    )""", re.VERBOSE)
+
+_COMPARATORS = {
+    '=': lambda left, right: left == right,
+    '<>': lambda left, right: left != right,
+    '<': lambda left, right: left < right,
+    '<=': lambda left, right: left <= right,
+    '>': lambda left, right: left > right,
+    '>=': lambda left, right: left >= right,
+}
+
+_MISSING = object()
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported expression syntax at: {expression[position:]!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+
+class _ExpressionContext:
+    """Attribute name/value placeholders of one request"""
+
+    def __init__(self, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]]):
+        self.names = names or {}
+        self.values = {key: _normalize(value) for key, value in (values or {}).items()}
+
+    def path(self, token: str) -> List[str]:
+        return [self.names.get(part, part) for part in token.split('.')]
+
+    def value(self, token: str) -> Any:
+        if token not in self.values:
+            raise _client_error('ValidationException', 'Expression', f"Missing value for {token}")
+        return self.values[token]
+
+
+def _resolve(item: Dict[str, Any], path: List[str]) -> Any:
+    current: Any = item
+    for part in path:
+        if not isinstance(current, dict) or part not in current:
+            return _MISSING
+        current = current[part]
+    return current
+
+
+class _ConditionParser:
+    """Recursive-descent evaluator for condition expressions"""
+
+    def __init__(self, expression: str, context: _ExpressionContext):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.context = context
+
+    def evaluate(self, item: Dict[str, Any]) -> bool:
+        self.position = 0
+        result = self._or(item)
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected token {self.tokens[self.position]!r}")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self, expected: Optional[str] = None) -> str:
+        token = self._peek()
+        if token is None or (expected and token.upper() != expected):
+            raise ValueError(f"Expected {expected or 'token'}, found {token!r}")
+        self.position += 1
+        return token
+
+    def _or(self, item) -> bool:
+        result = self._and(item)
+        while (self._peek() or '').upper() == 'OR':
+            self._take()
+            right = self._and(item)
+            result = result or right
+        return result
+
+    def _and(self, item) -> bool:
+        result = self._not(item)
+        while (self._peek() or '').upper() == 'AND':
+            self._take()
+            right = self._not(item)
+            result = result and right
+        return result
+
+    def _not(self, item) -> bool:
+        if (self._peek() or '').upper() == 'NOT':
+            self._take()
+            return not self._not(item)
+        return self._primary(item)
+
+    def _primary(self, item) -> bool:
+        token = self._take()
+
+        if token == '(':
+            result = self._or(item)
+            self._take(')')
+            return result
+
+        if token in ('attribute_exists', 'attribute_not_exists'):
+            self._take('(')
+            exists = _resolve(item, self.context.path(self._take())) is not _MISSING
+            self._take(')')
+            return exists if token == 'attribute_exists' else not exists
+
+        if token == 'begins_with':
+            self._take('(')
+            value = self._operand(item, self._take())
+            self._take(',')
+            prefix = self._operand(item, self._take())
+            self._take(')')
+            return isinstance(value, str) and isinstance(prefix, str) and value.startswith(prefix)
+
+        left = self._operand(item, token)
+        comparator = self._take()
+        if comparator not in _COMPARATORS:
+            raise ValueError(f"Unsupported comparator {comparator!r}")
+        right = self._operand(item, self._take())
+
+        if left is _MISSING or right is _MISSING or type(left) is not type(right):
+            return comparator == '<>' and left is not _MISSING and right is not _MISSING
+        return _COMPARATORS[comparator](left, right)
+
+    def _operand(self, item, token: str) -> Any:
+        if token.startswith(':'):
+            return self.context.value(token)
+        return _resolve(item, self.context.path(token))
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses"""
+
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _set_path(item: Dict[str, Any], path: List[str], value: Any) -> None:
+    target = item
+    for part in path[:-1]:
+        target = target.setdefault(part, {})
+    target[path[-1]] = value
+
+
+def _remove_path(item: Dict[str, Any], path: List[str]) -> None:
+    target = item
+    for part in path[:-1]:
+        target = target.get(part, {})
+    if isinstance(target, dict):
+        target.pop(path[-1], None)
+
+
+def _apply_update(item: Dict[str, Any], expression: str, context: _ExpressionContext) -> List[str]:
+    """
+    Apply an update expression to item in place.
+
+    Returns:
+        Top-level attribute names the expression touched
+    """
+
+    touched: List[str] = []
+    clauses = re.split(r'\b(SET|REMOVE|ADD|DELETE)\b', expression, flags=re.IGNORECASE)
+
+    def operand(token: str) -> Any:
+        token = token.strip()
+        if token.startswith(':'):
+            return context.value(token)
+        function = re.fullmatch(r'(if_not_exists|list_append)\((.*)\)', token)
+        if function:
+            first, second = _split_top_level(function.group(2))
+            if function.group(1) == 'if_not_exists':
+                current = _resolve(item, context.path(first))
+                return operand(second) if current is _MISSING else current
+            return list(operand(first)) + list(operand(second))
+        value = _resolve(item, context.path(token))
+        if value is _MISSING:
+            raise _client_error('ValidationException', 'UpdateItem',
+                                f"The provided expression refers to an attribute that does not exist: {token}")
+        return value
+
+    for keyword, body in zip(clauses[1::2], clauses[2::2]):
+        keyword = keyword.upper()
+        for action in _split_top_level(body):
+            if keyword == 'SET':
+                target, value_expression = (part.strip() for part in action.split('=', 1))
+                arithmetic = re.fullmatch(r'(.+?)\s*([+-])\s*(.+)', value_expression)
+                if arithmetic and '(' not in value_expression:
+                    left, right = operand(arithmetic.group(1)), operand(arithmetic.group(3))
+                    value = left + right if arithmetic.group(2) == '+' else left - right
+                else:
+                    value = operand(value_expression)
+                path = context.path(target)
+                _set_path(item, path, value)
+            elif keyword == 'REMOVE':
+                path = context.path(action)
+                _remove_path(item, path)
+            elif keyword == 'ADD':
+                target, value_token = action.split()
+                path = context.path(target)
+                increment = context.value(value_token)
+                current = _resolve(item, path)
+                if isinstance(increment, set):
+                    value = (set() if current is _MISSING else set(current)) | increment
+                else:
+                    value = (Decimal(0) if current is _MISSING else current) + increment
+                _set_path(item, path, value)
+            else:
+                target, value_token = action.split()
+                path = context.path(target)
+                current = _resolve(item, path)
+                if current is not _MISSING:
+                    _set_path(item, path, set(current) - context.value(value_token))
+            touched.append(path[0])
+
+    return touched
+
+
+def _evaluate_key_condition(condition, item: Dict[str, Any]) -> bool:
+    """Evaluate a boto3.dynamodb.conditions key condition against an item"""
+
+    expression = condition.get_expression()
+    operator, values = expression['operator'], expression['values']
+
+    if operator == 'AND':
+        return all(_evaluate_key_condition(part, item) for part in values)
+
+    current = item.get(values[0].name, _MISSING)
+    operands = [_normalize(value) for value in values[1:]]
+    if current is _MISSING or any(type(current) is not type(value) for value in operands):
+        return False
+    if operator == 'BETWEEN':
+        return operands[0] <= current <= operands[1]
+    if operator == 'begins_with':
+        return current.startswith(operands[0])
+    return _COMPARATORS[operator](current, operands[0])
+
+
+# ---------------------------------------------------------------------------
+# DynamoDB
+# ---------------------------------------------------------------------------
+
+class _BatchWriter:
+    """Table.batch_writer() stand-in; writes are billed like BatchWriteItem"""
+
+    # Items per BatchWriteItem request the boto3 batch writer flushes
+    FLUSH_AMOUNT = 25
+
+    def __init__(self, table: 'LocalTable'):
+        self.table = table
+        self.buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._flush()
+        return False
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self.table._write(Item, operation='BatchWriteItem', request=False)
+        self._buffer()
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self.table._delete(Key, operation='BatchWriteItem', request=False)
+        self._buffer()
+
+    def _buffer(self) -> None:
+        self.buffered += 1
+        if self.buffered == self.FLUSH_AMOUNT:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.buffered:
+            requests = self.table.capacity.requests
+            requests['BatchWriteItem'] = requests.get('BatchWriteItem', 0) + 1
+            self.buffered = 0
+
+
+class _TableMeta:
+    def __init__(self, client: 'LocalDynamoDBClient'):
+        self.client = client
+
+
+class LocalTable:
+    """
+    In-memory stand-in for a boto3 DynamoDB Table resource.
+
+    Example:
+        table = LocalTable('batches', 'batch_id', 'seq', BUILD_BATCHING_INDEXES.indexes)
+        table.put_item(Item={'batch_id': 'b1', 'seq': 0, 'status': 'active'})
+    """
+
+    def __init__(
+        self,
+        name: str,
+        partition_key: str,
+        sort_key: Optional[str] = None,
+        indexes: Tuple[GlobalIndexSpec, ...] = (),
+        capacity: Optional[CapacityMeter] = None,
+        client: Optional['LocalDynamoDBClient'] = None
+    ):
+        self.name = name
+        self.partition_key = partition_key
+        self.sort_key = sort_key
+        self.indexes = {index.name: index for index in indexes}
+        self.capacity = capacity or CapacityMeter()
+        self.items: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self.meta = _TableMeta(client or LocalDynamoDBClient({self.name: self}))
+
+    # Item API -------------------------------------------------------------
+
+    def get_item(self, Key: Dict[str, Any], ConsistentRead: bool = False, ProjectionExpression: Optional[str] = None,
+                 ExpressionAttributeNames: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        item = self.items.get(self._key(Key))
+        self.capacity.read('GetItem', read_units(item_size(item), ConsistentRead))
+        if item is None:
+            return {}
+        return {'Item': self._project(item, ProjectionExpression, ExpressionAttributeNames)}
+
+    def put_item(self, Item: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                 ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                 ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        self._check(self._key(Item), 'PutItem', ConditionExpression, ExpressionAttributeNames,
+                    ExpressionAttributeValues, billed_size=item_size(Item))
+        self._write(Item, operation='PutItem')
+        return {}
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: str, ConditionExpression: Optional[str] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                    ReturnValues: str = 'NONE', **kwargs) -> Dict[str, Any]:
+        key = self._key(Key)
+        self._check(key, 'UpdateItem', ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues)
+
+        previous = self.items.get(key)
+        updated = _normalize(previous) if previous else _normalize(Key)
+        touched = _apply_update(updated, UpdateExpression,
+                                _ExpressionContext(ExpressionAttributeNames, ExpressionAttributeValues))
+        self._write(updated, operation='UpdateItem', previous=previous)
+
+        if ReturnValues == 'ALL_NEW':
+            return {'Attributes': _normalize(updated)}
+        if ReturnValues == 'ALL_OLD':
+            return {'Attributes': _normalize(previous)} if previous else {}
+        if ReturnValues in ('UPDATED_NEW', 'UPDATED_OLD'):
+            source = updated if ReturnValues == 'UPDATED_NEW' else (previous or {})
+            return {'Attributes': {name: _normalize(source[name]) for name in touched if name in source}}
+        return {}
+
+    def delete_item(self, Key: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        key = self._key(Key)
+        self._check(key, 'DeleteItem', ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues)
+        self._delete(Key, operation='DeleteItem')
+        return {}
+
+    def query(self, KeyConditionExpression, IndexName: Optional[str] = None, Limit: Optional[int] = None,
+              ExclusiveStartKey: Optional[Dict[str, Any]] = None, ScanIndexForward: bool = True,
+              ConsistentRead: bool = False, **kwargs) -> Dict[str, Any]:
+        if IndexName:
+            if IndexName not in self.indexes:
+                raise _client_error('ValidationException', 'Query',
+                                    f"The table does not have the specified index: {IndexName}")
+            index = self.indexes[IndexName]
+            partition, sort = index.partition_key, index.sort_key
+        else:
+            index, partition, sort = None, self.partition_key, self.sort_key
+
+        # Global secondary indexes are sparse: items without the index keys are not in them
+        required = [partition] + ([sort] if sort else [])
+        candidates = [
+            item for item in self.items.values()
+            if all(name in item for name in required) and _evaluate_key_condition(KeyConditionExpression, item)
+        ]
+        candidates.sort(key=lambda item: (item.get(sort, 0) if sort else 0, self._key(item)),
+                        reverse=not ScanIndexForward)
+
+        if ExclusiveStartKey:
+            start = self._key(ExclusiveStartKey)
+            positions = [i for i, item in enumerate(candidates) if self._key(item) == start]
+            candidates = candidates[positions[0] + 1:] if positions else candidates
+
+        page, page_bytes = [], 0
+        for item in candidates:
+            if (Limit and len(page) >= Limit) or page_bytes >= QUERY_PAGE_BYTES:
+                break
+            page.append(item)
+            page_bytes += item_size(self._index_item(item, index))
+
+        self.capacity.read('Query', read_units(page_bytes, ConsistentRead and index is None))
+
+        response: Dict[str, Any] = {
+            'Items': [_normalize(self._index_item(item, index)) for item in page],
+            'Count': len(page)
+        }
+        if len(page) < len(candidates):
+            last = page[-1]
+            key_names = {self.partition_key, self.sort_key, partition, sort} - {None}
+            response['LastEvaluatedKey'] = {name: _normalize(last[name]) for name in key_names if name in last}
+        return response
+
+    def batch_writer(self, **kwargs) -> _BatchWriter:
+        return _BatchWriter(self)
+
+    # Internals ------------------------------------------------------------
+
+    def _key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        sort_value = _normalize(item[self.sort_key]) if self.sort_key else None
+        return (_normalize(item[self.partition_key]), sort_value)
+
+    def _check(self, key, operation: str, condition: Optional[str], names, values, billed_size: int = 0) -> None:
+        if not condition:
+            return
+        current = self.items.get(key) or {}
+        if not _ConditionParser(condition, _ExpressionContext(names, values)).evaluate(current):
+            # Failed conditional writes still consume write capacity
+            self.capacity.write(operation, write_units(max(billed_size, item_size(current))))
+            raise _client_error('ConditionalCheckFailedException', operation, 'The conditional request failed')
+
+    def _index_item(self, item: Dict[str, Any], index: Optional[GlobalIndexSpec]) -> Dict[str, Any]:
+        if index is None or index.projection != PROJECTION_KEYS_ONLY:
+            return item
+        names = {self.partition_key, self.sort_key, index.partition_key, index.sort_key} - {None}
+        return {name: item[name] for name in names if name in item}
+
+    def _project(self, item: Dict[str, Any], projection: Optional[str], names) -> Dict[str, Any]:
+        if not projection:
+            return _normalize(item)
+        attributes = [(names or {}).get(name.strip(), name.strip()) for name in projection.split(',')]
+        return {name: _normalize(item[name]) for name in attributes if name in item}
+
+    def _index_writes(self, previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]) -> float:
+        """Write units spent maintaining global secondary indexes"""
+
+        units = 0.0
+        for index in self.indexes.values():
+            keys = [index.partition_key] + ([index.sort_key] if index.sort_key else [])
+            before = previous is not None and all(name in previous for name in keys)
+            after = current is not None and all(name in current for name in keys)
+            if before and after:
+                moved = any(previous[name] != current[name] for name in keys)
+                units += 2 if moved else (0 if index.projection == PROJECTION_KEYS_ONLY else 1)
+            elif before or after:
+                units += 1
+        return units
+
+    def _write(self, item: Dict[str, Any], operation: str, previous: Optional[Dict[str, Any]] = None,
+               multiplier: float = 1, request: bool = True) -> None:
+        stored = _normalize(item)
+        key = self._key(stored)
+        previous = previous if previous is not None else self.items.get(key)
+        units = write_units(max(item_size(stored), item_size(previous))) + self._index_writes(previous, stored)
+        self.capacity.write(operation, units * multiplier, request)
+        self.items[key] = stored
+
+    def _delete(self, key_item: Dict[str, Any], operation: str, request: bool = True) -> None:
+        key = self._key(key_item)
+        previous = self.items.pop(key, None)
+        self.capacity.write(operation, write_units(item_size(previous)) + self._index_writes(previous, None), request)
+
+
+class LocalDynamoDBClient:
+    """Low-level client stand-in: transactions over LocalTables"""
+
+    def __init__(self, tables: Dict[str, LocalTable]):
+        self.tables = tables
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        operations = []
+        reasons = []
+
+        # All conditions are checked before anything is written
+        for entry in TransactItems:
+            (action, request), = entry.items()
+            table = self.tables[request['TableName']]
+            if action == 'Put':
+                target = {name: _deserializer.deserialize(value) for name, value in request['Item'].items()}
+            else:
+                target = {name: _deserializer.deserialize(value) for name, value in request['Key'].items()}
+
+            values = {
+                name: _deserializer.deserialize(value)
+                for name, value in request.get('ExpressionAttributeValues', {}).items()
+            }
+            condition = request.get('ConditionExpression')
+            current = table.items.get(table._key(target)) or {}
+            passed = not condition or _ConditionParser(
+                condition, _ExpressionContext(request.get('ExpressionAttributeNames'), values)
+            ).evaluate(current)
+
+            reasons.append({'Code': 'None' if passed else 'ConditionalCheckFailed'})
+            operations.append((action, table, target, request, values))
+
+        if any(reason['Code'] != 'None' for reason in reasons):
+            for _, table, target, _, _ in operations:
+                table.capacity.write('TransactWriteItems', 2 * write_units(item_size(target)), request=False)
+            raise _client_error('TransactionCanceledException', 'TransactWriteItems',
+                                'Transaction cancelled', CancellationReasons=reasons)
+
+        for action, table, target, request, values in operations:
+            if action == 'Put':
+                table._write(target, operation='TransactWriteItems', multiplier=2, request=False)
+            elif action == 'Delete':
+                previous = table.items.pop(table._key(target), None)
+                table.capacity.write('TransactWriteItems', 2 * write_units(item_size(previous)), request=False)
+            elif action == 'Update':
+                previous = table.items.get(table._key(target))
+                updated = _normalize(previous) if previous else dict(target)
+                _apply_update(updated, request['UpdateExpression'],
+                              _ExpressionContext(request.get('ExpressionAttributeNames'), values))
+                table._write(updated, operation='TransactWriteItems', previous=previous, multiplier=2, request=False)
+
+        for table in {id(table): table for _, table, _, _, _ in operations}.values():
+            table.capacity.requests['TransactWriteItems'] = table.capacity.requests.get('TransactWriteItems', 0) + 1
+        return {}
+
+
+class LocalDynamoDBResource:
+    """boto3.resource('dynamodb') stand-in over a fixed set of tables"""
+
+    def __init__(self, tables: List[LocalTable]):
+        self.meta = _TableMeta(LocalDynamoDBClient({table.name: table for table in tables}))
+        for table in tables:
+            table.meta = self.meta
+
+    def Table(self, name: str) -> LocalTable:
+        return self.meta.client.tables[name]
+
+
+# ---------------------------------------------------------------------------
+# CodeBuild, SNS
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LocalBuild:
+    """A simulated CodeBuild build"""
+
+    build_id: str
+    project_name: str
+    client_id: str
+    requested_at: datetime
+    duration_seconds: float
+    environment: Dict[str, str]
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def queued_seconds(self) -> float:
+        return (self.started_at - self.requested_at).total_seconds() if self.started_at else 0.0
+
+
+class LocalCodeBuild:
+    """
+    CodeBuild stand-in running builds on the virtual clock.
+
+    Builds beyond the concurrent build quota queue until a running build
+    finishes. The benchmark's event loop advances the clock to
+    next_completion() and collects finished builds with complete_due().
+    """
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        duration_model: Callable[[Dict[str, str]], float],
+        concurrent_build_limit: int = 20
+    ):
+        self.clock = clock
+        self.duration_model = duration_model
+        self.concurrent_build_limit = concurrent_build_limit
+        self.builds: List[LocalBuild] = []
+        self._queue: List[LocalBuild] = []
+        self._running: List[LocalBuild] = []
+
+    def start_build(self, projectName: str, environmentVariablesOverride: Optional[List[Dict[str, str]]] = None,
+                    **kwargs) -> Dict[str, Any]:
+        environment = {variable['name']: variable['value'] for variable in environmentVariablesOverride or []}
+        build = LocalBuild(
+            build_id=f"{projectName}:{uuid.uuid4()}",
+            project_name=projectName,
+            client_id=environment.get('CLIENT_ID', ''),
+            requested_at=self.clock.now,
+            duration_seconds=self.duration_model(environment),
+            environment=environment
+        )
+        self.builds.append(build)
+        self._queue.append(build)
+        self._start_queued()
+        return {'build': {'id': build.build_id, 'buildStatus': 'IN_PROGRESS'}}
+
+    def next_completion(self) -> Optional[datetime]:
+        """Finish time of the earliest running build"""
+        return min((build.finished_at for build in self._running), default=None)
+
+    def complete_due(self) -> List[LocalBuild]:
+        """Finish builds due at the current virtual time and start queued ones"""
+
+        finished = [build for build in self._running if build.finished_at <= self.clock.now]
+        self._running = [build for build in self._running if build.finished_at > self.clock.now]
+        self._start_queued()
+        return finished
+
+    def _start_queued(self) -> None:
+        while self._queue and len(self._running) < self.concurrent_build_limit:
+            build = self._queue.pop(0)
+            build.started_at = self.clock.now
+            build.finished_at = self.clock.now + timedelta(seconds=build.duration_seconds)
+            self._running.append(build)
+
+
+class LocalSNS:
+    """SNS stand-in recording published messages"""
+
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+
+    def publish(self, **kwargs) -> Dict[str, Any]:
+        self.messages.append(kwargs)
+        return {'MessageId': str(uuid.uuid4())}
+
+
+class LocalSQS:
+    """SQS stand-in recording sent messages with the time they become visible"""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.messages: List[Tuple[datetime, str, str]] = []
+
+    def send_message(self, QueueUrl: str, MessageBody: str, DelaySeconds: int = 0, **kwargs) -> Dict[str, Any]:
+        self.messages.append((self.clock.now + timedelta(seconds=DelaySeconds), QueueUrl, MessageBody))
+        return {'MessageId': str(uuid.uuid4())}
+
+
+def sqs_event(queue_url: str, body: str) -> Dict[str, Any]:
+    """Lambda event source invocation delivering one SQS message"""
+
+    return {'Records': [{
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': queue_url,
+        'messageId': str(uuid.uuid4()),
+        'body': body
+    }]}
+
+
+def build_state_change_event(build: LocalBuild, region: str = 'us-east-1', account: str = '000000000000') -> Dict[str, Any]:
+    """EventBridge CodeBuild Build State Change event for a finished build"""
+
+    return {
+        'source': 'aws.codebuild',
+        'detail-type': 'CodeBuild Build State Change',
+        'time': build.finished_at.isoformat(),
+        'detail': {
+            'build-status': 'SUCCEEDED',
+            'project-name': build.project_name,
+            'build-id': f"arn:aws:codebuild:{region}:{account}:build/{build.build_id}",
+            'additional-information': {
+                'phases': [{'phase-type': 'BUILD', 'duration-in-seconds': int(build.duration_seconds)}]
+            }
+        }
+    }
+
+
+_request_ids = itertools.count(1)
+
+
+class LocalLambdaContext:
+    """Lambda context whose remaining time runs on the virtual clock"""
+
+    def __init__(self, clock: VirtualClock, timeout_seconds: int):
+        self.clock = clock
+        self.deadline = clock.now + timedelta(seconds=timeout_seconds)
+        self.aws_request_id = f"local-{next(_request_ids)}"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self.deadline - self.clock.now).total_seconds() * 1000))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Backfill Content Index Keys
+
+Content items written before facet_key and type_status_key existed are
+missing from ClientFacetIndex and ClientTypeStatusIndex, so queries on those
+indexes would silently skip them. Until this migration records
+INDEX_KEYS_VERSION on the view store's generation item, OptimizedContentCache
+and MaterializedViewStore answer such queries from ClientContentTypeIndex.
+
+The migration scans a client's content table and sets the keys on every item
+that lacks them. Each update is conditioned on the item's status and
+updated_at still being what was scanned; an item rewritten in the meantime
+already carries its keys. Run it after the handlers writing the keys are
+deployed, so no item written during the scan is left without them.
+
+New deployments do not need it: the integration layer's index keys seed
+records the version when the content table is still empty at deploy time.
+An existing deployment upgrading to index keys is left on the fallback
+queries (the seed logs a warning) until this is run once per client:
+
+    1. Deploy the integration layer so every handler writes the keys.
+    2. Run the migration with --views-table so it records the version.
+
+Usage:
+    python tools/migrations/backfill_index_keys.py --table acme-unified-content-cache --views-table acme-content-views
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from shared.composition.aws_clients import AWSClients
+from shared.composition.materialized_views import INDEX_KEYS_VERSION, MaterializedViewStore
+from shared.composition.optimized_content_cache import build_facet_key, build_type_status_key
+
+
+logger = logging.getLogger(__name__)
+
+SCANNED_ATTRIBUTES = (
+    'content_id', 'content_type_provider', 'content_type', 'provider_name', '#status', 'updated_at',
+    'facet_key', 'type_status_key'
+)
+
+
+def index_keys(item: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Derived index keys of a content item, or None if it lacks their source attributes"""
+
+    if not all(item.get(name) for name in ('content_type', 'provider_name', 'status', 'updated_at')):
+        return None
+
+    return {
+        'facet_key': build_facet_key(item['content_type'], item['provider_name'], item['status'], item['updated_at']),
+        'type_status_key': build_type_status_key(item['content_type'], item['status'], item['updated_at']),
+    }
+
+
+def backfill_index_keys(content_table, view_store: Optional[MaterializedViewStore] = None) -> Dict[str, int]:
+    """
+    Set missing index keys on every item of a content table.
+
+    Args:
+        content_table: DynamoDB Table of one client's content
+        view_store: View store to record the backfilled version in, once complete
+
+    Returns:
+        Counts of scanned, updated, rewritten (changed during the scan) and
+        skipped (no content attributes) items
+    """
+
+    from botocore.exceptions import ClientError
+
+    stats = {'scanned': 0, 'updated': 0, 'rewritten': 0, 'skipped': 0}
+    params: Dict[str, Any] = {
+        'ProjectionExpression': ', '.join(SCANNED_ATTRIBUTES),
+        'ExpressionAttributeNames': {'#status': 'status'}
+    }
+
+    while True:
+        response = content_table.scan(**params)
+
+        for item in response.get('Items', []):
+            stats['scanned'] += 1
+            keys = index_keys(item)
+            if keys is None:
+                stats['skipped'] += 1
+                continue
+            if all(item.get(name) == value for name, value in keys.items()):
+                continue
+
+            try:
+                content_table.update_item(
+                    Key={'content_id': item['content_id'], 'content_type_provider': item['content_type_provider']},
+                    UpdateExpression='SET facet_key = :facet_key, type_status_key = :type_status_key',
+                    ConditionExpression='#status = :status AND updated_at = :updated_at',
+                    ExpressionAttributeNames={'#status': 'status'},
+                    ExpressionAttributeValues={
+                        ':facet_key': keys['facet_key'],
+                        ':type_status_key': keys['type_status_key'],
+                        ':status': item['status'],
+                        ':updated_at': item['updated_at']
+                    }
+                )
+                stats['updated'] += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                stats['rewritten'] += 1
+
+        if not response.get('LastEvaluatedKey'):
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    if view_store is not None:
+        view_store.mark_index_keys_backfilled(INDEX_KEYS_VERSION)
+
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Backfill facet_key and type_status_key on existing content')
+    parser.add_argument('--table', required=True, help='Unified content cache table of the client')
+    parser.add_argument('--views-table', help='Content views table; records the backfill so queries use the new indexes')
+    parser.add_argument('--region', help='AWS region (default: from the environment)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+
+    aws = AWSClients(region_name=args.region)
+    view_store = MaterializedViewStore(args.views_table, dynamodb=aws.resource('dynamodb')) if args.views_table else None
+
+    stats = backfill_index_keys(aws.table(args.table), view_store)
+
+    print(f"Scanned {stats['scanned']} items: {stats['updated']} updated, "
+          f"{stats['rewritten']} rewritten during the scan, {stats['skipped']} skipped")
+    if view_store is None:
+        print("No --views-table given: queries keep avoiding the keyed indexes until the backfill is recorded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())